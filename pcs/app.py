@@ -17,26 +17,9 @@ from pcs.cli.common import (
     routing,
 )
 from pcs.cli.common.reports import process_library_reports
-from pcs.cli.routing import (
-    acl,
-    alert,
-    booth,
-    client,
-    cluster,
-    config,
-    constraint,
-    dr,
-    host,
-    node,
-    pcsd,
-    prop,
-    qdevice,
-    quorum,
-    resource,
-    status,
-    stonith,
-)
 from pcs.lib.errors import LibraryError
+from pcs.lib.resource_agent import Agent
+from pcs.lib.resource_agent_cache import AgentMetadataCache
 
 
 def _non_root_run(argv_cmd):
@@ -125,7 +108,9 @@ def main(argv=None):
     if completion.has_applicable_environment(os.environ):
         print(completion.make_suggestions(
             os.environ,
-            usage.generate_completion_tree_from_usage()
+            completion.get_completion_tree(
+                settings.completion_tree_cache_file, settings.pcs_version
+            )
         ))
         sys.exit()
 
@@ -227,26 +212,37 @@ def main(argv=None):
     logger.propagate = 0
     logger.handlers = []
 
+    Agent.set_metadata_cache(AgentMetadataCache(
+        settings.agent_metadata_cache_dir,
+        settings.agent_metadata_cache_max_entries,
+        refresh=("--refresh-cache" in utils.pcs_options),
+    ))
+
     if (os.getuid() != 0) and (argv and argv[0] != "help") and not usefile:
         _non_root_run(argv)
     cmd_map = {
-        "resource": resource.resource_cmd,
-        "cluster": cluster.cluster_cmd,
-        "stonith": stonith.stonith_cmd,
-        "property": prop.property_cmd,
-        "constraint": constraint.constraint_cmd,
-        "acl": acl.acl_cmd,
-        "status": status.status_cmd,
-        "config": config.config_cmd,
-        "pcsd": pcsd.pcsd_cmd,
-        "node": node.node_cmd,
-        "quorum": quorum.quorum_cmd,
-        "qdevice": qdevice.qdevice_cmd,
-        "alert": alert.alert_cmd,
-        "booth": booth.booth_cmd,
-        "host": host.host_cmd,
-        "client": client.client_cmd,
-        "dr": dr.dr_cmd,
+        "resource": routing.import_cmd(
+            "pcs.cli.routing.resource", "resource_cmd"
+        ),
+        "cluster": routing.import_cmd("pcs.cli.routing.cluster", "cluster_cmd"),
+        "stonith": routing.import_cmd("pcs.cli.routing.stonith", "stonith_cmd"),
+        "property": routing.import_cmd("pcs.cli.routing.prop", "property_cmd"),
+        "constraint": routing.import_cmd(
+            "pcs.cli.routing.constraint", "constraint_cmd"
+        ),
+        "acl": routing.import_cmd("pcs.cli.routing.acl", "acl_cmd"),
+        "status": routing.import_cmd("pcs.cli.routing.status", "status_cmd"),
+        "config": routing.import_cmd("pcs.cli.routing.config", "config_cmd"),
+        "pcsd": routing.import_cmd("pcs.cli.routing.pcsd", "pcsd_cmd"),
+        "node": routing.import_cmd("pcs.cli.routing.node", "node_cmd"),
+        "quorum": routing.import_cmd("pcs.cli.routing.quorum", "quorum_cmd"),
+        "qdevice": routing.import_cmd("pcs.cli.routing.qdevice", "qdevice_cmd"),
+        "alert": routing.import_cmd("pcs.cli.routing.alert", "alert_cmd"),
+        "booth": routing.import_cmd("pcs.cli.routing.booth", "booth_cmd"),
+        "host": routing.import_cmd("pcs.cli.routing.host", "host_cmd"),
+        "client": routing.import_cmd("pcs.cli.routing.client", "client_cmd"),
+        "dr": routing.import_cmd("pcs.cli.routing.dr", "dr_cmd"),
+        "batch": routing.import_cmd("pcs.cli.routing.batch", "batch_cmd"),
         "help": lambda lib, argv, modifiers: usage.main(),
     }
     try:
@@ -0,0 +1,322 @@
+"""
+Run a sequence of pcs commands as one transaction on the CIB
+
+The commands work with a temporary copy of the CIB using the same mechanism as
+the -f option. The CIB is loaded once before the first command and the changes
+done by all the commands are pushed to the cluster at once after the last
+command. If any of the commands fails, nothing is pushed.
+
+Library commands share one library environment which keeps the CIB parsed
+between the commands. Legacy commands read and write the temporary copy.
+"""
+import logging
+import os
+import shlex
+import sys
+import tempfile
+import time
+from typing import (
+    Any,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from xml.etree.ElementTree import Element
+
+from pcs import utils
+from pcs.cli.common.console_report import error
+from pcs.cli.common.errors import CmdLineInputError
+from pcs.cli.common.parse_args import InputModifiers
+from pcs.common.tools import Version, format_os_error
+from pcs.lib import reports
+from pcs.lib.cib.tools import drop_id_index
+from pcs.lib.env import LibraryEnvironment
+from pcs.lib.errors import LibraryError
+from pcs.lib.external import CommandRunner
+from pcs.lib.pacemaker.live import (
+    ensure_cib_version,
+    get_cib,
+    push_cib_diff,
+    wait_for_idle,
+)
+from pcs.lib.xml_tools import etree_to_str
+
+
+class BatchCommand(NamedTuple):
+    line_number: int
+    argv: List[str]
+
+
+class BatchLibraryEnvironment(LibraryEnvironment):
+    """
+    Library environment shared by the commands of a batch
+
+    The CIB is parsed once and kept in memory. A pushed CIB is written to the
+    CIB file right away, so that legacy commands see it. The file is parsed
+    again only if it has been changed by something else, e.g. by a legacy
+    command.
+    """
+    def __init__(self, cib_file: str, **kwargs):
+        """
+        cib_file -- the CIB file shared by the commands
+        """
+        # The CIB is not live, the data are never used though, the CIB is
+        # always read from the file.
+        super().__init__(cib_data="", **kwargs)
+        self.__cib_file = cib_file
+        self.__cib: Optional[Element] = None
+        self.__cib_file_stamp: Optional[Tuple[int, int, int]] = None
+
+    def get_cib(
+        self,
+        minimal_version: Optional[Version] = None,
+        with_status: bool = False,
+    ) -> Element:
+        # the CIB file always contains the status section
+        del with_status
+        if self.__cib is None or self.__cib_file_stamp != self.__stamp():
+            self.__cib = get_cib(self.__read())
+            self.__cib_file_stamp = self.__stamp()
+            drop_id_index()
+        if minimal_version is not None:
+            upgraded_cib = ensure_cib_version(
+                self.cmd_runner(), self.__cib, minimal_version
+            )
+            if upgraded_cib is not None:
+                self.__cib = upgraded_cib
+                self.__cib_file_stamp = self.__stamp()
+                drop_id_index()
+                if not self._cib_upgrade_reported:
+                    self.report_processor.report(
+                        reports.cib_upgrade_successful()
+                    )
+                self._cib_upgrade_reported = True
+        return self.__cib
+
+    @property
+    def cib(self):
+        if self.__cib is None:
+            raise AssertionError("CIB has not been loaded")
+        return self.__cib
+
+    def push_cib(self, custom_cib=None, wait=False):
+        # waiting is not possible with a CIB file, this raises a proper error
+        self.get_wait_timeout(wait)
+        if custom_cib is not None:
+            self.__cib = custom_cib
+        elif self.__cib is None:
+            raise AssertionError("CIB has not been loaded")
+        try:
+            with open(self.__cib_file, mode="w") as cib_file:
+                cib_file.write(etree_to_str(self.__cib))
+        except EnvironmentError as e:
+            raise LibraryError(reports.cib_save_tmp_error(format_os_error(e)))
+        self.__cib_file_stamp = self.__stamp()
+        self._cib_upgrade_reported = False
+        drop_id_index()
+
+    def cmd_runner(self) -> CommandRunner:
+        # pacemaker tools work with the CIB file directly
+        runner_env = {
+            "LC_ALL": "C",
+            "CIB_file": self.__cib_file,
+        }
+        if self.user_login:
+            runner_env["CIB_user"] = self.user_login
+        return CommandRunner(self.logger, self.report_processor, runner_env)
+
+    def __read(self) -> str:
+        try:
+            with open(self.__cib_file, mode="r") as cib_file:
+                return cib_file.read()
+        except EnvironmentError as e:
+            raise LibraryError(reports.cib_load_error(format_os_error(e)))
+
+    def __stamp(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self.__cib_file)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def run(lib: Any, argv: Sequence[str], modifiers: InputModifiers) -> None:
+    """
+    Options:
+      * --wait
+      * -f - CIB file
+    """
+    del lib
+    modifiers.ensure_only_supported("--wait", "-f")
+    if len(argv) > 1:
+        raise CmdLineInputError()
+    wait = modifiers.is_specified("--wait")
+    wait_timeout = utils.validate_wait_get_timeout() if wait else None
+    command_list = parse_commands(_read_batch(argv[0] if argv else "-"))
+    if not command_list:
+        raise error("No commands to run")
+
+    cib_file = modifiers.get("-f")
+    if cib_file:
+        original_cib_xml = _read_file(cib_file, "CIB file")
+    else:
+        original_cib_xml = utils.get_cib()
+
+    with tempfile.NamedTemporaryFile(
+        mode="w+", suffix=".xml", prefix="pcs_batch_"
+    ) as batch_cib_file:
+        batch_cib_file.write(original_cib_xml)
+        batch_cib_file.flush()
+        _run_commands(command_list, batch_cib_file.name)
+        new_cib_xml = _read_file(batch_cib_file.name, "CIB file")
+
+    if new_cib_xml == original_cib_xml:
+        print("The new CIB is the same as the original CIB, nothing to push.")
+        return
+    if cib_file:
+        try:
+            with open(cib_file, mode="w") as file:
+                file.write(new_cib_xml)
+        except EnvironmentError as e:
+            raise error(
+                "Cannot write cib file '{0}': '{1}'".format(
+                    cib_file, format_os_error(e)
+                )
+            )
+        return
+
+    runner = utils.cmd_runner()
+    push_cib_diff(
+        runner,
+        utils.get_report_processor(),
+        original_cib_xml,
+        _keep_cluster_attributes(original_cib_xml, new_cib_xml),
+    )
+    print("CIB updated")
+    if wait:
+        wait_for_idle(runner, wait_timeout)
+
+
+def parse_commands(batch: str) -> List[BatchCommand]:
+    """
+    Split a batch to commands, each command is on its own line
+
+    Lines can be continued by a backslash, text following '#' is a comment,
+    leading 'pcs' of commands is optional.
+
+    batch -- content of a batch file
+    """
+    command_list = []
+    line_list = batch.splitlines()
+    line_index = 0
+    while line_index < len(line_list):
+        line_number = line_index + 1
+        line = line_list[line_index]
+        while line.endswith("\\") and line_index + 1 < len(line_list):
+            line_index += 1
+            line = line[:-1] + " " + line_list[line_index]
+        line_index += 1
+        try:
+            argv = shlex.split(line, comments=True)
+        except ValueError as e:
+            raise error(
+                "Unable to parse command on line {0}: {1}".format(
+                    line_number, e
+                )
+            )
+        if argv and argv[0] == "pcs":
+            argv = argv[1:]
+        if not argv:
+            continue
+        if argv[0] == "batch":
+            raise error(
+                "Command on line {0}: batches cannot be nested".format(
+                    line_number
+                )
+            )
+        command_list.append(BatchCommand(line_number, argv))
+    return command_list
+
+
+def _run_commands(command_list: List[BatchCommand], cib_file: str) -> None:
+    # pylint: disable=import-outside-toplevel
+    from pcs import app
+    # each command sets the options of pcs to its own, restore them afterwards
+    saved_state = (utils.pcs_options, utils.usefile, utils.filename)
+    cli_env = utils.get_cli_env()
+    utils.shared_lib_env = BatchLibraryEnvironment(
+        cib_file,
+        logger=logging.getLogger("pcs"),
+        report_processor=cli_env.report_processor,
+        user_login=cli_env.user,
+        user_groups=cli_env.groups,
+        known_hosts_getter=cli_env.known_hosts_getter,
+        request_timeout=cli_env.request_timeout,
+    )
+    batch_start = time.monotonic()
+    try:
+        for index, command in enumerate(command_list, 1):
+            command_start = time.monotonic()
+            failed = False
+            try:
+                app.main(["-f", cib_file] + command.argv)
+            except SystemExit as e:
+                failed = bool(e.code)
+            sys.stderr.write(
+                "Command {0}/{1} (line {2}) finished in {3:.3f} s: {4}\n"
+                .format(
+                    index,
+                    len(command_list),
+                    command.line_number,
+                    time.monotonic() - command_start,
+                    " ".join(shlex.quote(arg) for arg in command.argv),
+                )
+            )
+            if failed:
+                raise error(
+                    "Command on line {0} failed, no changes have been made"
+                    .format(command.line_number)
+                )
+    finally:
+        utils.pcs_options, utils.usefile, utils.filename = saved_state
+        utils.shared_lib_env = None
+        utils.drop_cib_snapshot()
+    sys.stderr.write(
+        "{0} commands finished in {1:.3f} s\n".format(
+            len(command_list), time.monotonic() - batch_start
+        )
+    )
+
+
+def _keep_cluster_attributes(original_cib_xml, new_cib_xml):
+    # Commands in the batch bump versions and other attributes of the CIB
+    # file they write to. Those are maintained by the cluster and must not be
+    # pushed. Only a schema upgrade done by the commands is kept.
+    original_cib = get_cib(original_cib_xml)
+    new_cib = get_cib(new_cib_xml)
+    validate_with = new_cib.get("validate-with")
+    new_cib.attrib.clear()
+    new_cib.attrib.update(original_cib.attrib)
+    if validate_with is not None:
+        new_cib.set("validate-with", validate_with)
+    return new_cib
+
+
+def _read_batch(path: str) -> str:
+    if path == "-":
+        return sys.stdin.read()
+    return _read_file(path, "batch file")
+
+
+def _read_file(path: str, description: str) -> str:
+    try:
+        with open(path, mode="r") as file:
+            return file.read()
+    except EnvironmentError as e:
+        raise error(
+            "Unable to read {0} '{1}': {2}".format(
+                description, path, format_os_error(e)
+            )
+        )
@@ -1,3 +1,9 @@
+import importlib.util
+import json
+import os
+import tempfile
+
+
 def has_applicable_environment(environment):
     """
     dict environment - very likely os.environ
@@ -14,6 +20,60 @@ def has_applicable_environment(environment):
         environment['COMP_CWORD'].isdigit()
     )
 
+def get_completion_tree(cache_file, pcs_version):
+    """
+    Return the completion tree, load it from a cache file if possible
+
+    Generating the tree requires rendering and parsing all usage texts. The
+    tree is therefore cached on disk. The cache is valid for the pcs version
+    and the usage module it has been generated from. The cache is
+    a best-effort optimization: any IO issue makes the tree be generated.
+
+    string cache_file -- path to the file caching the tree
+    string pcs_version -- version of pcs generating the tree
+    """
+    stamp = dict(pcs_version=pcs_version, usage=_get_usage_stamp())
+    try:
+        with open(cache_file, "r", encoding="utf-8") as cache:
+            cached = json.load(cache)
+        if cached["stamp"] == stamp and isinstance(cached["tree"], dict):
+            return cached["tree"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    # pylint: disable=import-outside-toplevel
+    from pcs import usage
+    tree = usage.generate_completion_tree_from_usage()
+    _store_completion_tree(cache_file, dict(stamp=stamp, tree=tree))
+    return tree
+
+def _get_usage_stamp():
+    # Locate the usage module without importing it, which is the slow part.
+    try:
+        usage_file = importlib.util.find_spec("pcs.usage").origin
+        stat = os.stat(usage_file)
+    except (AttributeError, ImportError, OSError, TypeError):
+        return None
+    return [usage_file, stat.st_mtime_ns, stat.st_size]
+
+def _store_completion_tree(cache_file, cached):
+    try:
+        cache_dir = os.path.dirname(cache_file)
+        os.makedirs(cache_dir, mode=0o755, exist_ok=True)
+        # write to a temporary file first so that concurrently running pcs
+        # processes never read a partially written cache
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+                json.dump(cached, tmp_file)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, cache_file)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass
+
 def make_suggestions(environment, suggestion_tree):
     """
     dict environment - very likely os.environ
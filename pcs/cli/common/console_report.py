@@ -694,6 +694,29 @@ CODE_TO_MESSAGE_BUILDER_MAP = {
         ).format(**info)
     ,
 
+    codes.NODE_COMMUNICATION_CONNECTIONS: lambda info:
+        "Connections to nodes: {created} opened, {reused} reused".format(
+            **info
+        )
+    ,
+
+    codes.NODE_COMMUNICATION_REQUEST_HEDGED: lambda info:
+        (
+            "Request '{request}' has not finished in {delay} seconds, "
+            "sending it to '{node}' as well"
+        ).format(**info)
+    ,
+
+    codes.NODE_COMMUNICATION_PIPELINE_FINISHED: lambda info:
+        "Requests to '{node}' finished: {durations}".format(
+            node=info["node"],
+            durations=", ".join(
+                f"'{request}' in {duration} seconds"
+                for request, duration in info["request_durations"]
+            )
+        )
+    ,
+
     codes.NODE_COMMUNICATION_NO_MORE_ADDRESSES: lambda info:
         "Unable to connect to '{node}' via any of its addresses".format(**info)
     ,
@@ -1624,6 +1647,15 @@ CODE_TO_MESSAGE_BUILDER_MAP = {
         )
     ,
 
+    codes.FILES_DISTRIBUTION_SKIPPED_SAME_CONTENT: lambda info:
+        "{node}: distribution of {_files} skipped, the node already has the "
+        "same content"
+        .format(
+            _files=format_list(info["file_list"]),
+            **info
+        )
+    ,
+
     codes.FILE_DISTRIBUTION_SUCCESS: lambda info:
         "{node}: successful distribution of the file '{file_description}'"
         .format(
@@ -1975,7 +2007,15 @@ CODE_TO_MESSAGE_BUILDER_MAP = {
         )
     ,
     codes.CLUSTER_START_SUCCESS: lambda info:
-        "{node}: Cluster started".format(**info)
+        "{node}: Cluster started{_time}".format(
+            _time=(
+                "" if info["time_to_ready"] is None
+                else ", ready after {0:.1f} seconds".format(
+                    info["time_to_ready"]
+                )
+            ),
+            **info
+        )
     ,
     codes.SERVICE_NOT_INSTALLED: lambda info:
         "{node}: Required cluster services not installed: {_services}".format(
@@ -10,3 +10,6 @@ class Env():
         self.known_hosts_getter = None
         self.debug = False
         self.request_timeout = None
+        # a library environment shared by several commands, a new one is
+        # created for each command if not set
+        self.lib_env = None
@@ -3,31 +3,6 @@ from collections import namedtuple
 from typing import Dict, Any
 
 from pcs.cli.common import middleware
-from pcs.lib.commands import (
-    acl,
-    alert,
-    booth,
-    cib_options,
-    cluster,
-    dr,
-    fencing_topology,
-    node,
-    pcsd,
-    qdevice,
-    quorum,
-    remote_node,
-    resource,
-    resource_agent,
-    sbd,
-    status,
-    stonith,
-    stonith_agent,
-)
-from pcs.lib.commands.constraint import (
-    colocation as constraint_colocation,
-    order as constraint_order,
-    ticket as constraint_ticket
-)
 from pcs.lib.env import LibraryEnvironment
 
 
@@ -72,6 +47,11 @@ def lib_env_to_cli_env(lib_env, cli_env):
 
 def bind(cli_env, run_with_middleware, run_library_command):
     def run(cli_env, *args, **kwargs):
+        if cli_env.lib_env is not None:
+            # The shared environment holds its data itself, there is nothing
+            # to be reflected to cli_env.
+            return run_library_command(cli_env.lib_env, *args, **kwargs)
+
         lib_env = cli_env_to_lib_env(cli_env)
 
         lib_call_result = run_library_command(lib_env, *args, **kwargs)
@@ -100,8 +80,12 @@ def get_module(env, middleware_factory, name):
 
 
 def load_module(env, middleware_factory, name):
+    # Library command modules are imported only when needed, importing all of
+    # them slows down every run of pcs considerably.
+    # pylint: disable=import-outside-toplevel
     # pylint: disable=too-many-return-statements, too-many-branches
     if name == "acl":
+        from pcs.lib.commands import acl
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -125,6 +109,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "alert":
+        from pcs.lib.commands import alert
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -140,6 +125,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "booth":
+        from pcs.lib.commands import booth
         return bind_all(
             env,
             middleware.build(
@@ -168,6 +154,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "cluster":
+        from pcs.lib.commands import cluster
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -179,12 +166,14 @@ def load_module(env, middleware_factory, name):
                 "remove_nodes": cluster.remove_nodes,
                 "remove_nodes_from_cib": cluster.remove_nodes_from_cib,
                 "setup": cluster.setup,
+                "sync_corosync_conf": cluster.sync_corosync_conf,
                 "update_link": cluster.update_link,
                 "verify": cluster.verify,
             }
         )
 
     if name == "dr":
+        from pcs.lib.commands import dr
         return bind_all(
             env,
             middleware.build(middleware_factory.corosync_conf_existing),
@@ -197,6 +186,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "remote_node":
+        from pcs.lib.commands import remote_node
         return bind_all(
             env,
             middleware.build(
@@ -212,6 +202,9 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == 'constraint_colocation':
+        from pcs.lib.commands.constraint import (
+            colocation as constraint_colocation,
+        )
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -222,6 +215,9 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == 'constraint_order':
+        from pcs.lib.commands.constraint import (
+            order as constraint_order,
+        )
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -232,6 +228,9 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == 'constraint_ticket':
+        from pcs.lib.commands.constraint import (
+            ticket as constraint_ticket,
+        )
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -244,6 +243,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "fencing_topology":
+        from pcs.lib.commands import fencing_topology
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -258,6 +258,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "node":
+        from pcs.lib.commands import node
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -275,6 +276,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "pcsd":
+        from pcs.lib.commands import pcsd
         return bind_all(
             env,
             middleware.build(),
@@ -284,6 +286,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "qdevice":
+        from pcs.lib.commands import qdevice
         return bind_all(
             env,
             middleware.build(),
@@ -307,6 +310,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "quorum":
+        from pcs.lib.commands import quorum
         return bind_all(
             env,
             middleware.build(middleware_factory.corosync_conf_existing),
@@ -324,6 +328,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "resource_agent":
+        from pcs.lib.commands import resource_agent
         return bind_all(
             env,
             middleware.build(),
@@ -338,6 +343,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "resource":
+        from pcs.lib.commands import resource
         return bind_all(
             env,
             middleware.build(
@@ -369,6 +375,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "cib_options":
+        from pcs.lib.commands import cib_options
         return bind_all(
             env,
             middleware.build(
@@ -381,6 +388,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "status":
+        from pcs.lib.commands import status
         return bind_all(
             env,
             middleware.build(
@@ -395,6 +403,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "stonith":
+        from pcs.lib.commands import stonith
         return bind_all(
             env,
             middleware.build(
@@ -412,6 +421,7 @@ def load_module(env, middleware_factory, name):
 
 
     if name == "sbd":
+        from pcs.lib.commands import sbd
         return bind_all(
             env,
             middleware.build(),
@@ -431,6 +441,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "stonith_agent":
+        from pcs.lib.commands import stonith_agent
         return bind_all(
             env,
             middleware.build(),
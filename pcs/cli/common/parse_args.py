@@ -32,6 +32,10 @@ PCS_LONG_OPTIONS = [
     "groups",
     # "pcs resource clear --expired" - only clear expired moves and bans
     "expired",
+    # do not use cached agents' metadata, load them again
+    "refresh-cache",
+    # pcs dr status - how long to wait for statuses of sites
+    "timeout=",
 ]
 
 def split_list(arg_list, separator):
@@ -380,6 +384,7 @@ class InputModifiers():
             "--no-watchdog-validation": "--no-watchdog-validation" in options,
             "--off": "--off" in options,
             "--pacemaker": "--pacemaker" in options,
+            "--refresh-cache": "--refresh-cache" in options,
             "--safe": "--safe" in options,
             "--simulate": "--simulate" in options,
             "--skip-offline": "--skip-offline" in options,
@@ -395,6 +400,7 @@ class InputModifiers():
             "--name": options.get("--name", None),
             "--node": options.get("--node", None),
             "--request-timeout": options.get("--request-timeout", None),
+            "--timeout": options.get("--timeout", None),
             "--to": options.get("--to", None),
             "--wait": options.get("--wait", False),
             "-f": options.get("-f", None),
@@ -1,3 +1,4 @@
+import importlib
 from typing import (
     Any,
     Callable,
@@ -40,3 +41,21 @@ def create_router(
             )
 
     return _router
+
+
+def import_cmd(module_name: str, cmd_name: str) -> CliCmdInterface:
+    """
+    Return a command which imports the specified command once it is run
+
+    Importing all the commands is slow. This makes it possible to import only
+    the command which is actually run.
+
+    module_name -- name of a module defining the command
+    cmd_name -- name of the command in the module
+    """
+    def _cmd(lib: Any, argv: List[str], modifiers: InputModifiers) -> None:
+        return getattr(importlib.import_module(module_name), cmd_name)(
+            lib, argv, modifiers
+        )
+
+    return _cmd
@@ -15,6 +15,7 @@ from pcs.common.dr import (
 )
 from pcs.common.interface import dto
 from pcs.common.tools import indent
+from pcs.lib.pacemaker.values import timeout_to_seconds
 
 def config(
     lib: Any,
@@ -75,16 +76,27 @@ def status(
       * --full - show full details, node attributes and failcount
       * --hide-inactive - hide inactive resources
       * --request-timeout - HTTP timeout for node authorization check
+      * --timeout - how long to wait for statuses of all sites
     """
     modifiers.ensure_only_supported(
-        "--full", "--hide-inactive", "--request-timeout",
+        "--full", "--hide-inactive", "--request-timeout", "--timeout",
     )
     if argv:
         raise CmdLineInputError()
 
+    timeout = None
+    if modifiers.is_specified("--timeout"):
+        timeout = timeout_to_seconds(modifiers.get("--timeout"))
+        if not timeout:
+            raise CmdLineInputError(
+                "'{}' is not a valid --timeout value, use a positive integer "
+                "or a time with a unit".format(modifiers.get("--timeout"))
+            )
+
     status_list_raw = lib.dr.status_all_sites_plaintext(
         hide_inactive_resources=modifiers.get("--hide-inactive"),
         verbose=modifiers.get("--full"),
+        timeout=timeout,
     )
     try:
         status_list = [
@@ -43,7 +43,10 @@ from pcs.lib import (
 )
 from pcs.lib.cib.tools import VERSION_FORMAT
 from pcs.lib.commands.remote_node import _destroy_pcmk_remote_env
-from pcs.lib.communication.nodes import CheckAuth
+from pcs.lib.communication.nodes import (
+    CheckAuth,
+    wait_for_pacemaker_to_start,
+)
 from pcs.lib.communication.tools import (
     run_and_raise,
     run as run_com_cmd,
@@ -154,22 +157,10 @@ def sync_nodes(lib, argv, modifiers):
     Options:
       * --request-timeout - timeout for HTTP requests
     """
-    del lib
     modifiers.ensure_only_supported("--request-timeout")
     if argv:
         raise CmdLineInputError()
-
-    config = utils.getCorosyncConf()
-    nodes, report_list = get_existing_nodes_names(
-        utils.get_corosync_conf_facade(conf_text=config)
-    )
-    if not nodes:
-        report_list.append(reports.corosync_config_no_nodes_defined())
-    if report_list:
-        process_library_reports(report_list)
-
-    for node in nodes:
-        utils.setCorosyncConfig(node, config)
+    lib.cluster.sync_corosync_conf()
 
 
 def start_cluster(argv):
@@ -286,29 +277,6 @@ def wait_for_local_node_started(stop_at, interval):
             "\n".join([build_report_message(item) for item in e.args])
         )
 
-def wait_for_remote_node_started(node, stop_at, interval):
-    """
-    Commandline options:
-      * --request-timeout - timeout for HTTP requests
-    """
-    while True:
-        time.sleep(interval)
-        code, output = utils.getPacemakerNodeStatus(node)
-        # HTTP error, permission denied or unable to auth
-        # there is no point in trying again as it won't get magically fixed
-        if code in [1, 3, 4]:
-            return 1, output
-        if code == 0:
-            try:
-                node_status = json.loads(output)
-                if is_node_fully_started(node_status):
-                    return 0, "Started"
-            except (ValueError, KeyError):
-                # this won't get fixed either
-                return 1, "Unable to get node status"
-        if datetime.datetime.now() > stop_at:
-            return 1, "Waiting timeout"
-
 def wait_for_nodes_started(node_list, timeout=None):
     """
     Commandline options:
@@ -316,22 +284,32 @@ def wait_for_nodes_started(node_list, timeout=None):
         node_list is not empty list
     """
     timeout = 60 * 15 if timeout is None else timeout
-    interval = 2
-    stop_at = datetime.datetime.now() + datetime.timedelta(seconds=timeout)
-    print("Waiting for node(s) to start...")
     if not node_list:
+        interval = 2
+        stop_at = datetime.datetime.now() + datetime.timedelta(seconds=timeout)
+        print("Waiting for node(s) to start...")
         code, output = wait_for_local_node_started(stop_at, interval)
         if code != 0:
             utils.err(output)
         else:
             print(output)
     else:
-        utils.read_known_hosts_file() # cache known hosts
-        node_errors = parallel_for_nodes(
-            wait_for_remote_node_started, node_list, stop_at, interval
+        lib_env = utils.get_lib_env()
+        report_list, target_list = (
+            lib_env.get_node_target_factory().get_target_list_with_reports(
+                node_list, allow_skip=False,
+            )
         )
-        if node_errors:
-            utils.err("unable to verify all nodes have started")
+        if report_list:
+            process_library_reports(report_list)
+        report_list = wait_for_pacemaker_to_start(
+            lib_env.get_node_communicator(),
+            lib_env.report_processor,
+            target_list,
+            timeout,
+        )
+        if report_list:
+            process_library_reports(report_list)
 
 def stop_cluster_all():
     """
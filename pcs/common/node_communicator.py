@@ -1,6 +1,8 @@
 import base64
+import heapq
 import io
 import re
+import time
 from collections import namedtuple
 from urllib.parse import urlencode
 
@@ -103,13 +105,19 @@ class Request():
     interface for getting next available host to make request on.
     """
 
-    def __init__(self, request_target, request_data):
+    def __init__(self, request_target, request_data, delay=0, timeout=None):
         """
         RequestTarget request_target
         RequestData request_data
+        float delay -- seconds to wait before performing the request once it
+            has been added to a communicator
+        float timeout -- seconds to wait for the request to finish, the
+            communicator's request timeout applies if it is shorter
         """
         self._target = request_target
         self._data = request_data
+        self.delay = delay
+        self.timeout = timeout
         self._current_dest_iterator = iter(self._target.dest_list)
         self._current_dest = None
         self.next_dest()
@@ -250,12 +258,74 @@ class Response():
             self.response_code,
         )
 
+class ConnectionPool():
+    """
+    Connections, TLS sessions and resolved names shared by communicators
+
+    Requests to a node performed by communicators sharing a pool reuse an
+    already open connection to the node instead of connecting and negotiating
+    TLS again.
+    """
+    # Older libcurl versions do not support sharing all of these, sharing what
+    # is supported is good enough.
+    _share_data_list = (
+        "LOCK_DATA_CONNECT",
+        "LOCK_DATA_SSL_SESSION",
+        "LOCK_DATA_DNS",
+    )
+
+    def __init__(self):
+        self._share = pycurl.CurlShare()
+        for data_name in self._share_data_list:
+            if not hasattr(pycurl, data_name):
+                continue
+            try:
+                self._share.setopt(pycurl.SH_SHARE, getattr(pycurl, data_name))
+            except pycurl.error:
+                pass
+        self.connections_created = 0
+        self.connections_reused = 0
+
+    def prepare_handle(self, handle):
+        """
+        Make an easy handle use the shared connections
+
+        pycurl.Curl handle -- handle to be performed
+        """
+        handle.setopt(pycurl.SHARE, self._share)
+
+    def register_response(self, response):
+        """
+        Count whether the connection of a finished request was reused
+
+        Response response -- response of a performed request
+        """
+        if not response.was_connected:
+            return
+        new_connections = response.handle.getinfo(pycurl.NUM_CONNECTS)
+        if new_connections is None:
+            return
+        if new_connections:
+            self.connections_created += new_connections
+        else:
+            self.connections_reused += 1
+
+
 class NodeCommunicatorFactory():
     def __init__(self, communicator_logger, user, groups, request_timeout):
         self._logger = communicator_logger
         self._user = user
         self._groups = groups
         self._request_timeout = request_timeout
+        self._connection_pool = None
+
+    @property
+    def connection_pool(self):
+        # Created on demand so that no curl objects are created unless there
+        # is a need to communicate with nodes.
+        if self._connection_pool is None:
+            self._connection_pool = ConnectionPool()
+        return self._connection_pool
 
     def get_communicator(self, request_timeout=None):
         return self.get_simple_communicator(request_timeout=request_timeout)
@@ -263,14 +333,15 @@ class NodeCommunicatorFactory():
     def get_simple_communicator(self, request_timeout=None):
         timeout = request_timeout if request_timeout else self._request_timeout
         return Communicator(
-            self._logger, self._user, self._groups, request_timeout=timeout
+            self._logger, self._user, self._groups, request_timeout=timeout,
+            connection_pool=self.connection_pool,
         )
 
     def get_multiaddress_communicator(self, request_timeout=None):
         timeout = request_timeout if request_timeout else self._request_timeout
         return MultiaddressCommunicator(
-            self._logger, self._user, self._groups, request_timeout=timeout
-
+            self._logger, self._user, self._groups, request_timeout=timeout,
+            connection_pool=self.connection_pool,
         )
 
 
@@ -282,8 +353,24 @@ class Communicator():
     """
     curl_multi_select_timeout_default = 0.8 # in seconds
 
-    def __init__(self, communicator_logger, user, groups, request_timeout=None):
+    def __init__(
+        self, communicator_logger, user, groups, request_timeout=None,
+        connection_pool=None
+    ):
+        """
+        CommunicatorLoggerInterface communicator_logger -- logs requests
+        string user -- CIB user
+        list groups -- CIB user groups
+        int request_timeout -- timeout of requests in seconds
+        ConnectionPool connection_pool -- connections shared with other
+            communicators, connections are not shared if not specified
+        """
+        # pylint: disable=too-many-arguments
         self._logger = communicator_logger
+        self._connection_pool = (
+            connection_pool if connection_pool is not None
+            else ConnectionPool()
+        )
         self._auth_cookies = _get_auth_cookies(user, groups)
         self._request_timeout = (
             request_timeout
@@ -296,6 +383,12 @@ class Communicator():
         # We need to have references for all the handles, so they don't be
         # cleaned up by the garbage collector.
         self._easy_handle_list = []
+        # Heap of handles of delayed requests which have not been added to the
+        # multi handle yet: (time to start at, sequence number, handle)
+        self._delayed_handle_heap = []
+        self._delayed_handle_counter = 0
+        # Handles of requests which have been neither finished nor cancelled
+        self._pending_handle_set = set()
 
     def add_requests(self, request_list):
         """
@@ -306,17 +399,62 @@ class Communicator():
         method is in progress (returned at least one response and not raised
         StopIteration exception).
 
+        Requests with a delay are performed once their delay elapses.
+
         list request_list -- Request objects to add to the queue
         """
         for request in request_list:
             handle = _create_request_handle(
                 request, self._auth_cookies, self._request_timeout,
             )
+            self._connection_pool.prepare_handle(handle)
             self._easy_handle_list.append(handle)
+            self._pending_handle_set.add(handle)
+            if request.delay > 0:
+                self._delayed_handle_counter += 1
+                heapq.heappush(
+                    self._delayed_handle_heap,
+                    (
+                        time.monotonic() + request.delay,
+                        self._delayed_handle_counter,
+                        handle,
+                    )
+                )
+                continue
             self._multi_handle.add_handle(handle)
             if self._is_running:
                 self._logger.log_request_start(request)
 
+    def cancel_requests(self, request_list):
+        """
+        Stop processing of requests which have been added to the queue and
+        have not finished yet. No responses are returned for the cancelled
+        requests.
+
+        list request_list -- Request objects to cancel
+        """
+        cancelled_id_set = {id(request) for request in request_list}
+        cancelled_handle_set = {
+            handle for handle in self._pending_handle_set
+            if id(handle.request_obj) in cancelled_id_set
+        }
+        if not cancelled_handle_set:
+            return
+        self._pending_handle_set -= cancelled_handle_set
+        delayed_handle_heap = [
+            item for item in self._delayed_handle_heap
+            if item[2] not in cancelled_handle_set
+        ]
+        delayed_handle_set = {
+            handle for dummy_at, dummy_no, handle in self._delayed_handle_heap
+        }
+        if len(delayed_handle_heap) != len(self._delayed_handle_heap):
+            heapq.heapify(delayed_handle_heap)
+            self._delayed_handle_heap = delayed_handle_heap
+        for handle in cancelled_handle_set:
+            if handle not in delayed_handle_set:
+                self._multi_handle.remove_handle(handle)
+
     def start_loop(self):
         """
         Returns generator. When generator is invoked, all requests in queue
@@ -343,24 +481,47 @@ class Communicator():
         if self._is_running:
             raise AssertionError("Method start_loop already running")
         self._is_running = True
+        connections_created = self._connection_pool.connections_created
+        connections_reused = self._connection_pool.connections_reused
+        delayed_handle_set = {
+            handle for dummy_at, dummy_no, handle in self._delayed_handle_heap
+        }
         for handle in self._easy_handle_list:
-            self._logger.log_request_start(handle.request_obj)
+            if handle not in delayed_handle_set:
+                self._logger.log_request_start(handle.request_obj)
 
-        finished_count = 0
-        while finished_count < len(self._easy_handle_list):
+        while self._pending_handle_set:
+            self.__start_delayed_requests()
             self.__multi_perform()
-            self.__wait_for_multi_handle()
-            response_list = self.__get_all_ready_responses()
-            for response in response_list:
+            self.__wait_for_multi_handle(
+                # are there any requests in progress which are not delayed
+                len(self._pending_handle_set) > len(self._delayed_handle_heap)
+            )
+            for response in self.__get_all_ready_responses():
+                if response.handle not in self._pending_handle_set:
+                    # the request has been cancelled while processing previous
+                    # responses
+                    continue
+                self._pending_handle_set.remove(response.handle)
                 # free up memory for next usage of this Communicator instance
                 self._multi_handle.remove_handle(response.handle)
+                self._connection_pool.register_response(response)
                 self._logger.log_response(response)
                 yield response
                 # if something was added to the queue in the meantime, run it
                 # immediately, so we don't need to wait until all responses will
                 # be processed
                 self.__multi_perform()
-            finished_count += len(response_list)
+        connections_created = (
+            self._connection_pool.connections_created - connections_created
+        )
+        connections_reused = (
+            self._connection_pool.connections_reused - connections_reused
+        )
+        if connections_created or connections_reused:
+            self._logger.log_connections(
+                connections_created, connections_reused
+            )
         self._easy_handle_list = []
         self._is_running = False
 
@@ -388,10 +549,38 @@ class Communicator():
             status, num_to_process = self._multi_handle.perform()
         return num_to_process
 
-    def __wait_for_multi_handle(self):
+    def __start_delayed_requests(self):
+        now = time.monotonic()
+        while (
+            self._delayed_handle_heap
+            and
+            self._delayed_handle_heap[0][0] <= now
+        ):
+            dummy_at, dummy_no, handle = heapq.heappop(
+                self._delayed_handle_heap
+            )
+            self._multi_handle.add_handle(handle)
+            self._logger.log_request_start(handle.request_obj)
+
+    def __get_delayed_timeout(self):
+        # seconds until the next delayed request is due, None if there is none
+        if not self._delayed_handle_heap:
+            return None
+        return max(0, self._delayed_handle_heap[0][0] - time.monotonic())
+
+    def __wait_for_multi_handle(self, has_requests_in_progress):
         # try to wait until there is something to do for us
         need_to_wait = True
         while need_to_wait:
+            delayed_timeout = self.__get_delayed_timeout()
+            if delayed_timeout == 0:
+                # a delayed request is due
+                return
+            if delayed_timeout is not None and not has_requests_in_progress:
+                # only delayed requests are left, there is nothing to wait for
+                # but them
+                time.sleep(delayed_timeout)
+                return
             timeout = self._multi_handle.timeout()
             if timeout == 0:
                 # if timeout == 0 then there is something to precess already
@@ -402,6 +591,8 @@ class Communicator():
                 # curl don't have timeout set, so we can use our default
                 else self.curl_multi_select_timeout_default
             )
+            if delayed_timeout is not None:
+                timeout = min(timeout, delayed_timeout)
             # when value returned from select is -1, it timed out, so we can
             # wait
             need_to_wait = (self._multi_handle.select(timeout) == -1)
@@ -442,6 +633,9 @@ class CommunicatorLoggerInterface():
     def log_no_more_addresses(self, response):
         raise NotImplementedError()
 
+    def log_connections(self, created, reused):
+        raise NotImplementedError()
+
 
 def _get_auth_cookies(user, group_list):
     """
@@ -496,7 +690,11 @@ def _create_request_handle(request, cookies, timeout):
     cookies.update(request.cookies)
     handle = pycurl.Curl()
     handle.setopt(pycurl.PROTOCOLS, pycurl.PROTO_HTTPS)
-    handle.setopt(pycurl.TIMEOUT, timeout)
+    if request.timeout is not None and request.timeout < timeout:
+        # pycurl.TIMEOUT only accepts whole seconds
+        handle.setopt(pycurl.TIMEOUT_MS, max(1, int(request.timeout * 1000)))
+    else:
+        handle.setopt(pycurl.TIMEOUT, timeout)
     handle.setopt(pycurl.URL, request.url.encode("utf-8"))
     handle.setopt(pycurl.WRITEFUNCTION, output.write)
     handle.setopt(pycurl.VERBOSE, 1)
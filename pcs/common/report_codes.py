@@ -149,6 +149,9 @@ EMPTY_ID = "EMPTY_ID"
 FENCE_HISTORY_COMMAND_ERROR = "FENCE_HISTORY_COMMAND_ERROR"
 FENCE_HISTORY_NOT_SUPPORTED = "FENCE_HISTORY_NOT_SUPPORTED"
 FILES_DISTRIBUTION_SKIPPED = "FILES_DISTRIBUTION_SKIPPED"
+FILES_DISTRIBUTION_SKIPPED_SAME_CONTENT = (
+    "FILES_DISTRIBUTION_SKIPPED_SAME_CONTENT"
+)
 FILES_DISTRIBUTION_STARTED = "FILES_DISTRIBUTION_STARTED"
 FILES_REMOVE_FROM_NODES_STARTED = "FILES_REMOVE_FROM_NODES_STARTED"
 FILES_REMOVE_FROM_NODES_SKIPPED = "FILES_REMOVE_FROM_NODES_SKIPPED"
@@ -184,6 +187,7 @@ NODE_ADDRESSES_CANNOT_BE_EMPTY = "NODE_ADDRESSES_CANNOT_BE_EMPTY"
 NODE_ADDRESSES_DUPLICATION = "NODE_ADDRESSES_DUPLICATION"
 NODE_ADDRESSES_UNRESOLVABLE = "NODE_ADDRESSES_UNRESOLVABLE"
 NODE_COMMUNICATION_COMMAND_UNSUCCESSFUL = "NODE_COMMUNICATION_COMMAND_UNSUCCESSFUL"
+NODE_COMMUNICATION_CONNECTIONS = "NODE_COMMUNICATION_CONNECTIONS"
 NODE_COMMUNICATION_DEBUG_INFO = "NODE_COMMUNICATION_DEBUG_INFO"
 NODE_COMMUNICATION_ERROR = "NODE_COMMUNICATION_ERROR"
 NODE_COMMUNICATION_ERROR_NOT_AUTHORIZED = "NODE_COMMUNICATION_ERROR_NOT_AUTHORIZED"
@@ -194,7 +198,9 @@ NODE_COMMUNICATION_ERROR_TIMED_OUT = "NODE_COMMUNICATION_ERROR_TIMED_OUT"
 NODE_COMMUNICATION_FINISHED = "NODE_COMMUNICATION_FINISHED"
 NODE_COMMUNICATION_NOT_CONNECTED = "NODE_COMMUNICATION_NOT_CONNECTED"
 NODE_COMMUNICATION_NO_MORE_ADDRESSES = "NODE_COMMUNICATION_NO_MORE_ADDRESSES"
+NODE_COMMUNICATION_PIPELINE_FINISHED = "NODE_COMMUNICATION_PIPELINE_FINISHED"
 NODE_COMMUNICATION_PROXY_IS_SET = "NODE_COMMUNICATION_PROXY_IS_SET"
+NODE_COMMUNICATION_REQUEST_HEDGED = "NODE_COMMUNICATION_REQUEST_HEDGED"
 NODE_COMMUNICATION_RETRYING = "NODE_COMMUNICATION_RETRYING"
 NODE_COMMUNICATION_STARTED = "NODE_COMMUNICATION_STARTED"
 NODE_NAMES_ALREADY_EXIST = "NODE_NAMES_ALREADY_EXIST"
@@ -1,7 +1,10 @@
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 import threading
 from typing import (
+    Any,
+    Callable,
     Iterable,
     List,
     Mapping,
@@ -21,6 +24,27 @@ def run_parallel(worker, data_list):
     for thread in thread_list:
         thread.join()
 
+def map_parallel(
+    worker: Callable[[Any], Any], item_list: Iterable[Any], max_workers: int
+) -> List[Any]:
+    """
+    Call worker for each item using at most max_workers threads
+
+    Return a list of worker's results in the same order as the items are.
+    Exceptions raised by the worker are propagated to the caller.
+
+    worker -- function to be called for each item
+    item_list -- items to be processed
+    max_workers -- maximal number of concurrently running workers
+    """
+    item_list = list(item_list)
+    if max_workers <= 1 or len(item_list) <= 1:
+        return [worker(item) for item in item_list]
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(item_list))
+    ) as executor:
+        return list(executor.map(worker, item_list))
+
 def format_environment_error(e):
     return format_os_error(e)
 
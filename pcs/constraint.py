@@ -3,7 +3,6 @@ from collections import defaultdict
 from os.path import isfile
 import xml.dom.minidom
 from xml.dom.minidom import parseString
-from enum import Enum
 
 from pcs import (
     rule as rule_utils,
@@ -25,6 +24,9 @@ from pcs.cli.constraint_ticket import command as ticket_command
 from pcs.common import report_codes
 from pcs.lib import reports
 from pcs.lib.cib.constraint import resource_set
+from pcs.lib.cib.constraint.common import (
+    RESOURCE_ATTRS as CONSTRAINT_RESOURCE_ATTRS,
+)
 from pcs.lib.cib.constraint.order import ATTRIB as order_attrib
 from pcs.lib.node import get_existing_nodes_names
 from pcs.lib.pacemaker.values import (
@@ -61,12 +63,6 @@ RULE_EXPIRED = "expired"
 RULE_NOT_IN_EFFECT = "not yet in effect"
 RULE_UNKNOWN_STATUS = "unknown status"
 
-class CrmRuleReturnCode(Enum):
-    IN_EFFECT = 0
-    EXPIRED = 110
-    TO_BE_IN_EFFECT = 111
-
-
 def constraint_location_cmd(lib, argv, modifiers):
     if not argv:
         sub_cmd = "show"
@@ -769,6 +765,8 @@ def _show_location_rules(
     """
     all_lines = []
     constraint_options = {}
+    # all rules are checked at the same time
+    rule_checker = rule_utils.DateRuleChecker()
     for rsc in sorted(
         ruleshash.keys(),
         key=lambda item: (
@@ -813,7 +811,7 @@ def _show_location_rules(
             for rule in constrainthash[constraint_id]:
                 rule_status = RULE_UNKNOWN_STATUS
                 if verify_expiration:
-                    rule_status = _get_rule_status(rule.getAttribute("id"), cib)
+                    rule_status = _get_rule_status(rule, cib, rule_checker)
                     if rule_status != RULE_EXPIRED:
                         is_constraint_expired = False
 
@@ -853,15 +851,25 @@ def _verify_score(score):
             % score
         )
 
-def _get_rule_status(rule_id, cib):
-    _, _, retval = utils.cmd_runner().run(
-        [settings.crm_rule, "--check", "--rule=" + rule_id, "-X-"],
-        cib
-    )
+def _get_rule_status(rule, cib, rule_checker):
+    return_code = rule_checker.check(rule)
+    if return_code is not None:
+        retval = return_code.value
+    else:
+        # crm_rule is only run for rules pcs cannot evaluate on its own
+        _, _, retval = utils.cmd_runner().run(
+            [
+                settings.crm_rule,
+                "--check",
+                "--rule=" + rule.getAttribute("id"),
+                "-X-",
+            ],
+            cib
+        )
     translation_map = {
-        CrmRuleReturnCode.IN_EFFECT.value: RULE_IN_EFFECT,
-        CrmRuleReturnCode.EXPIRED.value: RULE_EXPIRED,
-        CrmRuleReturnCode.TO_BE_IN_EFFECT.value: RULE_NOT_IN_EFFECT,
+        rule_utils.CrmRuleReturnCode.IN_EFFECT.value: RULE_IN_EFFECT,
+        rule_utils.CrmRuleReturnCode.EXPIRED.value: RULE_EXPIRED,
+        rule_utils.CrmRuleReturnCode.TO_BE_IN_EFFECT.value: RULE_NOT_IN_EFFECT,
     }
     return translation_map.get(retval, RULE_UNKNOWN_STATUS)
 
@@ -1322,9 +1330,13 @@ def constraint_ref(lib, argv, modifiers):
     if not argv:
         raise CmdLineInputError()
 
+    dom = utils.get_cib_dom()
+    constraints_index = ConstraintsIndex(dom)
     for arg in argv:
         print("Resource: %s" % arg)
-        constraints, set_constraints = find_constraints_containing(arg)
+        constraints, set_constraints = find_constraints_containing(
+            arg, dom, constraints_index
+        )
         if not constraints and not set_constraints:
             print("  No Matches.")
         else:
@@ -1334,105 +1346,168 @@ def constraint_ref(lib, argv, modifiers):
                 print("  " + constraint)
 
 def remove_constraints_containing(
-    resource_id, output=False, constraints_element=None, passed_dom=None
+    resource_id, output=False, passed_dom=None, constraints_index=None
 ):
     """
     Commandline options:
       * -f - CIB file, effective only if passed_dom is None
+
+    constraints_index -- ConstraintsIndex of passed_dom, allows to remove
+        constraints of many resources without walking the constraints for each
+        of them
     """
-    lib = utils.get_library_wrapper()
-    modifiers = utils.get_input_modifiers()
-    constraints, set_constraints = find_constraints_containing(
-        resource_id,
-        passed_dom
-    )
-    for c in constraints:
+    dom = passed_dom if passed_dom else utils.get_cib_dom()
+    if constraints_index is None:
+        constraints_index = ConstraintsIndex(dom)
+    # constraints of a clone apply to its primitive as well, a constraint may
+    # refer to both of them
+    constraint_el_list = [
+        constraint_el
+        for constraint_el in dict.fromkeys(
+            constraints_index.get_constraints(
+                constraints_index.clone_parents.get(resource_id, "")
+            )
+            +
+            constraints_index.get_constraints(resource_id)
+        )
+        # the index is not updated, skip constraints removed already
+        if constraint_el.parentNode is not None
+    ]
+    for constraint_el in constraint_el_list:
+        if output:
+            print("Removing Constraint - " + constraint_el.getAttribute("id"))
+        constraint_el.parentNode.removeChild(constraint_el)
+
+    resource_ref_list = [
+        resource_ref
+        for resource_ref in constraints_index.resource_refs.get(resource_id, [])
+        if _is_resource_ref_in_constraints(resource_ref)
+    ]
+    for c in resource_ref_list:
+        # If resource id is in a set, remove it from the set, if the set
+        # is empty, then we remove the set, if the parent of the set
+        # is empty then we remove it
+        pn = c.parentNode
+        pn.removeChild(c)
         if output:
-            print("Removing Constraint - " + c)
-        if constraints_element is not None:
-            constraint_rm(
-                lib, [c], modifiers, True, constraints_element,
-                passed_dom=passed_dom
+            print(
+                "Removing %s from set %s"
+                % (resource_id, pn.getAttribute("id"))
             )
-        else:
-            constraint_rm(lib, [c], modifiers, passed_dom=passed_dom)
+        if pn.getElementsByTagName("resource_ref").length == 0:
+            print("Removing set %s" % pn.getAttribute("id"))
+            pn2 = pn.parentNode
+            pn2.removeChild(pn)
+            if pn2.getElementsByTagName("resource_set").length == 0:
+                pn2.parentNode.removeChild(pn2)
+                print("Removing constraint %s" % pn2.getAttribute("id"))
+
+    if not passed_dom and (constraint_el_list or resource_ref_list):
+        utils.replace_cib_configuration(dom)
 
-    if set_constraints:
-        (dom, constraintsElement) = getCurrentConstraints(passed_dom)
-        for c in constraintsElement.getElementsByTagName("resource_ref")[:]:
-            # If resource id is in a set, remove it from the set, if the set
-            # is empty, then we remove the set, if the parent of the set
-            # is empty then we remove it
-            if c.getAttribute("id") == resource_id:
-                pn = c.parentNode
-                pn.removeChild(c)
-                if output:
-                    print(
-                        "Removing %s from set %s"
-                        % (resource_id, pn.getAttribute("id"))
+def _is_resource_ref_in_constraints(resource_ref):
+    """
+    Commandline options: no options
+    """
+    set_el = resource_ref.parentNode
+    if set_el is None:
+        return False
+    constraint_el = set_el.parentNode
+    return constraint_el is not None and constraint_el.parentNode is not None
+
+class ConstraintsIndex:
+    """
+    Constraints indexed by ids of resources they refer to
+
+    The constraints section is walked once, so looking up constraints of many
+    resources does not scan all the constraints for each of them. The index is
+    not updated when the dom changes.
+    """
+    # pylint: disable=too-few-public-methods
+    def __init__(self, dom):
+        """
+        Commandline options: no options
+        """
+        # resource id -> constraints without resource sets, grouped by type
+        self._constraints = defaultdict(lambda: defaultdict(list))
+        # resource id -> resource_ref elements in resource sets
+        self.resource_refs = defaultdict(list)
+        # primitive id -> id of its parent clone or master
+        self.clone_parents = {}
+
+        for primitive_el in dom.getElementsByTagName("primitive"):
+            parent_el = primitive_el.parentNode
+            if parent_el.tagName in ("clone", "master"):
+                self.clone_parents.setdefault(
+                    primitive_el.getAttribute("id"),
+                    parent_el.getAttribute("id")
+                )
+
+        constraints_el_list = dom.getElementsByTagName("constraints")
+        if not constraints_el_list:
+            return
+        for constraint_el in constraints_el_list[0].childNodes:
+            if constraint_el.nodeType != xml.dom.Node.ELEMENT_NODE:
+                continue
+            for attr in dict.fromkeys(
+                constraint_el.getAttribute(attr)
+                for attr in CONSTRAINT_RESOURCE_ATTRS.get(
+                    constraint_el.tagName, ()
+                )
+            ):
+                if attr:
+                    self._constraints[attr][constraint_el.tagName].append(
+                        constraint_el
                     )
-                if pn.getElementsByTagName("resource_ref").length == 0:
-                    print("Removing set %s" % pn.getAttribute("id"))
-                    pn2 = pn.parentNode
-                    pn2.removeChild(pn)
-                    if pn2.getElementsByTagName("resource_set").length == 0:
-                        pn2.parentNode.removeChild(pn2)
-                        print("Removing constraint %s" % pn2.getAttribute("id"))
-        if passed_dom:
-            return dom
-        utils.replace_cib_configuration(dom)
-    return None
+            for resource_ref in constraint_el.getElementsByTagName(
+                "resource_ref"
+            ):
+                self.resource_refs[resource_ref.getAttribute("id")].append(
+                    resource_ref
+                )
+
+    def get_constraints(self, resource_id):
+        """
+        Return constraints without resource sets referring to a resource
+        """
+        by_type = self._constraints.get(resource_id, {})
+        return [
+            constraint_el
+            for tag in CONSTRAINT_RESOURCE_ATTRS
+            for constraint_el in by_type.get(tag, [])
+        ]
 
-def find_constraints_containing(resource_id, passed_dom=None):
+def find_constraints_containing(
+    resource_id, passed_dom=None, constraints_index=None
+):
     """
     Commandline options:
       * -f - CIB file, effective only if passed_dom is None
     """
-    if passed_dom:
-        dom = passed_dom
-    else:
-        dom = utils.get_cib_dom()
+    if constraints_index is None:
+        constraints_index = ConstraintsIndex(
+            passed_dom if passed_dom else utils.get_cib_dom()
+        )
     constraints_found = []
     set_constraints = []
 
-    resources = dom.getElementsByTagName("primitive")
-    resource_match = None
-    for res in resources:
-        if res.getAttribute("id") == resource_id:
-            resource_match = res
-            break
-
-    if resource_match:
-        if (
-            resource_match.parentNode.tagName == "master"
-            or
-            resource_match.parentNode.tagName == "clone"
-        ):
-            constraints_found, set_constraints = find_constraints_containing(
-                resource_match.parentNode.getAttribute("id"),
-                dom
-            )
-
-    constraints = dom.getElementsByTagName("constraints")
-    if not constraints:
-        return [], []
-
-    constraints = constraints[0]
-    myConstraints = constraints.getElementsByTagName("rsc_colocation")
-    myConstraints += constraints.getElementsByTagName("rsc_location")
-    myConstraints += constraints.getElementsByTagName("rsc_order")
-    myConstraints += constraints.getElementsByTagName("rsc_ticket")
-    attr_to_match = ["rsc", "first", "then", "with-rsc", "first", "then"]
-    for c in myConstraints:
-        for attr in attr_to_match:
-            if c.getAttribute(attr) == resource_id:
-                constraints_found.append(c.getAttribute("id"))
-                break
+    # constraints of a clone apply to its primitive as well
+    parent_id = constraints_index.clone_parents.get(resource_id)
+    if parent_id:
+        constraints_found, set_constraints = find_constraints_containing(
+            parent_id, constraints_index=constraints_index
+        )
 
-    setConstraints = constraints.getElementsByTagName("resource_ref")
-    for c in setConstraints:
-        if c.getAttribute("id") == resource_id:
-            set_constraints.append(c.parentNode.parentNode.getAttribute("id"))
+    constraints_found.extend(
+        constraint_el.getAttribute("id")
+        for constraint_el in constraints_index.get_constraints(resource_id)
+    )
+    set_constraints.extend(
+        resource_ref.parentNode.parentNode.getAttribute("id")
+        for resource_ref in constraints_index.resource_refs.get(
+            resource_id, []
+        )
+    )
 
     # Remove duplicates
     set_constraints = list(set(set_constraints))
@@ -1,5 +1,9 @@
 from pcs.daemon.session import Storage
-from pcs.daemon.auth import check_user_groups, authorize_user
+from pcs.daemon.auth import (
+    authorize_user,
+    check_user_groups,
+    invalidate_user_groups,
+)
 
 PCSD_SESSION = "pcsd.sid"
 
@@ -54,6 +58,8 @@ class Mixin:
 
     def session_logout(self):
         if self.__session is not None:
+            if self.__session.is_authenticated:
+                invalidate_user_groups(self.__session.username)
             self.__storage.destroy(self.__session.sid)
         elif self.__sid_from_client is not None:
             self.__storage.destroy(self.__sid_from_client)
@@ -1,13 +1,24 @@
 from collections import namedtuple
 from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from ctypes import byref, cast, CDLL, CFUNCTYPE, POINTER, sizeof, Structure
 from ctypes import c_char, c_char_p, c_int, c_uint, c_void_p
 from ctypes.util import find_library
+from datetime import timedelta
 import grp
 import pwd
+from threading import Lock
+from time import monotonic
+from typing import (
+    Dict,
+    Optional,
+    Tuple,
+)
 
-from tornado.gen import coroutine
+from tornado.gen import with_timeout
+from tornado.util import TimeoutError as TornadoTimeoutError
 
+from pcs import settings
 from pcs.daemon import log
 
 # pylint: disable=invalid-name, too-few-public-methods
@@ -144,6 +155,14 @@ class PlainLogger:
     def success(self, username):
         pass
 
+def get_user_auth_info(username, groups, logger) -> UserAuthInfo:
+    if HA_ADM_GROUP not in groups:
+        logger.not_ha_adm_member(username, HA_ADM_GROUP)
+        return UserAuthInfo(username, groups, is_authorized=False)
+
+    logger.success(username)
+    return UserAuthInfo(username, groups, is_authorized=True)
+
 def check_user_groups_sync(username, logger) -> UserAuthInfo:
     try:
         groups = get_user_groups_sync(username)
@@ -151,12 +170,7 @@ def check_user_groups_sync(username, logger) -> UserAuthInfo:
         logger.unable_determine_groups(username, e)
         return UserAuthInfo(username, [], is_authorized=False)
 
-    if HA_ADM_GROUP not in groups:
-        logger.not_ha_adm_member(username, HA_ADM_GROUP)
-        return UserAuthInfo(username, groups, is_authorized=False)
-
-    logger.success(username)
-    return UserAuthInfo(username, groups, is_authorized=True)
+    return get_user_auth_info(username, groups, logger)
 
 def authorize_user_sync(username, password) -> UserAuthInfo:
     log.pcsd.info("Attempting login by '%s'", username)
@@ -169,24 +183,178 @@ def authorize_user_sync(username, password) -> UserAuthInfo:
 
     return check_user_groups_sync(username, LoginLogger())
 
-# TODO async/await version - how to do it?
-# When async/await is used then the problem is:
-# "TypeError: object Future can't be used in 'await' expression" is raised even
-# if the function "convert_yielded" is used according to
-# http://www.tornadoweb.org/en/stable/guide/coroutines.html#python-3-5-async-and-await
-@coroutine
-def run_in_process(sync_fn, *args):
-    pool = ProcessPoolExecutor(max_workers=1)
-    result = yield pool.submit(sync_fn, *args)
-    pool.shutdown()
-    return result
-
-@coroutine
-def authorize_user(username, password) -> UserAuthInfo:
-    user = yield run_in_process(authorize_user_sync, username, password)
-    return user
+class AuthPoolFull(Exception):
+    pass
+
+class AuthPoolTimeout(Exception):
+    pass
+
+class GroupsCache:
+    """
+    Groups of users recently loaded from the system
+    """
+    def __init__(self, ttl: float):
+        """
+        ttl -- how long in seconds the groups of a user are valid
+        """
+        self.__ttl = ttl
+        self.__cache: Dict[str, Tuple[float, Tuple[str, ...]]] = {}
 
-@coroutine
-def check_user_groups(username) -> UserAuthInfo:
-    user = yield run_in_process(check_user_groups_sync, username, PlainLogger())
+    def get(self, username) -> Optional[Tuple[str, ...]]:
+        cached = self.__cache.get(username)
+        if cached is None:
+            return None
+        loaded_at, groups = cached
+        if monotonic() - loaded_at >= self.__ttl:
+            del self.__cache[username]
+            return None
+        return groups
+
+    def set(self, username, groups) -> None:
+        if self.__ttl > 0:
+            self.__cache[username] = (monotonic(), tuple(groups))
+
+    def invalidate(self, username=None) -> None:
+        """
+        Drop the groups of the specified user or of all users
+        """
+        if username is None:
+            self.__cache.clear()
+        else:
+            self.__cache.pop(username, None)
+
+class AuthWorkerPool:
+    """
+    Run PAM authentication and group lookups in long-running processes
+
+    PAM modules may block or be slow, so they are not run in the daemon process
+    itself. The worker processes are reused for all requests. Requests over
+    the queue limit and requests not finished in time are rejected.
+    """
+    def __init__(self, size: int, queue_limit: int, timeout: float):
+        """
+        size -- number of worker processes
+        queue_limit -- maximal number of requests waiting for a worker
+        timeout -- maximal time in seconds to wait for a request to finish
+        """
+        self.__size = size
+        self.__queue_limit = queue_limit
+        self.__timeout = timeout
+        self.__executor = ProcessPoolExecutor(max_workers=size)
+        # Requests are counted until a worker finishes them, timed out requests
+        # may still keep the workers busy. The count is released from
+        # the threads of the executor.
+        self.__pending = 0
+        self.__pending_lock = Lock()
+
+    async def run(self, sync_fn, *args):
+        with self.__pending_lock:
+            if self.__pending >= self.__size + self.__queue_limit:
+                log.pcsd.warning(
+                    "Auth workers are overloaded, %s requests are pending",
+                    self.__pending,
+                )
+                raise AuthPoolFull()
+            self.__pending += 1
+            pending = self.__pending
+        log.pcsd.debug(
+            "Auth workers: %s busy of %s, %s requests waiting",
+            min(pending, self.__size),
+            self.__size,
+            max(pending - self.__size, 0),
+        )
+        started_at = monotonic()
+        try:
+            future = self.__submit(sync_fn, *args)
+        except BaseException:
+            self.__release()
+            raise
+        future.add_done_callback(self.__release)
+        try:
+            return await with_timeout(timedelta(seconds=self.__timeout), future)
+        except TornadoTimeoutError:
+            # A request still waiting for a worker is not run at all. A running
+            # request cannot be stopped, it is counted until it finishes.
+            future.cancel()
+            log.pcsd.warning(
+                "Auth request has not finished in %s s", self.__timeout
+            )
+            raise AuthPoolTimeout()
+        finally:
+            log.pcsd.debug(
+                "Auth request processed in %.3f s", monotonic() - started_at
+            )
+
+    def __release(self, dummy_future=None):
+        with self.__pending_lock:
+            self.__pending -= 1
+
+    def shutdown(self) -> None:
+        self.__executor.shutdown(wait=False)
+
+    def __submit(self, sync_fn, *args):
+        try:
+            return self.__executor.submit(sync_fn, *args)
+        except BrokenProcessPool:
+            # a worker process has died, replace all of them
+            log.pcsd.error("Auth workers failed, starting new ones")
+            self.__executor.shutdown(wait=False)
+            self.__executor = ProcessPoolExecutor(max_workers=self.__size)
+            return self.__executor.submit(sync_fn, *args)
+
+class _Auth:
+    # pylint: disable=too-few-public-methods
+    pool: Optional[AuthWorkerPool] = None
+    groups_cache = GroupsCache(settings.pcsd_user_groups_cache_ttl)
+
+def start_workers(
+    size=settings.pcsd_auth_workers,
+    queue_limit=settings.pcsd_auth_worker_queue_limit,
+    timeout=settings.pcsd_auth_worker_timeout,
+) -> AuthWorkerPool:
+    """
+    Start the pool of auth workers used by authorize_user and check_user_groups
+    """
+    if _Auth.pool is not None:
+        _Auth.pool.shutdown()
+    _Auth.pool = AuthWorkerPool(size, queue_limit, timeout)
+    return _Auth.pool
+
+def invalidate_user_groups(username=None) -> None:
+    """
+    Make the groups of the specified user (or of all users) to be loaded again
+    """
+    _Auth.groups_cache.invalidate(username)
+
+async def _run_in_pool(sync_fn, *args):
+    if _Auth.pool is None:
+        start_workers()
+    return await _Auth.pool.run(sync_fn, *args)
+
+async def authorize_user(username, password) -> UserAuthInfo:
+    try:
+        user = await _run_in_pool(authorize_user_sync, username, password)
+    except (AuthPoolFull, AuthPoolTimeout, BrokenProcessPool):
+        log.pcsd.info("Failed login by '%s' (auth workers busy)", username)
+        return UserAuthInfo(username, [], is_authorized=False)
+    # a login always gets the current groups, other requests reuse them
+    if user.groups:
+        _Auth.groups_cache.set(username, user.groups)
+    else:
+        _Auth.groups_cache.invalidate(username)
     return user
+
+async def check_user_groups(username) -> UserAuthInfo:
+    logger = PlainLogger()
+    groups = _Auth.groups_cache.get(username)
+    if groups is None:
+        try:
+            groups = await _run_in_pool(get_user_groups_sync, username)
+        except KeyError as e:
+            logger.unable_determine_groups(username, e)
+            return UserAuthInfo(username, [], is_authorized=False)
+        except (AuthPoolFull, AuthPoolTimeout, BrokenProcessPool):
+            logger.unable_determine_groups(username, "auth workers busy")
+            return UserAuthInfo(username, [], is_authorized=False)
+        _Auth.groups_cache.set(username, groups)
+    return get_user_auth_info(username, groups, logger)
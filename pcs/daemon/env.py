@@ -26,10 +26,13 @@ NOTIFY_SOCKET = "NOTIFY_SOCKET"
 PCSD_DEBUG = "PCSD_DEBUG"
 PCSD_DISABLE_GUI = "PCSD_DISABLE_GUI"
 PCSD_SESSION_LIFETIME = "PCSD_SESSION_LIFETIME"
+PCSD_RUBY_WORKERS = "PCSD_RUBY_WORKERS"
+PCSD_PCS_INTERNAL_WORKERS = "PCSD_PCS_INTERNAL_WORKERS"
 GEM_HOME = "GEM_HOME"
 PCSD_DEV = "PCSD_DEV"
 PCSD_CMDLINE_ENTRY = "PCSD_CMDLINE_ENTRY"
 PCSD_STATIC_FILES_DIR = "PCSD_STATIC_FILES_DIR"
+PCS_INTERNAL_EXEC = "PCS_INTERNAL_EXEC"
 HTTPS_PROXY = "HTTPS_PROXY"
 NO_PROXY = "NO_PROXY"
 
@@ -42,9 +45,12 @@ Env = namedtuple("Env", [
     PCSD_DEBUG,
     PCSD_DISABLE_GUI,
     PCSD_SESSION_LIFETIME,
+    PCSD_RUBY_WORKERS,
+    PCSD_PCS_INTERNAL_WORKERS,
     GEM_HOME,
     PCSD_CMDLINE_ENTRY,
     PCSD_STATIC_FILES_DIR,
+    PCS_INTERNAL_EXEC,
     HTTPS_PROXY,
     NO_PROXY,
     PCSD_DEV,
@@ -62,9 +68,12 @@ def prepare_env(environ, logger=None):
         loader.pcsd_debug(),
         loader.pcsd_disable_gui(),
         loader.session_lifetime(),
+        loader.ruby_workers(),
+        loader.pcs_internal_workers(),
         loader.gem_home(),
         loader.pcsd_cmdline_entry(),
         loader.pcsd_static_files_dir(),
+        loader.pcs_internal_exec(),
         loader.https_proxy(),
         loader.no_proxy(),
         loader.pcsd_dev(),
@@ -170,6 +179,16 @@ class EnvLoader:
             )
             return session_lifetime
 
+    def ruby_workers(self):
+        return self.__non_negative_int(
+            PCSD_RUBY_WORKERS, settings.pcsd_ruby_workers
+        )
+
+    def pcs_internal_workers(self):
+        return self.__non_negative_int(
+            PCSD_PCS_INTERNAL_WORKERS, settings.pcsd_pcs_internal_workers
+        )
+
     def pcsd_debug(self):
         return self.__has_true_in_environ(PCSD_DEBUG)
 
@@ -194,6 +213,12 @@ class EnvLoader:
             existence_required=not self.pcsd_disable_gui()
         )
 
+    def pcs_internal_exec(self):
+        if not self.pcsd_dev():
+            return settings.pcs_internal_exec
+        # pcs_internal is run from a local (git clone) directory
+        return realpath(join_path(PCSD_LOCAL_DIR, "../pcs/pcs_internal"))
+
     def https_proxy(self):
         for key in ["https_proxy", HTTPS_PROXY, "all_proxy", "ALL_PROXY"]:
             if key in self.environ:
@@ -217,5 +242,18 @@ class EnvLoader:
             self.errors.append(f"{description} '{in_pcsd_path}' does not exist")
         return in_pcsd_path
 
+    def __non_negative_int(self, environ_key, default):
+        value = self.environ.get(environ_key, default)
+        try:
+            if int(value) >= 0:
+                return int(value)
+        except ValueError:
+            pass
+        self.errors.append(
+            f"Invalid {environ_key} value '{value}'"
+            " (it must be a non-negative integer)"
+        )
+        return value
+
     def __has_true_in_environ(self, environ_key):
         return self.environ.get(environ_key, "").lower() == "true"
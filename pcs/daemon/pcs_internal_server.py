@@ -0,0 +1,222 @@
+"""
+Serve pcs_internal requests of ruby pcsd over a unix socket
+
+Running pcs_internal for each request means starting python and importing pcs
+library over and over again. The requests are processed by a pool of
+long-running pcs_internal workers instead. A client sends a JSON encoded
+request preceded by a line containing its length in bytes. The server sends
+back a JSON encoded response and closes the connection. If the response is
+empty, the request has not been processed and the client is supposed to run
+pcs_internal itself.
+
+The workers are restarted once the pcs package has been upgraded so that no
+request is processed by outdated code.
+"""
+import json
+import os
+import os.path
+from time import monotonic
+from typing import (
+    Callable,
+    Dict,
+    Hashable,
+    Optional,
+)
+
+from tornado.iostream import (
+    IOStream,
+    StreamClosedError,
+    UnsatisfiableReadError,
+)
+from tornado.netutil import bind_unix_socket
+from tornado.tcpserver import TCPServer
+
+from pcs import settings
+from pcs.daemon import log
+from pcs.daemon.ruby_workers import (
+    LatencyHistogram,
+    PoolFull,
+    PoolTimeout,
+    WorkerFailed,
+    WorkerPool,
+)
+
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Maximal length of a line with a request length, protects against garbage.
+_HEADER_LIMIT = 32
+
+
+def get_code_stamp(package_dir: str = PACKAGE_DIR) -> Hashable:
+    """
+    Return a value which changes when files of a package are replaced
+
+    Package managers replace a file by renaming a new file over it, which
+    updates the modification time of the directory holding the file.
+    """
+    stamp = []
+    for dir_path, dir_name_list, dummy_file_name_list in os.walk(package_dir):
+        dir_name_list[:] = sorted(
+            name for name in dir_name_list if name != "__pycache__"
+        )
+        try:
+            dir_stat = os.stat(dir_path)
+        except OSError:
+            continue
+        stamp.append((dir_path, dir_stat.st_ino, dir_stat.st_mtime_ns))
+    return tuple(stamp)
+
+
+def _get_cmd(request: bytes) -> str:
+    try:
+        cmd = json.loads(request).get("cmd")
+    except (ValueError, AttributeError):
+        cmd = None
+    return cmd if isinstance(cmd, str) else "invalid request"
+
+
+def _exception_response(status_msg: str) -> bytes:
+    return json.dumps(
+        dict(
+            status="exception",
+            status_msg=status_msg,
+            report_list=[],
+            data=None,
+        )
+    ).encode()
+
+
+class Server(TCPServer):
+    """
+    Pass requests from a unix socket to pcs_internal workers
+    """
+    def __init__(
+        self,
+        worker_pool: WorkerPool,
+        code_stamp_getter: Callable[[], Hashable] = get_code_stamp,
+        stats_interval: float = 60,
+    ):
+        """
+        worker_pool -- pool of pcs_internal workers
+        code_stamp_getter -- returns a value changed by a package upgrade
+        stats_interval -- how often in seconds to log statistics
+        """
+        super().__init__()
+        self.__worker_pool = worker_pool
+        self.__code_stamp_getter = code_stamp_getter
+        self.__code_stamp = code_stamp_getter()
+        self.__stats_interval = stats_interval
+        self.__stats_started = monotonic()
+        self.__histograms: Dict[str, LatencyHistogram] = {}
+
+    async def close(self) -> None:
+        """
+        Stop accepting requests and stop pcs_internal workers
+        """
+        self.stop()
+        await self.__worker_pool.close()
+
+    def listen_unix(self, socket_path: str) -> None:
+        # Commands are run as the user specified in the requests. Only root is
+        # allowed to connect.
+        self.add_socket(bind_unix_socket(socket_path, mode=0o600))
+
+    async def handle_stream(self, stream: IOStream, address) -> None:
+        try:
+            header = await stream.read_until(b"\n", max_bytes=_HEADER_LIMIT)
+            request = await stream.read_bytes(int(header))
+            response = await self.process_request(request)
+            await stream.write(response)
+        except (StreamClosedError, UnsatisfiableReadError, ValueError) as e:
+            log.pcsd.warning("Invalid pcs_internal request: %s", e)
+        finally:
+            stream.close()
+
+    async def process_request(self, request: bytes) -> bytes:
+        """
+        Return a JSON encoded response or an empty response if the request
+        must be processed outside of the pool
+
+        request -- JSON encoded request
+        """
+        self.__restart_workers_if_upgraded()
+        cmd = _get_cmd(request)
+        started_at = monotonic()
+        try:
+            response, stderr = await self.__worker_pool.run(request)
+        except (PoolFull, PoolTimeout):
+            return b""
+        except WorkerFailed as e:
+            log.pcsd.error(str(e))
+            response, stderr = _exception_response(str(e)), b""
+        latency = monotonic() - started_at
+        if stderr:
+            log.pcsd.debug(
+                "Stderr of pcs_internal command '%s': '%s'", cmd, stderr
+            )
+        log.pcsd.debug(
+            "pcs_internal command '%s' processed in %.3f s", cmd, latency
+        )
+        self.__histograms.setdefault(cmd, LatencyHistogram()).add(latency)
+        self.__log_stats()
+        return response
+
+    def __restart_workers_if_upgraded(self) -> None:
+        code_stamp = self.__code_stamp_getter()
+        if code_stamp != self.__code_stamp:
+            log.pcsd.info(
+                "pcs has been upgraded, restarting pcs_internal workers"
+            )
+            self.__code_stamp = code_stamp
+            self.__worker_pool.restart()
+
+    def __log_stats(self) -> None:
+        if monotonic() - self.__stats_started < self.__stats_interval:
+            return
+        for cmd, histogram in sorted(self.__histograms.items()):
+            log.pcsd.info(
+                "pcs_internal command '%s' latency: %s",
+                cmd,
+                histogram.get_summary(),
+            )
+        self.__histograms = {}
+        self.__stats_started = monotonic()
+
+
+def start(
+    pcs_internal_exec: str, socket_path: str, workers: int
+) -> Optional[Server]:
+    """
+    Start serving pcs_internal requests, return the server or None if the
+    socket cannot be created
+
+    pcs_internal_exec -- path to the pcs_internal executable
+    socket_path -- where to create the unix socket
+    workers -- maximal number of running pcs_internal workers
+    """
+    worker_env = {
+        name: value for name, value in os.environ.items()
+        if name not in ("CIB_user", "CIB_user_groups")
+    }
+    worker_env["LC_ALL"] = "C"
+    server = Server(
+        WorkerPool(
+            [pcs_internal_exec, "--worker"],
+            worker_env,
+            size=workers,
+            max_requests=settings.pcsd_pcs_internal_worker_max_requests,
+            queue_limit=settings.pcsd_pcs_internal_worker_queue_limit,
+            queue_timeout=settings.pcsd_pcs_internal_worker_queue_timeout,
+            name="pcs_internal",
+        )
+    )
+    try:
+        server.listen_unix(socket_path)
+    except OSError as e:
+        log.pcsd.error(
+            "Unable to listen for pcs_internal requests on '%s': %s",
+            socket_path,
+            e.strerror,
+        )
+        return None
+    return server
@@ -10,7 +10,14 @@ from tornado.web import HTTPError
 from tornado.httputil import split_host_and_port, HTTPServerRequest
 from tornado.process import Subprocess
 
+from pcs import settings
 from pcs.daemon import log
+from pcs.daemon.ruby_workers import (
+    PoolFull,
+    PoolTimeout,
+    WorkerFailed,
+    WorkerPool,
+)
 
 
 SINATRA_GUI = "sinatra_gui"
@@ -67,8 +74,16 @@ class Wrapper:
     # pylint: disable=too-many-instance-attributes
     def __init__(
         self, pcsd_cmdline_entry, gem_home=None, debug=False,
-        ruby_executable="ruby", https_proxy=None, no_proxy=None
+        ruby_executable="ruby", https_proxy=None, no_proxy=None, workers=0,
+        pcs_internal_socket=None
     ):
+        """
+        workers -- number of long-running ruby processes handling requests, if
+            0, a new ruby process is started for each request
+        pcs_internal_socket -- unix socket ruby sends pcs library calls to, if
+            None, ruby runs pcs_internal for each call
+        """
+        # pylint: disable=too-many-arguments
         self.__gem_home = gem_home
         self.__pcsd_cmdline_entry = pcsd_cmdline_entry
         self.__pcsd_dir = os.path.dirname(pcsd_cmdline_entry)
@@ -76,6 +91,18 @@ class Wrapper:
         self.__debug = debug
         self.__https_proxy = https_proxy
         self.__no_proxy = no_proxy
+        self.__pcs_internal_socket = pcs_internal_socket
+        self.__worker_pool = None
+        self.__fallback_count = 0
+        if workers > 0:
+            self.__worker_pool = WorkerPool(
+                self.__get_ruby_cmdline() + ["--worker"],
+                self.__get_ruby_env(),
+                size=workers,
+                max_requests=settings.pcsd_ruby_worker_max_requests,
+                queue_limit=settings.pcsd_ruby_worker_queue_limit,
+                queue_timeout=settings.pcsd_ruby_worker_queue_timeout,
+            )
 
     @staticmethod
     def get_sinatra_request(request: HTTPServerRequest):
@@ -102,7 +129,14 @@ class Wrapper:
             "rack.input": request.body.decode("utf8"),
         }}
 
-    async def send_to_ruby(self, request_json):
+    def __get_ruby_cmdline(self):
+        return [
+            self.__ruby_executable, "-I",
+            self.__pcsd_dir,
+            self.__pcsd_cmdline_entry
+        ]
+
+    def __get_ruby_env(self):
         env = {
             "PCSD_DEBUG": "true" if self.__debug else "false"
         }
@@ -113,17 +147,56 @@ class Wrapper:
             env["NO_PROXY"] = self.__no_proxy
         if self.__https_proxy is not None:
             env["HTTPS_PROXY"] = self.__https_proxy
+        if self.__pcs_internal_socket is not None:
+            env["PCSD_PCS_INTERNAL_SOCKET"] = self.__pcs_internal_socket
+        return env
+
+    async def send_to_ruby(self, request_json):
+        if self.__worker_pool is not None:
+            try:
+                stdout, stderr = await self.__worker_pool.run(
+                    str.encode(request_json)
+                )
+                return stdout, stderr, None
+            except PoolTimeout:
+                # All workers are busy for too long, do not let the request
+                # wait for them unless there are too many such requests.
+                return await self.__send_to_fallback_process(request_json)
+            except PoolFull:
+                raise HTTPError(503)
+            except WorkerFailed as e:
+                log.pcsd.error(str(e))
+                raise HTTPError(500)
+        return await self.__send_to_ruby_process(request_json)
+
+    async def close(self):
+        """
+        Stop long-running ruby processes
+        """
+        if self.__worker_pool is not None:
+            await self.__worker_pool.close()
+
+    async def __send_to_fallback_process(self, request_json):
+        if self.__fallback_count >= settings.pcsd_ruby_worker_fallback_limit:
+            log.pcsd.warning(
+                "Ruby pcsd workers are overloaded, %s requests are run in "
+                "separate ruby processes",
+                self.__fallback_count,
+            )
+            raise HTTPError(503)
+        self.__fallback_count += 1
+        try:
+            return await self.__send_to_ruby_process(request_json)
+        finally:
+            self.__fallback_count -= 1
 
+    async def __send_to_ruby_process(self, request_json):
         pcsd_ruby = Subprocess(
-            [
-                self.__ruby_executable, "-I",
-                self.__pcsd_dir,
-                self.__pcsd_cmdline_entry
-            ],
+            self.__get_ruby_cmdline(),
             stdin=Subprocess.STREAM,
             stdout=Subprocess.STREAM,
             stderr=Subprocess.STREAM,
-            env=env
+            env=self.__get_ruby_env()
         )
         await pcsd_ruby.stdin.write(str.encode(request_json))
         pcsd_ruby.stdin.close()
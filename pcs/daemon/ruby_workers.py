@@ -0,0 +1,435 @@
+"""
+Pool of long-running workers: ruby pcsd and pcs_internal
+
+Starting ruby and loading pcsd (or starting python and loading pcs library)
+takes much longer than processing a typical request. A worker loads its code
+once and then processes requests one by one. Each request and each response is
+a JSON document preceded by a line containing its length in bytes.
+"""
+import bisect
+from collections import deque
+from datetime import timedelta
+from time import monotonic
+from typing import (
+    Deque,
+    List,
+    Mapping,
+    Sequence,
+    Tuple,
+)
+
+from tornado.concurrent import Future
+from tornado.gen import with_timeout
+from tornado.ioloop import IOLoop
+from tornado.iostream import StreamClosedError, UnsatisfiableReadError
+from tornado.process import Subprocess
+from tornado.util import TimeoutError as TornadoTimeoutError
+
+from pcs.daemon import log
+
+
+# Longer stderr of a worker is truncated, only its end is kept.
+STDERR_LIMIT = 64 * 1024
+# Maximal length of a line with a response length, protects against garbage.
+_HEADER_LIMIT = 32
+# Upper bounds in seconds of latency histogram buckets
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+
+class WorkerFailed(Exception):
+    pass
+
+
+class PoolFull(Exception):
+    pass
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class Worker:
+    def __init__(
+        self,
+        cmdline: Sequence[str],
+        env: Mapping[str, str],
+        worker_id: int,
+        name: str = "Ruby pcsd",
+        generation: int = 0,
+    ):
+        """
+        cmdline -- command starting a worker process
+        env -- environment of a worker process
+        worker_id -- identification of the worker in logs
+        name -- name of the kind of workers in logs
+        generation -- restart of the pool the worker has been started in
+        """
+        # pylint: disable=too-many-arguments
+        self.worker_id = worker_id
+        self.name = name
+        self.generation = generation
+        self.handled_requests = 0
+        self.__is_running = True
+        self.__is_closing = False
+        self.__exited: Future = Future()
+        self.__stderr: List[bytes] = []
+        self.__stderr_len = 0
+        self.__process = Subprocess(
+            cmdline,
+            stdin=Subprocess.STREAM,
+            stdout=Subprocess.STREAM,
+            stderr=Subprocess.STREAM,
+            env=env,
+        )
+        self.__process.set_exit_callback(self.__on_exit)
+        IOLoop.current().spawn_callback(self.__collect_stderr)
+
+    @property
+    def is_usable(self) -> bool:
+        return self.__is_running and not self.__is_closing
+
+    async def request(self, request: bytes) -> Tuple[bytes, bytes]:
+        """
+        Send a request to the worker, return its response and stderr
+
+        request -- JSON encoded request
+        """
+        try:
+            await self.__process.stdin.write(
+                str(len(request)).encode() + b"\n" + request
+            )
+            header = await self.__process.stdout.read_until(
+                b"\n", max_bytes=_HEADER_LIMIT
+            )
+            response = await self.__process.stdout.read_bytes(int(header))
+        except (StreamClosedError, UnsatisfiableReadError, ValueError) as e:
+            self.close(force=True)
+            raise WorkerFailed(
+                f"{self.name} worker {self.worker_id} failed: {e}"
+            ) from e
+        self.handled_requests += 1
+        stderr = b"".join(self.__stderr)
+        self.__stderr = []
+        self.__stderr_len = 0
+        return response, stderr
+
+    def close(self, force: bool = False) -> None:
+        """
+        Stop the worker
+
+        force -- kill the worker instead of letting it finish gracefully
+        """
+        self.__is_closing = True
+        if not self.__is_running:
+            self.__close_streams()
+            return
+        if force:
+            try:
+                self.__process.proc.kill()
+            except OSError:
+                pass
+        else:
+            # the worker exits once it reads the end of its input
+            self.__process.stdin.close()
+
+    async def wait_for_exit(self) -> None:
+        await self.__exited
+
+    def __on_exit(self, exit_status):
+        self.__is_running = False
+        self.__exited.set_result(exit_status)
+        if self.__is_closing:
+            self.__close_streams()
+        else:
+            log.pcsd.warning(
+                "%s worker %s exited unexpectedly with code %s",
+                self.name,
+                self.worker_id,
+                exit_status,
+            )
+
+    def __close_streams(self):
+        # stderr is closed by its reader once it gets to its end
+        self.__process.stdin.close()
+        self.__process.stdout.close()
+
+    async def __collect_stderr(self):
+        stream = self.__process.stderr
+        try:
+            while True:
+                data = await stream.read_bytes(STDERR_LIMIT, partial=True)
+                self.__stderr.append(data)
+                self.__stderr_len += len(data)
+                if self.__stderr_len > STDERR_LIMIT:
+                    self.__stderr = [
+                        b"".join(self.__stderr)[-STDERR_LIMIT:]
+                    ]
+                    self.__stderr_len = STDERR_LIMIT
+        except StreamClosedError:
+            pass
+
+
+class LatencyHistogram:
+    """
+    Count of requests in latency buckets defined by LATENCY_BUCKETS
+    """
+    def __init__(self):
+        # the last bucket holds requests slower than the last bound
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def add(self, latency: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+    def get_summary(self) -> str:
+        """
+        Return non-empty buckets, e.g. "<=0.1 s: 10, <=0.25 s: 2, >300 s: 1"
+        """
+        bucket_list = [
+            f"<={bound} s: {count}"
+            for bound, count in zip(LATENCY_BUCKETS, self.counts)
+            if count
+        ]
+        if self.counts[-1]:
+            bucket_list.append(f">{LATENCY_BUCKETS[-1]} s: {self.counts[-1]}")
+        return ", ".join(bucket_list) if bucket_list else "empty"
+
+
+class PoolStats:
+    """
+    Latency and queue depth of requests processed since the last report
+    """
+    def __init__(self, name: str = "Ruby pcsd"):
+        self.name = name
+        self.reset()
+
+    def reset(self):
+        # pylint: disable=attribute-defined-outside-init
+        self.started = monotonic()
+        self.requests = 0
+        self.fallbacks = 0
+        self.rejected = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.latency_histogram = LatencyHistogram()
+        self.wait_max = 0.0
+        self.queue_depth_max = 0
+
+    def add_request(self, latency, wait, queue_depth):
+        self.requests += 1
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+        self.latency_histogram.add(latency)
+        self.wait_max = max(self.wait_max, wait)
+        self.queue_depth_max = max(self.queue_depth_max, queue_depth)
+
+    def get_summary(self):
+        return (
+            "{name} workers: {requests} requests in {period:.0f} s, "
+            "latency avg {avg:.3f} s max {max:.3f} s ({histogram}), queue "
+            "wait max {wait:.3f} s, queue depth max {depth}, served outside "
+            "the pool {fallbacks}, rejected {rejected}"
+        ).format(
+            name=self.name,
+            histogram=self.latency_histogram.get_summary(),
+            requests=self.requests,
+            period=monotonic() - self.started,
+            avg=self.latency_total / self.requests if self.requests else 0,
+            max=self.latency_max,
+            wait=self.wait_max,
+            depth=self.queue_depth_max,
+            fallbacks=self.fallbacks,
+            rejected=self.rejected,
+        )
+
+
+class WorkerPool:
+    """
+    Distribute requests among a limited number of workers
+
+    Workers are started on demand. A request waits in a queue when all workers
+    are busy. The queue length is limited, requests over the limit are
+    rejected. Requests waiting for too long are not served by the pool, so
+    that long running requests (e.g. those waiting for other nodes, possibly
+    for this very pcsd) cannot block the other ones. A worker is replaced once
+    it has processed the specified number of requests or if it crashes. All
+    workers can be replaced at once, e.g. when their code has been upgraded.
+    """
+    # pylint: disable=too-many-instance-attributes
+    def __init__(
+        self,
+        cmdline: Sequence[str],
+        env: Mapping[str, str],
+        size: int,
+        max_requests: int,
+        queue_limit: int,
+        queue_timeout: float,
+        stats_interval: float = 60,
+        name: str = "Ruby pcsd",
+    ):
+        """
+        cmdline -- command starting a worker process
+        env -- environment of worker processes
+        size -- maximal number of running workers
+        max_requests -- number of requests after which a worker is replaced
+        queue_limit -- maximal number of requests waiting for a worker
+        queue_timeout -- maximal time in seconds a request waits for a worker
+        stats_interval -- how often in seconds to log statistics
+        name -- name of the kind of workers in logs
+        """
+        # pylint: disable=too-many-arguments
+        self.__cmdline = list(cmdline)
+        self.__env = dict(env)
+        self.__size = size
+        self.__max_requests = max_requests
+        self.__queue_limit = queue_limit
+        self.__queue_timeout = queue_timeout
+        self.__stats_interval = stats_interval
+        self.__name = name
+        self.__stats = PoolStats(name)
+        self.__idle: List[Worker] = []
+        self.__waiters: Deque[Future] = deque()
+        self.__worker_count = 0
+        self.__last_worker_id = 0
+        self.__generation = 0
+
+    async def run(self, request: bytes) -> Tuple[bytes, bytes]:
+        """
+        Process a request by a worker, return its response and stderr
+
+        request -- JSON encoded request
+        """
+        queued_at = monotonic()
+        queue_depth = len(self.__waiters)
+        try:
+            worker = await self.__acquire()
+        except PoolTimeout:
+            self.__stats.fallbacks += 1
+            raise
+        except PoolFull:
+            self.__stats.rejected += 1
+            log.pcsd.warning(
+                "%s workers are overloaded, %s requests are waiting",
+                self.__name,
+                len(self.__waiters),
+            )
+            raise
+        started_at = monotonic()
+        try:
+            return await worker.request(request)
+        finally:
+            self.__release(worker)
+            finished_at = monotonic()
+            log.pcsd.debug(
+                "%s worker %s processed a request in %.3f s, it waited "
+                "%.3f s behind %s other requests",
+                self.__name,
+                worker.worker_id,
+                finished_at - started_at,
+                started_at - queued_at,
+                queue_depth,
+            )
+            self.__stats.add_request(
+                finished_at - queued_at, started_at - queued_at, queue_depth
+            )
+            self.__log_stats()
+
+    def restart(self) -> None:
+        """
+        Replace all workers, busy workers are replaced once they finish
+        """
+        self.__generation += 1
+        idle_workers, self.__idle = self.__idle, []
+        self.__worker_count -= len(idle_workers)
+        for worker in idle_workers:
+            worker.close()
+        log.pcsd.info("%s workers are being restarted", self.__name)
+
+    async def close(self) -> None:
+        """
+        Stop all idle workers, busy workers are stopped once they finish
+        """
+        self.__size = 0
+        idle_workers, self.__idle = self.__idle, []
+        self.__worker_count -= len(idle_workers)
+        for worker in idle_workers:
+            worker.close()
+        for worker in idle_workers:
+            await worker.wait_for_exit()
+
+    async def __acquire(self) -> Worker:
+        while self.__idle:
+            worker = self.__idle.pop()
+            if worker.is_usable:
+                return worker
+            worker.close()
+            self.__worker_count -= 1
+        if self.__worker_count < self.__size:
+            return self.__start_worker()
+        if len(self.__waiters) >= self.__queue_limit:
+            raise PoolFull()
+        waiter: Future = Future()
+        self.__waiters.append(waiter)
+        try:
+            return await with_timeout(
+                timedelta(seconds=self.__queue_timeout), waiter
+            )
+        except TornadoTimeoutError:
+            # a worker may have been handed over after the timeout expired
+            if waiter.done():
+                return waiter.result()
+            self.__waiters.remove(waiter)
+            raise PoolTimeout()
+
+    def __release(self, worker: Worker) -> None:
+        if (
+            not worker.is_usable
+            or
+            worker.handled_requests >= self.__max_requests
+            or
+            worker.generation != self.__generation
+        ):
+            worker.close()
+            self.__worker_count -= 1
+            if not self.__waiters or self.__worker_count >= self.__size:
+                return
+            try:
+                worker = self.__start_worker()
+            except WorkerFailed as e:
+                log.pcsd.error(str(e))
+                return
+        while self.__waiters:
+            waiter = self.__waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(worker)
+                return
+        if worker.is_usable:
+            self.__idle.append(worker)
+        else:
+            worker.close()
+            self.__worker_count -= 1
+
+    def __start_worker(self) -> Worker:
+        self.__last_worker_id += 1
+        try:
+            worker = Worker(
+                self.__cmdline,
+                self.__env,
+                self.__last_worker_id,
+                name=self.__name,
+                generation=self.__generation,
+            )
+        except OSError as e:
+            raise WorkerFailed(
+                f"Unable to start {self.__name} worker: {e.strerror}"
+            ) from e
+        self.__worker_count += 1
+        log.pcsd.debug(
+            "Started %s worker %s", self.__name, worker.worker_id
+        )
+        return worker
+
+    def __log_stats(self):
+        if monotonic() - self.__stats.started < self.__stats_interval:
+            return
+        log.pcsd.info(self.__stats.get_summary())
+        self.__stats.reset()
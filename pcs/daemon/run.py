@@ -2,14 +2,25 @@ import os
 import signal
 import socket
 from pathlib import Path
+from typing import Optional
 
+from tornado.gen import multi
 from tornado.ioloop import IOLoop
 from tornado.locks import Lock
+from tornado.util import TimeoutError as TornadoTimeoutError
 from tornado.web import Application, RedirectHandler
 
 from pcs import settings
 from pcs.common.system import is_systemd
-from pcs.daemon import log, ruby_pcsd, session, ssl, systemd
+from pcs.daemon import (
+    auth,
+    log,
+    pcs_internal_server,
+    ruby_pcsd,
+    session,
+    ssl,
+    systemd,
+)
 from pcs.daemon.app import sinatra_ui, sinatra_remote, ui
 from pcs.daemon.env import prepare_env
 from pcs.daemon.http_server import HttpsServerManage
@@ -31,6 +42,18 @@ def handle_signal(incomming_signal, frame):
 def sign_ioloop_started():
     SignalInfo.ioloop_started = True
 
+def close_workers(
+    ruby_pcsd_wrapper: ruby_pcsd.Wrapper,
+    pcs_internal: Optional[pcs_internal_server.Server],
+):
+    async def close():
+        await multi(
+            [ruby_pcsd_wrapper.close()]
+            +
+            ([pcs_internal.close()] if pcs_internal is not None else [])
+        )
+    return close
+
 def config_sync(
     sync_config_lock: Lock, ruby_pcsd_wrapper: ruby_pcsd.Wrapper
 ):
@@ -99,6 +122,19 @@ def main():
     if env.PCSD_DEBUG:
         log.enable_debug()
 
+    auth.start_workers()
+
+    pcs_internal = None
+    pcs_internal_socket = None
+    if env.PCSD_PCS_INTERNAL_WORKERS > 0:
+        pcs_internal = pcs_internal_server.start(
+            env.PCS_INTERNAL_EXEC,
+            settings.pcsd_pcs_internal_socket,
+            env.PCSD_PCS_INTERNAL_WORKERS,
+        )
+        if pcs_internal is not None:
+            pcs_internal_socket = settings.pcsd_pcs_internal_socket
+
     sync_config_lock = Lock()
     ruby_pcsd_wrapper = ruby_pcsd.Wrapper(
         pcsd_cmdline_entry=env.PCSD_CMDLINE_ENTRY,
@@ -107,6 +143,8 @@ def main():
         ruby_executable=settings.ruby_executable,
         https_proxy=env.HTTPS_PROXY,
         no_proxy=env.NO_PROXY,
+        workers=env.PCSD_RUBY_WORKERS,
+        pcs_internal_socket=pcs_internal_socket,
     )
     make_app = configure_app(
         session.Storage(env.PCSD_SESSION_LIFETIME),
@@ -150,4 +188,15 @@ def main():
     if is_systemd() and env.NOTIFY_SOCKET:
         ioloop.add_callback(systemd.notify, env.NOTIFY_SOCKET)
     ioloop.add_callback(config_sync(sync_config_lock, ruby_pcsd_wrapper))
-    ioloop.start()
+    try:
+        ioloop.start()
+    finally:
+        # The loop has been stopped by a signal, run it once more to let the
+        # workers exit.
+        try:
+            ioloop.run_sync(
+                close_workers(ruby_pcsd_wrapper, pcs_internal),
+                timeout=settings.pcsd_worker_shutdown_timeout,
+            )
+        except TornadoTimeoutError:
+            log.pcsd.warning("Workers have not exited in time")
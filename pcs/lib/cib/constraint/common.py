@@ -0,0 +1,7 @@
+# attributes of constraints without resource sets referring to resources
+RESOURCE_ATTRS = {
+    "rsc_colocation": ("rsc", "with-rsc"),
+    "rsc_location": ("rsc",),
+    "rsc_order": ("first", "then"),
+    "rsc_ticket": ("rsc",),
+}
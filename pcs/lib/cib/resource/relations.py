@@ -1,8 +1,11 @@
+from collections import defaultdict
 from xml.etree.ElementTree import Element
 from typing import (
     cast,
     AbstractSet,
     Any,
+    DefaultDict,
+    Dict,
     Iterable,
     List,
     Mapping,
@@ -18,8 +21,19 @@ from pcs.common.pacemaker.resource.relations import (
     ResourceRelationDto,
     ResourceRelationType,
 )
-from pcs.lib.cib import tools
+from pcs.lib.cib.constraint.common import (
+    RESOURCE_ATTRS as CONSTRAINT_RESOURCE_ATTRS,
+)
+from pcs.lib.cib.constraint.order import TAG_NAME as TAG_ORDER
 from pcs.lib.cib.resource import common
+from pcs.lib.cib.resource.bundle import TAG as TAG_BUNDLE
+from pcs.lib.cib.resource.clone import ALL_TAGS as TAG_CLONE_ALL
+from pcs.lib.cib.resource.group import TAG as TAG_GROUP
+from pcs.lib.cib.resource.primitive import TAG as TAG_PRIMITIVE
+from pcs.lib.cib.tools import (
+    get_constraints,
+    get_resources,
+)
 
 
 IdRelationMap = Mapping[str, RelationEntityDto]
@@ -140,11 +154,91 @@ class ResourceRelationTreeBuilder:
         return root
 
 
+_RESOURCE_TAGS = {TAG_BUNDLE, TAG_GROUP, TAG_PRIMITIVE} | set(TAG_CLONE_ALL)
+
+
+class RelationsIndex:
+    """
+    Resources and constraints of a CIB indexed by resource ids
+
+    The CIB is walked once when the index is created. Looking up relations of
+    many resources does not search the whole CIB for each resource then. The
+    index is not updated when the CIB changes.
+    """
+    def __init__(self, cib: Element):
+        """
+        cib -- the whole cib
+        """
+        self._resources: Dict[str, Element] = {}
+        self._constraints: DefaultDict[str, List[Element]] = defaultdict(list)
+        self._set_constraints: DefaultDict[str, List[Element]] = (
+            defaultdict(list)
+        )
+        for resource_el in get_resources(cib).iter(*_RESOURCE_TAGS):
+            self._resources[resource_el.attrib["id"]] = resource_el
+        for constraint_el in get_constraints(cib).iterchildren(
+            *CONSTRAINT_RESOURCE_ATTRS.keys()
+        ):
+            self._add_constraint(constraint_el)
+
+    def get_resource(self, resource_id: str) -> Optional[Element]:
+        """
+        Return a resource (primitive, group, clone, bundle) or None
+
+        resource_id -- id of the resource
+        """
+        return self._resources.get(resource_id)
+
+    def get_constraints(
+        self, resource_id: str, tag: Optional[str] = None
+    ) -> List[Element]:
+        """
+        Return constraints without resource sets referring to a resource
+
+        resource_id -- id of the resource
+        tag -- return only constraints of this type, e.g. rsc_ticket
+        """
+        return self._filter(self._constraints.get(resource_id, []), tag)
+
+    def get_set_constraints(
+        self, resource_id: str, tag: Optional[str] = None
+    ) -> List[Element]:
+        """
+        Return constraints with a resource set containing a resource
+
+        resource_id -- id of the resource
+        tag -- return only constraints of this type, e.g. rsc_ticket
+        """
+        return self._filter(self._set_constraints.get(resource_id, []), tag)
+
+    def _add_constraint(self, constraint_el: Element) -> None:
+        resource_ref_list = constraint_el.findall("resource_set/resource_ref")
+        if resource_ref_list:
+            index = self._set_constraints
+            id_list = [ref.get("id") for ref in resource_ref_list]
+        else:
+            index = self._constraints
+            id_list = [
+                constraint_el.get(attr)
+                for attr in CONSTRAINT_RESOURCE_ATTRS[constraint_el.tag]
+            ]
+        # a constraint may refer to a resource more than once
+        for resource_id in dict.fromkeys(id_list):
+            if resource_id:
+                index[resource_id].append(constraint_el)
+
+    @staticmethod
+    def _filter(
+        constraint_list: List[Element], tag: Optional[str]
+    ) -> List[Element]:
+        if tag is None:
+            return list(constraint_list)
+        return [el for el in constraint_list if el.tag == tag]
+
+
 class ResourceRelationsFetcher:
     def __init__(self, cib: Element):
-        self._cib = cib
-        self._resources_section = tools.get_resources(self._cib)
-        self._constraints_section = tools.get_constraints(self._cib)
+        self._index = RelationsIndex(cib)
 
     def get_relations(
         self, resource_id: str
@@ -174,11 +268,8 @@ class ResourceRelationsFetcher:
         return resources, relations
 
     def _get_resource_el(self, res_id: str) -> Element:
-        # client of this class should ensure that res_id really exists in CIB,
-        # so here we don't need to handle possible reports
-        return common.find_one_resource_and_report(
-            self._resources_section, res_id, []
-        )
+        # client of this class should ensure that res_id really exists in CIB
+        return cast(Element, self._index.get_resource(res_id))
 
     @staticmethod
     def _get_all_members(
@@ -215,20 +306,12 @@ class ResourceRelationsFetcher:
     def _get_ordering_coinstraints(
         self, resource_id: str
     ) -> Iterable[Element]:
-        return self._constraints_section.xpath(f"""
-            .//rsc_order[
-                not (descendant::resource_set)
-                and
-                (@first='{resource_id}' or @then='{resource_id}')
-            ]
-        """)
+        return self._index.get_constraints(resource_id, TAG_ORDER)
 
     def _get_ordering_set_constraints(
         self, resource_id: str
     ) -> Iterable[Element]:
-        return self._constraints_section.xpath(
-            f".//rsc_order[./resource_set/resource_ref[@id='{resource_id}']]"
-        )
+        return self._index.get_set_constraints(resource_id, TAG_ORDER)
 
 
 # relation obj to RelationEntityDto obj
@@ -1,6 +1,9 @@
 import re
+import threading
 from xml.etree.ElementTree import Element
 
+from lxml import etree
+
 from pcs.common import report_codes
 from pcs.common.tools import Version
 from pcs.lib import reports
@@ -172,6 +175,179 @@ class ElementSearcher():
                 return
 
 
+# Do not search in /cib/status, it may contain references to previously
+# existing and deleted resources and thus preventing creating them again.
+_ID_SCOPE_XPATH = """
+    (
+        /cib/*[name()!="status"]
+        |
+        /*[name()!="cib"]
+    )
+"""
+# Pacemaker creates an implicit resource for the pacemaker_remote connection,
+# which will be named the same as the value of the remote-node attribute of
+# the explicit resource. So the value of nvpair named "remote-node" is
+# considered to be id.
+_ID_XPATH = _ID_SCOPE_XPATH + """
+    //*[
+        (
+            name()!="acl_target"
+            and
+            name()!="role"
+            and
+            @id=$id
+        ) or (
+            name()="primitive"
+            and
+            meta_attributes[
+                nvpair[
+                    @name="remote-node"
+                    and
+                    @value=$id
+                ]
+            ]
+        )
+    ]
+"""
+
+def _find_id_in_tree(root, check_id):
+    return root.xpath(_ID_XPATH, id=check_id)
+
+
+class _IdIndex:
+    """
+    Ids used in a CIB tree, built once and shared by all id lookups
+
+    An lxml tree does not report its changes. Ids found in the index are
+    verified to be still present in the tree, ids of removed elements are
+    dropped. Commands put new ids to the tree only after the ids have been
+    checked or booked. Such ids are kept as pending and only they are looked
+    up in the tree when asked for again. An element found this way is added to
+    the index.
+    """
+    def __init__(self, root):
+        """
+        etree root -- root element of the tree
+        """
+        self.root = root
+        self._id_elements = None
+        self._pending_ids = set()
+
+    def does_id_exist(self, check_id):
+        if self._id_elements is None:
+            self._build()
+        element_list = self._id_elements.get(check_id)
+        if element_list:
+            element_list[:] = [
+                element for element in element_list
+                if self._is_element_valid(element, check_id)
+            ]
+            if element_list:
+                return True
+            # The element has been removed or changed, it may have been
+            # replaced by another element with the same id.
+            del self._id_elements[check_id]
+            self._pending_ids.add(check_id)
+        if check_id not in self._pending_ids:
+            self._pending_ids.add(check_id)
+            return False
+        element_list = _find_id_in_tree(self.root, check_id)
+        if not element_list:
+            return False
+        self._pending_ids.discard(check_id)
+        self._id_elements[check_id] = element_list
+        return True
+
+    def _build(self):
+        self._id_elements = {}
+        self._pending_ids = set()
+        # the same scope as in _ID_SCOPE_XPATH, walking the tree is much faster
+        # than evaluating the xpath
+        if self.root.tag == "cib":
+            scope_list = [
+                section for section in self.root.iterchildren(etree.Element)
+                if section.tag != "status"
+            ]
+        else:
+            scope_list = [self.root]
+        for scope in scope_list:
+            for element in scope.iterdescendants(etree.Element):
+                if (
+                    element.tag == "nvpair"
+                    and
+                    element.get("name") == "remote-node"
+                ):
+                    self._add_remote_node(element)
+                if (
+                    element.get("id") is not None
+                    and
+                    element.tag not in ("acl_target", "role")
+                ):
+                    self._id_elements.setdefault(element.get("id"), []).append(
+                        element
+                    )
+
+    def _add_remote_node(self, nvpair):
+        meta_attributes = nvpair.getparent()
+        if meta_attributes.tag != "meta_attributes":
+            return
+        primitive = meta_attributes.getparent()
+        if primitive is None or primitive.tag != "primitive":
+            return
+        self._id_elements.setdefault(nvpair.get("value"), []).append(
+            primitive
+        )
+
+    def _is_element_valid(self, element, check_id):
+        ancestor_list = list(element.iterancestors())
+        if not ancestor_list or ancestor_list[-1] is not self.root:
+            # the element has been removed from the tree
+            return False
+        if self.root.tag == "cib" and (
+            len(ancestor_list) < 2 or ancestor_list[-2].tag == "status"
+        ):
+            return False
+        if element.tag not in ("acl_target", "role") and (
+            element.get("id") == check_id
+        ):
+            return True
+        return element.tag == "primitive" and bool(
+            element.xpath(
+                """
+                    meta_attributes/nvpair[
+                        @name="remote-node" and @value=$id
+                    ]
+                """,
+                id=check_id
+            )
+        )
+
+
+# Only the index of the most recently used tree is kept, commands work with
+# one CIB at a time. Each thread keeps its own index, so commands run in
+# parallel do not share it.
+_id_index_cache = threading.local()
+
+
+def _get_id_index(tree):
+    root = get_root(tree)
+    if hasattr(root, "getroot"):
+        root = root.getroot()
+    index = getattr(_id_index_cache, "index", None)
+    if index is None or index.root is not root:
+        index = _IdIndex(root)
+        _id_index_cache.index = index
+    return index
+
+
+def drop_id_index():
+    """
+    Forget the cached id index of the current thread to release the indexed
+    tree
+    """
+    _id_index_cache.index = None
+
+
 # DEPRECATED, use IdProvider instead
 def does_id_exist(tree, check_id):
     """
@@ -179,41 +355,7 @@ def does_id_exist(tree, check_id):
     tree cib etree node
     check_id id to check
     """
-
-    # do not search in /cib/status, it may contain references to previously
-    # existing and deleted resources and thus preventing creating them again
-
-    #pacemaker creates an implicit resource for the pacemaker_remote connection,
-    #which will be named the same as the value of the remote-node attribute of
-    #the explicit resource. So the value of nvpair named "remote-node" is
-    #considered to be id
-    existing = get_root(tree).xpath("""
-        (
-            /cib/*[name()!="status"]
-            |
-            /*[name()!="cib"]
-        )
-        //*[
-            (
-                name()!="acl_target"
-                and
-                name()!="role"
-                and
-                @id="{0}"
-            ) or (
-                name()="primitive"
-                and
-                meta_attributes[
-                    nvpair[
-                        @name="remote-node"
-                        and
-                        @value="{0}"
-                    ]
-                ]
-            )
-        ]
-    """.format(check_id))
-    return len(existing) > 0
+    return _get_id_index(tree).does_id_exist(check_id)
 
 # DEPRECATED, use IdProvider instead
 def validate_id_does_not_exist(tree, _id):
@@ -236,7 +378,8 @@ def find_unique_id(tree, check_id, reserved_ids=None):
         reserved_ids = set()
     counter = 1
     temp_id = check_id
-    while temp_id in reserved_ids or does_id_exist(tree, temp_id):
+    id_index = _get_id_index(tree)
+    while temp_id in reserved_ids or id_index.does_id_exist(temp_id):
         temp_id = "{0}-{1}".format(check_id, counter)
         counter += 1
     return temp_id
@@ -13,7 +13,7 @@ from pcs.common.reports import (
     ReportItemSeverity,
 )
 from pcs.common.tools import join_multilines
-from pcs.lib import external, reports, tools
+from pcs.lib import external, node_communication_format, reports, tools
 from pcs.lib.cib.resource import primitive, group
 from pcs.lib.booth import (
     config_files,
@@ -28,6 +28,10 @@ from pcs.lib.communication.booth import (
     BoothGetConfig,
     BoothSendConfig,
 )
+from pcs.lib.communication.nodes import (
+    filter_targets_with_same_files,
+    forget_file_digests,
+)
 from pcs.lib.communication.tools import run_and_raise
 from pcs.lib.env import LibraryEnvironment
 from pcs.lib.errors import LibraryError
@@ -539,6 +543,7 @@ def config_sync(
 ):
     """
     Send specified local booth configuration to all nodes in the local cluster.
+    Nodes which already have the same configuration are skipped.
 
     env
     string instance_name -- booth instance name
@@ -583,6 +588,33 @@ def config_sync(
     if report_processor.has_errors:
         raise LibraryError()
 
+    config_name = "{0}.conf".format(booth_env.instance_name)
+    file_definitions = {
+        config_name: node_communication_format.booth_config_format(
+            config_name, booth_conf_data.decode("utf-8")
+        ),
+    }
+    if authfile_name is not None and authfile_data is not None:
+        file_definitions[authfile_name] = (
+            node_communication_format.booth_authfile_format(
+                authfile_name, authfile_data
+            )
+        )
+    node_communicator = env.get_node_communicator()
+    target_list = filter_targets_with_same_files(
+        node_communicator,
+        report_processor,
+        env.get_node_target_factory().get_target_list(
+            cluster_nodes_names,
+            skip_non_existing=skip_offline_nodes,
+        ),
+        file_definitions,
+        env.file_digest_cache,
+    )
+    if not target_list:
+        return
+    forget_file_digests(env.file_digest_cache, target_list, file_definitions)
+
     com_cmd = BoothSendConfig(
         env.report_processor,
         booth_env.instance_name,
@@ -591,13 +623,8 @@ def config_sync(
         authfile_data=authfile_data,
         skip_offline_targets=skip_offline_nodes
     )
-    com_cmd.set_targets(
-        env.get_node_target_factory().get_target_list(
-            cluster_nodes_names,
-            skip_non_existing=skip_offline_nodes,
-        )
-    )
-    run_and_raise(env.get_node_communicator(), com_cmd)
+    com_cmd.set_targets(target_list)
+    run_and_raise(node_communicator, com_cmd)
 
 
 def enable_booth(env: LibraryEnvironment, instance_name=None):
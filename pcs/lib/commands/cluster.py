@@ -1,7 +1,7 @@
 # pylint: disable=too-many-lines
+from functools import partial
 import math
 import os.path
-import time
 
 from pcs import settings
 from pcs.common import (
@@ -35,7 +35,6 @@ from pcs.lib.communication.corosync import (
     ReloadCorosyncConf,
 )
 from pcs.lib.communication.nodes import (
-    CheckPacemakerStarted,
     DistributeFilesWithoutForces,
     EnableCluster,
     GetHostInfo,
@@ -45,6 +44,10 @@ from pcs.lib.communication.nodes import (
     SendPcsdSslCertAndKey,
     StartCluster,
     UpdateKnownHosts,
+    bundle_node_actions,
+    filter_targets_with_same_files,
+    forget_file_digests,
+    wait_for_pacemaker_to_start,
 )
 from pcs.lib.communication.sbd import (
     CheckSbd,
@@ -55,6 +58,7 @@ from pcs.lib.communication.sbd import (
 from pcs.lib.communication.tools import (
     run as run_com,
     run_and_raise,
+    run_pipelined_and_raise,
 )
 from pcs.lib.corosync import (
     config_facade,
@@ -321,10 +325,9 @@ def setup(
     # Validate the nodes
     com_cmd = GetHostInfo(report_processor)
     com_cmd.set_targets(target_list)
+    host_info_dict = run_com(env.get_node_communicator(), com_cmd)
     report_processor.report_list(
-        _host_check_cluster_setup(
-            run_com(env.get_node_communicator(), com_cmd), force
-        )
+        _host_check_cluster_setup(host_info_dict, force)
     )
 
     # If there is an error reading the file, this will report it and exit
@@ -337,10 +340,14 @@ def setup(
     # Validation done. If errors occured, an exception has been raised and we
     # don't get below this line.
 
+    # Prepare the nodes. Each node proceeds to its next step as soon as it has
+    # finished the previous one, nodes do not wait for each other.
+    prepare_cmd_list = []
+
     # Destroy cluster on all nodes.
     com_cmd = cluster.Destroy(env.report_processor)
     com_cmd.set_targets(target_list)
-    run_and_raise(env.get_node_communicator(), com_cmd)
+    prepare_cmd_list.append(com_cmd)
 
     # Distribute auth tokens.
     com_cmd = UpdateKnownHosts(
@@ -351,15 +358,17 @@ def setup(
         known_hosts_to_remove=[],
     )
     com_cmd.set_targets(target_list)
-    run_and_raise(env.get_node_communicator(), com_cmd)
+    prepare_cmd_list.append(com_cmd)
 
-    # TODO This should be in the file distribution call but so far we don't
-    # have a call which allows to save and delete files at the same time.
-    com_cmd = RemoveFilesWithoutForces(
-        env.report_processor, {"pcsd settings": {"type": "pcsd_settings"}},
-    )
-    com_cmd.set_targets(target_list)
-    run_and_raise(env.get_node_communicator(), com_cmd)
+    # Remove pcsd settings and distribute configuration files. Nodes supporting
+    # it get all of that in one request.
+    files_cmd_factory_list = [
+        partial(
+            RemoveFilesWithoutForces,
+            env.report_processor,
+            {"pcsd settings": {"type": "pcsd_settings"}},
+        )
+    ]
 
     if not no_keys_sync:
         # Distribute configuration files except corosync.conf. Sending
@@ -378,33 +387,42 @@ def setup(
         actions.update(
             node_communication_format.pcmk_authkey_file(pcmk_authkey)
         )
-        com_cmd = DistributeFilesWithoutForces(env.report_processor, actions)
+        files_cmd_factory_list.append(
+            partial(DistributeFilesWithoutForces, env.report_processor, actions)
+        )
+
+    prepare_cmd_list.extend(
+        bundle_node_actions(
+            env.report_processor,
+            files_cmd_factory_list,
+            target_list,
+            host_info_dict,
+        )
+    )
+
+    # Distribute and reload pcsd SSL certificate
+    if not no_keys_sync and sync_ssl_certs:
+        # Local certificate and key cannot be used because the local node may
+        # not be a part of the new cluter at all.
+        ssl_key_raw = ssl.generate_key()
+        ssl_key = ssl.dump_key(ssl_key_raw)
+        ssl_cert = ssl.dump_cert(
+            ssl.generate_cert(ssl_key_raw, target_list[0].label)
+        )
+        com_cmd = SendPcsdSslCertAndKey(
+            env.report_processor,
+            ssl_cert, ssl_key
+        )
         com_cmd.set_targets(target_list)
-        run_and_raise(env.get_node_communicator(), com_cmd)
+        prepare_cmd_list.append(com_cmd)
 
-        # Distribute and reload pcsd SSL certificate
-        if sync_ssl_certs:
-            report_processor.report(
-                reports.pcsd_ssl_cert_and_key_distribution_started(
-                    [target.label for target in target_list]
-                )
-            )
-            # Local certificate and key cannot be used because the local node
-            # may not be a part of the new cluter at all.
-            ssl_key_raw = ssl.generate_key()
-            ssl_key = ssl.dump_key(ssl_key_raw)
-            ssl_cert = ssl.dump_cert(
-                ssl.generate_cert(ssl_key_raw, target_list[0].label)
-            )
-            com_cmd = SendPcsdSslCertAndKey(
-                env.report_processor,
-                ssl_cert, ssl_key
-            )
-            com_cmd.set_targets(target_list)
-            run_and_raise(env.get_node_communicator(), com_cmd)
+    run_pipelined_and_raise(
+        env.get_node_communicator(), env.report_processor, prepare_cmd_list
+    )
 
     # Create and distribute corosync.conf. Once a node saves corosync.conf it
-    # is considered to be in a cluster.
+    # is considered to be in a cluster. Therefore it is distributed only once
+    # all the nodes have been prepared.
     corosync_conf = config_facade.ConfigFacade.create(
         cluster_name, nodes, transport_type
     )
@@ -752,14 +770,14 @@ def add_nodes(
             allow_skip_offline=False
         )
 
-    # sbd setup
+    # sbd setup, each node enables sbd as soon as its config has been set
     if is_sbd_enabled:
         sbd_cfg = environment_file_to_dict(sbd.get_local_sbd_config())
 
-        com_cmd = SetSbdConfig(env.report_processor)
+        set_config_cmd = SetSbdConfig(env.report_processor)
         for new_node_target in new_nodes_target_list:
             new_node = new_nodes_dict[new_node_target.label]
-            com_cmd.add_request(
+            set_config_cmd.add_request(
                 new_node_target,
                 sbd.create_sbd_config(
                     sbd_cfg,
@@ -768,11 +786,14 @@ def add_nodes(
                     device_list=new_node["devices"],
                 )
             )
-        run_and_raise(env.get_node_communicator(), com_cmd)
 
         com_cmd = EnableSbdService(env.report_processor)
         com_cmd.set_targets(new_nodes_target_list)
-        run_and_raise(env.get_node_communicator(), com_cmd)
+        run_pipelined_and_raise(
+            env.get_node_communicator(),
+            env.report_processor,
+            [set_config_cmd, com_cmd],
+        )
     else:
         com_cmd = DisableSbdService(env.report_processor)
         com_cmd.set_targets(new_nodes_target_list)
@@ -859,26 +880,8 @@ def add_nodes(
                 file_path=settings.pcsd_settings_conf_location,
             ))
 
-    # stop here if one of the files could not be loaded and it was not forced
-    if report_processor.has_errors:
-        raise LibraryError()
-
-    if files_action:
-        com_cmd = DistributeFilesWithoutForces(
-            env.report_processor,
-            files_action
-        )
-        com_cmd.set_targets(new_nodes_target_list)
-        run_and_raise(env.get_node_communicator(), com_cmd)
-
-    # Distribute and reload pcsd SSL certificate
+    # pcsd SSL certificate
     if sync_ssl_certs:
-        report_processor.report(
-            reports.pcsd_ssl_cert_and_key_distribution_started(
-                [target.label for target in new_nodes_target_list]
-            )
-        )
-
         try:
             with open(settings.pcsd_cert_location, "r") as file:
                 ssl_cert = file.read()
@@ -903,12 +906,29 @@ def add_nodes(
                     file_path=settings.pcsd_key_location,
                 )
             )
-        if report_processor.has_errors:
-            raise LibraryError()
 
+    # stop here if one of the files could not be loaded and it was not forced
+    if report_processor.has_errors:
+        raise LibraryError()
+
+    # Distribute the files and then reload pcsd SSL certificate, each node
+    # proceeds on its own.
+    files_cmd_list = []
+    if files_action:
+        com_cmd = DistributeFilesWithoutForces(
+            env.report_processor,
+            files_action
+        )
+        com_cmd.set_targets(new_nodes_target_list)
+        files_cmd_list.append(com_cmd)
+    if sync_ssl_certs:
         com_cmd = SendPcsdSslCertAndKey(env.report_processor, ssl_cert, ssl_key)
         com_cmd.set_targets(new_nodes_target_list)
-        run_and_raise(env.get_node_communicator(), com_cmd)
+        files_cmd_list.append(com_cmd)
+    if files_cmd_list:
+        run_pipelined_and_raise(
+            env.get_node_communicator(), env.report_processor, files_cmd_list
+        )
 
     # When corosync >= 2 is in use, the procedure for adding a node is:
     # 1. add the new node to corosync.conf on all existing nodes
@@ -980,7 +1000,7 @@ def _start_cluster(
     )
     if wait_timeout is not False:
         if report_processor.report_list(
-            _wait_for_pacemaker_to_start(
+            wait_for_pacemaker_to_start(
                 communicator_factory.get_communicator(),
                 report_processor,
                 target_list,
@@ -989,36 +1009,6 @@ def _start_cluster(
         ).has_errors:
             raise LibraryError()
 
-def _wait_for_pacemaker_to_start(
-    node_communicator,
-    report_processor: ReportProcessor,
-    target_list,
-    timeout=None
-):
-    timeout = 60 * 15 if timeout is None else timeout
-    interval = 2
-    stop_at = time.time() + timeout
-    report_processor.report(
-        reports.wait_for_node_startup_started(
-            [target.label for target in target_list]
-        )
-    )
-    error_report_list = []
-    has_errors = False
-    while target_list:
-        if time.time() > stop_at:
-            error_report_list.append(reports.wait_for_node_startup_timed_out())
-            break
-        time.sleep(interval)
-        com_cmd = CheckPacemakerStarted(report_processor)
-        com_cmd.set_targets(target_list)
-        target_list = run_com(node_communicator, com_cmd)
-        has_errors = has_errors or com_cmd.has_errors
-
-    if error_report_list or has_errors:
-        error_report_list.append(reports.wait_for_node_startup_error())
-    return error_report_list
-
 def _host_check_cluster_setup(
     host_info_dict, force, check_services_versions=True
 ):
@@ -1405,6 +1395,46 @@ def remove_nodes_from_cib(env: LibraryEnvironment, node_list):
                 )
             )
 
+def sync_corosync_conf(env: LibraryEnvironment):
+    """
+    Send the local corosync.conf to all nodes of the local cluster. Nodes which
+    already have the same corosync.conf are skipped.
+
+    env LibraryEnvironment
+    """
+    if not env.is_corosync_conf_live:
+        raise LibraryError(reports.live_environment_required(["COROSYNC_CONF"]))
+
+    corosync_conf_data = env.get_corosync_conf_data()
+    corosync_nodes, report_list = get_existing_nodes_names(
+        config_facade.ConfigFacade.from_string(corosync_conf_data)
+    )
+    if not corosync_nodes:
+        report_list.append(reports.corosync_config_no_nodes_defined())
+    if env.report_processor.report_list(report_list).has_errors:
+        raise LibraryError()
+
+    file_definitions = node_communication_format.corosync_conf_file(
+        corosync_conf_data
+    )
+    node_communicator = env.get_node_communicator()
+    target_list = filter_targets_with_same_files(
+        node_communicator,
+        env.report_processor,
+        env.get_node_target_factory().get_target_list(corosync_nodes),
+        file_definitions,
+        env.file_digest_cache,
+    )
+    if not target_list:
+        return
+    forget_file_digests(env.file_digest_cache, target_list, file_definitions)
+
+    com_cmd = DistributeCorosyncConf(
+        env.report_processor, corosync_conf_data, allow_skip_offline=False
+    )
+    com_cmd.set_targets(target_list)
+    run_and_raise(node_communicator, com_cmd)
+
 def add_link(
     env: LibraryEnvironment,
     node_addr_map,
@@ -4,6 +4,7 @@ from typing import (
     Iterable,
     List,
     Mapping,
+    Optional,
     Tuple,
 )
 
@@ -27,8 +28,8 @@ from pcs.lib.communication.nodes import (
 )
 from pcs.lib.communication.status import GetFullClusterStatusPlaintext
 from pcs.lib.communication.tools import (
-    run as run_com_cmd,
     run_and_raise,
+    run_concurrently,
 )
 from pcs.lib.corosync.config_facade import ConfigFacade as CorosyncConfigFacade
 from pcs.lib.dr.config.facade import (
@@ -165,6 +166,7 @@ def status_all_sites_plaintext(
     env: LibraryEnvironment,
     hide_inactive_resources: bool = False,
     verbose: bool = False,
+    timeout: Optional[float] = None,
 ) -> List[Mapping[str, Any]]:
     """
     Return local site's and all remote sites' status as plaintext
@@ -172,6 +174,8 @@ def status_all_sites_plaintext(
     env -- LibraryEnvironment
     hide_inactive_resources -- if True, do not display non-running resources
     verbose -- if True, display more info
+    timeout -- seconds to wait for the statuses, sites which have not provided
+        their status in time are reported as failed
     """
     # The command does not provide an option to skip offline / unreacheable /
     # misbehaving nodes.
@@ -233,7 +237,9 @@ def status_all_sites_plaintext(
     if report_processor.has_errors:
         raise LibraryError()
 
-    # get all statuses
+    # get all statuses, sites are queried at once while nodes of each site are
+    # queried one by one until one of them provides the status
+    com_cmd_list = []
     for site_data in site_data_list:
         com_cmd = GetFullClusterStatusPlaintext(
             report_processor,
@@ -241,9 +247,13 @@ def status_all_sites_plaintext(
             verbose=verbose,
         )
         com_cmd.set_targets(site_data.target_list)
-        site_data.status_loaded, site_data.status_plaintext = run_com_cmd(
-            env.get_node_communicator(), com_cmd
-        )
+        com_cmd_list.append(com_cmd)
+    for site_data, (status_loaded, status_plaintext) in zip(
+        site_data_list,
+        run_concurrently(env.get_node_communicator(), com_cmd_list, timeout),
+    ):
+        site_data.status_loaded = status_loaded
+        site_data.status_plaintext = status_plaintext
 
     return [
         dto.to_dict(DrSiteStatusDto(
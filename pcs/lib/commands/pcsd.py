@@ -67,12 +67,6 @@ def synchronize_ssl_certificate(env: LibraryEnvironment, skip_offline=False):
     if report_processor.has_errors:
         raise LibraryError()
 
-    env.report_processor.report(
-        reports.pcsd_ssl_cert_and_key_distribution_started(
-            [target.label for target in target_list]
-        )
-    )
-
     com_cmd = SendPcsdSslCertAndKey(env.report_processor, ssl_cert, ssl_key)
     com_cmd.set_targets(target_list)
     run_and_raise(env.get_node_communicator(), com_cmd)
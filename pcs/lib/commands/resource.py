@@ -56,10 +56,13 @@ def resource_environment(
     wait=False,
     wait_for_resource_ids=None,
     resource_state_reporter=info_resource_state,
-    required_cib_version=None
+    required_cib_version=None,
+    cib_with_status=False,
 ):
     env.ensure_wait_satisfiable(wait)
-    yield get_resources(env.get_cib(required_cib_version))
+    yield get_resources(
+        env.get_cib(required_cib_version, with_status=cib_with_status)
+    )
     env.push_cib(wait=wait)
     if wait is not False and wait_for_resource_ids:
         state = env.get_cluster_state()
@@ -807,8 +810,13 @@ def disable_safe(env: LibraryEnvironment, resource_ids, strict, wait):
             reports.live_environment_required([file_type_codes.CIB])
         )
 
+    # the cluster is simulated with the status of the resources
     with resource_environment(
-        env, wait, resource_ids, _ensure_disabled_after_wait(True)
+        env,
+        wait,
+        resource_ids,
+        _ensure_disabled_after_wait(True),
+        cib_with_status=True,
     ) as resources_section:
         id_provider = IdProvider(resources_section)
         resource_el_list = _find_resources_or_raise(
@@ -885,7 +893,7 @@ def disable_simulate(env, resource_ids):
             reports.live_environment_required([file_type_codes.CIB])
         )
 
-    resources_section = get_resources(env.get_cib())
+    resources_section = get_resources(env.get_cib(with_status=True))
     _disable_validate_and_edit_cib(env, resources_section, resource_ids)
     plaintext_status, dummy_transitions, dummy_cib = simulate_cib(
         env.cmd_runner(),
@@ -1092,7 +1100,7 @@ def get_failcounts(
     )
 
     all_failcounts = cib_status.get_resources_failcounts(
-        get_status(env.get_cib())
+        get_status(env.get_cib(with_status=True))
     )
     return cib_status.filter_resources_failcounts(
         all_failcounts,
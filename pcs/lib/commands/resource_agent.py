@@ -83,11 +83,7 @@ def _complete_agent_list(
     agent_list = []
     for name in agent_names:
         try:
-            agent_metadata = metadata_class(runner, name)
-            if describe:
-                agent_list.append(agent_metadata.get_description_info())
-            else:
-                agent_list.append(agent_metadata.get_name_info())
+            agent_list.append(metadata_class(runner, name))
         except resource_agent.ResourceAgentError:
             #we don't return it in the list:
             #
@@ -103,7 +99,20 @@ def _complete_agent_list(
             #read this list and do not expect warnings there. Using the stderr
             #(to separate warnings) is currently difficult.
             pass
-    return agent_list
+
+    if not describe:
+        return [agent.get_name_info() for agent in agent_list]
+
+    # Running an agent to get its metadata takes time, so metadata of all the
+    # agents are loaded at once. Agents without valid metadata are skipped the
+    # same way as agents with invalid names, see above.
+    return [
+        agent.get_description_info()
+        for agent, error in zip(
+            agent_list, resource_agent.load_agents_metadata(agent_list)
+        )
+        if error is None
+    ]
 
 
 def describe_agent(lib_env, agent_name):
@@ -143,6 +143,7 @@ class ReloadCorosyncConf(
 class GetCorosyncConf(
     AllSameDataMixin, OneByOneStrategyMixin, RunRemotelyBase
 ):
+    _hedge_requests = True
     __was_successful = False
     __has_failures = False
     __corosync_conf = None
@@ -1,8 +1,11 @@
 import json
+import random
+import time
 
+from pcs import settings
 from pcs.common import report_codes
-from pcs.common.node_communicator import RequestData
-from pcs.common.reports import ReportItemSeverity
+from pcs.common.node_communicator import Request, RequestData
+from pcs.common.reports import ReportItemSeverity, ReportProcessor
 from pcs.lib import reports, node_communication_format
 from pcs.lib.communication.tools import (
     AllAtOnceStrategyMixin,
@@ -11,9 +14,13 @@ from pcs.lib.communication.tools import (
     SkipOfflineMixin,
     SimpleResponseProcessingMixin,
     SimpleResponseProcessingNoResponseOnSuccessMixin,
+    run,
 )
 from pcs.lib.node_communication import response_to_report_item
 
+# pcsd capability of running several file and service actions in one request
+NODE_ACTIONS_CAPABILITY = "pcs.node-actions"
+
 
 class GetOnlineTargets(
     AllSameDataMixin, AllAtOnceStrategyMixin, RunRemotelyBase
@@ -133,6 +140,7 @@ class RunActionBase(
     SkipOfflineMixin, AllSameDataMixin, AllAtOnceStrategyMixin, RunRemotelyBase
 ):
     _request_url = None
+    _node_action_type = None
     _response_key = None
     _force_code = None
     _code_message_map = None
@@ -188,22 +196,46 @@ class RunActionBase(
         except ValueError:
             self._report(reports.invalid_response_format(target.label))
             return
+        self.process_node_action_results(target.label, results)
+
+    def before(self):
+        self._report(self._start_report(
+            [
+                self._action_key_to_report(key)
+                for key in self._action_definition.keys()
+            ],
+            [target.label for target in self._target_list],
+        ))
+
+    def get_node_action(self):
+        """
+        Return the actions of the command as an item of a node_actions request
+        """
+        return dict(type=self._node_action_type, data=self._action_definition)
+
+    def process_node_action_results(self, target_label, results):
+        """
+        Report results of the actions of the command run on a node
+
+        string target_label -- label of the node the actions have been run on
+        dict results -- parsed response of the node to the actions
+        """
         results = node_communication_format.response_to_result(
             results,
             self._response_key,
             list(self._action_definition.keys()),
-            target.label
+            target_label
         )
         for key, item_response in sorted(results.items()):
             if self._is_success(item_response):
                 #only success process individually
                 report = self._success_report(
-                    target.label,
+                    target_label,
                     self._action_key_to_report(key),
                 )
             else:
                 report = self._failure_report(
-                    target.label,
+                    target_label,
                     self._action_key_to_report(key),
                     node_communication_format.get_format_result(
                         self._code_message_map
@@ -212,15 +244,6 @@ class RunActionBase(
                 )
             self._report(report)
 
-    def before(self):
-        self._report(self._start_report(
-            [
-                self._action_key_to_report(key)
-                for key in self._action_definition.keys()
-            ],
-            [target.label for target in self._target_list],
-        ))
-
     def _action_key_to_report(self, key):
         return self._key_to_report.get(key, key)
 
@@ -229,6 +252,7 @@ class ServiceAction(RunActionBase):
     # pylint: disable=too-many-ancestors
     def _init_properties(self):
         self._request_url = "remote/manage_services"
+        self._node_action_type = "manage_services"
         self._response_key = "actions"
         self._force_code = report_codes.SKIP_ACTION_ON_NODES_ERRORS
         self._code_message_map = {"fail": "Operation failed."}
@@ -264,6 +288,7 @@ class DistributeFiles(FileActionBase):
     def _init_properties(self):
         super(DistributeFiles, self)._init_properties()
         self._request_url = "remote/put_file"
+        self._node_action_type = "put_file"
         self._code_message_map = {"conflict": "File already exists"}
 
     def _failure_report(
@@ -301,6 +326,7 @@ class RemoveFiles(FileActionBase):
     def _init_properties(self):
         super(RemoveFiles, self)._init_properties()
         self._request_url = "remote/remove_file"
+        self._node_action_type = "remove_file"
         self._code_message_map = {}
 
     def _failure_report(
@@ -333,6 +359,214 @@ class RemoveFilesWithoutForces(RemoveFiles):
         self._failure_forceable = None
 
 
+class NodeActions(
+    SkipOfflineMixin, AllSameDataMixin, AllAtOnceStrategyMixin, RunRemotelyBase
+):
+    """
+    Run actions of several file and service commands in one request per node
+
+    A node runs the actions in the order of the commands and stops once one
+    of them fails. Each of the commands reports results of its own actions.
+    Offline nodes cannot be skipped.
+    """
+    def __init__(self, report_processor, cmd_list):
+        """
+        list cmd_list -- RunActionBase commands targeting the same nodes as
+            this command
+        """
+        super().__init__(report_processor)
+        self._set_skip_offline(False, force_code=None)
+        self._cmd_list = list(cmd_list)
+
+    def _get_request_data(self):
+        return RequestData(
+            "remote/node_actions",
+            [("data_json", json.dumps(dict(
+                actions=[cmd.get_node_action() for cmd in self._cmd_list]
+            )))],
+        )
+
+    def _process_response(self, response):
+        report = self._get_response_report(response)
+        if report:
+            self._report(report)
+            return
+        target_label = response.request.target.label
+        try:
+            result_list = json.loads(response.data)["results"]
+        except (ValueError, TypeError, KeyError):
+            result_list = None
+        if (
+            not isinstance(result_list, list)
+            or
+            len(result_list) != len(self._cmd_list)
+        ):
+            self._report(reports.invalid_response_format(target_label))
+            return
+        for cmd, results in zip(self._cmd_list, result_list):
+            cmd.process_node_action_results(target_label, results)
+
+    def before(self):
+        for cmd in self._cmd_list:
+            cmd.before()
+
+    @property
+    def has_errors(self):
+        return super().has_errors or any(
+            cmd.has_errors for cmd in self._cmd_list
+        )
+
+
+def bundle_node_actions(
+    report_processor, cmd_factory_list, target_list, host_info_dict
+):
+    """
+    Return communication commands running actions of file and service commands
+    on nodes. Nodes supporting node actions get all the actions in one request,
+    each of the other nodes gets one request from each of the commands.
+
+    list cmd_factory_list -- functions creating RunActionBase commands
+    list target_list -- RequestTarget of the nodes to run the actions on
+    dict host_info_dict -- host info from GetHostInfo, key is a node label
+    """
+    bundle_target_list = []
+    other_target_list = []
+    for target in target_list:
+        capabilities = host_info_dict.get(target.label, {}).get(
+            "pcsd_capabilities", []
+        )
+        if NODE_ACTIONS_CAPABILITY in capabilities:
+            bundle_target_list.append(target)
+        else:
+            other_target_list.append(target)
+
+    com_cmd_list = []
+    if bundle_target_list:
+        cmd_list = [create_cmd() for create_cmd in cmd_factory_list]
+        for cmd in cmd_list:
+            cmd.set_targets(bundle_target_list)
+        com_cmd = NodeActions(report_processor, cmd_list)
+        com_cmd.set_targets(bundle_target_list)
+        com_cmd_list.append(com_cmd)
+    if other_target_list:
+        for create_cmd in cmd_factory_list:
+            com_cmd = create_cmd()
+            com_cmd.set_targets(other_target_list)
+            com_cmd_list.append(com_cmd)
+    return com_cmd_list
+
+
+class GetFileDigests(
+    AllSameDataMixin, AllAtOnceStrategyMixin, RunRemotelyBase
+):
+    """
+    Get digests of files on nodes
+
+    Nodes unable to provide the digests, e.g. offline nodes or nodes running an
+    older pcsd, are left out of the result without any report. The files are
+    sent to them as if their content differed.
+    """
+    def __init__(self, report_processor, file_definitions):
+        """
+        dict file_definitions -- files in the remote/put_file format, their
+            data are not sent
+        """
+        super().__init__(report_processor)
+        self._file_definitions = file_definitions
+        self._digests = {}
+
+    def _get_request_data(self):
+        return RequestData(
+            "remote/get_file_digests",
+            [("data_json", json.dumps({
+                file_id: {
+                    key: value for key, value in file_data.items()
+                    if key in ("type", "name")
+                }
+                for file_id, file_data in self._file_definitions.items()
+            }))],
+        )
+
+    def _process_response(self, response):
+        if self._get_response_report(response) is not None:
+            return
+        try:
+            file_results = json.loads(response.data)["files"]
+            digests = {
+                file_id: file_results[file_id]["digest"]
+                for file_id in self._file_definitions
+            }
+        except (ValueError, TypeError, KeyError):
+            return
+        self._digests[response.request.target.label] = digests
+
+    def on_complete(self):
+        return self._digests
+
+
+def filter_targets_with_same_files(
+    node_communicator, report_processor, target_list, file_definitions,
+    digest_cache,
+):
+    """
+    Return targets which do not have the files with the same content yet.
+    Targets already having them are reported and left out.
+
+    NodeCommunicator node_communicator
+    list target_list -- RequestTarget of the nodes to send the files to
+    dict file_definitions -- files in the remote/put_file format
+    dict digest_cache -- digests of the files on nodes known in the running
+        command, {node label: {file id: digest}}, filled in by this function
+    """
+    query_target_list = [
+        target for target in target_list
+        if not set(file_definitions).issubset(
+            digest_cache.get(target.label, {})
+        )
+    ]
+    if query_target_list:
+        com_cmd = GetFileDigests(report_processor, file_definitions)
+        com_cmd.set_targets(query_target_list)
+        for label, digests in run(node_communicator, com_cmd).items():
+            digest_cache.setdefault(label, {}).update(digests)
+
+    local_digests = {
+        file_id: node_communication_format.file_digest(file_data)
+        for file_id, file_data in file_definitions.items()
+    }
+    changed_target_list = []
+    for target in target_list:
+        node_digests = digest_cache.get(target.label, {})
+        if all(
+            node_digests.get(file_id) == digest
+            for file_id, digest in local_digests.items()
+        ):
+            report_processor.report(
+                reports.files_distribution_skipped_same_content(
+                    target.label, sorted(file_definitions)
+                )
+            )
+        else:
+            changed_target_list.append(target)
+    return changed_target_list
+
+
+def forget_file_digests(digest_cache, target_list, file_definitions):
+    """
+    Remove digests of files sent to targets from the cache, they are not known
+    anymore
+
+    dict digest_cache -- digests of files on nodes, see
+        filter_targets_with_same_files
+    list target_list -- RequestTarget of the nodes the files were sent to
+    dict file_definitions -- the sent files in the remote/put_file format
+    """
+    for target in target_list:
+        node_digests = digest_cache.get(target.label, {})
+        for file_id in file_definitions:
+            node_digests.pop(file_id, None)
+
+
 class StartCluster(
     SimpleResponseProcessingNoResponseOnSuccessMixin, AllSameDataMixin,
     AllAtOnceStrategyMixin, RunRemotelyBase,
@@ -358,14 +592,61 @@ class EnableCluster(
         self._report(reports.cluster_enable_started(self._target_label_list))
 
 
-class CheckPacemakerStarted(
+class WaitForPacemakerStarted(
     AllSameDataMixin, AllAtOnceStrategyMixin, RunRemotelyBase
 ):
-    _not_yet_started_target_list = None
+    """
+    Poll nodes until pacemaker is fully started on them or the time runs out
+
+    Each node is polled on its own schedule, so a slow node does not delay
+    checking the others, and a node is not polled anymore once it has started.
+    Delays between polls of a node grow exponentially from initial_interval up
+    to max_interval seconds and are randomized to spread the requests.
+    """
+    def __init__(
+        self, report_processor, started_at, stop_at, initial_interval,
+        max_interval
+    ):
+        """
+        float started_at -- time the waiting started, used to report how long
+            it took a node to start
+        float stop_at -- time to stop polling at
+        float initial_interval -- seconds before the first poll of a node
+        float max_interval -- maximal number of seconds between polls
+        """
+        # pylint: disable=too-many-arguments
+        super().__init__(report_processor)
+        self._started_at = started_at
+        self._stop_at = stop_at
+        self._initial_interval = initial_interval
+        self._max_interval = max_interval
+        self._poll_count = {}
+        self._not_yet_started_target_list = []
 
     def _get_request_data(self):
         return RequestData("remote/pacemaker_node_status")
 
+    def _prepare_initial_requests(self):
+        return [self._get_poll_request(target) for target in self._target_list]
+
+    def _get_poll_request(self, target):
+        poll_count = self._poll_count.get(target.label, 0)
+        self._poll_count[target.label] = poll_count + 1
+        interval = min(
+            self._initial_interval * 2 ** poll_count, self._max_interval
+        )
+        return Request(
+            target,
+            self._get_request_data(),
+            delay=random.uniform(interval / 2, interval),
+        )
+
+    def _poll_again(self, target):
+        if time.time() > self._stop_at:
+            self._not_yet_started_target_list.append(target)
+            return []
+        return [self._get_poll_request(target)]
+
     def _process_response(self, response):
         report = response_to_report_item(response)
         target = response.request.target
@@ -380,26 +661,77 @@ class CheckPacemakerStarted(
                     or
                     not parsed_response.get("online", False)
                 ):
-                    self._not_yet_started_target_list.append(target)
-                    return
-                report = reports.cluster_start_success(target.label)
+                    return self._poll_again(target)
+                report = reports.cluster_start_success(
+                    target.label,
+                    time_to_ready=time.time() - self._started_at,
+                )
             except (json.JSONDecodeError, KeyError):
                 report = reports.invalid_response_format(target.label)
         else:
             if not response.was_connected:
-                self._not_yet_started_target_list.append(target)
-                report = response_to_report_item(
-                    response, severity=ReportItemSeverity.WARNING
+                self._report(
+                    response_to_report_item(
+                        response, severity=ReportItemSeverity.WARNING
+                    )
                 )
+                return self._poll_again(target)
         self._report(report)
-
-    def before(self):
-        self._not_yet_started_target_list = []
+        return []
 
     def on_complete(self):
+        """
+        Return targets which have not started before the time ran out
+        """
         return self._not_yet_started_target_list
 
 
+def wait_for_pacemaker_to_start(
+    node_communicator,
+    report_processor: ReportProcessor,
+    target_list,
+    timeout=None
+):
+    """
+    Wait for pacemaker to start on nodes, return error reports
+
+    node_communicator -- communicator to use
+    report_processor -- a tool for reporting progress of the nodes
+    target_list -- RequestTarget list of the nodes
+    int timeout -- seconds to wait, 15 minutes if None
+    """
+    timeout = 60 * 15 if timeout is None else timeout
+    started_at = time.time()
+    stop_at = started_at + timeout
+    report_processor.report(
+        reports.wait_for_node_startup_started(
+            [target.label for target in target_list]
+        )
+    )
+    error_report_list = []
+    has_errors = False
+    not_started_target_list = []
+    if target_list and time.time() > stop_at:
+        not_started_target_list = target_list
+    elif target_list:
+        com_cmd = WaitForPacemakerStarted(
+            report_processor,
+            started_at,
+            stop_at,
+            settings.wait_for_node_startup_initial_interval,
+            settings.wait_for_node_startup_max_interval,
+        )
+        com_cmd.set_targets(target_list)
+        not_started_target_list = run(node_communicator, com_cmd)
+        has_errors = com_cmd.has_errors
+    if not_started_target_list:
+        error_report_list.append(reports.wait_for_node_startup_timed_out())
+
+    if error_report_list or has_errors:
+        error_report_list.append(reports.wait_for_node_startup_error())
+    return error_report_list
+
+
 class UpdateKnownHosts(
     SimpleResponseProcessingNoResponseOnSuccessMixin, AllSameDataMixin,
     AllAtOnceStrategyMixin, RunRemotelyBase,
@@ -476,6 +808,13 @@ class SendPcsdSslCertAndKey(
     def _get_success_report(self, node_label):
         return reports.pcsd_ssl_cert_and_key_set_success(node_label)
 
+    def before(self):
+        self._report(
+            reports.pcsd_ssl_cert_and_key_distribution_started(
+                self._target_label_list
+            )
+        )
+
 
 def _force(force_code, is_forced):
     if is_forced:
@@ -15,6 +15,8 @@ from pcs.lib.node_communication import response_to_report_item
 class GetFullClusterStatusPlaintext(
     AllSameDataMixin, OneByOneStrategyMixin, RunRemotelyBase
 ):
+    _hedge_requests = True
+
     def __init__(
         self, report_processor, hide_inactive_resources=False, verbose=False
     ):
@@ -1,3 +1,7 @@
+from collections import defaultdict, deque
+from time import monotonic
+
+from pcs import settings
 from pcs.common import report_codes
 from pcs.common.node_communicator import Request
 from pcs.common.reports import ReportItemSeverity
@@ -25,6 +29,13 @@ class CommunicationCommandInterface:
         """
         raise NotImplementedError()
 
+    def get_cancelled_request_list(self):
+        """
+        Returns a list of Request objects which are no longer needed and
+        should be cancelled. Runs after each processed response.
+        """
+        raise NotImplementedError()
+
     def on_complete(self):
         """
         Runs after all reqests finished.
@@ -57,11 +68,205 @@ def run(communicator, cmd):
     communicator.add_requests(cmd.get_initial_request_list())
     for response in communicator.start_loop():
         extra_requests = cmd.on_response(response)
+        # Cancel first, a cancelled request may be added again to be performed
+        # right away.
+        cancelled_requests = cmd.get_cancelled_request_list()
+        if cancelled_requests:
+            communicator.cancel_requests(cancelled_requests)
         if extra_requests:
             communicator.add_requests(extra_requests)
     return cmd.on_complete()
 
 
+def run_concurrently(communicator, cmd_list, timeout=None):
+    """
+    Run communication commands in one communicator loop. Returns a list of
+    return values of method on_complete() of the commands.
+
+    NodeCommunicator communicator -- object used for communication
+    list cmd_list -- CommunicationCommandInterface objects
+    float timeout -- seconds to wait for all the commands to finish, requests
+        not finished in time are cancelled and no more requests are sent
+    """
+    return run(communicator, _ConcurrentCommands(cmd_list, timeout))
+
+
+class _ConcurrentCommands(CommunicationCommandInterface):
+    """
+    Communication command consisting of independent communication commands
+    """
+    def __init__(self, cmd_list, timeout=None):
+        self._cmd_list = list(cmd_list)
+        self._deadline = None if timeout is None else monotonic() + timeout
+        # Responses are not guaranteed to contain the very same request
+        # objects which have been sent. Requests are matched to the commands
+        # by their targets and actions instead.
+        self._waiting_cmds = defaultdict(deque)
+        self._last_cmd = None
+
+    def get_initial_request_list(self):
+        return [
+            request
+            for cmd in self._cmd_list
+            for request in self._register(cmd, cmd.get_initial_request_list())
+        ]
+
+    def on_response(self, response):
+        cmd = self._waiting_cmds[self._request_key(response.request)].popleft()
+        self._last_cmd = cmd
+        return self._register(cmd, cmd.on_response(response))
+
+    def get_cancelled_request_list(self):
+        if self._last_cmd is None:
+            return []
+        cancelled_list = self._last_cmd.get_cancelled_request_list()
+        for request in cancelled_list:
+            self._waiting_cmds[self._request_key(request)].remove(
+                self._last_cmd
+            )
+        return cancelled_list
+
+    def on_complete(self):
+        return [cmd.on_complete() for cmd in self._cmd_list]
+
+    def before(self):
+        for cmd in self._cmd_list:
+            cmd.before()
+
+    @property
+    def has_errors(self):
+        return any(cmd.has_errors for cmd in self._cmd_list)
+
+    def _register(self, cmd, request_list):
+        if self._deadline is not None:
+            remaining = self._deadline - monotonic()
+            if remaining <= 0:
+                return []
+            for request in request_list:
+                request.timeout = remaining
+        for request in request_list:
+            self._waiting_cmds[self._request_key(request)].append(cmd)
+        return request_list
+
+    @staticmethod
+    def _request_key(request):
+        return request.target.label, request.action
+
+
+def run_pipelined(communicator, report_processor, cmd_list):
+    """
+    Run communication commands one after another on each node in one
+    communicator loop. Returns a list of return values of method on_complete()
+    of the commands, None for commands which have not been started.
+
+    A node proceeds to the next command as soon as it has finished the
+    previous one, it does not wait for the other nodes. Once any command
+    fails, no more commands are started on any node. Nodes are the targets of
+    the first command. The commands must send all their requests at once and
+    at most one request to each node.
+
+    NodeCommunicator communicator -- object used for communication
+    ReportProcessor report_processor -- reports durations of the commands
+    list cmd_list -- CommunicationCommandInterface objects
+    """
+    return run(communicator, _PipelinedCommands(report_processor, cmd_list))
+
+
+def run_pipelined_and_raise(communicator, report_processor, cmd_list):
+    """
+    Run communication commands as a pipeline, see run_pipelined. Returns
+    a list of return values of method on_complete() of the commands.
+    Raises LibraryError (with no report item) when some errors occured while
+    running the communication commands.
+
+    NodeCommunicator communicator -- object used for communication
+    ReportProcessor report_processor -- reports durations of the commands
+    list cmd_list -- CommunicationCommandInterface objects
+    """
+    cmd = _PipelinedCommands(report_processor, cmd_list)
+    to_return = run(communicator, cmd)
+    if cmd.has_errors:
+        raise LibraryError()
+    return to_return
+
+
+class _PipelinedCommands(CommunicationCommandInterface):
+    """
+    Communication command running its commands one after another on each node
+    """
+    def __init__(self, report_processor, cmd_list):
+        self._report_processor = report_processor
+        self._cmd_list = list(cmd_list)
+        # requests of started commands: command index -> node -> request
+        self._requests = {}
+        # node -> (index of the running command, time it has been started at)
+        self._running = {}
+        # node -> [(request action, duration of the command on the node)]
+        self._durations = defaultdict(list)
+
+    def get_initial_request_list(self):
+        if not self._cmd_list:
+            return []
+        return [
+            request
+            for node in self._get_requests(0)
+            for request in self._send(node, 0)
+        ]
+
+    def on_response(self, response):
+        node = response.request.target.label
+        cmd_index, started_at = self._running.pop(node)
+        self._cmd_list[cmd_index].on_response(response)
+        self._durations[node].append(
+            (response.request.action, monotonic() - started_at)
+        )
+        return self._send(node, cmd_index + 1)
+
+    def get_cancelled_request_list(self):
+        # the commands send all their requests at once and cancel none of them
+        return []
+
+    def on_complete(self):
+        self._report_processor.report_list([
+            reports.node_communication_pipeline_finished(node, durations)
+            for node, durations in self._durations.items()
+        ])
+        return [
+            cmd.on_complete() if index in self._requests else None
+            for index, cmd in enumerate(self._cmd_list)
+        ]
+
+    def before(self):
+        # each command is prepared once it is about to send its first request
+        pass
+
+    @property
+    def has_errors(self):
+        return any(
+            self._cmd_list[index].has_errors for index in self._requests
+        )
+
+    def _get_requests(self, cmd_index):
+        if cmd_index not in self._requests:
+            cmd = self._cmd_list[cmd_index]
+            cmd.before()
+            self._requests[cmd_index] = {
+                request.target.label: request
+                for request in cmd.get_initial_request_list()
+            }
+        return self._requests[cmd_index]
+
+    def _send(self, node, cmd_index):
+        if self.has_errors:
+            return []
+        for index in range(cmd_index, len(self._cmd_list)):
+            request = self._get_requests(index).get(node)
+            if request is not None:
+                self._running[node] = (index, monotonic())
+                return [request]
+        return []
+
+
 def run_and_raise(communicator, cmd):
     """
     Run communication command. Returns return value of method on_complete() of
@@ -138,6 +343,9 @@ class RunRemotelyBase(CommunicationCommandInterface):
         returned = self._process_response(response)
         return returned if returned else []
 
+    def get_cancelled_request_list(self):
+        return []
+
     def on_complete(self):
         return None
 
@@ -169,22 +377,82 @@ class StrategyBase:
         raise NotImplementedError()
 
 
+class _LatencyStats:
+    """
+    Durations of successful requests, used for choosing hedging delays
+    """
+    max_samples = 100
+    min_samples = 20
+    min_delay = 0.1
+
+    def __init__(self):
+        self._durations = defaultdict(lambda: deque(maxlen=self.max_samples))
+
+    def add(self, action, duration):
+        self._durations[action].append(duration)
+
+    def get_hedge_delay(self, action):
+        """
+        Return the 95th percentile of durations of requests with the specified
+        action, or the configured delay if there are not enough of them
+
+        string action -- action of the requests
+        """
+        durations = sorted(self._durations.get(action, []))
+        if len(durations) < self.min_samples:
+            return settings.node_communication_hedge_delay
+        return max(
+            self.min_delay, durations[int(0.95 * (len(durations) - 1))]
+        )
+
+
+_latency_stats = _LatencyStats()
+
+
 class OneByOneStrategyMixin(StrategyBase):
     """
     Communication strategy in which requests are executed one by one. So only
     one request from _prepare_initial_requests is chosen as initial request
     list. Other requests are then available by calling method _get_next_list.
+
+    Commands which only read data may enable hedging by setting
+    _hedge_requests to True. Then if a request does not finish in time, the
+    same request is sent to the next target without waiting for the first one
+    to fail. The first successful response is used, the remaining requests are
+    cancelled. Response processing of the commands is the same in both modes,
+    a failed response is signaled by calling _get_next_list.
     """
     #pylint: disable=abstract-method
+    _hedge_requests = False
     __iter = None
     __successful = False
+    __hedge_delay = None
+    # target label -> (request, time the request has been started at)
+    __in_progress = None
+    # the last request sent with a delay and its start time
+    __hedge = None
+    __failed = False
+    __finished = False
+    __cancelled = None
 
     def get_initial_request_list(self):
         """
-        Returns only first request from _prepare_initial_requests.
+        Returns only first request from _prepare_initial_requests. When
+        hedging, the second request delayed by the hedging delay is returned
+        as well.
         """
         self.__iter = iter(self._prepare_initial_requests())
-        return self._get_next_list()
+        if not self._hedge_requests:
+            return self._get_next_list()
+        self.__in_progress = {}
+        self.__cancelled = []
+        request_list = self.__send_next(0)
+        if request_list:
+            self.__hedge_delay = _latency_stats.get_hedge_delay(
+                request_list[0].action
+            )
+            request_list.extend(self.__send_next(self.__hedge_delay))
+        return request_list
 
     def _get_next_list(self):
         """
@@ -192,11 +460,87 @@ class OneByOneStrategyMixin(StrategyBase):
         _prepare_initial_requests. Raises StopIteration when there is no other
         request left.
         """
+        if self._hedge_requests:
+            # the next requests are decided in on_response
+            self.__failed = True
+            return []
         try:
             return [next(self.__iter)]
         except StopIteration:
             return []
 
+    def on_response(self, response):
+        if not self._hedge_requests:
+            return super().on_response(response)
+        sent = self.__in_progress.pop(response.request.target.label, None)
+        if self.__finished or sent is None:
+            # a response to a cancelled request
+            return []
+        self.__report_started_hedge()
+        self.__failed = False
+        super().on_response(response)
+        if not self.__failed:
+            self.__finished = True
+            _latency_stats.add(response.request.action, monotonic() - sent[1])
+            self.__cancel(
+                [request for request, _ in self.__in_progress.values()]
+            )
+            return []
+        return self.__send_after_failure()
+
+    def get_cancelled_request_list(self):
+        if not self.__cancelled:
+            return []
+        cancelled_list = self.__cancelled
+        self.__cancelled = []
+        return cancelled_list
+
+    def __send_after_failure(self):
+        request_list = []
+        if self.__hedge is not None and self.__hedge[1] > monotonic():
+            # The delayed request has not been started yet, start it right
+            # away instead of waiting for its delay.
+            request = self.__hedge[0]
+            self.__cancel([request])
+            request.delay = 0
+            self.__in_progress[request.target.label] = (request, monotonic())
+            request_list.append(request)
+        elif not self.__in_progress:
+            request_list.extend(self.__send_next(0))
+        if self.__in_progress and self.__hedge is None:
+            request_list.extend(self.__send_next(self.__hedge_delay))
+        return request_list
+
+    def __send_next(self, delay):
+        try:
+            request = next(self.__iter)
+        except StopIteration:
+            return []
+        request.delay = delay
+        started_at = monotonic() + delay
+        self.__in_progress[request.target.label] = (request, started_at)
+        if delay:
+            self.__hedge = (request, started_at)
+        return [request]
+
+    def __cancel(self, request_list):
+        for request in request_list:
+            self.__in_progress.pop(request.target.label, None)
+            if self.__hedge is not None and self.__hedge[0] is request:
+                self.__hedge = None
+        self.__cancelled.extend(request_list)
+
+    def __report_started_hedge(self):
+        if self.__hedge is None or self.__hedge[1] > monotonic():
+            return
+        request = self.__hedge[0]
+        self.__hedge = None
+        self._report(
+            reports.node_communication_request_hedged(
+                request.target.label, request.action, self.__hedge_delay
+            )
+        )
+
 
 class AllAtOnceStrategyMixin(StrategyBase):
     """
@@ -10,7 +10,7 @@ from pcs.lib.corosync.node import(
     ADDR_IPV6,
     ADDR_FQDN,
     ADDR_UNRESOLVABLE,
-    get_address_type
+    get_address_types,
 )
 
 _QDEVICE_NET_REQUIRED_OPTIONS = (
@@ -59,7 +59,7 @@ def create(
     })
 
     # nodelist validation
-    get_addr_type = _addr_type_analyzer()
+    get_addr_type = _addr_type_analyzer(_node_list_addrs(node_list))
     all_names_usable = True # can names be used to identifying nodes?
     all_names_count = defaultdict(int)
     all_addrs_count = defaultdict(int)
@@ -193,14 +193,27 @@ def _get_node_name_validators(node_index):
         validate.ValueCorosyncValue("name", option_name_for_report=_name),
     ]
 
-def _addr_type_analyzer():
-    cache = dict()
+def _addr_type_analyzer(addr_list=()):
+    """
+    Return a function returning a type of an address. Addresses in addr_list
+    are resolved concurrently at once, other addresses when asked for.
+
+    iterable addr_list -- addresses to be validated
+    """
+    cache = get_address_types(
+        [addr for addr in addr_list if addr], resolve=True
+    )
     def analyzer(addr):
         if addr not in cache:
-            cache[addr] = get_address_type(addr, resolve=True)
+            cache.update(get_address_types([addr], resolve=True))
         return cache[addr]
     return analyzer
 
+def _node_list_addrs(node_list):
+    # Cannot use node.get("addrs", []) - if node["addrs"] == None then the get
+    # returns None and iterating over None raises an exception.
+    return [addr for node in node_list for addr in (node.get("addrs") or [])]
+
 def _extract_existing_addrs_and_names(
     coro_existing_nodes, pcmk_existing_nodes, pcmk_names=True
 ):
@@ -298,7 +311,7 @@ def add_nodes(
     number_of_existing_links = len(existing_addr_types)
 
     # validation
-    get_addr_type = _addr_type_analyzer()
+    get_addr_type = _addr_type_analyzer(_node_list_addrs(node_list))
     report_items = []
     new_names_count = defaultdict(int)
     new_addrs_count = defaultdict(int)
@@ -756,7 +769,7 @@ def add_link(
         for node in sorted(set(node_addr_map.keys()) - existing_names)
     ]
 
-    get_addr_type = _addr_type_analyzer()
+    get_addr_type = _addr_type_analyzer(node_addr_map.values())
     unresolvable_addresses = set()
     nodes_with_empty_addr = set()
     addr_types = []
@@ -907,7 +920,15 @@ def update_link(
                 _update_link_options_knet(link_options, current_link_options)
             )
     # validate addresses
-    get_addr_type = _addr_type_analyzer()
+    get_addr_type = _addr_type_analyzer(
+        list(node_addr_map.values())
+        +
+        [
+            node.addr_plain_for_link(linknumber)
+            for node in coro_existing_nodes
+            if node.name not in node_addr_map
+        ]
+    )
     existing_names = set()
     unchanged_addrs = set()
     link_addr_types = []
@@ -30,6 +30,33 @@ def get_quorum_status_text(runner):
         raise QuorumStatusReadException(stderr)
     return stdout
 
+def get_joined_nodes_names(runner):
+    """
+    Get names of nodes which have joined the corosync membership, return an
+    empty list if corosync is not running on the local node
+    """
+    stdout, dummy_stderr, retval = runner.run([
+        os.path.join(settings.corosync_binaries, "corosync-cmapctl"),
+    ])
+    if retval != 0:
+        return []
+    node_index_to_name = dict(
+        re.findall(r"^nodelist\.node\.(\d+)\.name .*= (.*)$", stdout, re.M)
+    )
+    node_index_to_id = dict(
+        re.findall(r"^nodelist\.node\.(\d+)\.nodeid .*= (\d+)$", stdout, re.M)
+    )
+    joined_ids = {
+        node_id for node_id, status in re.findall(
+            r"^runtime\.members\.(\d+)\.status .*= (.*)$", stdout, re.M
+        )
+        if status == "joined"
+    }
+    return [
+        name for index, name in node_index_to_name.items()
+        if node_index_to_id.get(index) in joined_ids
+    ]
+
 def set_expected_votes(runner, votes):
     """
     set expected votes in live cluster to specified value
@@ -1,6 +1,15 @@
 from collections import namedtuple
+import queue
 import socket
+import threading
+import time
+from typing import (
+    Dict,
+    Iterable,
+    List,
+)
 
+from pcs import settings
 from pcs.lib.validate import (
     is_ipv4_address,
     is_ipv6_address,
@@ -53,13 +62,98 @@ class CorosyncNode(
 
 
 def get_address_type(address, resolve=False):
+    if resolve:
+        return get_address_types([address], resolve=True)[address]
+    return _get_address_type_plain(address)
+
+
+def get_address_types(
+    address_list: Iterable[str], resolve: bool = False
+) -> Dict[str, str]:
+    """
+    Return types of addresses, hostnames are resolved concurrently
+
+    address_list -- addresses to get the types of
+    resolve -- if True, check that hostnames can be resolved
+    """
+    address_types = {
+        address: _get_address_type_plain(address)
+        for address in address_list
+    }
+    if resolve:
+        for address in _get_unresolvable([
+            address for address, address_type in address_types.items()
+            if address_type == ADDR_FQDN
+        ]):
+            address_types[address] = ADDR_UNRESOLVABLE
+    return address_types
+
+
+def _get_address_type_plain(address: str) -> str:
     if is_ipv4_address(address):
         return ADDR_IPV4
     if is_ipv6_address(address):
         return ADDR_IPV6
-    if resolve:
-        try:
-            socket.getaddrinfo(address, None)
-        except socket.gaierror:
-            return ADDR_UNRESOLVABLE
     return ADDR_FQDN
+
+
+def _get_unresolvable(hostname_list: List[str]) -> List[str]:
+    """
+    Return hostnames which cannot be resolved, hostnames not resolved in time
+    are considered unresolvable
+
+    hostname_list -- hostnames to be resolved
+    """
+    timeout = settings.corosync_address_resolve_timeout
+    waiting_list = list(enumerate(hostname_list))
+    waiting_list.reverse()
+    done_queue: queue.Queue = queue.Queue()
+    # index of a hostname being resolved: when its lookup times out
+    running: Dict[int, float] = {}
+    unresolvable = []
+    while waiting_list or running:
+        while (
+            waiting_list
+            and
+            len(running) < settings.corosync_address_resolve_parallelism
+        ):
+            index, hostname = waiting_list.pop()
+            running[index] = (
+                time.monotonic() + timeout if timeout is not None else 0
+            )
+            # Running getaddrinfo cannot be interrupted. A daemon thread does
+            # not prevent pcs from exiting while the lookup hangs.
+            threading.Thread(
+                target=_resolve,
+                args=(index, hostname, done_queue),
+                daemon=True,
+            ).start()
+        wait_timeout = None
+        if timeout is not None:
+            wait_timeout = max(0, min(running.values()) - time.monotonic())
+        try:
+            index, resolved = done_queue.get(timeout=wait_timeout)
+        except queue.Empty:
+            # Each lookup times out on its own, counted from its start. Its
+            # slot is released for a waiting hostname.
+            now = time.monotonic()
+            for index, deadline in list(running.items()):
+                if deadline <= now:
+                    del running[index]
+                    unresolvable.append(index)
+            continue
+        # a late result of a timed out lookup is ignored
+        if index in running:
+            del running[index]
+            if not resolved:
+                unresolvable.append(index)
+    return [hostname_list[index] for index in sorted(unresolvable)]
+
+
+def _resolve(index: int, hostname: str, done_queue: queue.Queue) -> None:
+    # pylint: disable=broad-except
+    try:
+        socket.getaddrinfo(hostname, None)
+        done_queue.put((index, True))
+    except Exception:
+        done_queue.put((index, False))
@@ -1,4 +1,6 @@
+from time import perf_counter
 from typing import (
+    Dict,
     Optional,
 )
 from xml.etree.ElementTree import Element
@@ -9,7 +11,7 @@ from pcs.common.reports import ReportProcessor
 from pcs.common.tools import Version
 from pcs.lib import reports
 from pcs.lib.booth.env import BoothEnv
-from pcs.lib.cib.tools import get_cib_crm_feature_set
+from pcs.lib.cib.tools import drop_id_index, get_cib_crm_feature_set
 from pcs.lib.dr.env import DrEnv
 from pcs.lib.node import get_existing_nodes_names
 from pcs.lib.communication import qdevice
@@ -34,13 +36,13 @@ from pcs.lib.node_communication import (
     NodeTargetLibFactory,
 )
 from pcs.lib.pacemaker.live import (
-    diff_cibs_xml,
     ensure_cib_version,
     ensure_wait_for_idle_support,
     get_cib,
+    get_cib_without_status_xml,
     get_cib_xml,
     get_cluster_status_xml,
-    push_cib_diff_xml,
+    push_cib_diff,
     replace_cib_configuration,
     wait_for_idle,
 )
@@ -95,6 +97,7 @@ class LibraryEnvironment:
         self.__loaded_dr_env = None
 
         self.__timeout_cache = {}
+        self.__file_digest_cache: Dict[str, Dict[str, Optional[str]]] = {}
 
     @property
     def logger(self):
@@ -121,16 +124,39 @@ class LibraryEnvironment:
             codes.add(file_type_codes.COROSYNC_CONF)
         return codes
 
-    def get_cib(self, minimal_version: Optional[Version] = None) -> Element:
+    def get_cib(
+        self,
+        minimal_version: Optional[Version] = None,
+        with_status: bool = False,
+    ) -> Element:
+        """
+        Load the CIB to be read or modified and pushed by push_cib
+
+        minimal_version -- upgrade the CIB to this schema version if older
+        with_status -- load the status section, otherwise it is left empty
+        """
         if self.__loaded_cib_diff_source is not None:
             raise AssertionError("CIB has already been loaded")
-        self.__loaded_cib_diff_source = get_cib_xml(self.cmd_runner())
+        if with_status:
+            self.__loaded_cib_diff_source = get_cib_xml(self.cmd_runner())
+        else:
+            self.__loaded_cib_diff_source = get_cib_without_status_xml(
+                self.cmd_runner()
+            )
+        started_at = perf_counter()
         self.__loaded_cib_to_modify = get_cib(self.__loaded_cib_diff_source)
+        self.logger.debug(
+            "Loaded CIB %s the status section: %d bytes parsed in %.3f s",
+            "with" if with_status else "without",
+            len(self.__loaded_cib_diff_source.encode("utf-8")),
+            perf_counter() - started_at,
+        )
         if minimal_version is not None:
             upgraded_cib = ensure_cib_version(
                 self.cmd_runner(),
                 self.__loaded_cib_to_modify,
-                minimal_version
+                minimal_version,
+                with_status=with_status,
             )
             if upgraded_cib is not None:
                 self.__loaded_cib_to_modify = upgraded_cib
@@ -233,14 +259,12 @@ class LibraryEnvironment:
         )
 
     def __main_push_cib_diff(self, cmd_runner):
-        cib_diff_xml = diff_cibs_xml(
+        push_cib_diff(
             cmd_runner,
             self.report_processor,
             self.__loaded_cib_diff_source,
-            etree_to_str(self.__loaded_cib_to_modify)
+            self.__loaded_cib_to_modify
         )
-        if cib_diff_xml:
-            push_cib_diff_xml(cmd_runner, cib_diff_xml)
 
     def __do_push_cib(self, cmd_runner, push_strategy, wait):
         timeout = self.get_wait_timeout(wait)
@@ -249,6 +273,7 @@ class LibraryEnvironment:
         self.__loaded_cib_diff_source = None
         self.__loaded_cib_diff_source_feature_set = None
         self.__loaded_cib_to_modify = None
+        drop_id_index()
         if self.is_cib_live and timeout is not False:
             wait_for_idle(cmd_runner, timeout)
 
@@ -401,6 +426,14 @@ class LibraryEnvironment:
             request_timeout=request_timeout
         )
 
+    @property
+    def file_digest_cache(self) -> Dict[str, Dict[str, Optional[str]]]:
+        """
+        Digests of files on nodes known in this command, see
+        pcs.lib.communication.nodes.filter_targets_with_same_files
+        """
+        return self.__file_digest_cache
+
     def get_node_target_factory(self) -> NodeTargetLibFactory:
         return NodeTargetLibFactory(
             self.__get_known_hosts(), self.report_processor
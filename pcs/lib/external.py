@@ -1,6 +1,5 @@
 import re
 from shlex import quote as shell_quote
-import signal
 import subprocess
 from typing import (
     Optional,
@@ -92,8 +91,6 @@ class CommandRunner:
         )
 
         try:
-            # pylint: disable=subprocess-popen-preexec-fn
-            # this is OK as pcs is only single-threaded application
             process = subprocess.Popen(
                 args,
                 # Some commands react differently if they get anything via stdin
@@ -104,9 +101,10 @@ class CommandRunner:
                 ),
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                preexec_fn=(
-                    lambda: signal.signal(signal.SIGPIPE, signal.SIG_DFL)
-                ),
+                # Python ignores SIGPIPE, reset it to SIG_DFL in the child.
+                # Unlike preexec_fn, this is safe when running commands from
+                # several threads.
+                restore_signals=True,
                 close_fds=True,
                 shell=False,
                 env=env_vars,
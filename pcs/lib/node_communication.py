@@ -127,6 +127,16 @@ class LibCommunicatorLogger(CommunicatorLoggerInterface):
             response.request.host_label, response.request.url
         ))
 
+    def log_connections(self, created, reused):
+        self._logger.debug(
+            "Connections to nodes: {created} opened, {reused} reused".format(
+                created=created, reused=reused
+            )
+        )
+        self._reporter.report(
+            reports.node_communication_connections(created, reused)
+        )
+
 
 class NodeTargetLibFactory(NodeTargetFactory):
     def __init__(self, known_hosts, report_processor: ReportProcessor):
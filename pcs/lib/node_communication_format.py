@@ -1,5 +1,6 @@
 import base64
 from collections import namedtuple
+import hashlib
 from typing import (
     Any,
     Dict,
@@ -48,6 +49,32 @@ def corosync_authkey_file(authkey_content):
         "corosync authkey": corosync_authkey_format(authkey_content)
     }
 
+def booth_config_format(name, config_content):
+    """
+    Return a dict usable in the communication with a remote/put_file
+    string name -- name of the booth config file
+    string config_content -- booth config content
+    """
+    return {
+        "type": "booth_config",
+        "name": name,
+        "data": config_content,
+        "rewrite_existing": True,
+    }
+
+def booth_authfile_format(name, authfile_content):
+    """
+    Return a dict usable in the communication with a remote/put_file
+    string name -- name of the booth authfile
+    bytes authfile_content -- raw authfile content
+    """
+    return {
+        "type": "booth_authfile",
+        "name": name,
+        "data": base64.b64encode(authfile_content).decode("utf-8"),
+        "rewrite_existing": True,
+    }
+
 def corosync_conf_format(corosync_conf_content):
     return {
         "type": "corosync_conf",
@@ -83,6 +110,15 @@ def pcs_settings_conf_file(content):
         "pcs_settings.conf": pcs_settings_conf_format(content)
     }
 
+def file_digest(file_format):
+    """
+    Return a digest of a file data, pcsd computes the same digest of a file it
+    has in remote/get_file_digests
+
+    dict file_format -- a file in the remote/put_file format
+    """
+    return hashlib.sha256(file_format["data"].encode("utf-8")).hexdigest()
+
 def service_cmd_format(service, command):
     """
     Return a dict usable in the communication with a remote/run_action
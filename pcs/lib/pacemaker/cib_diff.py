@@ -0,0 +1,224 @@
+"""
+In-process computation of CIB differences in the pacemaker patchset v2 format
+
+The produced patchset is equivalent to the output of
+'crm_diff --original OLD --new NEW --no-version' for the changes pcs does to
+the CIB: creating and deleting elements and setting and unsetting attributes.
+Changes which cannot be reliably expressed by this module (moving elements,
+changing text or comments, elements which cannot be unambiguously identified
+by a path) raise CibDiffUnsupported and the caller is expected to fall back to
+crm_diff.
+"""
+from collections import Counter
+from copy import deepcopy
+from typing import (
+    List,
+    Optional,
+)
+from xml.etree.ElementTree import Element
+
+from lxml import etree
+
+
+class CibDiffUnsupported(Exception):
+    pass
+
+
+def diff_cibs(cib_old: Element, cib_new: Element) -> Optional[Element]:
+    """
+    Return a patchset transforming cib_old to cib_new, None if they are equal
+
+    cib_old -- original CIB
+    cib_new -- modified CIB
+    """
+    if cib_old.tag != cib_new.tag:
+        raise CibDiffUnsupported("root elements differ")
+    delete_list: List[Element] = []
+    change_list: List[Element] = []
+    _diff_element(
+        cib_old,
+        cib_new,
+        _get_element_path("", cib_new),
+        _has_unusable_id(cib_new),
+        delete_list,
+        change_list,
+    )
+    if not delete_list and not change_list:
+        return None
+    # pacemaker lists deletions first, then the other changes in the document
+    # order of the new CIB
+    patchset = etree.Element("diff", format="2")
+    for change in delete_list + change_list:
+        patchset.append(change)
+    return patchset
+
+
+def _diff_element(
+    old_el, new_el, path, is_path_ambiguous, delete_list, change_list
+):
+    # pylint: disable=too-many-arguments
+    if _get_text(old_el.text) != _get_text(new_el.text):
+        raise CibDiffUnsupported(f"text of '{path}' changed")
+
+    attr_change_list = _diff_attributes(old_el, new_el)
+    if attr_change_list:
+        _ensure_unambiguous(path, is_path_ambiguous)
+        change = etree.Element("change", operation="modify", path=path)
+        etree.SubElement(change, "change-list").extend(attr_change_list)
+        etree.SubElement(
+            etree.SubElement(change, "change-result"),
+            new_el.tag,
+            dict(new_el.attrib),
+        )
+        change_list.append(change)
+
+    old_children = list(old_el)
+    new_children = list(new_el)
+    old_keys = [_get_child_key(child) for child in old_children]
+    new_keys = [_get_child_key(child) for child in new_children]
+
+    if old_keys == new_keys:
+        # No element has been added, removed or moved. Children with equal
+        # keys are therefore paired in order even if the keys are not unique.
+        key_count = Counter(new_keys)
+        for old_child, new_child, key in zip(
+            old_children, new_children, new_keys
+        ):
+            _diff_child(
+                old_child,
+                new_child,
+                path,
+                is_path_ambiguous or key_count[key] > 1,
+                delete_list,
+                change_list,
+            )
+        return
+
+    if (
+        len(set(old_keys)) != len(old_keys)
+        or
+        len(set(new_keys)) != len(new_keys)
+    ):
+        raise CibDiffUnsupported(
+            f"children of '{path}' cannot be identified unambiguously"
+        )
+    if any(key[0] is None for key in old_keys + new_keys):
+        raise CibDiffUnsupported(f"comments in '{path}' cannot be compared")
+    _ensure_unambiguous(path, is_path_ambiguous)
+
+    new_key_set = set(new_keys)
+    old_key_set = set(old_keys)
+    kept_old_keys = [key for key in old_keys if key in new_key_set]
+    kept_new_keys = [key for key in new_keys if key in old_key_set]
+    if kept_old_keys != kept_new_keys:
+        raise CibDiffUnsupported(f"children of '{path}' have been moved")
+
+    for old_child, key in zip(old_children, old_keys):
+        if key not in new_key_set:
+            _ensure_unambiguous(
+                _get_element_path(path, old_child),
+                _has_unusable_id(old_child)
+            )
+            delete_list.append(
+                etree.Element(
+                    "change",
+                    operation="delete",
+                    path=_get_element_path(path, old_child),
+                )
+            )
+
+    old_children_by_key = dict(zip(old_keys, old_children))
+    for position, (new_child, key) in enumerate(zip(new_children, new_keys)):
+        if key in old_key_set:
+            _diff_child(
+                old_children_by_key[key],
+                new_child,
+                path,
+                False,
+                delete_list,
+                change_list,
+            )
+            continue
+        change = etree.Element(
+            "change", operation="create", path=path, position=str(position)
+        )
+        created_el = deepcopy(new_child)
+        created_el.tail = None
+        change.append(created_el)
+        change_list.append(change)
+
+
+def _diff_child(
+    old_child, new_child, parent_path, is_path_ambiguous, delete_list,
+    change_list
+):
+    # pylint: disable=too-many-arguments
+    if _get_text(old_child.tail) != _get_text(new_child.tail):
+        raise CibDiffUnsupported(f"text of '{parent_path}' changed")
+    if not isinstance(new_child.tag, str):
+        # comments, processing instructions
+        if old_child.text != new_child.text:
+            raise CibDiffUnsupported(
+                f"comments in '{parent_path}' cannot be compared"
+            )
+        return
+    _diff_element(
+        old_child,
+        new_child,
+        _get_element_path(parent_path, new_child),
+        is_path_ambiguous or _has_unusable_id(new_child),
+        delete_list,
+        change_list,
+    )
+
+
+def _diff_attributes(old_el, new_el):
+    # The order of attribute changes follows pacemaker: changed and new
+    # attributes in the order of the new element, removed attributes in the
+    # order of the old element at the end.
+    change_list = []
+    old_attrs = old_el.attrib
+    new_attrs = new_el.attrib
+    for name, value in new_attrs.items():
+        if old_attrs.get(name) != value:
+            change_list.append(
+                etree.Element(
+                    "change-attr", name=name, operation="set", value=value
+                )
+            )
+    for name in old_attrs.keys():
+        if name not in new_attrs:
+            change_list.append(
+                etree.Element("change-attr", name=name, operation="unset")
+            )
+    return change_list
+
+
+def _get_child_key(child):
+    if not isinstance(child.tag, str):
+        return (None, child.text)
+    return (child.tag, child.get("id"))
+
+
+def _get_element_path(parent_path, element):
+    element_id = element.get("id")
+    if element_id is None:
+        return f"{parent_path}/{element.tag}"
+    return f"{parent_path}/{element.tag}[@id='{element_id}']"
+
+
+def _has_unusable_id(element):
+    # an id containing an apostrophe cannot be put to a patchset path
+    return "'" in element.get("id", "")
+
+
+def _ensure_unambiguous(path, is_path_ambiguous):
+    if is_path_ambiguous:
+        raise CibDiffUnsupported(
+            f"'{path}' does not identify an element unambiguously"
+        )
+
+
+def _get_text(text):
+    # whitespace is not significant in the CIB
+    return (text or "").strip()
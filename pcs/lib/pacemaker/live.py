@@ -19,6 +19,7 @@ from pcs.lib import reports
 from pcs.lib.cib.tools import get_pacemaker_version_by_which_cib_was_validated
 from pcs.lib.errors import LibraryError
 from pcs.lib.external import CommandRunner
+from pcs.lib.pacemaker.cib_diff import CibDiffUnsupported, diff_cibs
 from pcs.lib.pacemaker.state import ClusterState
 from pcs.lib.tools import write_tmpfile
 from pcs.lib.xml_tools import etree_to_str
@@ -104,6 +105,57 @@ def get_cib_xml(runner, scope=None):
         )
     return stdout
 
+def get_cib_header_xml(runner):
+    """
+    Get the cib element without its children
+
+    The element holds versions of the CIB, so it is a cheap way to find out
+    whether the CIB has changed.
+    """
+    stdout, stderr, retval = runner.run([
+        __exec("cibadmin"), "--local", "--query", "--xpath=/cib",
+        "--no-children",
+    ])
+    if retval != 0:
+        raise LibraryError(
+            reports.cib_load_error(join_multilines([stderr, stdout]))
+        )
+    return stdout
+
+def get_cib_without_status_xml(runner):
+    """
+    Get the CIB with an empty status section
+
+    The status section of a big cluster is many times larger than the
+    configuration, yet only a few commands need it. The configuration section
+    is loaded and put into the cib element with its attributes, which hold
+    versions of the CIB and its schema, so the result can be diffed, upgraded
+    and pushed the same way as the whole CIB.
+
+    The cib element is loaded before and after the configuration. If the
+    configuration has been changed in the meantime, the versions would not
+    match the loaded configuration. The whole CIB is loaded by one query in
+    that case.
+    """
+    header_xml = get_cib_header_xml(runner)
+    configuration_xml = get_cib_xml(runner, scope="configuration")
+    header_check_xml = get_cib_header_xml(runner)
+    try:
+        cib = parse_cib_xml(header_xml)
+        if _get_configuration_version(cib) != _get_configuration_version(
+            parse_cib_xml(header_check_xml)
+        ):
+            return get_cib_xml(runner)
+        cib.append(parse_cib_xml(configuration_xml))
+    except (etree.XMLSyntaxError, etree.DocumentInvalid) as e:
+        raise LibraryError(reports.cib_load_error_invalid_format(str(e)))
+    etree.SubElement(cib, "status")
+    return etree_to_str(cib)
+
+def _get_configuration_version(cib):
+    # num_updates is increased by changes of the status section as well
+    return cib.get("admin_epoch"), cib.get("epoch")
+
 def parse_cib_xml(xml):
     return xml_fromstring(xml)
 
@@ -220,7 +272,32 @@ def diff_cibs_xml(
         )
     return stdout.strip()
 
-def ensure_cib_version(runner, cib, version):
+def push_cib_diff(
+    runner: CommandRunner,
+    reporter: ReportProcessor,
+    cib_old_xml,
+    cib_new,
+):
+    """
+    Push changes done to a CIB to the cluster
+
+    runner
+    reporter
+    string cib_old_xml -- original CIB
+    etree cib_new -- modified CIB
+    """
+    try:
+        cib_diff = diff_cibs(get_cib(cib_old_xml), cib_new)
+        cib_diff_xml = "" if cib_diff is None else etree_to_str(cib_diff)
+    except CibDiffUnsupported:
+        # crm_diff is able to express any change
+        cib_diff_xml = diff_cibs_xml(
+            runner, reporter, cib_old_xml, etree_to_str(cib_new)
+        )
+    if cib_diff_xml:
+        push_cib_diff_xml(runner, cib_diff_xml)
+
+def ensure_cib_version(runner, cib, version, with_status=True):
     """
     This method ensures that specified cib is verified by pacemaker with
     version 'version' or newer. If cib doesn't correspond to this version,
@@ -231,13 +308,17 @@ def ensure_cib_version(runner, cib, version):
     CommandRunner runner -- runner
     etree cib -- cib tree
     pcs.common.tools.Version version -- required cib version
+    bool with_status -- if False, load the upgraded cib without its status
     """
     current_version = get_pacemaker_version_by_which_cib_was_validated(cib)
     if current_version >= version:
         return None
 
     _upgrade_cib(runner)
-    new_cib_xml = get_cib_xml(runner)
+    new_cib_xml = (
+        get_cib_xml(runner) if with_status
+        else get_cib_without_status_xml(runner)
+    )
 
     try:
         new_cib = parse_cib_xml(new_cib_xml)
@@ -2,9 +2,15 @@
 The intention is put there knowledge about cluster state structure.
 Hide information about underlaying xml is desired too.
 '''
+import os
 import os.path
 from collections import defaultdict
-from typing import Dict, Any
+from typing import (
+    Any,
+    Dict,
+    List,
+    Tuple,
+)
 
 from lxml import etree
 
@@ -17,7 +23,6 @@ from pcs.lib.pacemaker.values import (
     is_false,
     is_true,
 )
-from pcs.lib.xml_tools import find_parent
 
 class ResourceNotFound(Exception):
     pass
@@ -33,13 +38,18 @@ class _Attrs:
         self.required_attrs = required_attrs
 
     def __getattr__(self, name):
+        # Called only for attributes not found in the instance. A resolved
+        # value is stored in the instance so that it is resolved only once.
         if name in self.required_attrs.keys():
             try:
                 attr_specification = self.required_attrs[name]
                 if isinstance(attr_specification, tuple):
                     attr_name, attr_transform = attr_specification
-                    return attr_transform(self.attrib[attr_name])
-                return self.attrib[attr_specification]
+                    value = attr_transform(self.attrib[attr_name])
+                else:
+                    value = self.attrib[attr_specification]
+                setattr(self, name, value)
+                return value
             except KeyError:
                 raise AttributeError(
                     "Missing attribute '{0}' ('{1}' in source) in '{2}'"
@@ -59,16 +69,22 @@ class _Children:
         self.sections = sections
 
     def __getattr__(self, name):
+        # Called only for attributes not found in the instance. Found children
+        # are stored in the instance so that they are searched for only once.
         if name in self.children.keys():
             element_name, wrapper = self.children[name]
-            return [
+            value = [
                 wrapper(element)
                 for element in self.dom_part.findall('.//' + element_name)
             ]
+            setattr(self, name, value)
+            return value
 
         if name in self.sections.keys():
             element_name, wrapper = self.sections[name]
-            return wrapper(self.dom_part.findall('.//' + element_name)[0])
+            value = wrapper(self.dom_part.findall('.//' + element_name)[0])
+            setattr(self, name, value)
+            return value
 
         raise AttributeError(
             "'{0}' does not declare child or section '{1}'"
@@ -138,11 +154,28 @@ class _NodeSection(_Element):
         'nodes': ('node', _Node),
     }
 
+# compiled crm_mon schemas by their path: (file mtime and size, schema)
+_crm_mon_schema_cache: Dict[str, Tuple[Tuple[int, int], etree.RelaxNG]] = {}
+
+def _get_crm_mon_schema(schema_file):
+    """
+    Return the compiled crm_mon schema, compile it only once for the process
+
+    string schema_file -- path to the schema
+    """
+    stat = os.stat(schema_file)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _crm_mon_schema_cache.get(schema_file)
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, etree.RelaxNG(file=schema_file))
+        _crm_mon_schema_cache[schema_file] = cached
+    return cached[1]
+
 def get_cluster_state_dom(xml):
     try:
         dom = xml_fromstring(xml)
         if os.path.isfile(settings.crm_mon_schema):
-            etree.RelaxNG(file=settings.crm_mon_schema).assertValid(dom)
+            _get_crm_mon_schema(settings.crm_mon_schema).assertValid(dom)
         return dom
     except (etree.XMLSyntaxError, etree.DocumentInvalid):
         raise LibraryError(reports.cluster_state_invalid_format())
@@ -157,30 +190,174 @@ class ClusterState(_Element):
         self.dom = get_cluster_state_dom(xml)
         super(ClusterState, self).__init__(self.dom)
 
-def _id_xpath_predicate(resource_id):
-    return """(@id="{0}" or starts-with(@id, "{0}:"))""".format(resource_id)
+class _PrimitiveState:
+    """
+    A resource element of a cluster state
+    """
+    __slots__ = ("element", "position", "is_failed", "is_managed",
+        "is_parent_managed"
+    )
+
+    def __init__(self, element, position, is_parent_managed):
+        """
+        etree element -- the resource element
+        int position -- position of the element in the document order
+        bool is_parent_managed -- is the closest clone or bundle managed
+        """
+        self.element = element
+        self.position = position
+        self.is_failed = is_true(element.attrib.get("failed", ""))
+        self.is_managed = not is_false(element.attrib.get("managed", ""))
+        self.is_parent_managed = is_parent_managed
+
+class _CollectiveState:
+    """
+    A clone or bundle element of a cluster state
+    """
+    __slots__ = ("position", "is_managed", "primitive_list", "group_list",
+        "descendant_list"
+    )
+
+    def __init__(self, element, position):
+        """
+        etree element -- the clone or bundle element
+        int position -- position of the element in the document order
+        """
+        self.position = position
+        self.is_managed = not is_false(element.attrib.get("managed", ""))
+        # resources which are children of a clone or of replicas of a bundle
+        self.primitive_list: List[_PrimitiveState] = []
+        # resources of groups which are children of a clone, one list a group
+        self.group_list: List[List[_PrimitiveState]] = []
+        # all resources in the clone or bundle
+        self.descendant_list: List[_PrimitiveState] = []
+
+class _ResourceStateIndex:
+    """
+    Resources of a cluster state indexed by their ids, built in one pass
+
+    Primitives and groups are indexed by their ids and by their ids without
+    clone instance suffixes, e.g. "R:1" is indexed as "R:1" and "R". Clones
+    and bundles are indexed by their ids.
+    """
+    def __init__(self, cluster_state):
+        """
+        etree cluster_state -- status of the cluster, it must not be modified
+        """
+        self.cluster_state = cluster_state
+        self.primitives: Dict[str, List[_PrimitiveState]] = defaultdict(list)
+        self.groups: Dict[str, List[List[_PrimitiveState]]] = (
+            defaultdict(list)
+        )
+        self.clones: Dict[str, List[_CollectiveState]] = defaultdict(list)
+        self.bundles: Dict[str, List[_CollectiveState]] = defaultdict(list)
+        self._position = 0
+        self._index_children(cluster_state, [], None)
+
+    def _index_children(self, element, collective_list, parent_collective):
+        """
+        Index descendants of an element, return its resource children
+
+        etree element -- element to index descendants of
+        list collective_list -- clones and bundles containing the element
+        _CollectiveState parent_collective -- the element if it is a clone or
+            a bundle, its parent bundle if it is a replica, None otherwise
+        """
+        primitive_list = []
+        for child in element:
+            if not isinstance(child.tag, str):
+                continue
+            self._position += 1
+            child_id = child.attrib.get("id", "")
+            if child.tag == "resource":
+                primitive = _PrimitiveState(
+                    child,
+                    self._position,
+                    collective_list[-1].is_managed if collective_list
+                        else True
+                )
+                primitive_list.append(primitive)
+                for key in _get_id_keys(child_id):
+                    self.primitives[key].append(primitive)
+                for collective in collective_list:
+                    collective.descendant_list.append(primitive)
+                self._index_children(child, collective_list, None)
+            elif child.tag in ("clone", "bundle"):
+                collective = _CollectiveState(child, self._position)
+                if child.tag == "clone":
+                    self.clones[child_id].append(collective)
+                else:
+                    self.bundles[child_id].append(collective)
+                collective.primitive_list.extend(self._index_children(
+                    child, collective_list + [collective], collective
+                ))
+            elif child.tag == "group":
+                group = self._index_children(child, collective_list, None)
+                for key in _get_id_keys(child_id):
+                    self.groups[key].append(group)
+                if element.tag == "clone" and parent_collective:
+                    parent_collective.group_list.append(group)
+            elif child.tag == "replica":
+                replica = self._index_children(child, collective_list, None)
+                if element.tag == "bundle" and parent_collective:
+                    parent_collective.primitive_list.extend(replica)
+            else:
+                self._index_children(child, collective_list, None)
+        return primitive_list
+
+def _get_id_keys(resource_id):
+    # the id itself and the id without clone instance suffixes
+    key_list = [resource_id]
+    position = resource_id.find(":")
+    while position != -1:
+        key_list.append(resource_id[:position])
+        position = resource_id.find(":", position + 1)
+    return key_list
+
+# The index of the last used cluster state. Cluster states are read only and
+# typically several resources are looked up in one state.
+_state_index_cache: List[_ResourceStateIndex] = []
+
+def _get_state_index(cluster_state):
+    if (
+        not _state_index_cache
+        or
+        _state_index_cache[0].cluster_state is not cluster_state
+    ):
+        _state_index_cache[:] = [_ResourceStateIndex(cluster_state)]
+    return _state_index_cache[0]
+
+def drop_state_index():
+    """
+    Forget the cached index to release the indexed cluster state
+    """
+    _state_index_cache.clear()
 
 def _get_primitives_for_state_check(
     cluster_state, resource_id, expected_running
 ):
-    primitives = cluster_state.xpath("""
-        .//resource[{predicate_id}]
-        |
-        .//group[{predicate_id}]/resource[{predicate_position}]
-        |
-        .//clone[@id="{id}"]/resource
-        |
-        .//clone[@id="{id}"]/group/resource[{predicate_position}]
-        |
-        .//bundle[@id="{id}"]/replica/resource
-    """.format(
-        id=resource_id,
-        predicate_id=_id_xpath_predicate(resource_id),
-        predicate_position=("last()" if expected_running else "1")
-    ))
+    index = _get_state_index(cluster_state)
+    # Clone resources are represented by multiple primitive elements. Groups
+    # are represented by their last member when checking for running, so that
+    # the whole group is running, and by their first member otherwise.
+    primitive_list = list(index.primitives.get(resource_id, []))
+    group_list = list(index.groups.get(resource_id, []))
+    for clone in index.clones.get(resource_id, []):
+        primitive_list.extend(clone.primitive_list)
+        group_list.extend(clone.group_list)
+    for bundle in index.bundles.get(resource_id, []):
+        primitive_list.extend(bundle.primitive_list)
+    for group in group_list:
+        if group:
+            primitive_list.append(group[-1] if expected_running else group[0])
+    # keep the document order and drop duplicities
+    primitive_dict = {
+        primitive.position: primitive for primitive in primitive_list
+    }
     return [
-        element for element in primitives
-            if not is_true(element.attrib.get("failed", ""))
+        primitive_dict[position].element
+        for position in sorted(primitive_dict)
+        if not primitive_dict[position].is_failed
     ]
 
 def _get_primitive_roles_with_nodes(primitive_el_list):
@@ -249,37 +426,24 @@ def is_resource_managed(cluster_state, resource_id):
     etree cluster_state -- status of the cluster
     string resource_id -- id of the resource
     """
-    primitive_list = cluster_state.xpath("""
-        .//resource[{predicate_id}]
-        |
-        .//group[{predicate_id}]/resource
-        """.format(predicate_id=_id_xpath_predicate(resource_id))
-    )
+    index = _get_state_index(cluster_state)
+    primitive_list = list(index.primitives.get(resource_id, []))
+    for group in index.groups.get(resource_id, []):
+        primitive_list.extend(group)
     if primitive_list:
-        for primitive in primitive_list:
-            if is_false(primitive.attrib.get("managed", "")):
-                return False
-            parent = find_parent(primitive, ["clone", "bundle"])
-            if (
-                parent is not None
-                and
-                is_false(parent.attrib.get("managed", ""))
-            ):
-                return False
-        return True
-
-    parent_list = cluster_state.xpath("""
-        .//clone[@id="{0}"]
-        |
-        .//bundle[@id="{0}"]
-        """.format(resource_id)
+        return all(
+            primitive.is_managed and primitive.is_parent_managed
+            for primitive in primitive_list
+        )
+
+    parent_list = (
+        index.clones.get(resource_id, []) + index.bundles.get(resource_id, [])
     )
-    for parent in parent_list:
-        if is_false(parent.attrib.get("managed", "")):
-            return False
-        for primitive in parent.xpath(".//resource"):
-            if is_false(primitive.attrib.get("managed", "")):
-                return False
-        return True
+    if parent_list:
+        # the first one in the document order
+        parent = min(parent_list, key=lambda parent: parent.position)
+        return parent.is_managed and all(
+            primitive.is_managed for primitive in parent.descendant_list
+        )
 
     raise ResourceNotFound(resource_id)
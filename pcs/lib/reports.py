@@ -748,6 +748,61 @@ def node_communication_proxy_is_set(node=None, address=None):
     )
 
 
+def node_communication_connections(created, reused):
+    """
+    Requests sent to nodes have opened new connections or reused connections
+    opened by previous requests
+
+    int created -- number of connections opened
+    int reused -- number of requests sent over an already open connection
+    """
+    return ReportItem.debug(
+        report_codes.NODE_COMMUNICATION_CONNECTIONS,
+        info={
+            "created": created,
+            "reused": reused,
+        }
+    )
+
+
+def node_communication_request_hedged(node, request, delay):
+    """
+    A request has not finished in time, therefore it has been sent to another
+    node without waiting for the first node to fail
+
+    string node -- node the request has been sent to
+    string request -- the request
+    float delay -- seconds the request has been waited for
+    """
+    return ReportItem.debug(
+        report_codes.NODE_COMMUNICATION_REQUEST_HEDGED,
+        info={
+            "node": node,
+            "request": request,
+            "delay": round(delay, 3),
+        }
+    )
+
+
+def node_communication_pipeline_finished(node, request_durations):
+    """
+    A node has finished a sequence of requests sent to it one after another
+
+    string node -- the node
+    list request_durations -- (request, seconds it took) pairs
+    """
+    return ReportItem.debug(
+        report_codes.NODE_COMMUNICATION_PIPELINE_FINISHED,
+        info={
+            "node": node,
+            "request_durations": [
+                (request, round(duration, 3))
+                for request, duration in request_durations
+            ],
+        }
+    )
+
+
 def node_communication_retrying(
     node, failed_address, failed_port, next_address, next_port, request
 ):
@@ -2732,6 +2787,22 @@ def files_distribution_skipped(reason_type, file_list, node_list):
         }
     )
 
+def files_distribution_skipped_same_content(node, file_list):
+    """
+    Files distribution to a node skipped as the node already has the files
+    with the same content
+
+    string node -- name of a destination node
+    iterable of strings file_list -- contains description of files
+    """
+    return ReportItem.info(
+        report_codes.FILES_DISTRIBUTION_SKIPPED_SAME_CONTENT,
+        info={
+            "node": node,
+            "file_list": file_list,
+        }
+    )
+
 def file_distribution_success(node, file_description):
     """
     a file has been successfuly distributed to a node
@@ -3515,11 +3586,18 @@ def cluster_start_started(host_name_list):
     )
 
 
-def cluster_start_success(node):
+def cluster_start_success(node, time_to_ready=None):
+    """
+    Cluster has been started on a node
+
+    string node -- node name
+    float time_to_ready -- how many seconds it took the node to fully start
+    """
     return ReportItem.info(
         report_codes.CLUSTER_START_SUCCESS,
         info=dict(
             node=node,
+            time_to_ready=time_to_ready,
         ),
     )
 
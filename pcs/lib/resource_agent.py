@@ -1,5 +1,8 @@
+import os.path
 import re
 from collections import namedtuple
+from typing import Optional
+
 from lxml import etree
 
 from pcs import settings
@@ -8,11 +11,15 @@ from pcs.common.reports import (
     ReportItemSeverity,
     ReportProcessor,
 )
-from pcs.common.tools import xml_fromstring
+from pcs.common.tools import (
+    map_parallel,
+    xml_fromstring,
+)
 from pcs.lib import reports, validate
 from pcs.lib.errors import LibraryError
 from pcs.lib.external import CommandRunner
 from pcs.lib.pacemaker.values import is_true
+from pcs.lib.resource_agent_cache import AgentMetadataCache
 
 # TODO: fix
 # pylint: disable=no-self-use
@@ -256,10 +263,37 @@ def guess_resource_agent_full_name(runner, search_agent_name):
     ]
     # check if the agent is valid
     return [
-        agent for agent in agent_candidates if agent.is_valid_metadata()
+        agent
+        for agent, error in zip(
+            agent_candidates, load_agents_metadata(agent_candidates)
+        )
+        if error is None
     ]
 
 
+def load_agents_metadata(agent_list):
+    """
+    Load metadata of agents concurrently
+
+    Return a list of UnableToGetAgentMetadata errors, one for each agent in
+    the same order as in agent_list. None means metadata have been loaded
+    successfully. Loaded metadata are kept in the agents so they can be
+    accessed without running external processes again.
+
+    list agent_list -- Agent instances to load metadata for
+    """
+    def load(agent):
+        # pylint: disable=protected-access
+        try:
+            agent._get_metadata()
+            return None
+        except UnableToGetAgentMetadata as e:
+            return e
+    return map_parallel(
+        load, agent_list, settings.agent_metadata_load_parallelism
+    )
+
+
 def guess_exactly_one_resource_agent_full_name(runner, search_agent_name):
     """
     Get one resource agent matching specified search term
@@ -365,6 +399,25 @@ class Agent():
     Base class for providing convinient access to an agent's metadata
     """
     _agent_type_label = "agent"
+    _metadata_cache: Optional[AgentMetadataCache] = None
+
+    @classmethod
+    def set_metadata_cache(cls, cache: Optional[AgentMetadataCache]):
+        """
+        Set a cache to be used by all agents for storing loaded metadata
+
+        cache -- the cache to be used or None to disable caching
+        """
+        # the cache is shared by all agent classes, so it is stored in the base
+        Agent._metadata_cache = cache
+
+    @classmethod
+    def clear_metadata_cache(cls):
+        """
+        Remove all entries from the cache set by set_metadata_cache
+        """
+        if Agent._metadata_cache is not None:
+            Agent._metadata_cache.clear()
 
     def __init__(self, runner):
         """
@@ -755,10 +808,29 @@ class Agent():
             or parse its metadata
         """
         if self._metadata is None:
-            self._metadata = self._parse_metadata(self._load_metadata())
+            self._metadata = self._parse_metadata(self._load_cached_metadata())
         return self._metadata
 
 
+    def _load_cached_metadata(self):
+        agent_file = self._get_agent_file()
+        if Agent._metadata_cache is None or agent_file is None:
+            return self._load_metadata()
+        metadata = Agent._metadata_cache.get(self.get_name(), agent_file)
+        if metadata is None:
+            metadata = self._load_metadata()
+            Agent._metadata_cache.put(self.get_name(), agent_file, metadata)
+        return metadata
+
+
+    def _get_agent_file(self):
+        """
+        Return a path to the agent's executable or None if metadata cannot be
+        cached as there is no file to check them against
+        """
+        return None
+
+
     def _load_metadata(self):
         raise NotImplementedError()
 
@@ -827,6 +899,10 @@ class FencedMetadata(FakeAgentMetadata):
         return parameter
 
 
+    def _get_agent_file(self):
+        return settings.pacemaker_fenced
+
+
     def _load_metadata(self):
         stdout, stderr, dummy_retval = self._runner.run(
             [settings.pacemaker_fenced, "metadata"]
@@ -880,6 +956,20 @@ class CrmAgent(Agent):
         self._get_metadata()
         return self
 
+    def _get_agent_file(self):
+        name = self._name_parts
+        if name.standard == "ocf":
+            return os.path.join(
+                settings.ocf_resource_agents_dir, name.provider, name.type
+            )
+        if name.standard == "lsb":
+            return os.path.join(settings.lsb_resource_agents_dir, name.type)
+        if name.standard == "stonith":
+            return os.path.join(settings.fence_agent_binaries, name.type)
+        # metadata of other agents are generated by pacemaker, there is no
+        # agent file to check cached metadata against
+        return None
+
     def _load_metadata(self):
         env_path = ":".join([
             # otherwise pacemaker cannot run RHEL fence agents to get their
@@ -989,6 +1079,9 @@ class ResourceAgent(CrmAgent):
 
 
 class AbsentAgentMixin():
+    def _get_agent_file(self):
+        return None
+
     def _load_metadata(self):
         return "<resource-agent/>"
 
@@ -1019,12 +1112,11 @@ class StonithAgent(CrmAgent):
     """
     Provides convinient access to a stonith agent's metadata
     """
-    _fenced_metadata = None
     _agent_type_label = "stonith"
 
-    @classmethod
-    def clear_fenced_metadata_cache(cls):
-        cls._fenced_metadata = None
+    def __init__(self, runner, name):
+        super(StonithAgent, self).__init__(runner, name)
+        self._fenced_metadata = None
 
     def _prepare_name_parts(self, name):
         # pacemaker doesn't support stonith (nor resource) agents with : in type
@@ -1144,10 +1236,11 @@ class StonithAgent(CrmAgent):
         return filtered
 
     def _get_fenced_metadata(self):
-        # pylint: disable=protected-access
-        if not self.__class__._fenced_metadata:
-            self.__class__._fenced_metadata = FencedMetadata(self._runner)
-        return self.__class__._fenced_metadata
+        # Fenced metadata are cached in the same way as metadata of any other
+        # agent, see Agent.set_metadata_cache.
+        if self._fenced_metadata is None:
+            self._fenced_metadata = FencedMetadata(self._runner)
+        return self._fenced_metadata
 
     def get_provides_unfencing(self):
         # self.get_actions returns an empty list
@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+import tempfile
+from collections import namedtuple
+from typing import Optional
+
+
+AgentFileStamp = namedtuple("AgentFileStamp", "path mtime size")
+
+
+def get_agent_file_stamp(agent_file: Optional[str]):
+    """
+    Describe the current state of an agent's executable, None if unavailable
+
+    agent_file -- path to the agent's executable
+    """
+    if not agent_file:
+        return None
+    try:
+        stat = os.stat(agent_file)
+    except OSError:
+        return None
+    return AgentFileStamp(agent_file, stat.st_mtime_ns, stat.st_size)
+
+
+class AgentMetadataCache:
+    """
+    On-disk cache of agents' metadata
+
+    Each entry is keyed by an agent name and is only valid as long as the path,
+    mtime and size of the agent's executable match the values stored with the
+    entry, so an upgraded or modified agent is never served stale metadata.
+    The cache holds at most max_entries entries, the least recently used ones
+    are evicted first. The cache is a best-effort optimization: any IO issue
+    makes it behave as if the entry was not cached.
+    """
+    _ENTRY_SUFFIX = ".json"
+
+    def __init__(
+        self, cache_dir: str, max_entries: int, refresh: bool = False
+    ):
+        """
+        cache_dir -- directory holding the cache entries
+        max_entries -- maximal number of entries kept in the cache
+        refresh -- do not serve cached entries, overwrite them by fresh data
+        """
+        self._cache_dir = cache_dir
+        self._max_entries = max_entries
+        self._refresh = refresh
+
+    def get(self, agent_name: str, agent_file: str) -> Optional[str]:
+        """
+        Return cached metadata of an agent, None if not cached or outdated
+
+        agent_name -- full name of the agent
+        agent_file -- path to the agent's executable
+        """
+        if self._refresh:
+            return None
+        stamp = get_agent_file_stamp(agent_file)
+        if stamp is None:
+            return None
+        entry_path = self._get_entry_path(agent_name)
+        try:
+            with open(entry_path, "r", encoding="utf-8") as entry_file:
+                entry = json.load(entry_file)
+            if (
+                entry["name"] != agent_name
+                or
+                AgentFileStamp(entry["path"], entry["mtime"], entry["size"])
+                !=
+                stamp
+            ):
+                return None
+            # mark the entry as recently used
+            os.utime(entry_path)
+            return entry["metadata"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def put(self, agent_name: str, agent_file: str, metadata: str) -> None:
+        """
+        Store metadata of an agent
+
+        agent_name -- full name of the agent
+        agent_file -- path to the agent's executable
+        metadata -- metadata of the agent
+        """
+        stamp = get_agent_file_stamp(agent_file)
+        if stamp is None:
+            return
+        entry = dict(stamp._asdict(), name=agent_name, metadata=metadata)
+        try:
+            os.makedirs(self._cache_dir, mode=0o755, exist_ok=True)
+            # write to a temporary file first so that concurrently running
+            # pcs processes never read a partially written entry
+            fd, tmp_path = tempfile.mkstemp(
+                dir=self._cache_dir, suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+                    json.dump(entry, tmp_file)
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, self._get_entry_path(agent_name))
+            except OSError:
+                os.unlink(tmp_path)
+                raise
+            self._evict()
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        """
+        Remove all entries from the cache
+        """
+        for entry_path in self._list_entries():
+            try:
+                os.unlink(entry_path)
+            except OSError:
+                pass
+
+    def _get_entry_path(self, agent_name):
+        return os.path.join(
+            self._cache_dir,
+            hashlib.sha256(agent_name.encode("utf-8")).hexdigest()
+                +
+                self._ENTRY_SUFFIX
+        )
+
+    def _list_entries(self):
+        try:
+            return [
+                os.path.join(self._cache_dir, name)
+                for name in os.listdir(self._cache_dir)
+                if name.endswith(self._ENTRY_SUFFIX)
+            ]
+        except OSError:
+            return []
+
+    def _evict(self):
+        entry_list = []
+        for entry_path in self._list_entries():
+            try:
+                entry_list.append(
+                    (os.stat(entry_path).st_mtime_ns, entry_path)
+                )
+            except OSError:
+                pass
+        if len(entry_list) <= self._max_entries:
+            return
+        entry_list.sort()
+        for dummy_mtime, entry_path in (
+            entry_list[:len(entry_list) - self._max_entries]
+        ):
+            try:
+                os.unlink(entry_path)
+            except OSError:
+                pass
@@ -1,3 +1,4 @@
+import os
 import sys
 import json
 import logging
@@ -12,7 +13,9 @@ from pcs.common.reports import (
     ReportItemList,
     ReportProcessor,
 )
+from pcs.lib.cib.tools import drop_id_index
 from pcs.lib.errors import LibraryError
+from pcs.lib.pacemaker.state import drop_state_index
 
 
 SUPPORTED_COMMANDS = {
@@ -25,20 +28,31 @@ SUPPORTED_COMMANDS = {
 
 def _exit(status, status_msg=None, report_list=None, data=None):
     json.dump(
-        dict(
-            status=status,
-            status_msg=status_msg,
-            report_list=report_list or [],
-            data=data,
-        ),
-        sys.stdout
+        _response(status, status_msg, report_list, data), sys.stdout
     )
     sys.exit(0)
 
 
-def get_cli_env(options):
+def _response(status, status_msg=None, report_list=None, data=None):
+    return dict(
+        status=status,
+        status_msg=status_msg,
+        report_list=report_list or [],
+        data=data,
+    )
+
+
+def get_cli_env(options, user=None):
+    """
+    dict options -- options of the request
+    dict user -- user and groups the request is run as, if not specified they
+        are read from the environment
+    """
     env = Env()
-    env.user, env.groups = utils.get_cib_user_groups()
+    if user is None:
+        env.user, env.groups = utils.get_cib_user_groups()
+    else:
+        env.user, env.groups = _get_user_groups(user)
     env.known_hosts_getter = utils.read_known_hosts_file
     # Debug messages always go to the processor. The parameter only affects if
     # they will be printed to stdout. We are not printing the messages. Instead
@@ -51,8 +65,19 @@ def get_cli_env(options):
     return env
 
 
+def _get_user_groups(user):
+    # same rules as for CIB_user and CIB_user_groups environment variables
+    if os.geteuid() != 0:
+        return None, None
+    return (user.get("username") or None), (user.get("groups") or None)
+
+
 class LibraryReportProcessor(ReportProcessor):
-    processed_items: ReportItemList = []
+    def __init__(self):
+        super().__init__()
+        # Each request gets its own processor, so that requests processed by
+        # one worker do not see reports of each other.
+        self.processed_items: ReportItemList = []
 
     def _do_report(self, report_item: ReportItem) -> None:
         self.processed_items.append(report_item)
@@ -70,26 +95,46 @@ def report_item_to_dict(report_item):
         report_text=build_report_message(report_item),
     )
 
-def main():
+def _drop_cached_state():
+    """
+    Forget data cached while processing previous requests
+
+    A worker serves many requests and files like known-hosts may change
+    between them.
+    """
+    utils.read_known_hosts_file.cache_clear()
+    utils.cmd_runner.cache_clear()
+    utils.drop_cib_snapshot()
+    utils.pcs_options = {}
+    utils.usefile = False
+    utils.filename = ""
+    drop_id_index()
+    drop_state_index()
+
+def process_request(input_data):
+    """
+    Run a library command, return a response
+
+    dict input_data -- the command, its data and options, optionally a user
+        and groups the command is run as
+    """
     # pylint: disable=broad-except
-    argv = sys.argv[1:]
-    if argv:
-        _exit("input_error", status_msg="No arguments allowed")
-
-    utils.subprocess_setup()
-    logging.basicConfig()
-
+    cli_env = None
+    _drop_cached_state()
     try:
-        input_data = json.load(sys.stdin)
-        cli_env = get_cli_env(input_data.get("options", {}))
+        cli_env = get_cli_env(
+            input_data.get("options", {}), input_data.get("user")
+        )
         lib = Library(cli_env, utils.get_middleware_factory())
         cmd = input_data["cmd"]
         if cmd not in SUPPORTED_COMMANDS:
-            _exit("unknown_cmd", status_msg=f"Unknown command '{cmd}'")
+            return _response(
+                "unknown_cmd", status_msg=f"Unknown command '{cmd}'"
+            )
         for sub_cmd in cmd.split("."):
             lib = getattr(lib, sub_cmd)
         output_data = lib(**input_data["cmd_data"])
-        _exit(
+        return _response(
             "success",
             report_list=export_reports(
                 cli_env.report_processor.processed_items
@@ -97,16 +142,59 @@ def main():
             data=output_data,
         )
     except LibraryError as e:
-        _exit(
+        return _response(
             "error",
             report_list=export_reports(
                 cli_env.report_processor.processed_items + list(e.args)
             ),
         )
-    except json.JSONDecodeError as e:
-        _exit("input_error", status_msg=f"Unable to parse input data: {e.msg}")
     except KeyError as e:
-        _exit("input_error", status_msg=f"Missing key {e}")
+        return _response("input_error", status_msg=f"Missing key {e}")
     except Exception as e:
         # TODO: maybe add traceback?
-        _exit("exception", status_msg=str(e))
+        return _response("exception", status_msg=str(e))
+
+
+def _run_worker():
+    """
+    Process requests from stdin until its end, each request and each response
+    is a JSON document preceded by a line containing its length in bytes
+    """
+    # Anything printed by the library commands would break the responses. It
+    # is sent to stderr which is logged by pcsd.
+    output = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    request_stream = sys.stdin.buffer
+    while True:
+        header = request_stream.readline()
+        if not header:
+            break
+        try:
+            input_data = json.loads(request_stream.read(int(header)))
+        except ValueError as e:
+            response = _response(
+                "input_error", status_msg=f"Unable to parse input data: {e}"
+            )
+        else:
+            response = process_request(input_data)
+        response_data = json.dumps(response).encode()
+        output.write(str(len(response_data)).encode() + b"\n" + response_data)
+        output.flush()
+
+
+def main():
+    argv = sys.argv[1:]
+    if argv not in ([], ["--worker"]):
+        _exit("input_error", status_msg="No arguments allowed")
+
+    utils.subprocess_setup()
+    logging.basicConfig()
+
+    if argv:
+        _run_worker()
+        return
+    try:
+        input_data = json.load(sys.stdin)
+    except json.JSONDecodeError as e:
+        _exit("input_error", status_msg=f"Unable to parse input data: {e.msg}")
+    json.dump(process_request(input_data), sys.stdout)
@@ -201,8 +201,9 @@ def resource_list_available(lib, argv, modifiers):
     """
     Options:
       * --nodesc - don't display description
+      * --refresh-cache - do not use cached agents' metadata
     """
-    modifiers.ensure_only_supported("--nodesc")
+    modifiers.ensure_only_supported("--nodesc", "--refresh-cache")
     if len(argv) > 1:
         raise CmdLineInputError()
 
@@ -235,8 +236,9 @@ def resource_list_options(lib, argv, modifiers):
     """
     Options:
       * --full - show advanced
+      * --refresh-cache - do not use cached agents' metadata
     """
-    modifiers.ensure_only_supported("--full")
+    modifiers.ensure_only_supported("--full", "--refresh-cache")
     if len(argv) != 1:
         raise CmdLineInputError()
     agent_name = argv[0]
@@ -608,12 +610,16 @@ def resource_providers(lib, argv, modifiers):
 
 def resource_agents(lib, argv, modifiers):
     """
-    Options: no options
+    Options:
+      * --refresh-cache - drop all cached agents' metadata
     """
-    modifiers.ensure_only_supported()
+    modifiers.ensure_only_supported("--refresh-cache")
     if len(argv) > 1:
         raise CmdLineInputError()
 
+    if modifiers.get("--refresh-cache"):
+        lib_ra.Agent.clear_metadata_cache()
+
     standard = argv[0] if argv else None
 
     agents = lib.resource_agent.list_agents_for_standard_and_provider(standard)
@@ -1384,13 +1390,19 @@ def resource_remove_cmd(lib, argv, modifiers):
         raise CmdLineInputError()
     resource_remove(argv[0])
 
-def resource_remove(resource_id, output=True, is_remove_remote_context=False):
+def resource_remove(
+    resource_id, output=True, is_remove_remote_context=False,
+    references_removed=False
+):
     """
     Commandline options:
       * -f - CIB file
       * --force - don't stop a resource before its deletion
       * --wait - is supported by resource_disable but waiting for resource to
         stop is handled also in this function
+
+    references_removed -- references to the resource in constraints, fencing
+        levels and acls have been removed already
     """
     def is_bundle_running(bundle_id):
         roles_with_nodes = get_resource_state(
@@ -1501,8 +1513,23 @@ def resource_remove(resource_id, output=True, is_remove_remote_context=False):
                 if retval != 0 and output:
                     msg.append("\n" + output)
                 utils.err("\n".join(msg).strip())
-        for res in group_dom.documentElement.getElementsByTagName("primitive"):
-            resource_remove(res.getAttribute("id"))
+        member_id_list = [
+            res.getAttribute("id")
+            for res in group_dom.documentElement.getElementsByTagName(
+                "primitive"
+            )
+        ]
+        # remove references of all the members at once, so that constraints
+        # are not walked for each member
+        dom = utils.get_cib_dom()
+        constraints_index = constraint.ConstraintsIndex(dom)
+        for member_id in member_id_list:
+            remove_resource_references(
+                dom, member_id, True, constraints_index
+            )
+        utils.replace_cib_configuration(dom)
+        for member_id in member_id_list:
+            resource_remove(member_id, references_removed=True)
         sys.exit(0)
 
     # now we know resource is not a group, a clone, a master nor a bundle
@@ -1554,9 +1581,10 @@ def resource_remove(resource_id, output=True, is_remove_remote_context=False):
             utils.err("\n".join(msg).strip())
         print("Stopped")
 
-    utils.replace_cib_configuration(
-        remove_resource_references(utils.get_cib_dom(), resource_id, output)
-    )
+    if not references_removed:
+        utils.replace_cib_configuration(
+            remove_resource_references(utils.get_cib_dom(), resource_id, output)
+        )
     dom = utils.get_cib_dom()
     resource_el = utils.dom_get_resource(dom, resource_id)
     remote_node_name = None
@@ -1685,14 +1713,16 @@ def stonith_level_rm_device(cib_dom, stn_id):
 
 
 def remove_resource_references(
-    dom, resource_id, output=False, constraints_element=None
+    dom, resource_id, output=False, constraints_index=None
 ):
     """
     Commandline options: no options
     NOTE: -f - will be used only if dom will be None
+
+    constraints_index -- constraint.ConstraintsIndex of dom if already built
     """
     constraint.remove_constraints_containing(
-        resource_id, output, constraints_element, dom
+        resource_id, output, dom, constraints_index
     )
     stonith_level_rm_device(dom, resource_id)
     lib_acl.dom_remove_permissions_referencing(dom, resource_id)
@@ -1,3 +1,5 @@
+import datetime
+from enum import Enum
 import re
 import xml.dom.minidom
 
@@ -285,6 +287,214 @@ class ExportAsExpression:
         return attributes
 
 
+class CrmRuleReturnCode(Enum):
+    IN_EFFECT = 0
+    # crm_rule refuses to check the rule
+    UNSUPPORTED = 3
+    EXPIRED = 110
+    TO_BE_IN_EFFECT = 111
+
+
+class DateRuleChecker:
+    """
+    Check whether rules are in effect the same way 'crm_rule --check' does
+
+    Running crm_rule takes a while and it has to load the whole CIB every
+    time. Rules with a date expression are therefore evaluated in pcs as long
+    as the result is certain to be the same as the one of crm_rule. Like
+    crm_rule, only the date expression of a rule is taken into account. Rules
+    crm_rule refuses to check, as they do not have exactly one date
+    expression, are recognized without running it. Rules containing nested
+    rules are left to crm_rule.
+    """
+    # pacemaker compares times in seconds
+    _date_re = re.compile(
+        r"^(?P<year>\d{4})-(?P<month>\d{2})-(?P<day>\d{2})"
+        r"([T ](?P<hour>\d{2}):(?P<minute>\d{2})(:(?P<second>\d{2}))?"
+        r"(?P<utc>Z)?)?$"
+    )
+    _range_re = re.compile(r"^(?P<low>\d+)(-(?P<high>\d+))?$")
+    _duration_parts = (
+        "years", "months", "weeks", "days", "hours", "minutes", "seconds"
+    )
+
+    def __init__(self, now=None):
+        """
+        datetime now -- the time to check rules at, current local time if None
+        """
+        if now is None:
+            now = datetime.datetime.now(datetime.timezone.utc).astimezone()
+        self._now = now.replace(microsecond=0)
+
+    def check(self, rule):
+        """
+        Return CrmRuleReturnCode crm_rule would exit with, None if unsure
+
+        rule -- rule element
+        """
+        child_list = [
+            child for child in rule.childNodes
+            if child.nodeType == xml.dom.minidom.Node.ELEMENT_NODE
+        ]
+        # The result of crm_rule for nested rules is not certain.
+        if any(child.tagName == "rule" for child in child_list):
+            return None
+        expression_list = [
+            child for child in child_list if child.tagName == "date_expression"
+        ]
+        # crm_rule refuses to check rules without a date expression or with
+        # more of them
+        if len(expression_list) != 1:
+            return CrmRuleReturnCode.UNSUPPORTED
+        # Pacemaker versions differ in the time zone of dates without time.
+        # A rule is only evaluated if the time zone does not matter.
+        result_set = set()
+        for date_tz in {self._now.tzinfo, datetime.timezone.utc}:
+            try:
+                result_set.add(
+                    self._check_expression(expression_list[0], date_tz)
+                )
+            except ValueError:
+                return None
+        return result_set.pop() if len(result_set) == 1 else None
+
+    def _check_expression(self, expression, date_tz):
+        operation = expression.getAttribute("operation")
+        if operation == "date_spec":
+            return self._check_date_spec(expression)
+        start = end = None
+        if expression.hasAttribute("start"):
+            start = self._parse_date(expression.getAttribute("start"), date_tz)
+        if expression.hasAttribute("end"):
+            end = self._parse_date(expression.getAttribute("end"), date_tz)
+        durations = expression.getElementsByTagName("duration")
+        if start is not None and end is None and durations:
+            end = self._add_duration(start, durations[0])
+
+        if operation == "in_range" and (start is not None or end is not None):
+            if start is not None and self._now < start:
+                return CrmRuleReturnCode.TO_BE_IN_EFFECT
+            if end is not None and self._now > end:
+                return CrmRuleReturnCode.EXPIRED
+            return CrmRuleReturnCode.IN_EFFECT
+        if operation == "gt" and start is not None:
+            if self._now > start:
+                return CrmRuleReturnCode.IN_EFFECT
+            return CrmRuleReturnCode.TO_BE_IN_EFFECT
+        if operation == "lt" and end is not None:
+            if self._now < end:
+                return CrmRuleReturnCode.IN_EFFECT
+            return CrmRuleReturnCode.EXPIRED
+        # crm_rule fails for a missing operation, unknown operations and
+        # missing dates
+        raise ValueError("Unsupported date expression")
+
+    def _check_date_spec(self, expression):
+        date_specs = expression.getElementsByTagName("date_spec")
+        # crm_rule only checks date specs with years and without moon
+        if (
+            not date_specs
+            or
+            not date_specs[0].hasAttribute("years")
+            or
+            date_specs[0].hasAttribute("moon")
+        ):
+            raise ValueError("Unsupported date spec")
+        date_spec = date_specs[0]
+        week_year, week, weekday = self._now.isocalendar()
+        # the first field out of its range decides
+        for name, value in (
+            ("years", self._now.year),
+            ("months", self._now.month),
+            ("monthdays", self._now.day),
+            ("hours", self._now.hour),
+            ("minutes", self._now.minute),
+            ("seconds", self._now.second),
+            ("yeardays", self._now.timetuple().tm_yday),
+            ("weekyears", week_year),
+            ("weeks", week),
+            ("weekdays", weekday),
+        ):
+            if not date_spec.hasAttribute(name):
+                continue
+            match = self._range_re.match(date_spec.getAttribute(name))
+            if not match:
+                raise ValueError("Unsupported date spec range")
+            low = int(match.group("low"))
+            high = int(match.group("high") or low)
+            if value < low:
+                return CrmRuleReturnCode.TO_BE_IN_EFFECT
+            if value > high:
+                return CrmRuleReturnCode.EXPIRED
+        return CrmRuleReturnCode.IN_EFFECT
+
+    def _parse_date(self, value, date_tz):
+        # Only the common formats are supported. Pacemaker uses the current
+        # offset of the local time zone for times without a time zone.
+        match = self._date_re.match(value)
+        if not match:
+            raise ValueError("Unsupported date '{0}'".format(value))
+        if match.group("hour") is None:
+            tzinfo = date_tz
+        elif match.group("utc"):
+            tzinfo = datetime.timezone.utc
+        else:
+            tzinfo = self._now.tzinfo
+        return datetime.datetime(
+            int(match.group("year")),
+            int(match.group("month")),
+            int(match.group("day")),
+            int(match.group("hour") or 0),
+            int(match.group("minute") or 0),
+            int(match.group("second") or 0),
+            tzinfo=tzinfo,
+        )
+
+    def _add_duration(self, start, duration):
+        parts = {}
+        for name, value in duration.attributes.items():
+            if name == "id":
+                continue
+            if name not in self._duration_parts or not value.isdigit():
+                raise ValueError("Unsupported duration")
+            parts[name] = int(value)
+        end = start
+        if parts.get("years"):
+            # Pacemaker may keep either the day of the month or the day of
+            # the year. Only durations with the same result are supported.
+            year = start.year + parts["years"]
+            end_by_day_of_year = start.replace(year=year, month=1, day=1) + (
+                datetime.timedelta(days=start.timetuple().tm_yday - 1)
+            )
+            if (end_by_day_of_year.month, end_by_day_of_year.day) != (
+                start.month, start.day
+            ):
+                raise ValueError("Unsupported duration")
+            end = end_by_day_of_year
+        if parts.get("months"):
+            month_index = end.year * 12 + end.month - 1 + parts["months"]
+            year, month = divmod(month_index, 12)
+            month += 1
+            # the day of the month is kept unless the month is shorter
+            end = end.replace(
+                year=year,
+                month=month,
+                day=min(end.day, self._days_in_month(year, month)),
+            )
+        return end + datetime.timedelta(
+            weeks=parts.get("weeks", 0),
+            days=parts.get("days", 0),
+            hours=parts.get("hours", 0),
+            minutes=parts.get("minutes", 0),
+            seconds=parts.get("seconds", 0),
+        )
+
+    @staticmethod
+    def _days_in_month(year, month):
+        next_month = datetime.date(year + month // 12, month % 12 + 1, 1)
+        return (next_month - datetime.timedelta(days=1)).day
+
+
 # generic parser
 
 class SymbolBase:
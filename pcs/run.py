@@ -5,7 +5,11 @@ created by setuptools (see setup.py).
 This module deals with some bundled python dependencies that are installed in
 a pcs-specific location rather than in a standard system location for the python
 packages.
+
+The entry points import what they need only when called, so that running one
+of them does not pay for importing the others.
 """
+import os
 import sys
 
 from pcs import settings
@@ -13,13 +17,31 @@ from pcs import settings
 if settings.pcs_bundled_pacakges_dir not in sys.path:
     sys.path.insert(0, settings.pcs_bundled_pacakges_dir)
 
-# pylint: disable=unused-import, wrong-import-position
-from pcs.daemon.run import main as daemon
-from pcs.app import main as cli
-try:
+# pylint: disable=import-outside-toplevel, wrong-import-position
+from pcs.cli.common import completion
+
+
+def daemon():
+    from pcs.daemon.run import main
+    main()
+
+def cli():
+    # Bash completion runs pcs on each key press. Suggestions are served
+    # without importing the rest of pcs.
+    if completion.has_applicable_environment(os.environ):
+        print(completion.make_suggestions(
+            os.environ,
+            completion.get_completion_tree(
+                settings.completion_tree_cache_file, settings.pcs_version
+            )
+        ))
+        sys.exit()
+    from pcs.app import main
+    main()
+
+def pcs_snmp_agent():
     # It is possible the package `pcs.snmp` is not installed. `pcsd` does not
     # require on pcs.snmp. `pcs.snmp` should be installed when `pcs_snmp_agent`
     # is called.
-    from pcs.snmp.pcs_snmp_agent import main as pcs_snmp_agent
-except ImportError:
-    pass
+    from pcs.snmp.pcs_snmp_agent import main
+    main()
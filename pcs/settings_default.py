@@ -42,6 +42,22 @@ crm_verify = os.path.join(pacemaker_binaries, "crm_verify")
 cibadmin = os.path.join(pacemaker_binaries, "cibadmin")
 crm_mon_schema = '/usr/share/pacemaker/crm_mon.rng'
 agent_metadata_schema = "/usr/share/resource-agents/ra-api-1.dtd"
+ocf_resource_agents_dir = "/usr/lib/ocf/resource.d/"
+lsb_resource_agents_dir = "/etc/init.d/"
+pcs_cache_dir = "/var/cache/pcs/"
+agent_metadata_cache_dir = os.path.join(pcs_cache_dir, "agent_metadata")
+agent_metadata_cache_max_entries = 512
+# number of agents' metadata loaded concurrently when listing agents
+agent_metadata_load_parallelism = 8
+# number of corosync node addresses resolved concurrently when validating them
+corosync_address_resolve_parallelism = 16
+# seconds to wait for resolving an address counted from the start of its
+# lookup, addresses not resolved in time are considered unresolvable, None
+# means wait as long as the resolver does
+corosync_address_resolve_timeout = 10
+completion_tree_cache_file = os.path.join(
+    pcs_cache_dir, "completion_tree.json"
+)
 pcsd_var_location = "/var/lib/pcsd/"
 pcsd_cert_location = os.path.join(pcsd_var_location, "pcsd.crt")
 pcsd_key_location = os.path.join(pcsd_var_location, "pcsd.key")
@@ -54,6 +70,46 @@ pcsd_dr_config_location = os.path.join(pcsd_var_location, "disaster-recovery")
 pcsd_exec_location = "/usr/lib/pcsd/"
 pcsd_log_location = "/var/log/pcsd/pcsd.log"
 pcsd_default_port = 2224
+# Number of long-running ruby processes handling pcsd requests, 0 starts a new
+# ruby process for each request.
+pcsd_ruby_workers = 4
+# A ruby worker is replaced after it has handled this number of requests.
+pcsd_ruby_worker_max_requests = 100
+# Maximal number of requests waiting for a ruby worker, more are rejected.
+pcsd_ruby_worker_queue_limit = 64
+# A request waiting for a ruby worker for longer than this number of seconds is
+# handled by a newly started ruby process instead.
+pcsd_ruby_worker_queue_timeout = 5
+# Maximal number of ruby processes started for requests which have waited for a
+# ruby worker for too long, more such requests are rejected.
+pcsd_ruby_worker_fallback_limit = 4
+# Number of long-running pcs_internal processes handling pcsd library calls, 0
+# starts a new pcs_internal process for each call.
+pcsd_pcs_internal_workers = 2
+# A pcs_internal worker is replaced after it has handled this number of calls.
+pcsd_pcs_internal_worker_max_requests = 100
+# Maximal number of calls waiting for a pcs_internal worker, more are run in a
+# newly started pcs_internal process.
+pcsd_pcs_internal_worker_queue_limit = 16
+# A call waiting for a pcs_internal worker for longer than this number of
+# seconds is run in a newly started pcs_internal process instead.
+pcsd_pcs_internal_worker_queue_timeout = 5
+# Number of seconds to wait for idle ruby and pcs_internal workers to exit when
+# pcsd is shutting down.
+pcsd_worker_shutdown_timeout = 5
+pcsd_pcs_internal_socket = os.path.join(
+    pcsd_var_location, "pcs_internal.socket"
+)
+pcs_internal_exec = "/usr/lib/pcs/pcs_internal"
+# Number of long-running processes authenticating users by PAM and loading
+# their groups.
+pcsd_auth_workers = 2
+# Maximal number of requests waiting for an auth worker, more are rejected.
+pcsd_auth_worker_queue_limit = 32
+# An auth request not finished in this number of seconds is rejected.
+pcsd_auth_worker_timeout = 30
+# Groups of a logged in user are loaded again after this number of seconds.
+pcsd_user_groups_cache_ttl = 10
 pcsd_config = "/etc/sysconfig/pcsd"
 cib_dir = "/var/lib/pacemaker/cib/"
 pacemaker_uname = "hacluster"
@@ -69,6 +125,14 @@ pacemaker_wait_timeout_status = 124
 booth_config_dir = "/etc/booth"
 booth_binary = "/usr/sbin/booth"
 default_request_timeout = 60
+# Read-only requests which have not finished in this number of seconds are sent
+# to another node as well. Once enough requests have finished, the delay is
+# learned from their durations instead.
+node_communication_hedge_delay = 2
+# Delays in seconds between checks whether a node has started grow from the
+# initial interval up to the max interval.
+wait_for_node_startup_initial_interval = 0.5
+wait_for_node_startup_max_interval = 2
 pcs_bundled_dir = "/usr/lib/pcs/bundled/"
 pcs_bundled_pacakges_dir = os.path.join(pcs_bundled_dir, "packages")
 
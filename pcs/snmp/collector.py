@@ -0,0 +1,263 @@
+"""
+Collecting cluster data provided by the SNMP agent
+
+The data are collected by a background thread, SNMP updaters only read the
+last collected data, so they never wait for pacemaker and corosync tools. The
+collection is skipped if neither the CIB nor corosync.conf have changed since
+the last collection, unless the collected data are older than the cache TTL.
+"""
+import logging
+import os
+import threading
+from time import monotonic
+from typing import (
+    Hashable,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+)
+
+from pcs import settings
+from pcs.cli.common.reports import build_report_message
+from pcs.lib.corosync.config_facade import ConfigFacade as CorosyncConfigFacade
+from pcs.lib.corosync.live import (
+    get_joined_nodes_names,
+    get_local_corosync_conf,
+)
+from pcs.lib.errors import LibraryError
+from pcs.lib.external import CommandRunner
+from pcs.lib.node import get_existing_nodes_names
+from pcs.lib.pacemaker.live import (
+    get_cib,
+    get_cib_header_xml,
+    get_cib_xml,
+    get_cluster_status_xml,
+)
+from pcs.lib.pacemaker.state import get_cluster_state_dom
+
+logger = logging.getLogger("pcs.snmp.collector")
+logger.addHandler(logging.NullHandler())
+
+
+class ClusterData(NamedTuple):
+    cluster_name: str
+    quorate: bool
+    nodes: List[str]
+    corosync_nodes_online: List[str]
+    corosync_nodes_offline: List[str]
+    pcmk_nodes_online: List[str]
+    pcmk_nodes_standby: List[str]
+    pcmk_nodes_offline: List[str]
+    resources: List[str]
+    resources_running: List[str]
+    resources_stopped: List[str]
+    resources_failed: List[str]
+
+
+def collect_cluster_data(runner: CommandRunner) -> ClusterData:
+    """
+    Collect data about the cluster from the local node
+
+    runner -- runs pacemaker and corosync tools
+    """
+    corosync_conf = CorosyncConfigFacade.from_string(get_local_corosync_conf())
+    corosync_nodes, dummy_report_list = get_existing_nodes_names(
+        corosync_conf
+    )
+    corosync_online = sorted(get_joined_nodes_names(runner))
+    corosync_offline = sorted(
+        node for node in corosync_nodes if node not in corosync_online
+    )
+
+    cluster_status = get_cluster_state_dom(get_cluster_status_xml(runner))
+    pcmk_online, pcmk_standby, pcmk_offline = _get_pcmk_nodes(cluster_status)
+
+    cib = get_cib(get_cib_xml(runner))
+    running_ids = {
+        resource.get("id").split(":")[0]
+        for resource in cluster_status.iterfind("resources//resource")
+        if resource.get("active") == "true"
+    }
+    resources, running, stopped, failed = [], [], [], []
+    for primitive, disabled in _get_primitives(
+        cib.find("configuration/resources")
+    ):
+        primitive_id = primitive.get("id")
+        resources.append(primitive_id)
+        if disabled:
+            stopped.append(primitive_id)
+        elif primitive_id in running_ids:
+            running.append(primitive_id)
+        else:
+            failed.append(primitive_id)
+
+    return ClusterData(
+        cluster_name=corosync_conf.get_cluster_name() or "",
+        quorate=(
+            cluster_status.find("summary/current_dc[@with_quorum='true']")
+            is not None
+        ),
+        nodes=_unique(
+            corosync_online + corosync_offline
+            + pcmk_online + pcmk_offline + pcmk_standby
+        ),
+        corosync_nodes_online=corosync_online,
+        corosync_nodes_offline=corosync_offline,
+        pcmk_nodes_online=pcmk_online,
+        pcmk_nodes_standby=pcmk_standby,
+        pcmk_nodes_offline=pcmk_offline,
+        resources=resources,
+        resources_running=running,
+        resources_stopped=stopped,
+        resources_failed=failed,
+    )
+
+
+def get_cache_key(runner: CommandRunner) -> Hashable:
+    """
+    Return a value which changes when the cluster data may have changed
+
+    Changes of cluster membership and resources are recorded in the CIB which
+    bumps its version.
+    """
+    cib_header = get_cib(get_cib_header_xml(runner))
+    try:
+        corosync_conf_stat = os.stat(settings.corosync_conf_file)
+        corosync_conf_key = (
+            corosync_conf_stat.st_mtime_ns, corosync_conf_stat.st_size
+        )
+    except OSError:
+        corosync_conf_key = None
+    return (
+        tuple(
+            cib_header.get(name)
+            for name in ("admin_epoch", "epoch", "num_updates")
+        ),
+        corosync_conf_key,
+    )
+
+
+class Collector(threading.Thread):
+    """
+    Collect cluster data periodically in the background
+    """
+    def __init__(self, runner: CommandRunner, interval: float, ttl: float):
+        """
+        runner -- runs pacemaker and corosync tools
+        interval -- how often in seconds to check for new data
+        ttl -- maximal age in seconds of data reused from the previous
+            collection
+        """
+        super().__init__(name="pcs_snmp_collector", daemon=True)
+        self._runner = runner
+        self._interval = interval
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._collected = threading.Event()
+        self._stopped = threading.Event()
+        self._data: Optional[ClusterData] = None
+        self._cache_key: Optional[Hashable] = None
+        self._collected_at = 0.0
+
+    def run(self):
+        while not self._stopped.is_set():
+            self.refresh()
+            self._stopped.wait(self._interval)
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def get_data(
+        self, timeout: Optional[float] = None
+    ) -> Optional[ClusterData]:
+        """
+        Return the last collected data or None if the collection failed
+
+        timeout -- how long to wait for the first collection to finish
+        """
+        self._collected.wait(timeout)
+        with self._lock:
+            return self._data
+
+    def refresh(self) -> None:
+        """
+        Collect the data unless the cached data are still valid
+        """
+        # pylint: disable=broad-except
+        data = None
+        try:
+            cache_key = get_cache_key(self._runner)
+            if (
+                self._data is not None
+                and
+                cache_key == self._cache_key
+                and
+                monotonic() - self._collected_at < self._ttl
+            ):
+                logger.debug("Cluster has not changed, using cached data")
+                data = self._data
+            else:
+                started_at = monotonic()
+                data = collect_cluster_data(self._runner)
+                self._cache_key = cache_key
+                self._collected_at = monotonic()
+                logger.debug(
+                    "Cluster data collected in %.3f s",
+                    self._collected_at - started_at,
+                )
+        except LibraryError as e:
+            logger.error(
+                "Unable to obtain cluster status: %s",
+                "; ".join(build_report_message(report) for report in e.args),
+            )
+        except Exception:
+            logger.exception("Unable to obtain cluster status")
+        with self._lock:
+            self._data = data
+        self._collected.set()
+
+
+def _get_pcmk_nodes(cluster_status):
+    online, standby, offline = [], [], []
+    for node in cluster_status.iterfind("nodes/node"):
+        if node.get("type") == "remote":
+            continue
+        if node.get("online") != "true":
+            offline.append(node.get("name"))
+        elif node.get("standby") == "true":
+            standby.append(node.get("name"))
+        else:
+            # nodes in maintenance are online
+            online.append(node.get("name"))
+    return online, standby, offline
+
+
+def _get_primitives(resources_el, parent_disabled=False):
+    """
+    Yield primitives and whether they are disabled, primitives in bundles are
+    not provided
+
+    resources_el -- element containing resources
+    parent_disabled -- whether a parent of the resources is disabled
+    """
+    if resources_el is None:
+        return
+    for resource in resources_el:
+        disabled = parent_disabled or _is_disabled(resource)
+        if resource.tag == "primitive":
+            # stonith devices cannot be disabled by target-role
+            yield resource, disabled and resource.get("class") != "stonith"
+        elif resource.tag in ("group", "clone", "master"):
+            yield from _get_primitives(resource, disabled)
+
+
+def _is_disabled(resource):
+    for nvpair in resource.iterfind("meta_attributes/nvpair"):
+        if nvpair.get("name") == "target-role":
+            return (nvpair.get("value") or "").lower() == "stopped"
+    return False
+
+
+def _unique(item_list: Iterable[str]) -> List[str]:
+    return list(dict.fromkeys(item_list))
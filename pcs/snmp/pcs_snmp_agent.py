@@ -8,6 +8,7 @@ import pyagentx
 
 import pcs.utils
 from pcs.snmp import settings
+from pcs.snmp.collector import Collector
 from pcs.snmp.updaters.v1 import ClusterPcsV1Updater
 
 
@@ -49,7 +50,7 @@ def setup_logging(debug=False):
     level = logging.INFO
     if debug:
         level = logging.DEBUG
-        # this is required to enable debug also in the ruby code
+        # this is required to enable debug of commands run by pcs
         # key '--debug' has to be added
         pcs.utils.pcs_options["--debug"] = debug
     formatter = logging.Formatter(
@@ -70,6 +71,13 @@ class PcsAgent(pyagentx.Agent):
     def setup(self):
         update_interval = get_update_interval()
         logger.info("Update interval set to: %s", str(update_interval))
+        # Cluster data are collected in the background, updaters only provide
+        # the last collected data.
+        collector = Collector(
+            pcs.utils.cmd_runner(), update_interval, settings.CACHE_TTL
+        )
+        collector.start()
+        ClusterPcsV1Updater.collector = collector
         self.register(
             settings.PCS_OID + ".1", ClusterPcsV1Updater, freq=update_interval,
         )
@@ -3,3 +3,8 @@ ENTERPRISES_OID = "1.3.6.1.4.1"
 PACEMAKER_OID = ENTERPRISES_OID + ".32723"
 PCS_OID = PACEMAKER_OID + ".100"
 DEFAULT_UPDATE_INTERVAL = 30
+# Cluster data are collected again after this number of seconds even if the
+# CIB and corosync.conf have not changed.
+CACHE_TTL = 300
+# How long in seconds the agent waits for cluster data after it has started
+FIRST_COLLECTION_TIMEOUT = 60
@@ -1,12 +1,14 @@
 import logging
+from typing import Optional
 
-from pcs.utils import run_pcsdcli
+from pcs.snmp import settings
 from pcs.snmp.agentx.updater import AgentxUpdaterBase
 from pcs.snmp.agentx.types import (
     IntegerType,
     StringType,
     Oid,
 )
+from pcs.snmp.collector import Collector
 
 logger = logging.getLogger("pcs.snmp.updaters.v1")
 logger.addHandler(logging.NullHandler())
@@ -41,29 +43,28 @@ _cluster_v1_oid_tree = Oid(
 
 class ClusterPcsV1Updater(AgentxUpdaterBase):
     _oid_tree = Oid(0, "pcs_v1", member_list=[_cluster_v1_oid_tree])
+    # Provides the cluster data, it is set by the agent before the updater is
+    # started.
+    collector: Optional[Collector] = None
+
     def update(self):
-        # pylint: disable=too-many-locals
-        output, ret_val = run_pcsdcli("node_status")
-        if ret_val != 0 or output["status"] != "ok":
-            logger.error(
-                "Unable to obtain cluster status.\nPCSD return code: %s\n"
-                "PCSD output: %s\n",
-                ret_val,
-                output
-            )
+        data = self.collector.get_data(
+            timeout=settings.FIRST_COLLECTION_TIMEOUT
+        )
+        if data is None:
+            logger.error("Cluster status is not available")
             return
-        data = output["data"]
         self.set_value(
             "pcmkPcsV1Cluster.pcmkPcsV1ClusterName",
-            data.get("cluster_name", "")
+            data.cluster_name
         )
         self.set_value(
             "pcmkPcsV1Cluster.pcmkPcsV1ClusterQuorate",
-            _bool_to_int(data.get("node", {}).get("quorum"))
+            _bool_to_int(data.quorate)
         )
 
         # nodes
-        known_nodes = data.get("known_nodes", [])
+        known_nodes = data.nodes
         self.set_value(
             "pcmkPcsV1Cluster.pcmkPcsV1ClusterNodesNum",
             len(known_nodes)
@@ -73,7 +74,7 @@ class ClusterPcsV1Updater(AgentxUpdaterBase):
             known_nodes
         )
 
-        corosync_nodes_online = data.get("corosync_online")
+        corosync_nodes_online = data.corosync_nodes_online
         self.set_value(
             "pcmkPcsV1Cluster.pcmkPcsV1ClusterCorosyncNodesOnlineNum",
             len(corosync_nodes_online)
@@ -83,7 +84,7 @@ class ClusterPcsV1Updater(AgentxUpdaterBase):
             corosync_nodes_online
         )
 
-        corosync_nodes_offline = data.get("corosync_offline")
+        corosync_nodes_offline = data.corosync_nodes_offline
         self.set_value(
             "pcmkPcsV1Cluster.pcmkPcsV1ClusterCorosyncNodesOfflineNum",
             len(corosync_nodes_offline)
@@ -93,7 +94,7 @@ class ClusterPcsV1Updater(AgentxUpdaterBase):
             corosync_nodes_offline
         )
 
-        pcmk_nodes_online = data.get("pacemaker_online")
+        pcmk_nodes_online = data.pcmk_nodes_online
         self.set_value(
             "pcmkPcsV1Cluster.pcmkPcsV1ClusterPcmkNodesOnlineNum",
             len(pcmk_nodes_online)
@@ -103,7 +104,7 @@ class ClusterPcsV1Updater(AgentxUpdaterBase):
             pcmk_nodes_online
         )
 
-        pcmk_nodes_standby = data.get("pacemaker_standby")
+        pcmk_nodes_standby = data.pcmk_nodes_standby
         self.set_value(
             "pcmkPcsV1Cluster.pcmkPcsV1ClusterPcmkNodesStandbyNum",
             len(pcmk_nodes_standby)
@@ -113,7 +114,7 @@ class ClusterPcsV1Updater(AgentxUpdaterBase):
             pcmk_nodes_standby
         )
 
-        pcmk_nodes_offline = data.get("pacemaker_offline")
+        pcmk_nodes_offline = data.pcmk_nodes_offline
         self.set_value(
             "pcmkPcsV1Cluster.pcmkPcsV1ClusterPcmkNodesOfflineNum",
             len(pcmk_nodes_offline)
@@ -124,11 +125,7 @@ class ClusterPcsV1Updater(AgentxUpdaterBase):
         )
 
         # resources
-        primitive_list = []
-        for resource in data.get("resource_list", []):
-            primitive_list.extend(_get_primitives(resource))
-
-        primitive_id_list = _get_resource_id_list(primitive_list)
+        primitive_id_list = data.resources
         self.set_value(
             "pcmkPcsV1Cluster.pcmkPcsV1ClusterAllResourcesNum",
             len(primitive_id_list)
@@ -137,9 +134,7 @@ class ClusterPcsV1Updater(AgentxUpdaterBase):
             "pcmkPcsV1Cluster.pcmkPcsV1ClusterAllResourcesIds",
             primitive_id_list
         )
-        running_primitive_id_list = _get_resource_id_list(
-            primitive_list, _res_in_status(["running"])
-        )
+        running_primitive_id_list = data.resources_running
 
         self.set_value(
             "pcmkPcsV1Cluster.pcmkPcsV1ClusterRunningResourcesNum",
@@ -150,9 +145,7 @@ class ClusterPcsV1Updater(AgentxUpdaterBase):
             running_primitive_id_list
         )
 
-        disabled_primitive_id_list = _get_resource_id_list(
-            primitive_list, _res_in_status(["disabled"])
-        )
+        disabled_primitive_id_list = data.resources_stopped
         self.set_value(
             "pcmkPcsV1Cluster.pcmkPcsV1ClusterStoppedResourcesNum",
             len(disabled_primitive_id_list)
@@ -162,10 +155,7 @@ class ClusterPcsV1Updater(AgentxUpdaterBase):
             disabled_primitive_id_list
         )
 
-        failed_primitive_id_list = _get_resource_id_list(
-            primitive_list,
-            lambda res: not _res_in_status(["running", "disabled"])(res)
-        )
+        failed_primitive_id_list = data.resources_failed
         self.set_value(
             "pcmkPcsV1Cluster.pcmkPcsV1ClusterFailedResourcesNum",
             len(failed_primitive_id_list)
@@ -178,28 +168,3 @@ class ClusterPcsV1Updater(AgentxUpdaterBase):
 
 def _bool_to_int(value):
     return 1 if value else 0
-
-
-def _get_primitives(resource):
-    res_type = resource["class_type"]
-    if res_type == "primitive":
-        return [resource]
-    if res_type == "group":
-        primitive_list = []
-        for primitive in resource["members"]:
-            primitive_list.extend(_get_primitives(primitive))
-        return primitive_list
-    # check master-slave type
-    if res_type in ["clone", "master"]:
-        return _get_primitives(resource["member"])
-    return []
-
-
-def _get_resource_id_list(resource_list, predicate=None):
-    if predicate is None:
-        predicate = lambda _: True
-    return [resource["id"] for resource in resource_list if predicate(resource)]
-
-
-def _res_in_status(status_list):
-    return lambda res: res["status"] in status_list
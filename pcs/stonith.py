@@ -50,8 +50,9 @@ def stonith_list_available(lib, argv, modifiers):
     """
     Options:
       * --nodesc - do not show description of the agents
+      * --refresh-cache - do not use cached agents' metadata
     """
-    modifiers.ensure_only_supported("--nodesc")
+    modifiers.ensure_only_supported("--nodesc", "--refresh-cache")
     if len(argv) > 1:
         raise CmdLineInputError()
 
@@ -87,8 +88,9 @@ def stonith_list_options(lib, argv, modifiers):
     """
     Options:
       * --full - show advanced options
+      * --refresh-cache - do not use cached agents' metadata
     """
-    modifiers.ensure_only_supported("--full")
+    modifiers.ensure_only_supported("--full", "--refresh-cache")
     if len(argv) != 1:
         raise CmdLineInputError()
     agent_name = argv[0]
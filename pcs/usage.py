@@ -23,6 +23,7 @@ def full_usage():
     out += strip_extras(alert([], False))
     out += strip_extras(client([], False))
     out += strip_extras(dr([], False))
+    out += strip_extras(batch([], False))
     print(out.strip())
     print("Examples:\n" + examples.replace(r" \ ", ""))
 
@@ -126,6 +127,7 @@ def generate_completion_tree_from_usage():
     tree["booth"] = generate_tree(booth([], False))
     tree["client"] = generate_tree(client([], False))
     tree["dr"] = generate_tree(dr([], False))
+    tree["batch"] = generate_tree(batch([], False))
     return tree
 
 def generate_tree(usage_txt):
@@ -197,6 +199,7 @@ Commands:
     alert       Manage pacemaker alerts.
     client      Manage pcsd client configuration.
     dr          Manage disaster recovery configuration.
+    batch       Run pcs commands as one CIB transaction.
 """
 # Advanced usage to possibly add later
 #  --corosync_conf=<corosync file> Specify alternative corosync.conf file
@@ -220,14 +223,18 @@ Commands:
         Show options of all currently configured resources or if resource ids
         are specified show the options for the specified resource ids.
 
-    list [filter] [--nodesc]
+    list [filter] [--nodesc] [--refresh-cache]
         Show list of all available resource agents (if filter is provided then
         only resource agents matching the filter will be shown). If --nodesc is
-        used then descriptions of resource agents are not printed.
+        used then descriptions of resource agents are not printed. If
+        --refresh-cache is specified, agents' metadata are loaded from the
+        agents even if they are cached.
 
-    describe [<standard>:[<provider>:]]<type> [--full]
+    describe [<standard>:[<provider>:]]<type> [--full] [--refresh-cache]
         Show options for the specified resource. If --full is specified, all
-        options including advanced and deprecated ones are shown.
+        options including advanced and deprecated ones are shown. If
+        --refresh-cache is specified, agent's metadata are loaded from the
+        agent even if they are cached.
 
     create <resource id> [<standard>:[<provider>:]]<type> [resource options]
            [op <operation action> <operation options> [<operation action>
@@ -394,8 +401,9 @@ Commands:
     providers
         List available OCF resource agent providers.
 
-    agents [standard[:provider]]
-        List available agents optionally filtered by standard and provider.
+    agents [standard[:provider]] [--refresh-cache]
+        List available agents optionally filtered by standard and provider. If
+        --refresh-cache is specified, all cached agents' metadata are removed.
 
     update <resource id> [resource options] [op [<operation action>
            <operation options>]...] [meta <meta operations>...] [--wait[=n]]
@@ -801,7 +809,8 @@ Commands:
 
     sync corosync
         Sync corosync configuration to all nodes found from current
-        corosync.conf file.
+        corosync.conf file. Nodes which already have the same configuration
+        are skipped.
 
     cib [filename] [scope=<scope> | --config]
         Get the raw xml from the CIB (Cluster Information Base).  If a filename
@@ -1018,14 +1027,18 @@ Commands:
         Show options of all currently configured stonith devices or if stonith
         ids are specified show the options for the specified stonith device ids.
 
-    list [filter] [--nodesc]
+    list [filter] [--nodesc] [--refresh-cache]
         Show list of all available stonith agents (if filter is provided then
         only stonith agents matching the filter will be shown). If --nodesc is
-        used then descriptions of stonith agents are not printed.
+        used then descriptions of stonith agents are not printed. If
+        --refresh-cache is specified, agents' metadata are loaded from the
+        agents even if they are cached.
 
-    describe <stonith agent> [--full]
+    describe <stonith agent> [--full] [--refresh-cache]
         Show options for specified stonith agent. If --full is specified, all
-        options including advanced and deprecated ones are shown.
+        options including advanced and deprecated ones are shown. If
+        --refresh-cache is specified, agent's metadata are loaded from the
+        agent even if they are cached.
 
     create <stonith id> <stonith device type> [stonith device options]
            [op <operation action> <operation options> [<operation action>
@@ -1965,7 +1978,8 @@ Commands:
 
     sync [--skip-offline]
         Send booth configuration from the local node to all nodes
-        in the cluster.
+        in the cluster. Nodes which already have the same configuration are
+        skipped.
 
     enable
         Enable booth arbitrator service.
@@ -2057,9 +2071,12 @@ Commands:
     config
         Display disaster-recovery configuration from the local node.
 
-    status [--full] [--hide-inactive]
+    status [--full] [--hide-inactive] [--timeout=<time>]
         Display status of the local and the remote site cluster (--full
         provides more details, --hide-inactive hides inactive resources).
+        Statuses of all sites are obtained at once. If --timeout is
+        specified, sites which do not provide their status in <time> are
+        reported as failed.
 
     set-recovery-site <recovery site node>
         Set up disaster-recovery with the local cluster being the primary site.
@@ -2074,6 +2091,30 @@ Commands:
     return output
 
 
+def batch(args=(), pout=True):
+    output = """
+Usage: pcs batch <command>
+Run pcs commands as one CIB transaction.
+
+Commands:
+    run [<batch file>] [--wait[=n]]
+        Run pcs commands listed in the batch file, or read from stdin if no
+        file or '-' is specified, one command per line. Lines can be continued
+        by a backslash, text following '#' is a comment and the leading 'pcs'
+        of commands is optional. The CIB is loaded once, all the commands
+        modify its copy and their changes are pushed to the cluster at once
+        after the last command finishes. If any of the commands fails, no
+        changes are pushed. Commands which do not support the -f option
+        cannot be run in a batch. Time it took to run each command is
+        displayed. If --wait is specified, pcs will wait up to 'n' seconds for
+        the changes to be applied.
+"""
+    if pout:
+        print(sub_usage(args, output))
+        return None
+    return output
+
+
 def show(main_usage_name, rest_usage_names):
     usage_map = {
         "acl": acl,
@@ -2084,6 +2125,7 @@ def show(main_usage_name, rest_usage_names):
         "config": config,
         "constraint": constraint,
         "dr": dr,
+        "batch": batch,
         "host": host,
         "node": node,
         "pcsd": pcsd,
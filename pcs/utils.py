@@ -22,9 +22,12 @@ from urllib.parse import urlencode
 from typing import (
     Any,
     Dict,
+    Optional,
     Sequence,
 )
 
+from lxml import etree
+
 from pcs import settings, usage
 
 from pcs.common import (
@@ -90,6 +93,9 @@ usefile = False
 filename = ""
 # Note: not properly typed
 pcs_options: Dict[Any, Any] = {}
+# library environment used by all library commands instead of creating a new
+# environment for each of them, set by pcs.cli.batch
+shared_lib_env: Optional[LibraryEnvironment] = None
 
 
 class UnknownPropertyException(Exception):
@@ -366,25 +372,6 @@ def getCorosyncConfig(node):
     """
     return sendHTTPRequest(node, 'remote/get_corosync_conf', None, False, False)
 
-def setCorosyncConfig(node, config):
-    """
-    Commandline options:
-      * --request-timeout - timeout for HTTP requests
-    """
-    data = urlencode({'corosync_conf':config})
-    (status, data) = sendHTTPRequest(node, 'remote/set_corosync_conf', data)
-    if status != 0:
-        err("Unable to set corosync config: {0}".format(data))
-
-def getPacemakerNodeStatus(node):
-    """
-    Commandline options:
-      * --request-timeout - timeout for HTTP requests
-    """
-    return sendHTTPRequest(
-        node, "remote/pacemaker_node_status", None, False, False
-    )
-
 def startCluster(node, quiet=False, timeout=None):
     """
     Commandline options:
@@ -792,6 +779,9 @@ def run(
         env_var["CIB_file"] = filename
         touch_cib_file(filename)
 
+    if not _is_cib_read_only_command(args):
+        drop_cib_snapshot()
+
     command = args[0]
     if (
         command[0:3] == "crm"
@@ -1078,8 +1068,13 @@ def does_exist(xpath_query):
     """
     Commandline options:
       * -f - CIB file
+      * --debug
     """
     args = ["cibadmin", "-Q", "--xpath", xpath_query]
+    element_list = _cib_snapshot_xpath(xpath_query)
+    if element_list is not None:
+        _cib_snapshot_report_hit(args)
+        return bool(element_list)
     dummy_output, retval = run(args)
     if retval != 0:
         return False
@@ -1533,13 +1528,187 @@ def validate_wait_get_timeout(need_cib_support=True):
     return wait_timeout
 
 
+# Pacemaker tools which never modify the CIB. Running any other pacemaker tool
+# drops the CIB snapshot.
+_CIB_READ_ONLY_COMMANDS = frozenset(["crm_mon", "crm_verify", "iso8601"])
+_CIB_WRITE_OPTIONS = frozenset([
+    "-C", "--create", "-D", "--delete", "-E", "--erase", "-M", "--modify",
+    "-P", "--patch", "-R", "--replace", "-B", "--bump", "-u", "--upgrade",
+])
+# Map of cibadmin scopes to xpaths of the elements they return
+_CIB_SCOPE_XPATH = {
+    "configuration": "/cib/configuration",
+    "status": "/cib/status",
+    "nodes": "/cib/configuration/nodes",
+    "resources": "/cib/configuration/resources",
+    "constraints": "/cib/configuration/constraints",
+    "crm_config": "/cib/configuration/crm_config",
+    "rsc_defaults": "/cib/configuration/rsc_defaults",
+    "op_defaults": "/cib/configuration/op_defaults",
+}
+
+
+class _CibSnapshot:
+    """
+    CIB loaded once per pcs invocation and shared by CIB queries
+
+    Legacy commands query the CIB many times while processing a single
+    command. Each query used to run cibadmin and parse its output. The snapshot
+    loads the CIB once and answers the queries from memory until anything is
+    written to the CIB.
+    """
+    def __init__(self, source, cib_xml):
+        """
+        source -- identification of the CIB the snapshot has been loaded from
+        cib_xml -- content of the CIB
+        """
+        self.source = source
+        self.cib_xml = cib_xml
+        self._tree = None
+
+    def get_tree(self):
+        if self._tree is None:
+            self._tree = etree.fromstring(self.cib_xml.encode("utf-8"))
+        return self._tree
+
+
+_cib_snapshot: Optional[_CibSnapshot] = None
+_cib_snapshot_hits = 0
+
+
+def _get_cib_snapshot_source():
+    """
+    Commandline options:
+      * -f - CIB file
+    """
+    if not usefile:
+        return ("live",)
+    try:
+        stat = os.stat(filename)
+        # the snapshot is not valid anymore if the file has been overwritten
+        return ("file", filename, stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
+
+def _get_valid_cib_snapshot():
+    """
+    Commandline options:
+      * -f - CIB file
+    """
+    if _cib_snapshot is None:
+        return None
+    if _cib_snapshot.source != _get_cib_snapshot_source():
+        drop_cib_snapshot()
+        return None
+    return _cib_snapshot
+
+
+def _cib_snapshot_report_hit(args):
+    """
+    Commandline options:
+      * --debug
+    """
+    # pylint: disable=global-statement
+    global _cib_snapshot_hits
+    _cib_snapshot_hits += 1
+    if "--debug" in pcs_options:
+        print(
+            "Served from CIB snapshot: {0}\n"
+            "CIB queries avoided so far: {1}\n".format(
+                " ".join(args), _cib_snapshot_hits
+            )
+        )
+
+
+def _cib_snapshot_xpath(xpath_query):
+    """
+    Return a list of elements matching the query, None if not possible
+
+    Commandline options:
+      * -f - CIB file
+    """
+    snapshot = _get_valid_cib_snapshot()
+    if snapshot is None:
+        return None
+    try:
+        result = snapshot.get_tree().xpath(xpath_query)
+    except (etree.XPathError, etree.XMLSyntaxError):
+        # let cibadmin deal with queries lxml does not understand
+        return None
+    if not isinstance(result, list) or not all(
+        isinstance(item, etree._Element) # pylint: disable=protected-access
+        for item in result
+    ):
+        # cibadmin only returns elements, leave anything else to it
+        return None
+    return result
+
+
+def _cib_element_to_str(element):
+    return etree.tostring(element, encoding="unicode", with_tail=False)
+
+
+def drop_cib_snapshot():
+    """
+    Forget the CIB snapshot, next query loads the CIB again
+
+    Commandline options: no options
+    """
+    # pylint: disable=global-statement
+    global _cib_snapshot
+    _cib_snapshot = None
+
+
+def _is_cib_read_only_command(args):
+    """
+    Commandline options: no options
+    """
+    command = os.path.basename(args[0])
+    if command in _CIB_READ_ONLY_COMMANDS:
+        return True
+    if command == "cibadmin":
+        return (
+            ("-Q" in args or "--query" in args)
+            and
+            not _CIB_WRITE_OPTIONS.intersection(args)
+        )
+    return False
+
+
+def _cib_snapshot_middleware(next_in_line, env, *args, **kwargs):
+    """
+    Drop the CIB snapshot after a library command which may change the CIB
+
+    Commandline options: no options
+    """
+    try:
+        return next_in_line(env, *args, **kwargs)
+    finally:
+        drop_cib_snapshot()
+
+
 # Return matches from the CIB with the xpath_query
 def get_cib_xpath(xpath_query):
     """
     Commandline options:
       * -f - CIB file
+      * --debug
     """
     args = ["cibadmin", "-Q", "--xpath", xpath_query]
+    element_list = _cib_snapshot_xpath(xpath_query)
+    if element_list is not None:
+        _cib_snapshot_report_hit(args)
+        if not element_list:
+            return ""
+        if len(element_list) == 1:
+            return _cib_element_to_str(element_list[0]) + "\n"
+        # cibadmin wraps multiple matches in an xpath-query element
+        return "<xpath-query>\n{0}\n</xpath-query>\n".format(
+            "\n".join(
+                _cib_element_to_str(element) for element in element_list
+            )
+        )
     output, retval = run(args)
     if retval != 0:
         return ""
@@ -1549,16 +1718,33 @@ def get_cib(scope=None):
     """
     Commandline options:
       * -f - CIB file
+      * --debug
     """
+    # pylint: disable=global-statement
+    global _cib_snapshot
     command = ["cibadmin", "-l", "-Q"]
     if scope:
         command.append("--scope=%s" % scope)
+    snapshot = _get_valid_cib_snapshot()
+    if snapshot is not None and not scope:
+        _cib_snapshot_report_hit(command)
+        return snapshot.cib_xml
+    if snapshot is not None and scope in _CIB_SCOPE_XPATH:
+        _cib_snapshot_report_hit(command)
+        element_list = snapshot.get_tree().xpath(_CIB_SCOPE_XPATH[scope])
+        if element_list:
+            return _cib_element_to_str(element_list[0]) + "\n"
+        err("unable to get cib, scope '%s' not present in cib" % scope)
+
+    source = _get_cib_snapshot_source()
     output, retval = run(command)
     if retval != 0:
         if retval == 105 and scope:
             err("unable to get cib, scope '%s' not present in cib" % scope)
         else:
             err("unable to get cib")
+    if not scope and source is not None:
+        _cib_snapshot = _CibSnapshot(source, output)
     return output
 
 def get_cib_dom(cib_xml=None):
@@ -1613,6 +1799,7 @@ def replace_cib_configuration(dom):
         new_dom = dom
     cmd = ["cibadmin", "--replace", "-V", "--xml-pipe", "-o", "configuration"]
     output, retval = run(cmd, False, new_dom)
+    drop_cib_snapshot()
     if retval != 0:
         err("Unable to update cib\n"+output)
 
@@ -1639,28 +1826,122 @@ def does_id_exist(dom, check_id):
         )):
             if elem.get("id") == check_id:
                 return True
-    else:
-        document = (
-            dom
-            if isinstance(dom, xml.dom.minidom.Document)
-            else dom.ownerDocument
+        return False
+    return _get_dom_id_index(dom).does_id_exist(check_id)
+
+class _DomIdIndex:
+    """
+    Ids used in a minidom document, built once and shared by id lookups
+
+    Ids found in the index are verified to be still present in the document,
+    ids of removed elements are dropped. Ids reported as free are kept as
+    pending, as they are about to be put to the document. Only pending ids are
+    looked up in the document when asked for again.
+    """
+    def __init__(self, document):
+        """
+        Commandline options: no options
+        """
+        self.document = document
+        self._id_elements = None
+        self._pending_ids = set()
+
+    def does_id_exist(self, check_id):
+        """
+        Commandline options: no options
+        """
+        if self._id_elements is None:
+            self._build()
+        element_list = self._id_elements.get(check_id)
+        if element_list:
+            element_list[:] = [
+                elem for elem in element_list
+                if self._is_element_valid(elem, check_id)
+            ]
+            if element_list:
+                return True
+            del self._id_elements[check_id]
+            self._pending_ids.add(check_id)
+        if check_id not in self._pending_ids:
+            self._pending_ids.add(check_id)
+            return False
+        element_list = [
+            elem for elem in _dom_get_id_scope_elements(self.document)
+            if elem.getAttribute("id") == check_id
+        ]
+        if not element_list:
+            return False
+        self._pending_ids.discard(check_id)
+        self._id_elements[check_id] = element_list
+        return True
+
+    def _build(self):
+        self._id_elements = {}
+        self._pending_ids = set()
+        for elem in _dom_get_id_scope_elements(self.document):
+            elem_id = elem.getAttribute("id")
+            if elem_id:
+                self._id_elements.setdefault(elem_id, []).append(elem)
+
+    def _is_element_valid(self, elem, check_id):
+        if elem.getAttribute("id") != check_id:
+            return False
+        ancestor_list = []
+        node = elem.parentNode
+        while node is not None:
+            ancestor_list.append(node)
+            node = node.parentNode
+        if not ancestor_list or ancestor_list[-1] is not self.document:
+            # the element has been removed from the document
+            return False
+        if self.document.documentElement.tagName != "cib":
+            return True
+        # the element must be in a section of cib other than status
+        return (
+            len(ancestor_list) >= 3
+            and
+            ancestor_list[-3].tagName != "status"
         )
-        cib_found = False
-        for cib in dom_get_children_by_tag_name(document, "cib"):
-            cib_found = True
-            for section in cib.childNodes:
-                if section.nodeType != xml.dom.minidom.Node.ELEMENT_NODE:
-                    continue
-                if section.tagName == "status":
-                    continue
-                for elem in section.getElementsByTagName("*"):
-                    if elem.getAttribute("id") == check_id:
-                        return True
-        if not cib_found:
-            for elem in document.getElementsByTagName("*"):
-                if elem.getAttribute("id") == check_id:
-                    return True
-    return False
+
+# Only the index of the most recently used document is kept, commands work
+# with one document at a time.
+_dom_id_index = None
+
+def _get_dom_id_index(dom):
+    """
+    Commandline options: no options
+    """
+    # pylint: disable=global-statement
+    global _dom_id_index
+    document = (
+        dom
+        if isinstance(dom, xml.dom.minidom.Document)
+        else dom.ownerDocument
+    )
+    if _dom_id_index is None or _dom_id_index.document is not document:
+        _dom_id_index = _DomIdIndex(document)
+    return _dom_id_index
+
+def _dom_get_id_scope_elements(dom):
+    """
+    Commandline options: no options
+    """
+    document = (
+        dom
+        if isinstance(dom, xml.dom.minidom.Document)
+        else dom.ownerDocument
+    )
+    cib_found = False
+    for cib in dom_get_children_by_tag_name(document, "cib"):
+        cib_found = True
+        for section in cib.childNodes:
+            if section.nodeType != xml.dom.minidom.Node.ELEMENT_NODE:
+                continue
+            if section.tagName == "status":
+                continue
+            yield from section.getElementsByTagName("*")
+    if not cib_found:
+        yield from document.getElementsByTagName("*")
 
 # Returns check_id if it doesn't exist in the dom, otherwise it adds an integer
 # to the end of the id and increments it until a unique id is found
@@ -2640,6 +2921,7 @@ def get_cli_env():
     env.known_hosts_getter = read_known_hosts_file
     env.report_processor = get_report_processor()
     env.request_timeout = pcs_options.get("--request-timeout")
+    env.lib_env = shared_lib_env
     return env
 
 def get_middleware_factory():
@@ -2652,7 +2934,10 @@ def get_middleware_factory():
       * -f
     """
     return middleware.create_middleware_factory(
-        cib=middleware.cib(filename if usefile else None, touch_cib_file),
+        cib=middleware.build(
+            middleware.cib(filename if usefile else None, touch_cib_file),
+            _cib_snapshot_middleware,
+        ),
         corosync_conf_existing=middleware.corosync_conf_existing(
             pcs_options.get("--corosync_conf", None)
         ),
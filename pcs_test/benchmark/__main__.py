@@ -0,0 +1,98 @@
+"""
+Benchmark library commands against a synthetic large cluster
+
+Usage: python3 -m pcs_test.benchmark --resources 10000 --output result.json
+
+The results of all scenarios are printed as JSON, so they can be compared
+between revisions.
+"""
+import argparse
+import json
+import os.path
+import platform
+import subprocess
+import sys
+
+from pcs import settings
+
+from pcs_test.benchmark.scenarios import (
+    SCENARIO_LIST,
+    SCENARIO_NAMES,
+    measure,
+)
+from pcs_test.benchmark.synthetic import ClusterSpec
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            universal_newlines=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python3 -m pcs_test.benchmark",
+        description=__doc__.strip().splitlines()[0],
+    )
+    parser.add_argument(
+        "--resources", type=int, default=1000,
+        help="number of primitive resources (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--nodes", type=int, default=16,
+        help="number of cluster nodes (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--constraints", type=int, default=None,
+        help="number of constraints (default: number of resources)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3,
+        help="number of timed runs of each scenario (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--scenario", action="append", choices=SCENARIO_NAMES,
+        help="scenario to run, may be repeated (default: all scenarios)",
+    )
+    parser.add_argument(
+        "--output", default=None,
+        help="file to write the results to (default: standard output)",
+    )
+    args = parser.parse_args(argv)
+    if args.resources < 1 or args.nodes < 1 or args.repeat < 1:
+        parser.error("--resources, --nodes and --repeat must be positive")
+
+    spec = ClusterSpec.from_resource_count(
+        args.resources, nodes=args.nodes, constraints=args.constraints
+    )
+    selected = args.scenario or SCENARIO_NAMES
+    result = {
+        "pcs_version": settings.pcs_version,
+        "git_commit": _git_commit(),
+        "python_version": platform.python_version(),
+        "cluster": spec._asdict(),
+        "repeat": args.repeat,
+        "scenarios": {
+            scenario.name: measure(scenario, spec, args.repeat)
+            for scenario in SCENARIO_LIST
+            if scenario.name in selected
+        },
+    }
+    output = json.dumps(result, indent=2) + "\n"
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(output)
+    else:
+        sys.stdout.write(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Library commands run against a synthetic cluster and their measurement
+"""
+import logging
+import statistics
+import tracemalloc
+from contextlib import ExitStack
+from time import perf_counter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+)
+from unittest import mock
+
+from pcs.lib.commands import (
+    resource,
+    status,
+)
+from pcs.lib.commands.constraint import (
+    colocation as constraint_colocation,
+    order as constraint_order,
+    ticket as constraint_ticket,
+)
+from pcs.lib.env import LibraryEnvironment
+
+from pcs_test.benchmark.synthetic import (
+    AGENT_NAME,
+    ClusterSpec,
+    Runner,
+    corosync_conf,
+)
+from pcs_test.tools.custom_mock import MockLibraryReportProcessor
+
+
+class Scenario(NamedTuple):
+    name: str
+    description: str
+    # called with a factory of library environments and the cluster spec
+    run: Callable[[Callable[[], LibraryEnvironment], ClusterSpec], Any]
+
+
+def _resource_create(get_env, spec):
+    # pylint: disable=unused-argument
+    resource.create(get_env(), "benchmark-new", AGENT_NAME, [], {}, {})
+
+
+def _resource_disable(get_env, spec):
+    resource.disable(get_env(), spec.top_level_ids[:1], False)
+
+
+def _resource_enable(get_env, spec):
+    resource.enable(get_env(), spec.top_level_ids[:1], False)
+
+
+def _resource_relations(get_env, spec):
+    resource.get_resource_relations_tree(get_env(), spec.top_level_ids[0])
+
+
+def _constraint_list(get_env, spec):
+    # pylint: disable=unused-argument
+    # every listing runs in its own environment, like in "pcs constraint"
+    for command in (
+        constraint_order.show,
+        constraint_colocation.show,
+        constraint_ticket.show,
+    ):
+        command(get_env())
+
+
+def _status(get_env, spec):
+    # pylint: disable=unused-argument
+    status.full_cluster_status_plaintext(get_env())
+
+
+def _cib_push(get_env, spec):
+    env = get_env()
+    cib = env.get_cib()
+    primitive = cib.find(
+        f".//primitive[@id='{spec.primitive_ids[-1]}']/operations/op"
+    )
+    primitive.set("timeout", "30s")
+    env.push_cib()
+
+
+SCENARIO_LIST = [
+    Scenario(
+        "resource-create", "create a primitive resource", _resource_create
+    ),
+    Scenario("resource-disable", "disable a resource", _resource_disable),
+    Scenario("resource-enable", "enable a resource", _resource_enable),
+    Scenario(
+        "resource-relations",
+        "get a relations tree of a resource",
+        _resource_relations,
+    ),
+    Scenario(
+        "constraint-list",
+        "list order, colocation and ticket constraints",
+        _constraint_list,
+    ),
+    Scenario("status", "get a full cluster status", _status),
+    Scenario(
+        "cib-push", "load, modify and push the CIB by a diff", _cib_push
+    ),
+]
+
+SCENARIO_NAMES = [scenario.name for scenario in SCENARIO_LIST]
+
+
+def _env_factory(runner: Runner) -> Callable[[], LibraryEnvironment]:
+    def get_env():
+        env = LibraryEnvironment(
+            logging.getLogger("pcs.benchmark"),
+            MockLibraryReportProcessor(debug=False),
+        )
+        env.cmd_runner = lambda: runner
+        return env
+    return get_env
+
+
+def _patch_live_system(spec: ClusterSpec) -> ExitStack:
+    stack = ExitStack()
+    conf = corosync_conf(spec)
+    stack.enter_context(
+        mock.patch("pcs.lib.env.get_local_corosync_conf", lambda: conf)
+    )
+    stack.enter_context(
+        mock.patch("pcs.lib.external.is_systemctl", lambda: True)
+    )
+    # synthetic cluster status does not have to conform to the schema
+    stack.enter_context(
+        mock.patch("pcs.settings.crm_mon_schema", "/nonexistent")
+    )
+    return stack
+
+
+def measure(
+    scenario: Scenario, spec: ClusterSpec, repeat: int = 3
+) -> Dict[str, Any]:
+    """
+    Run a scenario against a synthetic cluster, return its wall time, peak
+    memory and numbers of external commands run
+
+    scenario -- scenario to run
+    spec -- synthetic cluster to run the scenario against
+    repeat -- number of runs to measure the wall time
+    """
+    runner = Runner(spec)
+    get_env = _env_factory(runner)
+    time_list: List[float] = []
+    with _patch_live_system(spec):
+        for _ in range(repeat):
+            runner.calls.clear()
+            started_at = perf_counter()
+            scenario.run(get_env, spec)
+            time_list.append(perf_counter() - started_at)
+        calls = dict(sorted(runner.calls.items()))
+        # tracing slows the run down, so memory is measured in a separate run
+        tracemalloc.start()
+        try:
+            scenario.run(get_env, spec)
+            dummy_current, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return {
+        "description": scenario.description,
+        "wall_time_seconds": {
+            "min": min(time_list),
+            "median": statistics.median(time_list),
+            "max": max(time_list),
+        },
+        "peak_memory_bytes": peak_memory,
+        "external_calls": calls,
+    }
@@ -0,0 +1,389 @@
+"""
+Synthetic clusters of configurable size for benchmarking library commands
+"""
+import os.path
+from collections import Counter
+from typing import (
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from pcs_test.tools.misc import read_test_resource
+
+AGENT_NAME = "ocf:heartbeat:Dummy"
+AGENT_METADATA_FILE = "resource_agent_ocf_heartbeat_dummy.xml"
+
+
+class ClusterSpec(NamedTuple):
+    nodes: int
+    primitives: int
+    groups: int
+    group_size: int
+    clones: int
+    bundles: int
+    constraints: int
+
+    @classmethod
+    def from_resource_count(
+        cls, resources: int, nodes: int = 16, constraints: Optional[int] = None
+    ) -> "ClusterSpec":
+        """
+        Create a cluster with the specified number of primitive resources
+
+        40 % of the primitives are in groups of 4, 10 % are cloned and 5 % are
+        in bundles, the rest are standalone primitives.
+
+        resources -- number of primitive resources
+        nodes -- number of cluster nodes
+        constraints -- number of constraints, the number of resources if None
+        """
+        group_size = 4
+        groups = int(resources * 0.4) // group_size
+        clones = int(resources * 0.1)
+        bundles = int(resources * 0.05)
+        return cls(
+            nodes=nodes,
+            primitives=resources - groups * group_size - clones - bundles,
+            groups=groups,
+            group_size=group_size,
+            clones=clones,
+            bundles=bundles,
+            constraints=(resources if constraints is None else constraints),
+        )
+
+    @property
+    def node_names(self) -> List[str]:
+        return [f"node-{i}" for i in range(1, self.nodes + 1)]
+
+    @property
+    def resources(self) -> int:
+        return (
+            self.primitives + self.groups * self.group_size + self.clones
+            + self.bundles
+        )
+
+    @property
+    def top_level_ids(self) -> List[str]:
+        """
+        Ids of resources which are not inside other resources
+        """
+        return (
+            [f"R{i}" for i in range(1, self.primitives + 1)]
+            + [f"G{i}" for i in range(1, self.groups + 1)]
+            + [f"C{i}-clone" for i in range(1, self.clones + 1)]
+            + [f"B{i}" for i in range(1, self.bundles + 1)]
+        )
+
+    @property
+    def primitive_ids(self) -> List[str]:
+        return (
+            [f"R{i}" for i in range(1, self.primitives + 1)]
+            + [
+                f"G{i}-R{j}"
+                for i in range(1, self.groups + 1)
+                for j in range(1, self.group_size + 1)
+            ]
+            + [f"C{i}" for i in range(1, self.clones + 1)]
+            + [f"B{i}-R" for i in range(1, self.bundles + 1)]
+        )
+
+
+def _primitive(resource_id: str) -> str:
+    return (
+        f'<primitive id="{resource_id}" class="ocf" provider="heartbeat" '
+        'type="Dummy"><operations>'
+        f'<op id="{resource_id}-monitor-interval-10s" name="monitor" '
+        'interval="10s" timeout="20s"/>'
+        "</operations></primitive>"
+    )
+
+
+def _constraints(spec: ClusterSpec) -> List[str]:
+    ids = spec.top_level_ids
+    nodes = spec.node_names
+    if not ids:
+        return []
+    constraint_list = []
+    for i in range(spec.constraints):
+        rsc = ids[i % len(ids)]
+        with_rsc = ids[(i + 1) % len(ids)]
+        kind = i % 10
+        if kind < 4:
+            constraint_list.append(
+                f'<rsc_location id="location-{rsc}-{i}" rsc="{rsc}" '
+                f'node="{nodes[i % len(nodes)]}" score="INFINITY"/>'
+            )
+        elif kind < 6:
+            constraint_list.append(
+                f'<rsc_colocation id="colocation-{rsc}-{with_rsc}-{i}" '
+                f'rsc="{rsc}" with-rsc="{with_rsc}" score="INFINITY"/>'
+            )
+        elif kind < 9:
+            constraint_list.append(
+                f'<rsc_order id="order-{rsc}-{with_rsc}-{i}" first="{rsc}" '
+                f'first-action="start" then="{with_rsc}" '
+                'then-action="start"/>'
+            )
+        else:
+            set_list = []
+            for set_no in range(2):
+                refs = "".join(
+                    f'<resource_ref id="{ids[(i + set_no * 3 + j) % len(ids)]}"'
+                    "/>"
+                    for j in range(3)
+                )
+                set_list.append(
+                    f'<resource_set id="order-set-{i}-{set_no}">{refs}'
+                    "</resource_set>"
+                )
+            constraint_list.append(
+                f'<rsc_order id="order-set-{i}">{"".join(set_list)}'
+                "</rsc_order>"
+            )
+    return constraint_list
+
+
+def cib_xml(spec: ClusterSpec) -> str:
+    """
+    Return a CIB of the specified cluster
+    """
+    resource_list = [
+        _primitive(f"R{i}") for i in range(1, spec.primitives + 1)
+    ]
+    for i in range(1, spec.groups + 1):
+        resource_list.append(
+            f'<group id="G{i}">'
+            + "".join(
+                _primitive(f"G{i}-R{j}") for j in range(1, spec.group_size + 1)
+            )
+            + "</group>"
+        )
+    for i in range(1, spec.clones + 1):
+        resource_list.append(
+            f'<clone id="C{i}-clone">{_primitive(f"C{i}")}</clone>'
+        )
+    for i in range(1, spec.bundles + 1):
+        resource_list.append(
+            f'<bundle id="B{i}"><docker image="pcs:test"/>'
+            f'<network control-port="{9000 + i % 1000}"/>'
+            f'{_primitive(f"B{i}-R")}</bundle>'
+        )
+    node_list = [
+        f'<node id="{i}" uname="{name}"/>'
+        for i, name in enumerate(spec.node_names, 1)
+    ]
+    return (
+        '<cib epoch="1" num_updates="0" admin_epoch="0" '
+        'validate-with="pacemaker-3.2" crm_feature_set="3.3.0" '
+        'have-quorum="1" dc-uuid="1">'
+        "<configuration>"
+        '<crm_config><cluster_property_set id="cib-bootstrap-options">'
+        '<nvpair id="cib-bootstrap-options-stonith-enabled" '
+        'name="stonith-enabled" value="false"/>'
+        "</cluster_property_set></crm_config>"
+        f'<nodes>{"".join(node_list)}</nodes>'
+        f'<resources>{"".join(resource_list)}</resources>'
+        f'<constraints>{"".join(_constraints(spec))}</constraints>'
+        "</configuration>"
+        "<status/>"
+        "</cib>"
+    )
+
+
+def cib_header_xml(cib: str) -> str:
+    return cib[:cib.index(">") + 1].replace(">", "/>")
+
+
+def _resource_state(resource_id: str, node: Tuple[int, str]) -> str:
+    node_id, node_name = node
+    return (
+        f'<resource id="{resource_id}" resource_agent="ocf::heartbeat:Dummy" '
+        'role="Started" active="true" orphaned="false" blocked="false" '
+        'managed="true" failed="false" failure_ignored="false" '
+        'nodes_running_on="1">'
+        f'<node name="{node_name}" id="{node_id}" cached="false"/>'
+        "</resource>"
+    )
+
+
+def crm_mon_xml(spec: ClusterSpec) -> str:
+    """
+    Return a cluster status of the specified cluster in the crm_mon format
+    """
+    node_list = list(enumerate(spec.node_names, 1))
+    placement = _placement(spec)
+    resource_list = [
+        _resource_state(f"R{i}", node_list[placement[f"R{i}"]])
+        for i in range(1, spec.primitives + 1)
+    ]
+    for i in range(1, spec.groups + 1):
+        node = node_list[placement[f"G{i}"]]
+        resource_list.append(
+            f'<group id="G{i}" number_resources="{spec.group_size}">'
+            + "".join(
+                _resource_state(f"G{i}-R{j}", node)
+                for j in range(1, spec.group_size + 1)
+            )
+            + "</group>"
+        )
+    for i in range(1, spec.clones + 1):
+        resource_list.append(
+            f'<clone id="C{i}-clone" multi_state="false" unique="false" '
+            'managed="true" failed="false" failure_ignored="false">'
+            + "".join(
+                _resource_state(f"C{i}", node)
+                for node in node_list
+            )
+            + "</clone>"
+        )
+    for i in range(1, spec.bundles + 1):
+        node = node_list[placement[f"B{i}"]]
+        resource_list.append(
+            f'<bundle id="B{i}" type="docker" image="pcs:test" '
+            'unique="false" managed="true" failed="false">'
+            '<replica id="0">'
+            f'{_resource_state(f"B{i}-R", node)}'
+            "</replica></bundle>"
+        )
+    running = Counter(placement.values())
+    node_status_list = [
+        f'<node name="{name}" id="{node_id}" online="true" standby="false" '
+        'standby_onfail="false" maintenance="false" pending="false" '
+        'unclean="false" shutdown="false" expected_up="true" '
+        f'is_dc="{"true" if node_id == 1 else "false"}" '
+        f'resources_running="{running[node_id - 1]}" type="member"/>'
+        for node_id, name in node_list
+    ]
+    return (
+        '<crm_mon version="2.0.3"><summary>'
+        '<stack type="corosync"/>'
+        '<current_dc present="true" version="2.0.3" name="node-1" id="1" '
+        'with_quorum="true"/>'
+        f'<nodes_configured number="{spec.nodes}"/>'
+        f'<resources_configured number="{spec.resources}" disabled="0" '
+        'blocked="0"/>'
+        "</summary>"
+        f'<nodes>{"".join(node_status_list)}</nodes>'
+        f'<resources>{"".join(resource_list)}</resources>'
+        "</crm_mon>"
+    )
+
+
+def crm_mon_text(spec: ClusterSpec) -> str:
+    """
+    Return a cluster status of the specified cluster in the plaintext format
+    """
+    node_names = spec.node_names
+    placement = _placement(spec)
+    line_list = [
+        "Cluster Summary:",
+        "  * Stack: corosync",
+        "  * Current DC: node-1 (version 2.0.3) - partition with quorum",
+        f"  * {spec.nodes} nodes configured",
+        f"  * {spec.resources} resource instances configured",
+        "",
+        "Node List:",
+        f"  * Online: [ {' '.join(node_names)} ]",
+        "",
+        "Full List of Resources:",
+    ]
+    for resource_id in spec.top_level_ids:
+        line_list.append(
+            f"  * {resource_id}\t(ocf::heartbeat:Dummy):\t Started "
+            f"{node_names[placement.get(resource_id, 0)]}"
+        )
+    return "\n".join(line_list) + "\n"
+
+
+def corosync_conf(spec: ClusterSpec) -> str:
+    node_list = "".join(
+        "    node {\n"
+        f"        ring0_addr: 10.0.{i // 250}.{i % 250 + 1}\n"
+        f"        name: {name}\n"
+        f"        nodeid: {i}\n"
+        "    }\n"
+        for i, name in enumerate(spec.node_names, 1)
+    )
+    return (
+        "totem {\n"
+        "    version: 2\n"
+        "    cluster_name: benchmark\n"
+        "    transport: knet\n"
+        "}\n\n"
+        f"nodelist {{\n{node_list}}}\n\n"
+        "quorum {\n"
+        "    provider: corosync_votequorum\n"
+        "}\n"
+    )
+
+
+def _placement(spec: ClusterSpec) -> Dict[str, int]:
+    return {
+        resource_id: index % spec.nodes
+        for index, resource_id in enumerate(spec.top_level_ids)
+    }
+
+
+class Runner:
+    """
+    Command runner answering pacemaker and system tools from a synthetic
+    cluster and counting the calls
+    """
+    def __init__(self, spec: ClusterSpec):
+        self.cib = cib_xml(spec)
+        self.cib_header = cib_header_xml(self.cib)
+        self.cib_configuration = self.cib[
+            self.cib.index("<configuration>"):
+            self.cib.index("</configuration>") + len("</configuration>")
+        ]
+        self.crm_mon_xml = crm_mon_xml(spec)
+        self.crm_mon_text = crm_mon_text(spec)
+        self.agent_metadata = read_test_resource(AGENT_METADATA_FILE)
+        self.calls: Counter = Counter()
+        self.pushed_bytes = 0
+
+    @property
+    def env_vars(self):
+        return {}
+
+    def run(
+        self, args, stdin_string=None, env_extend=None, binary_output=False
+    ):
+        # pylint: disable=unused-argument, too-many-return-statements
+        command = os.path.basename(args[0])
+        self.calls[command] += 1
+        if command == "cibadmin":
+            if "--query" in args:
+                if "--xpath=/cib" in args:
+                    return self.cib_header, "", 0
+                if "--scope=configuration" in args:
+                    return self.cib_configuration, "", 0
+                return self.cib, "", 0
+            if "--patch" in args or "--replace" in args:
+                self.pushed_bytes += len(stdin_string or "")
+                return "", "", 0
+        elif command == "crm_mon":
+            if "--as-xml" in args:
+                return self.crm_mon_xml, "", 0
+            return self.crm_mon_text, "", 0
+        elif command == "crm_resource":
+            if "--show-metadata" in args:
+                return self.agent_metadata, "", 0
+            return "", "", 0
+        elif command == "systemctl":
+            if "is-active" in args:
+                return "active\n", "", 0
+            if "is-enabled" in args:
+                return "enabled\n", "", 0
+            return "", "", 0
+        elif command == "crm_diff":
+            # only used for changes the native CIB diff cannot express
+            return "<diff/>", "", 1
+        elif command == "crm_ticket":
+            return "", "", 0
+        raise AssertionError(
+            "Unexpected command in benchmark: '{0}'".format(" ".join(args))
+        )
@@ -1,7 +1,13 @@
-from unittest import TestCase
+import json
+import os.path
+import shutil
+import tempfile
+from unittest import mock, TestCase
 
+from pcs import usage
 from pcs.cli.common.completion import (
     _find_suggestions,
+    get_completion_tree,
     has_applicable_environment,
     make_suggestions,
     _split_words,
@@ -157,3 +163,67 @@ class SplitWordsTest(TestCase):
             EnvironmentError,
             lambda: _split_words("pcs resource op a ", ["3", "8", "2", "1"])
         )
+
+
+@mock.patch(
+    "pcs.usage.generate_completion_tree_from_usage",
+    side_effect=lambda: tree,
+)
+class GetCompletionTree(TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+        self.cache_file = os.path.join(self.cache_dir, "cache", "tree.json")
+
+    def test_generate_and_cache(self, mock_generate):
+        self.assertEqual(tree, get_completion_tree(self.cache_file, "1.0"))
+        self.assertEqual(tree, get_completion_tree(self.cache_file, "1.0"))
+        mock_generate.assert_called_once_with()
+        self.assertEqual([], [
+            name for name in os.listdir(os.path.dirname(self.cache_file))
+            if name.endswith(".tmp")
+        ])
+
+    def test_regenerate_for_other_version(self, mock_generate):
+        get_completion_tree(self.cache_file, "1.0")
+        get_completion_tree(self.cache_file, "1.1")
+        get_completion_tree(self.cache_file, "1.1")
+        self.assertEqual(2, mock_generate.call_count)
+
+    def test_regenerate_when_usage_changed(self, mock_generate):
+        get_completion_tree(self.cache_file, "1.0")
+        with open(self.cache_file, "r") as cache:
+            cached = json.load(cache)
+        cached["stamp"]["usage"][1] -= 1
+        with open(self.cache_file, "w") as cache:
+            json.dump(cached, cache)
+        get_completion_tree(self.cache_file, "1.0")
+        self.assertEqual(2, mock_generate.call_count)
+
+    def test_broken_cache(self, mock_generate):
+        os.makedirs(os.path.dirname(self.cache_file))
+        with open(self.cache_file, "w") as cache:
+            cache.write("not json")
+        self.assertEqual(tree, get_completion_tree(self.cache_file, "1.0"))
+        self.assertEqual(tree, get_completion_tree(self.cache_file, "1.0"))
+        mock_generate.assert_called_once_with()
+
+    def test_unable_to_cache(self, mock_generate):
+        # a file in place of the cache directory
+        cache_file = os.path.join(self.cache_dir, "file", "tree.json")
+        with open(os.path.dirname(cache_file), "w"):
+            pass
+        self.assertEqual(tree, get_completion_tree(cache_file, "1.0"))
+        self.assertEqual(tree, get_completion_tree(cache_file, "1.0"))
+        self.assertEqual(2, mock_generate.call_count)
+
+
+class CachedCompletionTree(TestCase):
+    def test_same_as_generated(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache_file = os.path.join(cache_dir, "tree.json")
+            get_completion_tree(cache_file, "1.0")
+            self.assertEqual(
+                usage.generate_completion_tree_from_usage(),
+                get_completion_tree(cache_file, "1.0"),
+            )
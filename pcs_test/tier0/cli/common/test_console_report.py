@@ -1592,6 +1592,18 @@ class FilesDistributionSkipped(NameBuildTest):
         )
 
 
+class FilesDistributionSkippedSameContent(NameBuildTest):
+    def test_success(self):
+        self.assert_message_from_report(
+            "nodeA: distribution of 'file1', 'file2' skipped, the node already "
+                "has the same content"
+            ,
+            reports.files_distribution_skipped_same_content(
+                "nodeA", ["file1", "file2"]
+            )
+        )
+
+
 class FilesRemoveFromNodesSkipped(NameBuildTest):
     def test_not_live(self):
         self.assert_message_from_report(
@@ -2944,6 +2956,37 @@ class NodeCommunicationRetrying(NameBuildTest):
             )
         )
 
+class NodeCommunicationRequestHedged(NameBuildTest):
+    def test_success(self):
+        self.assert_message_from_report(
+            (
+                "Request 'my/request' has not finished in 1.5 seconds, "
+                "sending it to 'node_name' as well"
+            ),
+            reports.node_communication_request_hedged(
+                "node_name", "my/request", 1.5
+            )
+        )
+
+class NodeCommunicationConnections(NameBuildTest):
+    def test_success(self):
+        self.assert_message_from_report(
+            "Connections to nodes: 2 opened, 3 reused",
+            reports.node_communication_connections(2, 3)
+        )
+
+class NodeCommunicationPipelineFinished(NameBuildTest):
+    def test_success(self):
+        self.assert_message_from_report(
+            (
+                "Requests to 'node_name' finished: 'my/request' in 1.5 "
+                "seconds, 'my/next_request' in 0.25 seconds"
+            ),
+            reports.node_communication_pipeline_finished(
+                "node_name", [("my/request", 1.5), ("my/next_request", 0.25)]
+            )
+        )
+
 class NodeCommunicationNoMoreAddresses(NameBuildTest):
     def test_success(self):
         self.assert_message_from_report(
@@ -3072,6 +3115,12 @@ class ClusterStartSuccess(NameBuildTest):
             reports.cluster_start_success("node1")
         )
 
+    def test_time_to_ready(self):
+        self.assert_message_from_report(
+            "node1: Cluster started, ready after 12.3 seconds",
+            reports.cluster_start_success("node1", time_to_ready=12.345)
+        )
+
 class ClusterStateCannotLoad(NameBuildTest):
     def test_without_reason(self):
         self.assert_message_from_report(
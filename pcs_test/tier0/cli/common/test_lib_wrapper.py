@@ -8,7 +8,7 @@ class LibraryWrapperTest(TestCase):
         lib = Library('env', mock_middleware_factory)
         self.assertRaises(Exception, lambda: lib.no_valid_library_part)
 
-    @mock.patch('pcs.cli.common.lib_wrapper.constraint_order.create_with_set')
+    @mock.patch('pcs.lib.commands.constraint.order.create_with_set')
     @mock.patch('pcs.cli.common.lib_wrapper.cli_env_to_lib_env')
     def test_bind_to_library(self, mock_cli_env_to_lib_env, mock_order_set):
         # pylint: disable=no-self-use
@@ -25,8 +25,30 @@ class LibraryWrapperTest(TestCase):
         mock_middleware_factory.cib = dummy_middleware
         mock_middleware_factory.corosync_conf_existing = dummy_middleware
         mock_env = mock.MagicMock()
+        mock_env.lib_env = None
         Library(mock_env, mock_middleware_factory).constraint_order.set(
             'first', second="third"
         )
 
         mock_order_set.assert_called_once_with(lib_env, "first", second="third")
+
+    @mock.patch.dict("pcs.cli.common.lib_wrapper._CACHE", clear=True)
+    @mock.patch('pcs.lib.commands.constraint.order.create_with_set')
+    @mock.patch('pcs.cli.common.lib_wrapper.cli_env_to_lib_env')
+    def test_bind_to_shared_env(
+        self, mock_cli_env_to_lib_env, mock_order_set
+    ):
+        def dummy_middleware(next_in_line, env, *args, **kwargs):
+            return next_in_line(env, *args, **kwargs)
+
+        mock_middleware_factory = mock.MagicMock()
+        mock_middleware_factory.cib = dummy_middleware
+        mock_env = mock.MagicMock()
+        Library(mock_env, mock_middleware_factory).constraint_order.set(
+            'first', second="third"
+        )
+
+        mock_order_set.assert_called_once_with(
+            mock_env.lib_env, "first", second="third"
+        )
+        mock_cli_env_to_lib_env.assert_not_called()
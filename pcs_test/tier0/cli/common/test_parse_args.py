@@ -623,6 +623,7 @@ class InputModifiersTest(TestCase):
             "--nodesc",
             "--off",
             "--pacemaker",
+            "--refresh-cache",
             "--safe",
             "--simulate",
             "--skip-offline",
@@ -639,6 +640,7 @@ class InputModifiersTest(TestCase):
             "--name",
             "--node",
             "--request-timeout",
+            "--timeout",
             "--to",
             # "--wait", # --wait is a special case, it has its own tests
             "-f",
@@ -0,0 +1,310 @@
+import os
+import tempfile
+from unittest import mock, TestCase
+
+from lxml import etree
+
+from pcs_test.tools.assertions import assert_raise_library_error
+from pcs_test.tools.custom_mock import MockLibraryReportProcessor
+from pcs_test.tools.misc import dict_to_modifiers
+
+from pcs import utils
+from pcs.cli import batch
+from pcs.cli.common.errors import CmdLineInputError
+from pcs.cli.common.parse_args import InputModifiers
+from pcs.common import report_codes
+from pcs.common.reports import ReportItemSeverity as severity
+
+CIB = """<cib epoch="1" num_updates="0" validate-with="pacemaker-3.2">
+<configuration><resources/></configuration><status/></cib>"""
+
+
+class ParseCommands(TestCase):
+    def test_success(self):
+        self.assertEqual(
+            [
+                batch.BatchCommand(2, ["resource", "create", "A", "a b"]),
+                batch.BatchCommand(4, ["resource", "meta", "A", "c=d"]),
+                batch.BatchCommand(
+                    7, ["constraint", "order", "A", "then", "B"]
+                ),
+            ],
+            batch.parse_commands(
+                "# comment\n"
+                "pcs resource create A 'a b'\n"
+                "\n"
+                "resource meta A c=d # comment\n"
+                "   \n"
+                "  pcs\n"
+                "constraint order \\\n"
+                "  A then B\n"
+            )
+        )
+
+    @mock.patch("sys.stderr")
+    def test_syntax_error(self, mock_stderr):
+        with self.assertRaises(SystemExit):
+            batch.parse_commands("resource create A\nresource meta 'A\n")
+        mock_stderr.write.assert_called_once_with(
+            "Error: Unable to parse command on line 2: No closing quotation\n"
+        )
+
+    @mock.patch("sys.stderr")
+    def test_nested_batch(self, mock_stderr):
+        with self.assertRaises(SystemExit):
+            batch.parse_commands("pcs batch run file\n")
+        mock_stderr.write.assert_called_once_with(
+            "Error: Command on line 1: batches cannot be nested\n"
+        )
+
+
+def fixture_command(index):
+    # a command adding a resource to the CIB file pcs has been run with
+    def command(argv):
+        cib_file = argv[argv.index("-f") + 1]
+        cib = etree.parse(cib_file).getroot()
+        # a CIB file written by pacemaker tools has its version bumped
+        cib.set("epoch", str(int(cib.get("epoch")) + 1))
+        etree.SubElement(
+            cib.find("configuration/resources"), "primitive", id=f"R{index}"
+        )
+        with open(cib_file, "w") as file:
+            file.write(etree.tostring(cib).decode())
+    return command
+
+
+def fixture_lib_command(index):
+    # a library command adding a resource to the CIB
+    def command(argv):
+        del argv
+        lib_env = utils.get_cli_env().lib_env
+        cib = lib_env.get_cib()
+        etree.SubElement(
+            cib.find("configuration/resources"), "primitive", id=f"R{index}"
+        )
+        lib_env.push_cib()
+    return command
+
+
+def fixture_main(*command_list):
+    command_iter = iter(command_list)
+    def main(argv):
+        command = next(command_iter)
+        if isinstance(command, BaseException):
+            raise command
+        if command:
+            command(argv)
+    return main
+
+
+@mock.patch("sys.stderr")
+@mock.patch("pcs.cli.batch.print")
+@mock.patch("pcs.app.main")
+class Run(TestCase):
+    def setUp(self):
+        # pylint: disable=consider-using-with
+        batch_file = tempfile.NamedTemporaryFile("w", delete=False)
+        batch_file.write("resource create R1\nresource create R2\n")
+        batch_file.close()
+        self.batch_file = batch_file.name
+        self.addCleanup(os.unlink, self.batch_file)
+
+    def fixture_cib_file(self):
+        # pylint: disable=consider-using-with
+        cib_file = tempfile.NamedTemporaryFile("w", delete=False)
+        cib_file.write(CIB)
+        cib_file.close()
+        self.addCleanup(os.unlink, cib_file.name)
+        return cib_file.name
+
+    @staticmethod
+    def read_resources(cib_file):
+        return [
+            primitive.get("id")
+            for primitive in etree.parse(cib_file).iter("primitive")
+        ]
+
+    def test_argv(self, mock_main, mock_print, mock_stderr):
+        with self.assertRaises(CmdLineInputError):
+            batch.run(None, ["file1", "file2"], dict_to_modifiers({}))
+        mock_main.assert_not_called()
+        mock_print.assert_not_called()
+        mock_stderr.write.assert_not_called()
+
+    def test_cib_file(self, mock_main, mock_print, mock_stderr):
+        cib_file = self.fixture_cib_file()
+        mock_main.side_effect = fixture_main(
+            fixture_command(1), fixture_command(2)
+        )
+        batch.run(
+            None, [self.batch_file], InputModifiers({"-f": cib_file})
+        )
+
+        self.assertEqual(["R1", "R2"], self.read_resources(cib_file))
+        self.assertEqual(2, mock_main.call_count)
+        temporary_cib = mock_main.call_args[0][0][1]
+        self.assertNotEqual(cib_file, temporary_cib)
+        self.assertEqual(
+            ["-f", temporary_cib, "resource", "create", "R2"],
+            mock_main.call_args[0][0]
+        )
+        mock_print.assert_not_called()
+        self.assertEqual(3, mock_stderr.write.call_count)
+
+    def test_lib_and_legacy_commands(
+        self, mock_main, mock_print, dummy_stderr
+    ):
+        cib_file = self.fixture_cib_file()
+        with open(self.batch_file, "w") as batch_file:
+            batch_file.write("a\nb\nc\nd\n")
+        mock_main.side_effect = fixture_main(
+            fixture_lib_command(1),
+            fixture_lib_command(2),
+            fixture_command(3),
+            fixture_lib_command(4),
+        )
+
+        batch.run(
+            None, [self.batch_file], InputModifiers({"-f": cib_file})
+        )
+
+        self.assertEqual(
+            ["R1", "R2", "R3", "R4"], self.read_resources(cib_file)
+        )
+        self.assertIsNone(utils.shared_lib_env)
+        mock_print.assert_not_called()
+
+    def test_failed_command(self, mock_main, mock_print, mock_stderr):
+        cib_file = self.fixture_cib_file()
+        mock_main.side_effect = fixture_main(fixture_command(1), SystemExit(1))
+
+        with self.assertRaises(SystemExit):
+            batch.run(
+                None, [self.batch_file], InputModifiers({"-f": cib_file})
+            )
+
+        self.assertEqual([], self.read_resources(cib_file))
+        mock_print.assert_not_called()
+        mock_stderr.write.assert_called_with(
+            "Error: Command on line 2 failed, no changes have been made\n"
+        )
+
+    def test_no_change(self, mock_main, mock_print, mock_stderr):
+        cib_file = self.fixture_cib_file()
+        mock_main.side_effect = fixture_main(None, SystemExit(0))
+
+        batch.run(
+            None, [self.batch_file], InputModifiers({"-f": cib_file})
+        )
+
+        mock_print.assert_called_once_with(
+            "The new CIB is the same as the original CIB, nothing to push."
+        )
+        self.assertEqual(3, mock_stderr.write.call_count)
+
+    @mock.patch("pcs.cli.batch.push_cib_diff")
+    @mock.patch("pcs.cli.batch.utils.cmd_runner")
+    @mock.patch("pcs.cli.batch.utils.get_cib")
+    def test_live(
+        self, mock_get_cib, mock_runner, mock_push, mock_main, mock_print,
+        dummy_stderr
+    ):
+        mock_get_cib.return_value = CIB
+        mock_main.side_effect = fixture_main(
+            fixture_command(1), fixture_command(2)
+        )
+
+        batch.run(None, [self.batch_file], dict_to_modifiers({}))
+
+        mock_get_cib.assert_called_once_with()
+        mock_push.assert_called_once()
+        runner, dummy_reporter, old_cib, new_cib = mock_push.call_args[0]
+        self.assertEqual(mock_runner.return_value, runner)
+        self.assertEqual(CIB, old_cib)
+        # versions of the CIB are left to the cluster
+        self.assertEqual("1", new_cib.get("epoch"))
+        self.assertEqual(
+            ["R1", "R2"],
+            [primitive.get("id") for primitive in new_cib.iter("primitive")]
+        )
+        mock_print.assert_called_once_with("CIB updated")
+
+
+class BatchLibraryEnvironment(TestCase):
+    def setUp(self):
+        # pylint: disable=consider-using-with
+        cib_file = tempfile.NamedTemporaryFile("w", delete=False)
+        cib_file.write(CIB)
+        cib_file.close()
+        self.cib_file = cib_file.name
+        self.addCleanup(os.unlink, self.cib_file)
+        self.env = batch.BatchLibraryEnvironment(
+            self.cib_file,
+            logger=mock.MagicMock(),
+            report_processor=MockLibraryReportProcessor(),
+        )
+
+    def read_cib(self):
+        return etree.parse(self.cib_file).getroot()
+
+    def test_cib_kept_loaded(self):
+        cib = self.env.get_cib()
+        cib.find("configuration/resources").append(
+            etree.Element("primitive", id="R1")
+        )
+        # the same tree is returned until the CIB file changes
+        self.assertIs(cib, self.env.get_cib())
+        self.assertIs(cib, self.env.cib)
+        self.assertEqual([], list(self.read_cib().iter("primitive")))
+
+    def test_push_writes_file(self):
+        cib = self.env.get_cib()
+        cib.find("configuration/resources").append(
+            etree.Element("primitive", id="R1")
+        )
+        self.env.push_cib()
+        self.assertEqual(
+            ["R1"],
+            [
+                primitive.get("id")
+                for primitive in self.read_cib().iter("primitive")
+            ]
+        )
+        self.assertIs(cib, self.env.get_cib())
+
+    def test_file_changed(self):
+        cib = self.env.get_cib()
+        # a legacy command has written the file
+        with open(self.cib_file, "w") as cib_file:
+            cib_file.write(CIB.replace('epoch="1"', 'epoch="12"'))
+        new_cib = self.env.get_cib()
+        self.assertIsNot(cib, new_cib)
+        self.assertEqual("12", new_cib.get("epoch"))
+
+    def test_push_custom_cib(self):
+        cib = etree.fromstring(CIB.replace('epoch="1"', 'epoch="5"'))
+        self.env.push_cib(cib)
+        self.assertEqual("5", self.read_cib().get("epoch"))
+        self.assertIs(cib, self.env.get_cib())
+
+    def test_push_not_loaded(self):
+        with self.assertRaises(AssertionError):
+            self.env.push_cib()
+
+    def test_wait_not_supported(self):
+        self.env.get_cib()
+        assert_raise_library_error(
+            lambda: self.env.push_cib(wait=10),
+            (
+                severity.ERROR,
+                report_codes.WAIT_FOR_IDLE_NOT_LIVE_CLUSTER,
+                {},
+                None
+            ),
+        )
+
+    def test_runner_uses_cib_file(self):
+        self.assertEqual(
+            {"LC_ALL": "C", "CIB_file": self.cib_file},
+            self.env.cmd_runner().env_vars
+        )
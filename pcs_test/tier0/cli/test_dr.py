@@ -157,7 +157,8 @@ class Status(TestCase):
         self._fixture_response()
         self._call_cmd([])
         self.lib.dr.status_all_sites_plaintext.assert_called_once_with(
-            hide_inactive_resources=False, verbose=False
+            hide_inactive_resources=False, verbose=False,
+            timeout=None,
         )
         mock_print.assert_called_once_with(self._fixture_print())
 
@@ -165,7 +166,8 @@ class Status(TestCase):
         self._fixture_response()
         self._call_cmd([], {"full": True})
         self.lib.dr.status_all_sites_plaintext.assert_called_once_with(
-            hide_inactive_resources=False, verbose=True
+            hide_inactive_resources=False, verbose=True,
+            timeout=None,
         )
         mock_print.assert_called_once_with(self._fixture_print())
 
@@ -173,7 +175,8 @@ class Status(TestCase):
         self._fixture_response()
         self._call_cmd([], {"hide-inactive": True})
         self.lib.dr.status_all_sites_plaintext.assert_called_once_with(
-            hide_inactive_resources=True, verbose=False
+            hide_inactive_resources=True, verbose=False,
+            timeout=None,
         )
         mock_print.assert_called_once_with(self._fixture_print())
 
@@ -181,10 +184,35 @@ class Status(TestCase):
         self._fixture_response()
         self._call_cmd([], {"full": True, "hide-inactive": True})
         self.lib.dr.status_all_sites_plaintext.assert_called_once_with(
-            hide_inactive_resources=True, verbose=True
+            hide_inactive_resources=True, verbose=True,
+            timeout=None,
         )
         mock_print.assert_called_once_with(self._fixture_print())
 
+    def test_success_timeout(self, mock_print):
+        self._fixture_response()
+        self._call_cmd([], {"timeout": "1min"})
+        self.lib.dr.status_all_sites_plaintext.assert_called_once_with(
+            hide_inactive_resources=False, verbose=False,
+            timeout=60,
+        )
+        mock_print.assert_called_once_with(self._fixture_print())
+
+    def test_invalid_timeout(self, mock_print):
+        for timeout in ["0", "-1", "1x"]:
+            with self.subTest(timeout=timeout):
+                with self.assertRaises(CmdLineInputError) as cm:
+                    self._call_cmd([], {"timeout": timeout})
+                self.assertEqual(
+                    (
+                        f"'{timeout}' is not a valid --timeout value, use a "
+                        "positive integer or a time with a unit"
+                    ),
+                    cm.exception.message
+                )
+        self.lib.dr.status_all_sites_plaintext.assert_not_called()
+        mock_print.assert_not_called()
+
     @mock.patch("pcs.cli.common.console_report.sys.stderr.write")
     def test_error_local(self, mock_stderr, mock_print):
         self._fixture_response(local_success=False)
@@ -192,7 +220,8 @@ class Status(TestCase):
             self._call_cmd([])
         self.assertEqual(cm.exception.code, 1)
         self.lib.dr.status_all_sites_plaintext.assert_called_once_with(
-            hide_inactive_resources=False, verbose=False
+            hide_inactive_resources=False, verbose=False,
+            timeout=None,
         )
         mock_print.assert_called_once_with(dedent("""\
             --- Local cluster - Primary site ---
@@ -213,7 +242,8 @@ class Status(TestCase):
             self._call_cmd([])
         self.assertEqual(cm.exception.code, 1)
         self.lib.dr.status_all_sites_plaintext.assert_called_once_with(
-            hide_inactive_resources=False, verbose=False
+            hide_inactive_resources=False, verbose=False,
+            timeout=None,
         )
         mock_print.assert_called_once_with(dedent("""\
             --- Local cluster - Primary site ---
@@ -235,7 +265,8 @@ class Status(TestCase):
             self._call_cmd([])
         self.assertEqual(cm.exception.code, 1)
         self.lib.dr.status_all_sites_plaintext.assert_called_once_with(
-            hide_inactive_resources=False, verbose=False
+            hide_inactive_resources=False, verbose=False,
+            timeout=None,
         )
         mock_print.assert_called_once_with(dedent("""\
             --- Local cluster - Primary site ---
@@ -258,7 +289,8 @@ class Status(TestCase):
             self._call_cmd([])
         self.assertEqual(cm.exception.code, 1)
         self.lib.dr.status_all_sites_plaintext.assert_called_once_with(
-            hide_inactive_resources=False, verbose=False
+            hide_inactive_resources=False, verbose=False,
+            timeout=None,
         )
         mock_print.assert_not_called()
         mock_stderr.assert_called_once_with(
@@ -346,6 +346,24 @@ class CreateRequestHandleTest(TestCase):
         self.assertEqual("", handle.output_buffer.getvalue().decode("utf-8"))
         self.assertEqual("", handle.debug_buffer.getvalue().decode("utf-8"))
 
+    def test_request_timeout(self, mock_curl):
+        mock_curl.return_value = MockCurl(None)
+        request = lib.Request(
+            lib.RequestTarget("label"), lib.RequestData("action"), timeout=2.5
+        )
+        handle = lib._create_request_handle(request, {}, 10)
+        self.assertEqual(2500, handle.opts[pycurl.TIMEOUT_MS])
+        self.assertFalse(pycurl.TIMEOUT in handle.opts)
+
+    def test_request_timeout_longer(self, mock_curl):
+        mock_curl.return_value = MockCurl(None)
+        request = lib.Request(
+            lib.RequestTarget("label"), lib.RequestData("action"), timeout=20
+        )
+        handle = lib._create_request_handle(request, {}, 10)
+        self.assertEqual(10, handle.opts[pycurl.TIMEOUT])
+        self.assertFalse(pycurl.TIMEOUT_MS in handle.opts)
+
 
 def fixture_request(host_id=1, action="action"):
     return lib.Request(
@@ -353,6 +371,41 @@ def fixture_request(host_id=1, action="action"):
     )
 
 
+class ConnectionPoolTest(TestCase):
+    def setUp(self):
+        self.pool = lib.ConnectionPool()
+
+    def register(self, num_connects, error=None):
+        handle = MockCurl(info={pycurl.NUM_CONNECTS: num_connects})
+        self.pool.prepare_handle(handle)
+        self.assertIn(pycurl.SHARE, handle.opts)
+        self.pool.register_response(
+            lib.Response.connection_failure(handle, error, "reason") if error
+            else lib.Response.connection_successful(handle)
+        )
+
+    def test_count_connections(self):
+        self.register(1)
+        self.register(0)
+        self.register(0)
+        self.register(2)
+        self.register(1, error=pycurl.E_SEND_ERROR)
+        self.assertEqual(3, self.pool.connections_created)
+        self.assertEqual(2, self.pool.connections_reused)
+
+    def test_pool_shared_by_factory(self):
+        factory = lib.NodeCommunicatorFactory(None, None, None, None)
+        # pylint: disable=protected-access
+        self.assertIs(
+            factory.get_simple_communicator()._connection_pool,
+            factory.get_multiaddress_communicator()._connection_pool,
+        )
+        self.assertIs(
+            factory.connection_pool,
+            factory.get_communicator()._connection_pool,
+        )
+
+
 class CommunicatorBaseTest(TestCase):
     def setUp(self):
         self.mock_com_log = mock.MagicMock(
@@ -432,6 +485,43 @@ class CommunicatorMultiTest(CommunicatorBaseTest):
         with self.assertRaises(AssertionError):
             next(com.start_loop())
 
+    @mock.patch("pcs.common.node_communicator._create_request_handle")
+    @mock.patch(
+        "pcs.common.node_communicator.pycurl.CurlMulti",
+        side_effect=lambda: MockCurlMulti([1, 1])
+    )
+    def test_log_connections(self, _, mock_create_handle):
+        pool = lib.ConnectionPool()
+        pool.connections_created = 5
+        com = lib.Communicator(
+            self.mock_com_log, None, None, connection_pool=pool
+        )
+        num_connects_list = [1, 0]
+        mock_create_handle.side_effect = lambda request, _, __: MockCurl(
+            info={pycurl.NUM_CONNECTS: num_connects_list.pop(0)},
+            request=request,
+        )
+        com.add_requests([fixture_request(i) for i in range(2)])
+        list(com.start_loop())
+        # only connections of the requests performed by the loop are logged
+        self.mock_com_log.log_connections.assert_called_once_with(1, 1)
+        self.assertEqual(6, pool.connections_created)
+        self.assertEqual(1, pool.connections_reused)
+
+    @mock.patch("pcs.common.node_communicator._create_request_handle")
+    @mock.patch(
+        "pcs.common.node_communicator.pycurl.CurlMulti",
+        side_effect=lambda: MockCurlMulti([1])
+    )
+    def test_no_connections_not_logged(self, _, mock_create_handle):
+        com = self.get_communicator()
+        mock_create_handle.side_effect = lambda request, _, __: MockCurl(
+            error=(pycurl.E_SEND_ERROR, "reason"), request=request,
+        )
+        com.add_requests([fixture_request(0)])
+        list(com.start_loop())
+        self.assertEqual(0, self.mock_com_log.log_connections.call_count)
+
     @mock.patch("pcs.common.node_communicator.pycurl.Curl")
     @mock.patch(
         "pcs.common.node_communicator.pycurl.CurlMulti",
@@ -486,6 +576,83 @@ class CommunicatorMultiTest(CommunicatorBaseTest):
         # pylint: disable=no-member, protected-access
         com._multi_handle.assert_no_handle_left()
 
+    @mock.patch("pcs.common.node_communicator._create_request_handle")
+    @mock.patch(
+        "pcs.common.node_communicator.pycurl.CurlMulti",
+        side_effect=lambda: MockCurlMulti([1, 0, 1])
+    )
+    def test_delayed_request(self, _, mock_create_handle):
+        clock = {"now": 100.0}
+        def _sleep(secs):
+            clock["now"] += secs
+        com = self.get_communicator()
+        mock_create_handle.side_effect = lambda request, _, __: MockCurl(
+            request=request
+        )
+        request_list = [
+            fixture_request(0),
+            lib.Request(
+                lib.RequestTarget("host1"), lib.RequestData("action"), delay=10
+            ),
+        ]
+        with mock.patch("time.monotonic", lambda: clock["now"]), \
+            mock.patch("time.sleep", side_effect=_sleep) as mock_sleep:
+            com.add_requests(request_list)
+            response_list = list(com.start_loop())
+        mock_sleep.assert_called_once_with(10)
+        self.assertEqual(request_list, [r.request for r in response_list])
+        self.assertEqual(
+            [
+                mock.call.log_request_start(request_list[0]),
+                mock.call.log_response(response_list[0]),
+                mock.call.log_request_start(request_list[1]),
+                mock.call.log_response(response_list[1]),
+            ],
+            self.mock_com_log.mock_calls
+        )
+        # pylint: disable=no-member, protected-access
+        com._multi_handle.assert_no_handle_left()
+
+    @mock.patch("pcs.common.node_communicator._create_request_handle")
+    @mock.patch(
+        "pcs.common.node_communicator.pycurl.CurlMulti",
+        side_effect=lambda: MockCurlMulti([2])
+    )
+    def test_cancel_requests(self, _, mock_create_handle):
+        com = self.get_communicator()
+        mock_create_handle.side_effect = lambda request, _, __: MockCurl(
+            request=request
+        )
+        request_list = [
+            fixture_request(0),
+            fixture_request(1),
+            lib.Request(
+                lib.RequestTarget("host2"), lib.RequestData("action"), delay=10
+            ),
+        ]
+        com.add_requests(request_list)
+        response_list = []
+        with mock.patch("time.sleep") as mock_sleep:
+            for response in com.start_loop():
+                response_list.append(response)
+                # the second request has finished already, the third one has
+                # not been started yet
+                com.cancel_requests(request_list[1:])
+        mock_sleep.assert_not_called()
+        self.assertEqual(
+            [request_list[0]], [r.request for r in response_list]
+        )
+        self.assertEqual(
+            [
+                mock.call.log_request_start(request_list[0]),
+                mock.call.log_request_start(request_list[1]),
+                mock.call.log_response(response_list[0]),
+            ],
+            self.mock_com_log.mock_calls
+        )
+        # pylint: disable=no-member, protected-access
+        com._multi_handle.assert_no_handle_left()
+
 
 def fixture_logger_request_retry_calls(response, hostname):
     return [
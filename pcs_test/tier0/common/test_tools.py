@@ -1,3 +1,4 @@
+import threading
 import time
 from unittest import TestCase
 
@@ -24,6 +25,54 @@ class RunParallelTestCase(TestCase):
         self.assertTrue(elapsed_time < sum([i + 1 for i in range(timeout)]))
 
 
+class MapParallelTest(TestCase):
+    def test_keep_order(self):
+        def worker(i):
+            time.sleep((5 - i) / 100)
+            return i * 10
+        self.assertEqual(
+            [0, 10, 20, 30, 40],
+            tools.map_parallel(worker, range(5), 5)
+        )
+
+    def test_bounded(self):
+        lock = threading.Lock()
+        running = []
+        max_running = []
+        def worker(i):
+            with lock:
+                running.append(i)
+                max_running.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.remove(i)
+            return i
+        self.assertEqual(
+            list(range(6)),
+            tools.map_parallel(worker, range(6), 2)
+        )
+        self.assertEqual(2, max(max_running))
+
+    def test_sequential(self):
+        thread_list = []
+        def worker(i):
+            thread_list.append(threading.current_thread())
+            return i
+        self.assertEqual([0, 1, 2], tools.map_parallel(worker, range(3), 1))
+        self.assertEqual([threading.current_thread()] * 3, thread_list)
+
+    def test_empty(self):
+        self.assertEqual([], tools.map_parallel(lambda i: i, [], 4))
+
+    def test_propagate_exception(self):
+        def worker(i):
+            if i == 2:
+                raise ValueError(i)
+            return i
+        with self.assertRaises(ValueError):
+            tools.map_parallel(worker, range(4), 4)
+
+
 class JoinMultilinesTest(TestCase):
     def test_empty_input(self):
         self.assertEqual(
@@ -1,5 +1,9 @@
-from unittest import TestCase
+from unittest import mock, TestCase
+import asyncio
 import logging
+import time
+
+from tornado.testing import AsyncTestCase, gen_test
 
 from pcs_test.tools.misc import create_setup_patch_mixin
 
@@ -38,3 +42,118 @@ class AuthorizeUserSync(TestCase, create_setup_patch_mixin(auth)):
         user_auth_info = auth.authorize_user_sync(USER, PASSWORD)
         self.assertEqual(user_auth_info.name, USER)
         self.assertFalse(user_auth_info.is_authorized)
+
+class GroupsCache(TestCase):
+    def setUp(self):
+        self.cache = auth.GroupsCache(ttl=60)
+        self.cache.set(USER, [auth.HA_ADM_GROUP])
+
+    def test_cached(self):
+        self.assertEqual((auth.HA_ADM_GROUP,), self.cache.get(USER))
+        self.assertIsNone(self.cache.get("other"))
+
+    @mock.patch("pcs.daemon.auth.monotonic")
+    def test_expired(self, mock_monotonic):
+        mock_monotonic.return_value = 10 ** 6
+        self.assertIsNone(self.cache.get(USER))
+
+    def test_invalidate_user(self):
+        self.cache.set("other", [])
+        self.cache.invalidate(USER)
+        self.assertIsNone(self.cache.get(USER))
+        self.assertEqual((), self.cache.get("other"))
+
+    def test_invalidate_all(self):
+        self.cache.invalidate()
+        self.assertIsNone(self.cache.get(USER))
+
+class AuthWorkerPool(AsyncTestCase):
+    def setUp(self):
+        super().setUp()
+        self.pool = auth.AuthWorkerPool(size=1, queue_limit=0, timeout=30)
+        self.addCleanup(self.pool.shutdown)
+
+    @gen_test
+    async def test_success(self):
+        self.assertEqual(4, await self.pool.run(abs, -4))
+        self.assertEqual(2, await self.pool.run(abs, -2))
+
+    @gen_test
+    async def test_exception_propagated(self):
+        with self.assertRaises(KeyError):
+            await self.pool.run(auth.pwd.getpwnam, "no user with this name")
+
+    @gen_test
+    async def test_full(self):
+        first = asyncio.ensure_future(self.pool.run(time.sleep, 0.5))
+        await asyncio.sleep(0)
+        with self.assertRaises(auth.AuthPoolFull):
+            await self.pool.run(abs, -4)
+        await first
+
+    @gen_test
+    async def test_timed_out_request_counted_until_finished(self):
+        pool = auth.AuthWorkerPool(size=1, queue_limit=0, timeout=0.3)
+        self.addCleanup(pool.shutdown)
+        # start the worker process
+        self.assertEqual(1, await pool.run(abs, -1))
+        with self.assertRaises(auth.AuthPoolTimeout):
+            await pool.run(time.sleep, 1)
+        # the worker is still busy
+        with self.assertRaises(auth.AuthPoolFull):
+            await pool.run(abs, -4)
+        await asyncio.sleep(1)
+        self.assertEqual(4, await pool.run(abs, -4))
+
+class CheckUserGroups(AsyncTestCase, create_setup_patch_mixin(auth)):
+    def setUp(self):
+        super().setUp()
+        self.groups = [auth.HA_ADM_GROUP]
+        self.calls = []
+        self.setup_patch("_run_in_pool", self.run_in_pool)
+        auth.invalidate_user_groups()
+        self.addCleanup(auth.invalidate_user_groups)
+
+    async def run_in_pool(self, sync_fn, *args):
+        self.calls.append(sync_fn.__name__)
+        if sync_fn is auth.authorize_user_sync:
+            return auth.UserAuthInfo(USER, self.groups, is_authorized=True)
+        return self.groups
+
+    @gen_test
+    async def test_groups_cached(self):
+        self.assertTrue((await auth.check_user_groups(USER)).is_authorized)
+        self.groups = []
+        self.assertTrue((await auth.check_user_groups(USER)).is_authorized)
+        self.assertEqual(["get_user_groups_sync"], self.calls)
+
+    @gen_test
+    async def test_invalidated(self):
+        await auth.check_user_groups(USER)
+        self.groups = []
+        auth.invalidate_user_groups(USER)
+        self.assertFalse((await auth.check_user_groups(USER)).is_authorized)
+        self.assertEqual(
+            ["get_user_groups_sync", "get_user_groups_sync"], self.calls
+        )
+
+    @gen_test
+    async def test_login_refreshes_groups(self):
+        await auth.check_user_groups(USER)
+        self.groups = ["wheel", auth.HA_ADM_GROUP]
+        await auth.authorize_user(USER, PASSWORD)
+        user_auth_info = await auth.check_user_groups(USER)
+        self.assertEqual(("wheel", auth.HA_ADM_GROUP), user_auth_info.groups)
+        self.assertEqual(
+            ["get_user_groups_sync", "authorize_user_sync"], self.calls
+        )
+
+    @gen_test
+    async def test_pool_full(self):
+        async def run_in_pool(sync_fn, *args):
+            raise auth.AuthPoolFull()
+        self.setup_patch("_run_in_pool", run_in_pool)
+        self.assertFalse((await auth.check_user_groups(USER)).is_authorized)
+        self.assertFalse(
+            (await auth.authorize_user(USER, PASSWORD)).is_authorized
+        )
@@ -1,4 +1,4 @@
-from os.path import join as join_path
+from os.path import join as join_path, realpath
 from functools import partial
 from ssl import OP_NO_SSLv2
 from unittest import TestCase
@@ -41,9 +41,14 @@ class Prepare(TestCase, create_setup_patch_mixin(env)):
             env.PCSD_DEBUG: False,
             env.PCSD_DISABLE_GUI: False,
             env.PCSD_SESSION_LIFETIME: settings.gui_session_lifetime_seconds,
+            env.PCSD_RUBY_WORKERS: settings.pcsd_ruby_workers,
+            env.PCSD_PCS_INTERNAL_WORKERS: (
+                settings.pcsd_pcs_internal_workers
+            ),
             env.GEM_HOME: pcsd_dir(settings.pcsd_gem_path),
             env.PCSD_CMDLINE_ENTRY: pcsd_dir(env.PCSD_CMDLINE_ENTRY_RB_SCRIPT),
             env.PCSD_STATIC_FILES_DIR: pcsd_dir(env.PCSD_STATIC_FILES_DIR_NAME),
+            env.PCS_INTERNAL_EXEC: settings.pcs_internal_exec,
             env.HTTPS_PROXY: None,
             env.NO_PROXY: None,
             env.PCSD_DEV: False,
@@ -76,6 +81,8 @@ class Prepare(TestCase, create_setup_patch_mixin(env)):
             env.PCSD_DEBUG: "true",
             env.PCSD_DISABLE_GUI: "true",
             env.PCSD_SESSION_LIFETIME: str(session_lifetime),
+            env.PCSD_RUBY_WORKERS: "0",
+            env.PCSD_PCS_INTERNAL_WORKERS: "1",
             env.PCSD_DEV: "true",
             env.HTTPS_PROXY: "proxy1",
             env.NO_PROXY: "host",
@@ -92,6 +99,8 @@ class Prepare(TestCase, create_setup_patch_mixin(env)):
                 env.PCSD_DEBUG: True,
                 env.PCSD_DISABLE_GUI: True,
                 env.PCSD_SESSION_LIFETIME: session_lifetime,
+                env.PCSD_RUBY_WORKERS: 0,
+                env.PCSD_PCS_INTERNAL_WORKERS: 1,
                 env.GEM_HOME: pcsd_dir(settings.pcsd_gem_path),
                 env.PCSD_CMDLINE_ENTRY: pcsd_dir(
                     env.PCSD_CMDLINE_ENTRY_RB_SCRIPT
@@ -99,6 +108,9 @@ class Prepare(TestCase, create_setup_patch_mixin(env)):
                 env.PCSD_STATIC_FILES_DIR: pcsd_dir(
                     env.PCSD_STATIC_FILES_DIR_NAME
                 ),
+                env.PCS_INTERNAL_EXEC: realpath(
+                    pcsd_dir("../pcs/pcs_internal")
+                ),
                 env.HTTPS_PROXY: environ[env.HTTPS_PROXY],
                 env.NO_PROXY: environ[env.NO_PROXY],
                 env.PCSD_DEV: True,
@@ -116,6 +128,33 @@ class Prepare(TestCase, create_setup_patch_mixin(env)):
             ]
         )
 
+    def test_error_on_invalid_ruby_workers(self):
+        for value in ["invalid", "-1"]:
+            with self.subTest(value=value):
+                self.logger = Logger()
+                environ = {env.PCSD_RUBY_WORKERS: value}
+                self.assert_environ_produces_modified_pcsd_env(
+                    environ,
+                    specific_env_values={**environ, "has_errors": True},
+                    errors=[
+                        f"Invalid PCSD_RUBY_WORKERS value '{value}'"
+                        " (it must be a non-negative integer)"
+                    ]
+                )
+
+    def test_error_on_invalid_pcs_internal_workers(self):
+        for value in ["invalid", "-1"]:
+            with self.subTest(value=value):
+                self.logger = Logger()
+                environ = {env.PCSD_PCS_INTERNAL_WORKERS: value}
+                self.assert_environ_produces_modified_pcsd_env(
+                    environ,
+                    specific_env_values={**environ, "has_errors": True},
+                    errors=[
+                        f"Invalid PCSD_PCS_INTERNAL_WORKERS value '{value}'"
+                        " (it must be a non-negative integer)"
+                    ]
+                )
 
     def test_report_invalid_ssl_ciphers(self):
         environ = {env.PCSD_SSL_CIPHERS: "invalid ;@{}+ ciphers"}
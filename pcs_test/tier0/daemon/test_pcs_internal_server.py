@@ -0,0 +1,149 @@
+import json
+import logging
+import os
+import shutil
+import socket
+import tempfile
+from unittest import TestCase
+
+from tornado.iostream import IOStream
+from tornado.testing import AsyncTestCase, gen_test
+
+from pcs.daemon import pcs_internal_server
+from pcs.daemon.ruby_workers import PoolTimeout, WorkerFailed
+
+# Don't write errors to test output.
+logging.getLogger("pcs.daemon").setLevel(logging.CRITICAL)
+
+
+class WorkerPool:
+    def __init__(self, response=b'{"status": "success"}', exception=None):
+        self.response = response
+        self.exception = exception
+        self.requests = []
+        self.restarts = 0
+        self.closed = False
+
+    async def run(self, request):
+        self.requests.append(request)
+        if self.exception:
+            raise self.exception
+        return self.response, b""
+
+    def restart(self):
+        self.restarts += 1
+
+    async def close(self):
+        self.closed = True
+
+
+class CodeStamp:
+    def __init__(self):
+        self.stamp = 1
+
+    def __call__(self):
+        return self.stamp
+
+
+class Server(AsyncTestCase):
+    def setUp(self):
+        super().setUp()
+        self.pool = WorkerPool()
+        self.code_stamp = CodeStamp()
+        self.server = pcs_internal_server.Server(self.pool, self.code_stamp)
+
+    @gen_test
+    async def test_success(self):
+        response = await self.server.process_request(b'{"cmd": "a.b"}')
+        self.assertEqual(b'{"status": "success"}', response)
+        self.assertEqual([b'{"cmd": "a.b"}'], self.pool.requests)
+        self.assertEqual(0, self.pool.restarts)
+
+    @gen_test
+    async def test_pool_busy(self):
+        self.pool.exception = PoolTimeout()
+        response = await self.server.process_request(b'{"cmd": "a.b"}')
+        self.assertEqual(b"", response)
+
+    @gen_test
+    async def test_worker_failed(self):
+        self.pool.exception = WorkerFailed("worker crashed")
+        response = await self.server.process_request(b'{"cmd": "a.b"}')
+        self.assertEqual(
+            {
+                "status": "exception",
+                "status_msg": "worker crashed",
+                "report_list": [],
+                "data": None,
+            },
+            json.loads(response)
+        )
+
+    @gen_test
+    async def test_restart_workers_after_upgrade(self):
+        await self.server.process_request(b'{"cmd": "a.b"}')
+        self.code_stamp.stamp = 2
+        await self.server.process_request(b'{"cmd": "a.b"}')
+        await self.server.process_request(b'{"cmd": "a.b"}')
+        self.assertEqual(1, self.pool.restarts)
+
+    @gen_test
+    async def test_close(self):
+        await self.server.close()
+        self.assertTrue(self.pool.closed)
+
+    @gen_test
+    async def test_unix_socket(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        socket_path = os.path.join(tmp_dir, "pcs_internal.socket")
+        self.server.listen_unix(socket_path)
+        self.assertEqual(0o600, os.stat(socket_path).st_mode & 0o777)
+
+        stream = IOStream(socket.socket(socket.AF_UNIX))
+        await stream.connect(socket_path)
+        await stream.write(b'14\n{"cmd": "a.b"}')
+        response = await stream.read_until_close()
+        stream.close()
+        self.server.stop()
+
+        self.assertEqual(b'{"status": "success"}', response)
+        self.assertEqual([b'{"cmd": "a.b"}'], self.pool.requests)
+
+
+class GetCodeStamp(TestCase):
+    def setUp(self):
+        self.package_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.package_dir)
+        os.makedirs(os.path.join(self.package_dir, "lib", "__pycache__"))
+
+    def write(self, *path):
+        with open(os.path.join(self.package_dir, *path), "w") as file:
+            file.write("code")
+
+    def set_mtime(self, *path):
+        os.utime(os.path.join(self.package_dir, *path), ns=(0, 0))
+
+    def test_file_replaced(self):
+        self.write("lib", "module.py")
+        self.set_mtime("lib")
+        stamp = pcs_internal_server.get_code_stamp(self.package_dir)
+        self.assertEqual(
+            stamp, pcs_internal_server.get_code_stamp(self.package_dir)
+        )
+        # the way package managers replace files
+        self.write("lib", "module.py.new")
+        os.rename(
+            os.path.join(self.package_dir, "lib", "module.py.new"),
+            os.path.join(self.package_dir, "lib", "module.py"),
+        )
+        self.assertNotEqual(
+            stamp, pcs_internal_server.get_code_stamp(self.package_dir)
+        )
+
+    def test_bytecode_ignored(self):
+        stamp = pcs_internal_server.get_code_stamp(self.package_dir)
+        self.write("lib", "__pycache__", "module.pyc")
+        self.assertEqual(
+            stamp, pcs_internal_server.get_code_stamp(self.package_dir)
+        )
@@ -1,16 +1,19 @@
+import asyncio
 import json
 import logging
 from base64 import b64encode
 from unittest import TestCase, mock
 from urllib.parse import urlencode
 
+from tornado.concurrent import Future
+from tornado.gen import multi
 from tornado.httputil import HTTPServerRequest
 from tornado.testing import AsyncTestCase, gen_test
 from tornado.web import HTTPError
 
 from pcs_test.tools.misc import create_patcher, get_test_resource as rc
 
-from pcs.daemon import ruby_pcsd
+from pcs.daemon import ruby_pcsd, ruby_workers
 
 # Don't write errors to test output.
 logging.getLogger("pcs.daemon").setLevel(logging.CRITICAL)
@@ -170,6 +173,127 @@ class RunRuby(AsyncTestCase):
         )
         self.assert_sinatra_result(result, headers, status, body)
 
+class SendToRubyWorkers(AsyncTestCase):
+    def setUp(self):
+        super().setUp()
+        self.pool = mock.Mock(spec_set=["run", "close"])
+        self.pool_result = None
+        self.pool.run = mock.Mock(side_effect=self.pool_run)
+        self.pool.close = mock.Mock(side_effect=self.pool_close)
+        self.process_calls = []
+        pool_class = patch_ruby_pcsd("WorkerPool", return_value=self.pool)
+        self.addCleanup(pool_class.stop)
+        self.pool_class = pool_class.start()
+        self.wrapper = ruby_pcsd.Wrapper(
+            "/path/to/pcsd/cmdline/entry", ruby_executable="ruby", workers=2
+        )
+        send_to_process = mock.patch.object(
+            self.wrapper,
+            "_Wrapper__send_to_ruby_process",
+            self.send_to_process,
+        )
+        self.addCleanup(send_to_process.stop)
+        send_to_process.start()
+
+    async def pool_run(self, request):
+        # pylint: disable=unused-argument
+        if isinstance(self.pool_result, Exception):
+            raise self.pool_result
+        return self.pool_result
+
+    async def pool_close(self):
+        pass
+
+    async def send_to_process(self, request_json):
+        self.process_calls.append(request_json)
+        return b"process", b"", 0
+
+    def test_pool_created(self):
+        self.pool_class.assert_called_once_with(
+            [
+                "ruby", "-I", "/path/to/pcsd/cmdline",
+                "/path/to/pcsd/cmdline/entry", "--worker",
+            ],
+            {"PCSD_DEBUG": "false"},
+            size=2,
+            max_requests=ruby_pcsd.settings.pcsd_ruby_worker_max_requests,
+            queue_limit=ruby_pcsd.settings.pcsd_ruby_worker_queue_limit,
+            queue_timeout=ruby_pcsd.settings.pcsd_ruby_worker_queue_timeout,
+        )
+
+    @gen_test
+    async def test_served_by_worker(self):
+        self.pool_result = (b"worker", b"stderr")
+        self.assertEqual(
+            (b"worker", b"stderr", None),
+            await self.wrapper.send_to_ruby("{}")
+        )
+        self.pool.run.assert_called_once_with(b"{}")
+        self.assertEqual([], self.process_calls)
+
+    @gen_test
+    async def test_queue_timeout(self):
+        self.pool_result = ruby_workers.PoolTimeout()
+        self.assertEqual(
+            (b"process", b"", 0),
+            await self.wrapper.send_to_ruby("{}")
+        )
+        self.assertEqual(["{}"], self.process_calls)
+
+    @gen_test
+    async def test_queue_timeout_fallback_limit(self):
+        self.pool_result = ruby_workers.PoolTimeout()
+        release = Future()
+
+        async def send_to_process(request_json):
+            self.process_calls.append(request_json)
+            await release
+            return b"process", b"", 0
+
+        with mock.patch.object(
+            self.wrapper, "_Wrapper__send_to_ruby_process", send_to_process
+        ), mock.patch.object(
+            ruby_pcsd.settings, "pcsd_ruby_worker_fallback_limit", 2
+        ):
+            running = [
+                asyncio.ensure_future(self.wrapper.send_to_ruby("{}"))
+                for dummy in range(2)
+            ]
+            # let the requests start their processes
+            await asyncio.sleep(0)
+            with self.assertRaises(HTTPError) as cm:
+                await self.wrapper.send_to_ruby("{}")
+            self.assertEqual(503, cm.exception.status_code)
+            release.set_result(None)
+            await multi(running)
+            # finished processes do not count to the limit anymore
+            self.assertEqual(
+                (b"process", b"", 0),
+                await self.wrapper.send_to_ruby("{}")
+            )
+        self.assertEqual(["{}", "{}", "{}"], self.process_calls)
+
+    @gen_test
+    async def test_close(self):
+        await self.wrapper.close()
+        self.pool.close.assert_called_once_with()
+
+    @gen_test
+    async def test_queue_full(self):
+        self.pool_result = ruby_workers.PoolFull()
+        with self.assertRaises(HTTPError) as cm:
+            await self.wrapper.send_to_ruby("{}")
+        self.assertEqual(503, cm.exception.status_code)
+        self.assertEqual([], self.process_calls)
+
+    @gen_test
+    async def test_worker_failed(self):
+        self.pool_result = ruby_workers.WorkerFailed("failed")
+        with self.assertRaises(HTTPError) as cm:
+            await self.wrapper.send_to_ruby("{}")
+        self.assertEqual(500, cm.exception.status_code)
+        self.assertEqual([], self.process_calls)
+
 class ProcessResponseLog(TestCase):
     @patch_ruby_pcsd("log.from_external_source")
     @patch_ruby_pcsd("next", mock.Mock(return_value=1))
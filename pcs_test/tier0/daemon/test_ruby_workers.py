@@ -0,0 +1,222 @@
+import json
+import logging
+import os
+import sys
+import tempfile
+from unittest import TestCase
+
+from tornado.gen import convert_yielded, multi, sleep
+from tornado.process import Subprocess
+from tornado.testing import AsyncTestCase, gen_test
+
+from pcs.daemon import ruby_workers
+
+# Don't write errors to test output.
+logging.getLogger("pcs.daemon").setLevel(logging.CRITICAL)
+
+# A worker speaking the same protocol as sinatra_cmdline_wrapper.rb --worker
+FAKE_WORKER = """
+import json, os, sys, time
+while True:
+    header = sys.stdin.buffer.readline()
+    if not header:
+        break
+    request = json.loads(sys.stdin.buffer.read(int(header)))
+    if request.get("crash"):
+        sys.exit(1)
+    if request.get("stderr"):
+        sys.stderr.write(request["stderr"])
+        sys.stderr.flush()
+    time.sleep(request.get("sleep", 0))
+    response = json.dumps(
+        {"pid": os.getpid(), "request": request, "env": os.environ.get("X")}
+    ).encode()
+    sys.stdout.buffer.write(str(len(response)).encode() + b"\\n" + response)
+    sys.stdout.buffer.flush()
+"""
+
+
+def request(**kwargs):
+    return json.dumps(kwargs).encode()
+
+
+class WorkerPoolTest(AsyncTestCase):
+    def setUp(self):
+        super().setUp()
+        # Watch for exited workers in the IOLoop of this test. A previous test
+        # may have installed the SIGCHLD handler to its own, now closed, loop.
+        Subprocess.uninitialize()
+        # pylint: disable=consider-using-with
+        self.worker_file = tempfile.NamedTemporaryFile(
+            "w", suffix=".py", delete=False
+        )
+        self.worker_file.write(FAKE_WORKER)
+        self.worker_file.close()
+        self.addCleanup(os.unlink, self.worker_file.name)
+        self.pools = []
+
+    def tearDown(self):
+        for pool in self.pools:
+            self.io_loop.run_sync(pool.close, timeout=10)
+        Subprocess.uninitialize()
+        super().tearDown()
+
+    def create_pool(
+        self, size=2, max_requests=100, queue_limit=10, queue_timeout=10
+    ):
+        pool = ruby_workers.WorkerPool(
+            [sys.executable, self.worker_file.name],
+            {"X": "value"},
+            size=size,
+            max_requests=max_requests,
+            queue_limit=queue_limit,
+            queue_timeout=queue_timeout,
+        )
+        self.pools.append(pool)
+        return pool
+
+    async def run_request(self, pool, **kwargs):
+        stdout, stderr = await pool.run(request(**kwargs))
+        return json.loads(stdout), stderr
+
+    @gen_test(timeout=20)
+    async def test_worker_is_reused(self):
+        pool = self.create_pool(size=1)
+        response1, dummy_stderr = await self.run_request(pool, data=1)
+        response2, dummy_stderr = await self.run_request(pool, data=2)
+        self.assertEqual({"data": 1}, response1["request"])
+        self.assertEqual({"data": 2}, response2["request"])
+        self.assertEqual("value", response1["env"])
+        self.assertEqual(response1["pid"], response2["pid"])
+
+    @gen_test(timeout=20)
+    async def test_stderr(self):
+        pool = self.create_pool(size=1)
+        dummy_response, stderr = await self.run_request(pool, stderr="error")
+        # stderr is read asynchronously, it may come with the next response
+        if not stderr:
+            dummy_response, stderr = await self.run_request(pool)
+        self.assertEqual(b"error", stderr)
+
+    @gen_test(timeout=20)
+    async def test_requests_run_in_parallel(self):
+        pool = self.create_pool(size=2)
+        response_list = await multi([
+            self.run_request(pool, sleep=0.5),
+            self.run_request(pool, sleep=0.5),
+        ])
+        self.assertNotEqual(
+            response_list[0][0]["pid"], response_list[1][0]["pid"]
+        )
+
+    @gen_test(timeout=20)
+    async def test_queue(self):
+        pool = self.create_pool(size=1)
+        response_list = await multi([
+            self.run_request(pool, sleep=0.2, data=i) for i in range(3)
+        ])
+        self.assertEqual(
+            [{"sleep": 0.2, "data": i} for i in range(3)],
+            [response["request"] for response, dummy_stderr in response_list]
+        )
+        self.assertEqual(
+            1, len({response["pid"] for response, dummy in response_list})
+        )
+
+    @gen_test(timeout=20)
+    async def test_queue_full(self):
+        pool = self.create_pool(size=1, queue_limit=1)
+        busy = convert_yielded(self.run_request(pool, sleep=1))
+        queued = convert_yielded(self.run_request(pool))
+        await sleep(0.1)
+        with self.assertRaises(ruby_workers.PoolFull):
+            await self.run_request(pool)
+        await multi([busy, queued])
+
+    @gen_test(timeout=20)
+    async def test_queue_timeout(self):
+        pool = self.create_pool(size=1, queue_timeout=0.1)
+        busy = convert_yielded(self.run_request(pool, sleep=1))
+        await sleep(0.05)
+        with self.assertRaises(ruby_workers.PoolTimeout):
+            await self.run_request(pool)
+        await busy
+        # the pool is usable after a timeout
+        response, dummy_stderr = await self.run_request(pool, data=1)
+        self.assertEqual({"data": 1}, response["request"])
+
+    @gen_test(timeout=20)
+    async def test_worker_recycled(self):
+        pool = self.create_pool(size=1, max_requests=2)
+        pid_list = []
+        for dummy_i in range(3):
+            response, dummy_stderr = await self.run_request(pool)
+            pid_list.append(response["pid"])
+        self.assertEqual(pid_list[0], pid_list[1])
+        self.assertNotEqual(pid_list[1], pid_list[2])
+
+    @gen_test(timeout=20)
+    async def test_worker_crashed(self):
+        pool = self.create_pool(size=1)
+        response1, dummy_stderr = await self.run_request(pool)
+        with self.assertRaises(ruby_workers.WorkerFailed):
+            await self.run_request(pool, crash=True)
+        response2, dummy_stderr = await self.run_request(pool)
+        self.assertNotEqual(response1["pid"], response2["pid"])
+
+    @gen_test(timeout=20)
+    async def test_idle_worker_crashed(self):
+        pool = self.create_pool(size=1)
+        response1, dummy_stderr = await self.run_request(pool)
+        os.kill(response1["pid"], 9)
+        await sleep(0.2)
+        response2, dummy_stderr = await self.run_request(pool)
+        self.assertNotEqual(response1["pid"], response2["pid"])
+
+    @gen_test(timeout=20)
+    async def test_unable_to_start_worker(self):
+        pool = ruby_workers.WorkerPool(
+            ["/nonexistent/ruby"],
+            {},
+            size=1,
+            max_requests=100,
+            queue_limit=10,
+            queue_timeout=10,
+        )
+        with self.assertRaises(ruby_workers.WorkerFailed):
+            await pool.run(request())
+
+    @gen_test(timeout=20)
+    async def test_restart(self):
+        pool = self.create_pool(size=2)
+        busy = convert_yielded(self.run_request(pool, sleep=0.5))
+        await sleep(0.1)
+        idle_response, dummy_stderr = await self.run_request(pool)
+        pool.restart()
+        busy_response, dummy_stderr = await busy
+        # both the idle and the busy worker have been replaced
+        response_list = await multi([
+            self.run_request(pool, sleep=0.2),
+            self.run_request(pool, sleep=0.2),
+        ])
+        self.assertEqual(
+            set(),
+            {response["pid"] for response, dummy in response_list}
+            &
+            {idle_response["pid"], busy_response["pid"]}
+        )
+
+
+class LatencyHistogramTest(TestCase):
+    def test_empty(self):
+        self.assertEqual(
+            "empty", ruby_workers.LatencyHistogram().get_summary()
+        )
+
+    def test_buckets(self):
+        histogram = ruby_workers.LatencyHistogram()
+        for latency in (0.01, 0.1, 0.3, 0.3, 1000):
+            histogram.add(latency)
+        self.assertEqual(
+            "<=0.1 s: 2, <=0.5 s: 2, >300 s: 1", histogram.get_summary()
+        )
@@ -439,6 +439,63 @@ class ResourceRelationsFetcher(TestCase):
                 self.assertEqual(expected, obj.get_relations(res))
 
 
+class RelationsIndex(TestCase):
+    def setUp(self):
+        self.index = lib.RelationsIndex(fixture_cib(
+            """
+            <primitive id="A"/>
+            <group id="G"><primitive id="B"/></group>
+            <bundle id="X"><primitive id="C"/></bundle>
+            """,
+            """
+            <rsc_order id="order-A-B" first="A" then="B"/>
+            <rsc_order id="order-A-A" first="A" then="A"/>
+            <rsc_location id="location-A" rsc="A" node="n"/>
+            <rsc_location id="location-pattern" rsc-pattern="A" node="n"/>
+            <rsc_ticket id="ticket-set">
+                <resource_set id="set1">
+                    <resource_ref id="A"/>
+                    <resource_ref id="C"/>
+                </resource_set>
+                <resource_set id="set2"><resource_ref id="A"/></resource_set>
+            </rsc_ticket>
+            """
+        ))
+
+    @staticmethod
+    def ids(element_list):
+        return [element.get("id") for element in element_list]
+
+    def test_resources(self):
+        self.assertEqual("group", self.index.get_resource("G").tag)
+        self.assertEqual("bundle", self.index.get_resource("X").tag)
+        self.assertEqual("C", self.index.get_resource("C").get("id"))
+        self.assertIsNone(self.index.get_resource("set1"))
+
+    def test_constraints(self):
+        self.assertEqual(
+            ["order-A-B", "order-A-A", "location-A"],
+            self.ids(self.index.get_constraints("A"))
+        )
+        self.assertEqual(
+            ["order-A-B", "order-A-A"],
+            self.ids(self.index.get_constraints("A", "rsc_order"))
+        )
+        self.assertEqual([], self.index.get_constraints("G"))
+
+    def test_set_constraints(self):
+        self.assertEqual(
+            ["ticket-set"], self.ids(self.index.get_set_constraints("A"))
+        )
+        self.assertEqual(
+            ["ticket-set"],
+            self.ids(self.index.get_set_constraints("C", "rsc_ticket"))
+        )
+        self.assertEqual(
+            [], self.index.get_set_constraints("C", "rsc_order")
+        )
+
+
 class ResourceRelationTreeBuilder(TestCase):
     @staticmethod
     def primitive_fixture(_id, members):
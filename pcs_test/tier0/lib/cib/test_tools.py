@@ -1,4 +1,5 @@
 from functools import partial
+import threading
 from unittest import mock, TestCase
 from lxml import etree
 
@@ -216,6 +217,142 @@ class DoesIdExistTest(CibToolsTest):
         """)
         self.assertTrue(lib.does_id_exist(tree, "a"))
 
+class DoesIdExistIndexTest(CibToolsTest):
+    def setUp(self):
+        super().setUp()
+        lib.drop_id_index()
+        self.addCleanup(lib.drop_id_index)
+
+    def get_primitive(self, element_id):
+        return self.cib.tree.find(f".//primitive[@id='{element_id}']")
+
+    def test_index_built_once(self):
+        for i in range(10):
+            self.fixture_add_primitive_with_id(
+                "myId" if i == 0 else f"myId-{i}"
+            )
+        with mock.patch.object(
+            lib._IdIndex, # pylint: disable=protected-access
+            "_build",
+            autospec=True,
+            side_effect=lib._IdIndex._build, # pylint: disable=protected-access
+        ) as mock_build:
+            self.assertEqual(
+                "myId-10", lib.find_unique_id(self.cib.tree, "myId")
+            )
+            self.assertTrue(lib.does_id_exist(self.cib.tree, "myId-5"))
+            self.assertEqual(1, mock_build.call_count)
+
+    def test_removed_element(self):
+        self.fixture_add_primitive_with_id("myId")
+        self.assertTrue(lib.does_id_exist(self.cib.tree, "myId"))
+        primitive = self.get_primitive("myId")
+        primitive.getparent().remove(primitive)
+        self.assertFalse(lib.does_id_exist(self.cib.tree, "myId"))
+
+    def test_changed_id(self):
+        self.fixture_add_primitive_with_id("myId")
+        self.assertTrue(lib.does_id_exist(self.cib.tree, "myId"))
+        self.assertFalse(lib.does_id_exist(self.cib.tree, "otherId"))
+        self.get_primitive("myId").set("id", "otherId")
+        self.assertFalse(lib.does_id_exist(self.cib.tree, "myId"))
+        self.assertTrue(lib.does_id_exist(self.cib.tree, "otherId"))
+
+    def test_moved_to_status(self):
+        self.fixture_add_primitive_with_id("myId")
+        self.assertTrue(lib.does_id_exist(self.cib.tree, "myId"))
+        self.cib.tree.find("status").append(self.get_primitive("myId"))
+        self.assertFalse(lib.does_id_exist(self.cib.tree, "myId"))
+
+    def test_added_element(self):
+        self.assertFalse(lib.does_id_exist(self.cib.tree, "myId"))
+        self.fixture_add_primitive_with_id("myId")
+        self.assertTrue(lib.does_id_exist(self.cib.tree, "myId"))
+
+    def test_added_element_allocated_id(self):
+        self.fixture_add_primitive_with_id("myId")
+        provider = lib.IdProvider(self.cib.tree)
+        self.assertEqual("myId-1", provider.allocate_id("myId"))
+        self.fixture_add_primitive_with_id("myId-1")
+        self.assertEqual("myId-2", lib.find_unique_id(self.cib.tree, "myId"))
+        self.assertFalse(lib.does_id_exist(self.cib.tree, "thirdId"))
+
+    def test_bulk_allocation_without_tree_lookups(self):
+        for i in range(50):
+            self.fixture_add_primitive_with_id(f"R{i}")
+        provider = lib.IdProvider(self.cib.tree)
+        with mock.patch(
+            "pcs.lib.cib.tools._find_id_in_tree",
+            side_effect=lib._find_id_in_tree, # pylint: disable=protected-access
+        ) as mock_find:
+            for i in range(300):
+                provider.allocate_id(f"R{i % 50}")
+                provider.allocate_id(f"new{i}")
+            self.assertEqual([], provider.book_ids("other"))
+            mock_find.assert_not_called()
+
+    def test_added_elements_looked_up_once(self):
+        with mock.patch(
+            "pcs.lib.cib.tools._find_id_in_tree",
+            side_effect=lib._find_id_in_tree, # pylint: disable=protected-access
+        ) as mock_find:
+            for i in range(20):
+                self.fixture_add_primitive_with_id(
+                    lib.find_unique_id(self.cib.tree, "myId")
+                )
+            self.assertEqual(
+                "myId-20", lib.find_unique_id(self.cib.tree, "myId")
+            )
+            self.assertEqual(20, mock_find.call_count)
+
+    def test_index_per_thread(self):
+        self.fixture_add_primitive_with_id("myId")
+        self.assertTrue(lib.does_id_exist(self.cib.tree, "myId"))
+        other_tree = self.create_cib().tree
+        result = []
+        thread = threading.Thread(
+            target=lambda: result.append(
+                lib.does_id_exist(other_tree, "myId")
+            )
+        )
+        thread.start()
+        thread.join()
+        self.assertEqual([False], result)
+        # pylint: disable=protected-access
+        self.assertIs(
+            self.cib.tree.getroottree().getroot(),
+            lib._id_index_cache.index.root,
+        )
+
+    def test_removed_and_added_element(self):
+        self.fixture_add_primitive_with_id("myId")
+        self.assertTrue(lib.does_id_exist(self.cib.tree, "myId"))
+        primitive = self.get_primitive("myId")
+        primitive.getparent().remove(primitive)
+        self.fixture_add_primitive_with_id("myId")
+        self.assertTrue(lib.does_id_exist(self.cib.tree, "myId"))
+
+    def test_removed_remote_node(self):
+        self.cib.append_to_first_tag_name("resources", """
+            <primitive id="b">
+                <meta_attributes id="b-meta">
+                    <nvpair id="b-meta-remote" name="remote-node" value="a"/>
+                </meta_attributes>
+            </primitive>
+        """)
+        self.assertTrue(lib.does_id_exist(self.cib.tree, "a"))
+        self.assertFalse(lib.does_id_exist(self.cib.tree, "c"))
+        nvpair = self.cib.tree.find(".//nvpair[@id='b-meta-remote']")
+        nvpair.set("value", "c")
+        self.assertFalse(lib.does_id_exist(self.cib.tree, "a"))
+        self.assertTrue(lib.does_id_exist(self.cib.tree, "c"))
+
+    def test_other_tree(self):
+        self.fixture_add_primitive_with_id("myId")
+        self.assertTrue(lib.does_id_exist(self.cib.tree, "myId"))
+        self.assertFalse(lib.does_id_exist(self.create_cib().tree, "myId"))
+
+
 class FindUniqueIdTest(CibToolsTest):
     def test_already_unique(self):
         self.fixture_add_primitive_with_id("myId")
@@ -99,6 +99,15 @@ def corosync_conf_fixture(node_list=(), quorum_options=(), qdevice_net=False):
     )
 
 
+def pipeline_reports_fixture(node_list, action_list):
+    return [
+        fixture.debug(
+            report_codes.NODE_COMMUNICATION_PIPELINE_FINISHED,
+            node=node,
+            request_durations=[(action, 0.0) for action in action_list],
+        ) for node in node_list
+    ]
+
 def node_fixture(node, node_id, addr_sufix=""):
     return corosync_node_fixture(node_id, node, [f"{node}{addr_sufix}"])
 
@@ -355,8 +364,19 @@ class LocalConfig():
                 name=f"{local_prefix}http.sbd.set_sbd_config",
             )
             .http.sbd.enable_sbd(node_labels=node_labels)
+            .http.pipeline(
+                [
+                    f"{local_prefix}http.sbd.set_sbd_config",
+                    "http.sbd.enable_sbd",
+                ],
+                name=f"{local_prefix}http.pipeline",
+            )
         )
         self.expected_reports.extend(
+            pipeline_reports_fixture(
+                node_labels, ["remote/set_sbd_config", "remote/sbd_enable"]
+            )
+            +
             [fixture.info(report_codes.SBD_CONFIG_DISTRIBUTION_STARTED)]
             +
             [
@@ -607,16 +627,23 @@ class LocalConfig():
         local_prefix = "local.pcsd_ssl_cert_sync."
         pcsd_ssl_cert = "pcsd ssl cert"
         pcsd_ssl_key = "pcsd ssl key"
+        # The cert and key are read before the files are distributed, both are
+        # then sent in one pipeline.
+        put_files_name = "local.files_sync.http.files.put_files"
+        files_synced = f"{put_files_name}_requests" in self.__calls.names
+        before = f"{put_files_name}_requests" if files_synced else None
         (self.config
             .fs.open(
                 settings.pcsd_cert_location,
                 mock.mock_open(read_data=pcsd_ssl_cert)(),
-                name=f"{local_prefix}fs.open.pcsd_ssl_cert"
+                name=f"{local_prefix}fs.open.pcsd_ssl_cert",
+                before=before,
             )
             .fs.open(
                 settings.pcsd_key_location,
                 mock.mock_open(read_data=pcsd_ssl_key)(),
-                name=f"{local_prefix}fs.open.pcsd_ssl_key"
+                name=f"{local_prefix}fs.open.pcsd_ssl_key",
+                before=before,
             )
             .http.host.send_pcsd_cert(
                 cert=pcsd_ssl_cert,
@@ -624,7 +651,17 @@ class LocalConfig():
                 node_labels=node_labels
             )
         )
+        step_list = ["http.host.send_pcsd_cert"]
+        action_list = ["remote/set_certs"]
+        if files_synced:
+            step_list.insert(0, put_files_name)
+            action_list.insert(0, "remote/put_file")
+        self.config.http.pipeline(
+            step_list, name=f"{local_prefix}http.pipeline"
+        )
         self.expected_reports.extend(
+            pipeline_reports_fixture(node_labels, action_list)
+            +
             [
                 fixture.info(
                     report_codes.PCSD_SSL_CERT_AND_KEY_DISTRIBUTION_STARTED,
@@ -1235,6 +1272,7 @@ class SslCertSync(TestCase):
         self._assert_certs_not_synced()
 
 
+@mock.patch("pcs.lib.communication.tools.monotonic", lambda: 0.0)
 class AddNodeFull(TestCase):
     def setUp(self):
         self.env_assist, self.config = get_env_tools(self)
@@ -1975,6 +2013,7 @@ class FailureCorosyncConfDistribution(TestCase):
         )
 
 
+@mock.patch("pcs.lib.communication.tools.monotonic", lambda: 0.0)
 class FailurePcsdSslCertSync(TestCase):
     # pylint: disable=too-many-instance-attributes
     def setUp(self):
@@ -2014,14 +2053,6 @@ class FailurePcsdSslCertSync(TestCase):
             .fs.isdir(settings.booth_config_dir, return_value=False)
             .local.no_file_sync()
         )
-        self.expected_reports.extend(
-            [
-                fixture.info(
-                    report_codes.PCSD_SSL_CERT_AND_KEY_DISTRIBUTION_STARTED,
-                    node_name_list=self.new_nodes
-                )
-            ]
-        )
 
     def _add_nodes_with_lib_error(self):
         self.env_assist.assert_raise_library_error(
@@ -2093,6 +2124,7 @@ class FailurePcsdSslCertSync(TestCase):
                     dict(label=node) for node in self.successful_nodes
                 ]
             )
+            .http.pipeline(["http.host.send_pcsd_cert"])
         )
 
         self._add_nodes_with_lib_error()
@@ -2100,6 +2132,15 @@ class FailurePcsdSslCertSync(TestCase):
         self.env_assist.assert_reports(
             self.expected_reports
             +
+            pipeline_reports_fixture(self.new_nodes, ["remote/set_certs"])
+            +
+            [
+                fixture.info(
+                    report_codes.PCSD_SSL_CERT_AND_KEY_DISTRIBUTION_STARTED,
+                    node_name_list=self.new_nodes
+                )
+            ]
+            +
             [
                 fixture.info(
                     report_codes.PCSD_SSL_CERT_AND_KEY_SET_SUCCESS,
@@ -2118,6 +2159,7 @@ class FailurePcsdSslCertSync(TestCase):
         )
 
 
+@mock.patch("pcs.lib.communication.tools.monotonic", lambda: 0.0)
 class FailureFilesDistribution(TestCase):
     # pylint: disable=too-many-instance-attributes
     def setUp(self):
@@ -2191,7 +2233,9 @@ class FailureFilesDistribution(TestCase):
                 ) for node in self.new_nodes
             ]
         )
-        self.distribution_started_reports = [
+        self.distribution_started_reports = pipeline_reports_fixture(
+            self.new_nodes, ["remote/put_file"]
+        ) + [
             fixture.info(
                 report_codes.FILES_DISTRIBUTION_STARTED,
                 file_list=[
@@ -2436,6 +2480,7 @@ class FailureFilesDistribution(TestCase):
                     dict(label=node) for node in self.successful_nodes
                 ]
             )
+            .http.pipeline(["http.files.put_files"])
         )
 
         self._add_nodes_with_lib_error()
@@ -2518,6 +2563,7 @@ class FailureFilesDistribution(TestCase):
                     dict(label=node) for node in self.successful_nodes
                 ]
             )
+            .http.pipeline(["http.files.put_files"])
         )
 
         self._add_nodes_with_lib_error()
@@ -2581,6 +2627,7 @@ class FailureFilesDistribution(TestCase):
                     dict(label=node) for node in self.successful_nodes
                 ]
             )
+            .http.pipeline(["http.files.put_files"])
         )
 
         self._add_nodes_with_lib_error()
@@ -2644,6 +2691,7 @@ class FailureFilesDistribution(TestCase):
                     dict(label=node) for node in self.successful_nodes
                 ]
             )
+            .http.pipeline(["http.files.put_files"])
         )
 
         self._add_nodes_with_lib_error()
@@ -3469,6 +3517,7 @@ class FailureDisableSbd(TestCase):
         )
 
 
+@mock.patch("pcs.lib.communication.tools.monotonic", lambda: 0.0)
 class FailureEnableSbd(TestCase):
     # pylint: disable=too-many-instance-attributes
     def setUp(self):
@@ -3550,6 +3599,7 @@ class FailureEnableSbd(TestCase):
                     ) for node in self.unsuccessful_nodes
                 ] + [dict(label=node) for node in self.successful_nodes]
             )
+            .http.pipeline(["http.sbd.set_sbd_config", "http.sbd.enable_sbd"])
         )
 
         self._add_nodes_with_lib_error()
@@ -3557,6 +3607,10 @@ class FailureEnableSbd(TestCase):
         self.env_assist.assert_reports(
             self.expected_reports
             +
+            pipeline_reports_fixture(
+                self.new_nodes, ["remote/set_sbd_config", "remote/sbd_enable"]
+            )
+            +
             [fixture.info(report_codes.SBD_CONFIG_DISTRIBUTION_STARTED)]
             +
             [
@@ -3615,6 +3669,7 @@ class FailureEnableSbd(TestCase):
                     ) for node in self.successful_nodes
                 ]
             )
+            .http.pipeline(["http.sbd.set_sbd_config"])
         )
 
         self._add_nodes_with_lib_error()
@@ -3622,6 +3677,10 @@ class FailureEnableSbd(TestCase):
         self.env_assist.assert_reports(
             self.expected_reports
             +
+            pipeline_reports_fixture(
+                self.new_nodes, ["remote/set_sbd_config"]
+            )
+            +
             [fixture.info(report_codes.SBD_CONFIG_DISTRIBUTION_STARTED)]
             +
             [
@@ -22,6 +22,7 @@ from pcs.common.ssl import (
     generate_key,
 )
 from pcs.lib.commands import cluster
+from pcs.lib.communication.nodes import NODE_ACTIONS_CAPABILITY
 from pcs.lib.corosync import constants
 
 PCSD_SSL_KEY = generate_key()
@@ -168,9 +169,22 @@ def corosync_conf_fixture(
         ),
     )
 
+PREPARE_STEP_LIST = [
+    "http.host.cluster_destroy",
+    "http.host.update_known_hosts",
+    "http.files.remove_files",
+    "http.files.put_files",
+]
+PREPARE_ACTION_LIST = [
+    "remote/cluster_destroy",
+    "remote/known_hosts_change",
+    "remote/remove_file",
+    "remote/put_file",
+]
+
 def config_succes_minimal_fixture(
     config, corosync_conf=None, node_labels=None, communication_list=None,
-    known_hosts=None
+    known_hosts=None, keys_sync=True, pipeline=True
 ):
     if node_labels is None and communication_list is None:
         node_labels = NODE_LIST
@@ -218,24 +232,43 @@ def config_succes_minimal_fixture(
             pcsd_settings=True,
             communication_list=communication_list,
         )
-        .http.files.put_files(
+    )
+    if keys_sync:
+        config.http.files.put_files(
             node_labels=node_labels,
             pcmk_authkey=RANDOM_KEY,
             corosync_authkey=RANDOM_KEY,
             communication_list=communication_list,
         )
-        .http.files.put_files(
-            node_labels=node_labels,
-            corosync_conf=corosync_conf,
-            name="distribute_corosync_conf",
-            communication_list=communication_list,
-        )
+    config.http.files.put_files(
+        node_labels=node_labels,
+        corosync_conf=corosync_conf,
+        name="distribute_corosync_conf",
+        communication_list=communication_list,
     )
+    if pipeline:
+        config.http.pipeline(
+            PREPARE_STEP_LIST if keys_sync else PREPARE_STEP_LIST[:-1]
+        )
+
+def reports_pipeline_fixture(node_list, action_list):
+    return [
+        fixture.debug(
+            report_codes.NODE_COMMUNICATION_PIPELINE_FINISHED,
+            node=node,
+            request_durations=[(action, 0.0) for action in action_list],
+        ) for node in node_list
+    ]
 
 def reports_success_minimal_fixture(
     node_list=None, using_known_hosts_addresses=True, keys_sync=True,
+    pipeline_action_list=None,
 ):
     node_list = node_list or NODE_LIST
+    if pipeline_action_list is None:
+        pipeline_action_list = (
+            PREPARE_ACTION_LIST if keys_sync else PREPARE_ACTION_LIST[:-1]
+        )
     auth_file_list = ["corosync authkey", "pacemaker authkey"]
     pcsd_settings_file = "pcsd settings"
     corosync_conf_file = "corosync.conf"
@@ -248,6 +281,8 @@ def reports_success_minimal_fixture(
             ) for node in node_list if using_known_hosts_addresses
         ]
         +
+        reports_pipeline_fixture(node_list, pipeline_action_list)
+        +
         [
             fixture.info(
                 report_codes.CLUSTER_DESTROY_STARTED,
@@ -373,6 +408,7 @@ class CheckLive(TestCase):
     "pcs.lib.commands.cluster.ssl.generate_cert",
     lambda ssl_key, server_name: PCSD_SSL_CERT
 )
+@mock.patch("pcs.lib.communication.tools.monotonic", lambda: 0.0)
 class SetupSuccessMinimal(TestCase):
     def setUp(self):
         self.env_assist, self.config = get_env_tools(self)
@@ -522,9 +558,20 @@ class SetupSuccessMinimal(TestCase):
             ]
         )
 
+
+@mock.patch("pcs.lib.communication.tools.monotonic", lambda: 0.0)
+class SetupSuccessNoKeysSync(TestCase):
+    def setUp(self):
+        self.env_assist, self.config = get_env_tools(self)
+        self.config.env.set_known_nodes(NODE_LIST)
+        patch_getaddrinfo(self, NODE_LIST)
+        config_succes_minimal_fixture(
+            self.config,
+            corosync_conf=corosync_conf_fixture(COROSYNC_NODE_LIST),
+            keys_sync=False,
+        )
+
     def test_no_keys_sync(self):
-        self.config.calls.remove("http.files.put_files_requests")
-        self.config.calls.remove("http.files.put_files_responses")
         cluster.setup(
             self.env_assist.get_env(),
             CLUSTER_NAME,
@@ -537,6 +584,152 @@ class SetupSuccessMinimal(TestCase):
         )
 
 
+@mock.patch(
+    "pcs.lib.commands.cluster.generate_binary_key",
+    lambda random_bytes_count: RANDOM_KEY,
+)
+@mock.patch("pcs.lib.communication.tools.monotonic", lambda: 0.0)
+class SetupNodeActions(TestCase):
+    def setUp(self):
+        self.env_assist, self.config = get_env_tools(self)
+        self.config.env.set_known_nodes(NODE_LIST)
+        patch_getaddrinfo(self, NODE_LIST)
+
+    def _config(self, node_actions_node_list):
+        other_node_list = [
+            node for node in NODE_LIST if node not in node_actions_node_list
+        ]
+        services_status = {
+            service: dict(
+                installed=True, enabled=False, running=False, version="1.0",
+            ) for service in SERVICE_LIST
+        }
+        (self.config
+            .http.host.get_host_info(
+                communication_list=[
+                    dict(
+                        label=node,
+                        output=json.dumps(dict(
+                            services=services_status,
+                            cluster_configuration_exists=False,
+                            pcsd_capabilities=(
+                                [NODE_ACTIONS_CAPABILITY]
+                                if node in node_actions_node_list else []
+                            ),
+                        )),
+                    ) for node in NODE_LIST
+                ],
+            )
+            .fs.isfile(settings.pcsd_config)
+            .fs.open(
+                settings.pcsd_config,
+                mock.mock_open(read_data="PCSD_SSL_CERT_SYNC_ENABLED=false\n")()
+            )
+            .http.host.cluster_destroy(NODE_LIST)
+            .http.host.update_known_hosts(NODE_LIST, to_add_hosts=NODE_LIST)
+            .http.files.remove_files(
+                node_actions_node_list,
+                pcsd_settings=True,
+                name="node_actions.remove_files",
+            )
+            .http.files.put_files(
+                node_actions_node_list,
+                pcmk_authkey=RANDOM_KEY,
+                corosync_authkey=RANDOM_KEY,
+                name="node_actions.put_files",
+            )
+            .http.node_actions(
+                ["node_actions.remove_files", "node_actions.put_files"]
+            )
+        )
+        step_list = PREPARE_STEP_LIST[:2] + ["http.node_actions"]
+        if other_node_list:
+            (self.config
+                .http.files.remove_files(other_node_list, pcsd_settings=True)
+                .http.files.put_files(
+                    other_node_list,
+                    pcmk_authkey=RANDOM_KEY,
+                    corosync_authkey=RANDOM_KEY,
+                )
+            )
+            step_list.extend(PREPARE_STEP_LIST[2:])
+        (self.config
+            .http.files.put_files(
+                NODE_LIST,
+                corosync_conf=corosync_conf_fixture(COROSYNC_NODE_LIST),
+                name="distribute_corosync_conf",
+            )
+            .http.pipeline(step_list)
+        )
+
+    def test_all_nodes(self):
+        self._config(NODE_LIST)
+        cluster.setup(
+            self.env_assist.get_env(),
+            CLUSTER_NAME,
+            COMMAND_NODE_LIST,
+        )
+        self.env_assist.assert_reports(
+            reports_success_minimal_fixture(
+                pipeline_action_list=(
+                    PREPARE_ACTION_LIST[:2] + ["remote/node_actions"]
+                ),
+            )
+        )
+
+    def test_some_nodes(self):
+        node_actions_node_list = NODE_LIST[1:]
+        other_node_list = NODE_LIST[:1]
+        self._config(node_actions_node_list)
+        cluster.setup(
+            self.env_assist.get_env(),
+            CLUSTER_NAME,
+            COMMAND_NODE_LIST,
+        )
+        file_list = ["corosync authkey", "pacemaker authkey"]
+        self.env_assist.assert_reports(
+            [
+                report for report in reports_success_minimal_fixture()
+                if report[1] not in (
+                    report_codes.NODE_COMMUNICATION_PIPELINE_FINISHED,
+                    report_codes.FILES_REMOVE_FROM_NODES_STARTED,
+                    report_codes.FILES_DISTRIBUTION_STARTED,
+                )
+            ]
+            +
+            reports_pipeline_fixture(
+                node_actions_node_list,
+                PREPARE_ACTION_LIST[:2] + ["remote/node_actions"],
+            )
+            +
+            reports_pipeline_fixture(other_node_list, PREPARE_ACTION_LIST)
+            +
+            [
+                fixture.info(
+                    report_codes.FILES_REMOVE_FROM_NODES_STARTED,
+                    file_list=["pcsd settings"],
+                    node_list=node_list,
+                ) for node_list in (node_actions_node_list, other_node_list)
+            ]
+            +
+            [
+                fixture.info(
+                    report_codes.FILES_DISTRIBUTION_STARTED,
+                    file_list=file_list,
+                    node_list=node_list,
+                ) for node_list in (node_actions_node_list, other_node_list)
+            ]
+            +
+            [
+                fixture.info(
+                    report_codes.FILES_DISTRIBUTION_STARTED,
+                    file_list=["corosync.conf"],
+                    node_list=NODE_LIST,
+                )
+            ]
+        )
+
+
 @mock.patch(
     "pcs.lib.commands.cluster.generate_binary_key",
     lambda random_bytes_count: RANDOM_KEY,
@@ -549,6 +742,7 @@ class SetupSuccessMinimal(TestCase):
     "pcs.lib.commands.cluster.ssl.generate_cert",
     lambda ssl_key, server_name: PCSD_SSL_CERT
 )
+@mock.patch("pcs.lib.communication.tools.monotonic", lambda: 0.0)
 class SetupSuccessAddresses(TestCase):
     def setUp(self):
         self.env_assist, self.config = get_env_tools(self)
@@ -615,6 +809,7 @@ class SetupSuccessAddresses(TestCase):
     "pcs.lib.commands.cluster.ssl.generate_cert",
     lambda ssl_key, server_name: PCSD_SSL_CERT
 )
+@mock.patch("pcs.lib.communication.tools.monotonic", lambda: 0.0)
 class Setup2NodeSuccessMinimal(TestCase):
     def setUp(self):
         self.env_assist, self.config = get_env_tools(self)
@@ -651,6 +846,7 @@ class Setup2NodeSuccessMinimal(TestCase):
                 pcmk_authkey=RANDOM_KEY,
                 corosync_authkey=RANDOM_KEY,
             )
+            .http.pipeline(PREPARE_STEP_LIST)
         )
 
     def test_two_node(self):
@@ -705,6 +901,7 @@ class Setup2NodeSuccessMinimal(TestCase):
     "pcs.lib.commands.cluster.ssl.generate_cert",
     lambda ssl_key, server_name: PCSD_SSL_CERT
 )
+@mock.patch("pcs.lib.communication.tools.monotonic", lambda: 0.0)
 class Validation(TestCase):
     def setUp(self):
         self.env_assist, self.config = get_env_tools(self)
@@ -1807,6 +2004,7 @@ QUORUM_OPTIONS = dict(
     "pcs.lib.commands.cluster.ssl.generate_cert",
     lambda ssl_key, server_name: PCSD_SSL_CERT
 )
+@mock.patch("pcs.lib.communication.tools.monotonic", lambda: 0.0)
 class TransportKnetSuccess(TestCase):
     def setUp(self):
         self.env_assist, self.config = get_env_tools(self)
@@ -1969,6 +2167,7 @@ class TransportKnetSuccess(TestCase):
     "pcs.lib.commands.cluster.ssl.generate_cert",
     lambda ssl_key, server_name: PCSD_SSL_CERT
 )
+@mock.patch("pcs.lib.communication.tools.monotonic", lambda: 0.0)
 class TransportUdpSuccess(TestCase):
     def setUp(self):
         self.env_assist, self.config = get_env_tools(self)
@@ -2047,6 +2246,20 @@ class TransportUdpSuccess(TestCase):
         ))
 
 
+def pacemaker_started_fixture(node):
+    return dict(
+        label=node,
+        output=json.dumps(dict(pending=False, online=True)),
+    )
+
+
+def pacemaker_not_started_fixture(node):
+    return dict(
+        label=node,
+        output=json.dumps(dict(pending=True, online=False)),
+    )
+
+
 def get_time_mock(step=1):
     _counter = 0
     def time():
@@ -2068,6 +2281,7 @@ def get_time_mock(step=1):
     "pcs.lib.commands.cluster.ssl.generate_cert",
     lambda ssl_key, server_name: PCSD_SSL_CERT
 )
+@mock.patch("pcs.lib.communication.tools.monotonic", lambda: 0.0)
 class SetupWithWait(TestCase):
     def setUp(self):
         self.env_assist, self.config = get_env_tools(self)
@@ -2107,6 +2321,7 @@ class SetupWithWait(TestCase):
                 ),
                 name="distribute_corosync_conf",
             )
+            .http.pipeline(PREPARE_STEP_LIST)
             .http.host.start_cluster(NODE_LIST)
         )
 
@@ -2140,11 +2355,9 @@ class SetupWithWait(TestCase):
             [
                 fixture.info(
                     report_codes.CLUSTER_START_SUCCESS,
-                    node=node,
-                ) for node in NODE_LIST[:1]
-            ]
-            +
-            [
+                    node=NODE_LIST[0],
+                    time_to_ready=2,
+                ),
                 fixture.error(report_codes.WAIT_FOR_NODE_STARTUP_TIMED_OUT),
                 fixture.error(report_codes.WAIT_FOR_NODE_STARTUP_ERROR),
             ]
@@ -2179,31 +2392,26 @@ class SetupWithWait(TestCase):
     @mock.patch("time.sleep", lambda secs: None)
     @mock.patch("time.time", get_time_mock())
     def test_multiple_tries(self):
-        (self.config
-            .http.host.check_pacemaker_started(
-                pacemaker_started_node_list=NODE_LIST[:1],
-                pacemaker_not_started_node_list=NODE_LIST[1:],
-            )
-            .http.host.check_pacemaker_started(
-                pacemaker_not_started_node_list=NODE_LIST[1:],
-                name="pcmk_status_check_1"
-            )
-            .http.host.check_pacemaker_started(
-                pacemaker_started_node_list=NODE_LIST[1:2],
-                pacemaker_not_started_node_list=NODE_LIST[2:],
-                name="pcmk_status_check_2"
-            )
-            .http.host.check_pacemaker_started(
-                pacemaker_started_node_list=NODE_LIST[2:3],
-                name="pcmk_status_check_3"
-            )
+        # Each node is polled again right after its response, nodes are not
+        # polled anymore once they have started.
+        self.config.http.host.check_pacemaker_started(
+            communication_list=[
+                [
+                    pacemaker_started_fixture(NODE_LIST[0]),
+                    pacemaker_not_started_fixture(NODE_LIST[1]),
+                    pacemaker_not_started_fixture(NODE_LIST[2]),
+                ],
+                [pacemaker_not_started_fixture(NODE_LIST[1])],
+                [pacemaker_started_fixture(NODE_LIST[2])],
+                [pacemaker_started_fixture(NODE_LIST[1])],
+            ]
         )
         cluster.setup(
             self.env_assist.get_env(),
             CLUSTER_NAME,
             [dict(name=node, addrs=None) for node in NODE_LIST],
             start=True,
-            wait=5,
+            wait=10,
         )
         self.env_assist.assert_reports(
             reports_success_minimal_fixture()
@@ -2214,29 +2422,31 @@ class SetupWithWait(TestCase):
                     report_codes.WAIT_FOR_NODE_STARTUP_STARTED,
                     node_name_list=NODE_LIST,
                 ),
-            ]
-            +
-            [
                 fixture.info(
                     report_codes.CLUSTER_START_SUCCESS,
-                    node=node,
-                ) for node in NODE_LIST
+                    node=NODE_LIST[0],
+                    time_to_ready=2,
+                ),
+                fixture.info(
+                    report_codes.CLUSTER_START_SUCCESS,
+                    node=NODE_LIST[2],
+                    time_to_ready=6,
+                ),
+                fixture.info(
+                    report_codes.CLUSTER_START_SUCCESS,
+                    node=NODE_LIST[1],
+                    time_to_ready=7,
+                ),
             ]
         )
 
     @mock.patch("time.sleep", lambda secs: None)
     @mock.patch("time.time", get_time_mock())
     def test_fails(self):
-        node_not_started = dict(
-            label=NODE_LIST[2],
-            output=json.dumps(dict(
-                pending=True,
-                online=False,
-            )),
-        )
-        (self.config
-            .http.host.check_pacemaker_started(
-                communication_list=[
+        node_not_started = pacemaker_not_started_fixture(NODE_LIST[2])
+        self.config.http.host.check_pacemaker_started(
+            communication_list=[
+                [
                     dict(
                         label=NODE_LIST[0],
                         was_connected=False,
@@ -2248,21 +2458,15 @@ class SetupWithWait(TestCase):
                     ),
                     node_not_started,
                 ],
-            )
-            .http.host.check_pacemaker_started(
-                communication_list=[
+                [
                     dict(
                         label=NODE_LIST[0],
                         response_code=400,
                     ),
-                    node_not_started,
                 ],
-                name="pcmk_status_check_2"
-            )
-            .http.host.check_pacemaker_started(
-                pacemaker_started_node_list=NODE_LIST[2:3],
-                name="pcmk_status_check_3"
-            )
+                [node_not_started],
+                [pacemaker_started_fixture(NODE_LIST[2])],
+            ]
         )
         self.env_assist.assert_raise_library_error(
             lambda: cluster.setup(
@@ -2287,17 +2491,7 @@ class SetupWithWait(TestCase):
                     node=NODE_LIST[0],
                     command="remote/pacemaker_node_status",
                     reason="error",
-                )
-            ]
-            +
-            [
-                fixture.info(
-                    report_codes.CLUSTER_START_SUCCESS,
-                    node=node,
-                ) for node in NODE_LIST[2:3]
-            ]
-            +
-            [
+                ),
                 fixture.error(
                     report_codes.INVALID_RESPONSE_FORMAT, node=NODE_LIST[1]
                 ),
@@ -2307,6 +2501,11 @@ class SetupWithWait(TestCase):
                     command="remote/pacemaker_node_status",
                     reason="",
                 ),
+                fixture.info(
+                    report_codes.CLUSTER_START_SUCCESS,
+                    node=NODE_LIST[2],
+                    time_to_ready=5,
+                ),
                 fixture.error(report_codes.WAIT_FOR_NODE_STARTUP_ERROR),
             ]
         )
@@ -2314,9 +2513,9 @@ class SetupWithWait(TestCase):
     @mock.patch("time.sleep", lambda secs: None)
     @mock.patch("time.time", get_time_mock())
     def test_fails_and_timed_out(self):
-        (self.config
-            .http.host.check_pacemaker_started(
-                communication_list=[
+        self.config.http.host.check_pacemaker_started(
+            communication_list=[
+                [
                     dict(
                         label=NODE_LIST[0],
                         was_connected=False,
@@ -2326,20 +2525,10 @@ class SetupWithWait(TestCase):
                         label=NODE_LIST[1],
                         output="not json"
                     ),
-                    dict(
-                        label=NODE_LIST[2],
-                        output=json.dumps(dict(
-                            pending=True,
-                            online=False,
-                        )),
-                    ),
+                    pacemaker_not_started_fixture(NODE_LIST[2]),
                 ],
-            )
-            .http.host.check_pacemaker_started(
-                pacemaker_started_node_list=[NODE_LIST[0]],
-                pacemaker_not_started_node_list=[NODE_LIST[2]],
-                name="pcmk_status_check_1"
-            )
+                [pacemaker_started_fixture(NODE_LIST[0])],
+            ]
         )
         self.env_assist.assert_raise_library_error(
             lambda: cluster.setup(
@@ -2374,11 +2563,9 @@ class SetupWithWait(TestCase):
             [
                 fixture.info(
                     report_codes.CLUSTER_START_SUCCESS,
-                    node=node,
-                ) for node in NODE_LIST[:1]
-            ]
-            +
-            [
+                    node=NODE_LIST[0],
+                    time_to_ready=4,
+                ),
                 fixture.error(report_codes.WAIT_FOR_NODE_STARTUP_TIMED_OUT),
                 fixture.error(report_codes.WAIT_FOR_NODE_STARTUP_ERROR),
             ]
@@ -2399,6 +2586,7 @@ REASON = "error msg"
     "pcs.lib.commands.cluster.ssl.generate_cert",
     lambda ssl_key, server_name: PCSD_SSL_CERT
 )
+@mock.patch("pcs.lib.communication.tools.monotonic", lambda: 0.0)
 class Failures(RemoveCallsMixin, TestCase):
     def setUp(self):
         self.env_assist, self.config = get_env_tools(self)
@@ -2425,6 +2613,7 @@ class Failures(RemoveCallsMixin, TestCase):
         config_succes_minimal_fixture(
             self.config,
             corosync_conf=corosync_conf_fixture(COROSYNC_NODE_LIST),
+            pipeline=False,
         )
 
     def _get_failure_reports(self, command):
@@ -2451,6 +2640,7 @@ class Failures(RemoveCallsMixin, TestCase):
                 communication_list=self.communication_list,
             )
         )
+        self.config.http.pipeline(PREPARE_STEP_LIST)
         self.env_assist.assert_raise_library_error(
             lambda: cluster.setup(
                 self.env_assist.get_env(),
@@ -2480,6 +2670,7 @@ class Failures(RemoveCallsMixin, TestCase):
         self.config.http.host.enable_cluster(
             communication_list=self.communication_list,
         )
+        self.config.http.pipeline(PREPARE_STEP_LIST)
         self.env_assist.assert_raise_library_error(
             lambda: cluster.setup(
                 self.env_assist.get_env(),
@@ -2510,6 +2701,7 @@ class Failures(RemoveCallsMixin, TestCase):
             corosync_conf=corosync_conf_fixture(COROSYNC_NODE_LIST),
             name="distribute_corosync_conf",
         )
+        self.config.http.pipeline(PREPARE_STEP_LIST)
         self.env_assist.assert_raise_library_error(
             lambda: cluster.setup(
                 self.env_assist.get_env(),
@@ -2555,6 +2747,7 @@ class Failures(RemoveCallsMixin, TestCase):
             corosync_conf=corosync_conf_fixture(COROSYNC_NODE_LIST),
             name="distribute_corosync_conf",
         )
+        self.config.http.pipeline(PREPARE_STEP_LIST)
         self.env_assist.assert_raise_library_error(
             lambda: cluster.setup(
                 self.env_assist.get_env(),
@@ -2600,6 +2793,7 @@ class Failures(RemoveCallsMixin, TestCase):
             corosync_conf=corosync_conf_fixture(COROSYNC_NODE_LIST),
             name="distribute_corosync_conf",
         )
+        self.config.http.pipeline(PREPARE_STEP_LIST)
         self.env_assist.assert_raise_library_error(
             lambda: cluster.setup(
                 self.env_assist.get_env(),
@@ -2636,6 +2830,7 @@ class Failures(RemoveCallsMixin, TestCase):
             communication_list=self.communication_list,
             pcsd_settings=True,
         )
+        self.config.http.pipeline(PREPARE_STEP_LIST[:3])
         self.env_assist.assert_raise_library_error(
             lambda: cluster.setup(
                 self.env_assist.get_env(),
@@ -2647,7 +2842,9 @@ class Failures(RemoveCallsMixin, TestCase):
             []
         )
         self.env_assist.assert_reports(
-            reports_success_minimal_fixture()[:-15]
+            reports_success_minimal_fixture(
+                pipeline_action_list=PREPARE_ACTION_LIST[:3],
+            )[:-15]
             +
             [
                 fixture.info(
@@ -2680,6 +2877,7 @@ class Failures(RemoveCallsMixin, TestCase):
             ],
             pcsd_settings=True,
         )
+        self.config.http.pipeline(PREPARE_STEP_LIST[:3])
         self.env_assist.assert_raise_library_error(
             lambda: cluster.setup(
                 self.env_assist.get_env(),
@@ -2691,7 +2889,9 @@ class Failures(RemoveCallsMixin, TestCase):
             []
         )
         self.env_assist.assert_reports(
-            reports_success_minimal_fixture()[:-15]
+            reports_success_minimal_fixture(
+                pipeline_action_list=PREPARE_ACTION_LIST[:3],
+            )[:-15]
             +
             [
                 fixture.info(
@@ -2724,6 +2924,7 @@ class Failures(RemoveCallsMixin, TestCase):
             ],
             pcsd_settings=True,
         )
+        self.config.http.pipeline(PREPARE_STEP_LIST[:3])
         self.env_assist.assert_raise_library_error(
             lambda: cluster.setup(
                 self.env_assist.get_env(),
@@ -2735,7 +2936,9 @@ class Failures(RemoveCallsMixin, TestCase):
             []
         )
         self.env_assist.assert_reports(
-            reports_success_minimal_fixture()[:-15]
+            reports_success_minimal_fixture(
+                pipeline_action_list=PREPARE_ACTION_LIST[:3],
+            )[:-15]
             +
             [
                 fixture.info(
@@ -2793,6 +2996,7 @@ class Failures(RemoveCallsMixin, TestCase):
             pcmk_authkey=RANDOM_KEY,
             corosync_authkey=RANDOM_KEY,
         )
+        self.config.http.pipeline(PREPARE_STEP_LIST)
         self.env_assist.assert_raise_library_error(
             lambda: cluster.setup(
                 self.env_assist.get_env(),
@@ -2856,6 +3060,7 @@ class Failures(RemoveCallsMixin, TestCase):
             pcmk_authkey=RANDOM_KEY,
             corosync_authkey=RANDOM_KEY,
         )
+        self.config.http.pipeline(PREPARE_STEP_LIST)
         self.env_assist.assert_raise_library_error(
             lambda: cluster.setup(
                 self.env_assist.get_env(),
@@ -2894,6 +3099,7 @@ class Failures(RemoveCallsMixin, TestCase):
             pcmk_authkey=RANDOM_KEY,
             corosync_authkey=RANDOM_KEY,
         )
+        self.config.http.pipeline(PREPARE_STEP_LIST)
         self.env_assist.assert_raise_library_error(
             lambda: cluster.setup(
                 self.env_assist.get_env(),
@@ -2926,6 +3132,7 @@ class Failures(RemoveCallsMixin, TestCase):
             communication_list=self.communication_list,
             to_add_hosts=NODE_LIST
         )
+        self.config.http.pipeline(PREPARE_STEP_LIST[:2])
         self.env_assist.assert_raise_library_error(
             lambda: cluster.setup(
                 self.env_assist.get_env(),
@@ -2937,7 +3144,9 @@ class Failures(RemoveCallsMixin, TestCase):
             []
         )
         self.env_assist.assert_reports(
-            reports_success_minimal_fixture()[:-16]
+            reports_success_minimal_fixture(
+                pipeline_action_list=PREPARE_ACTION_LIST[:2],
+            )[:-16]
             +
             self._get_failure_reports("remote/known_hosts_change")
         )
@@ -2947,6 +3156,7 @@ class Failures(RemoveCallsMixin, TestCase):
         self.config.http.host.cluster_destroy(
             communication_list=self.communication_list,
         )
+        self.config.http.pipeline(PREPARE_STEP_LIST[:1])
         self.env_assist.assert_raise_library_error(
             lambda: cluster.setup(
                 self.env_assist.get_env(),
@@ -2958,7 +3168,9 @@ class Failures(RemoveCallsMixin, TestCase):
             []
         )
         self.env_assist.assert_reports(
-            reports_success_minimal_fixture()[:-19]
+            reports_success_minimal_fixture(
+                pipeline_action_list=PREPARE_ACTION_LIST[:1],
+            )[:-19]
             +
             [
                 fixture.info(
@@ -2976,6 +3188,7 @@ class Failures(RemoveCallsMixin, TestCase):
     "pcs.lib.commands.cluster.generate_binary_key",
     lambda random_bytes_count: RANDOM_KEY,
 )
+@mock.patch("pcs.lib.communication.tools.monotonic", lambda: 0.0)
 class SslCertSync(RemoveCallsMixin, TestCase):
     def setUp(self):
         self.env_assist, self.config = get_env_tools(self)
@@ -2984,6 +3197,7 @@ class SslCertSync(RemoveCallsMixin, TestCase):
         config_succes_minimal_fixture(
             self.config,
             corosync_conf=corosync_conf_fixture(COROSYNC_NODE_LIST),
+            pipeline=False,
         )
 
     def test_sync_disabled(self):
@@ -2994,6 +3208,7 @@ class SslCertSync(RemoveCallsMixin, TestCase):
             instead="fs.open.pcsd_config",
         )
 
+        self.config.http.pipeline(PREPARE_STEP_LIST)
         cluster.setup(
             self.env_assist.get_env(),
             CLUSTER_NAME,
@@ -3009,6 +3224,7 @@ class SslCertSync(RemoveCallsMixin, TestCase):
             instead="fs.open.pcsd_config",
         )
 
+        self.config.http.pipeline(PREPARE_STEP_LIST)
         cluster.setup(
             self.env_assist.get_env(),
             CLUSTER_NAME,
@@ -3024,6 +3240,7 @@ class SslCertSync(RemoveCallsMixin, TestCase):
             instead="fs.open.pcsd_config",
         )
 
+        self.config.http.pipeline(PREPARE_STEP_LIST)
         cluster.setup(
             self.env_assist.get_env(),
             CLUSTER_NAME,
@@ -3040,6 +3257,7 @@ class SslCertSync(RemoveCallsMixin, TestCase):
         )
         self.config.calls.remove("fs.open.pcsd_config")
 
+        self.config.http.pipeline(PREPARE_STEP_LIST)
         cluster.setup(
             self.env_assist.get_env(),
             CLUSTER_NAME,
@@ -3106,13 +3324,18 @@ class SslCertSync(RemoveCallsMixin, TestCase):
             before="distribute_corosync_conf_requests"
         )
 
+        self.config.http.pipeline(
+            PREPARE_STEP_LIST + ["http.host.send_pcsd_cert"]
+        )
         cluster.setup(
             self.env_assist.get_env(),
             CLUSTER_NAME,
             COMMAND_NODE_LIST,
         )
         self.env_assist.assert_reports(
-            reports_success_minimal_fixture()
+            reports_success_minimal_fixture(
+                pipeline_action_list=PREPARE_ACTION_LIST + ["remote/set_certs"],
+            )
             +
             [
                 fixture.info(
@@ -3158,6 +3381,9 @@ class SslCertSync(RemoveCallsMixin, TestCase):
                 dict(label=node) for node in NODE_LIST[1:]
             ]
         )
+        self.config.http.pipeline(
+            PREPARE_STEP_LIST + ["http.host.send_pcsd_cert"]
+        )
         self.env_assist.assert_raise_library_error(
             lambda: cluster.setup(
                 self.env_assist.get_env(),
@@ -3167,7 +3393,9 @@ class SslCertSync(RemoveCallsMixin, TestCase):
             []
         )
         self.env_assist.assert_reports(
-            reports_success_minimal_fixture()[:-5]
+            reports_success_minimal_fixture(
+                pipeline_action_list=PREPARE_ACTION_LIST + ["remote/set_certs"],
+            )[:-5]
             +
             [
                 fixture.info(
@@ -0,0 +1,170 @@
+import hashlib
+import json
+from unittest import TestCase
+
+from pcs_test.tools import fixture
+from pcs_test.tools.command_env import get_env_tools
+from pcs_test.tools.misc import get_test_resource as rc
+
+from pcs.common import report_codes
+from pcs.lib.commands import cluster
+
+FILE_LIST = {"corosync.conf": dict(type="corosync_conf")}
+
+
+class SyncCorosyncConf(TestCase):
+    def setUp(self):
+        self.env_assist, self.config = get_env_tools(self)
+        self.node_list = ["rh7-1", "rh7-2"]
+        self.config.env.set_known_nodes(self.node_list)
+        with open(rc("corosync.conf")) as a_file:
+            self.corosync_conf = a_file.read()
+        self.digest = hashlib.sha256(
+            self.corosync_conf.encode("utf-8")
+        ).hexdigest()
+
+    def fixture_digests_output(self, digest):
+        return json.dumps(dict(files={"corosync.conf": dict(digest=digest)}))
+
+    def fixture_reports_sent(self, node_list):
+        return [
+            fixture.info(report_codes.COROSYNC_CONFIG_DISTRIBUTION_STARTED)
+        ] + [
+            fixture.info(
+                report_codes.COROSYNC_CONFIG_ACCEPTED_BY_NODE, node=node
+            )
+            for node in node_list
+        ]
+
+    def test_live_corosync_conf_required(self):
+        self.config.env.set_corosync_conf_data(self.corosync_conf)
+        self.env_assist.assert_raise_library_error(
+            lambda: cluster.sync_corosync_conf(self.env_assist.get_env()),
+            [
+                fixture.error(
+                    report_codes.LIVE_ENVIRONMENT_REQUIRED,
+                    forbidden_options=["COROSYNC_CONF"]
+                )
+            ],
+            expected_in_processor=False
+        )
+
+    def test_success(self):
+        (self.config
+            .corosync_conf.load()
+            .http.files.get_file_digests(
+                FILE_LIST, node_labels=self.node_list
+            )
+            .http.corosync.set_corosync_conf(
+                self.corosync_conf, node_labels=self.node_list
+            )
+        )
+        cluster.sync_corosync_conf(self.env_assist.get_env())
+        self.env_assist.assert_reports(
+            self.fixture_reports_sent(self.node_list)
+        )
+
+    def test_same_content_on_all_nodes(self):
+        (self.config
+            .corosync_conf.load()
+            .http.files.get_file_digests(
+                FILE_LIST,
+                digests={"corosync.conf": self.digest},
+                node_labels=self.node_list,
+            )
+        )
+        cluster.sync_corosync_conf(self.env_assist.get_env())
+        self.env_assist.assert_reports([
+            fixture.info(
+                report_codes.FILES_DISTRIBUTION_SKIPPED_SAME_CONTENT,
+                node=node,
+                file_list=["corosync.conf"],
+            )
+            for node in self.node_list
+        ])
+
+    def test_same_content_on_some_nodes(self):
+        (self.config
+            .corosync_conf.load()
+            .http.files.get_file_digests(
+                FILE_LIST,
+                communication_list=[
+                    dict(
+                        label=self.node_list[0],
+                        output=self.fixture_digests_output("other"),
+                    ),
+                    dict(
+                        label=self.node_list[1],
+                        output=self.fixture_digests_output(self.digest),
+                    ),
+                ],
+            )
+            .http.corosync.set_corosync_conf(
+                self.corosync_conf, node_labels=self.node_list[:1]
+            )
+        )
+        cluster.sync_corosync_conf(self.env_assist.get_env())
+        self.env_assist.assert_reports(
+            [
+                fixture.info(
+                    report_codes.FILES_DISTRIBUTION_SKIPPED_SAME_CONTENT,
+                    node=self.node_list[1],
+                    file_list=["corosync.conf"],
+                ),
+            ]
+            +
+            self.fixture_reports_sent(self.node_list[:1])
+        )
+
+    def test_node_offline(self):
+        (self.config
+            .corosync_conf.load()
+            .http.files.get_file_digests(
+                FILE_LIST,
+                communication_list=[
+                    dict(
+                        label=self.node_list[0],
+                        errno=1,
+                        error_msg="error",
+                        was_connected=False,
+                    ),
+                    dict(
+                        label=self.node_list[1],
+                    ),
+                ],
+            )
+            .http.corosync.set_corosync_conf(
+                self.corosync_conf,
+                communication_list=[
+                    dict(
+                        label=self.node_list[0],
+                        errno=1,
+                        error_msg="error",
+                        was_connected=False,
+                    ),
+                    dict(
+                        label=self.node_list[1],
+                    ),
+                ],
+            )
+        )
+        self.env_assist.assert_raise_library_error(
+            lambda: cluster.sync_corosync_conf(self.env_assist.get_env()),
+            []
+        )
+        self.env_assist.assert_reports(
+            self.fixture_reports_sent(self.node_list[1:])
+            +
+            [
+                fixture.error(
+                    report_codes.NODE_COMMUNICATION_ERROR_UNABLE_TO_CONNECT,
+                    node=self.node_list[0],
+                    command="remote/set_corosync_conf",
+                    reason="error",
+                ),
+                fixture.error(
+                    report_codes.COROSYNC_CONFIG_DISTRIBUTION_NODE_ERROR,
+                    node=self.node_list[0],
+                ),
+            ]
+        )
@@ -60,14 +60,16 @@ class CibAsWholeValid(TestCase):
 
     def test_success_on_valid(self):
         (self.config
-            .runner.cib.load()
+            .runner.cib.load(with_status=True)
             .runner.pcmk.load_state()
         )
         verify(self.env_assist.get_env())
 
     def test_fail_on_invalid_fence_topology(self):
         (self.config
-            .runner.cib.load(optional_in_conf=BAD_FENCING_TOPOLOGY)
+            .runner.cib.load(
+                optional_in_conf=BAD_FENCING_TOPOLOGY, with_status=True
+            )
             .runner.pcmk.load_state()
         )
         self.env_assist.assert_raise_library_error(
@@ -84,12 +86,12 @@ class CibAsWholeInvalid(TestCase, AssertInvalidCibMixin):
         )
 
     def test_fail_immediately_on_unloadable_cib(self):
-        self.config.runner.cib.load(returncode=1)
+        self.config.runner.cib.load(returncode=1, with_status=True)
         self.assert_raises_invalid_cib_content(CRM_VERIFY_ERROR_REPORT_LINES[0])
 
     def test_continue_on_loadable_cib(self):
         (self.config
-            .runner.cib.load()
+            .runner.cib.load(with_status=True)
             .runner.pcmk.load_state()
         )
         self.assert_raises_invalid_cib_content(CRM_VERIFY_ERROR_REPORT_LINES[0])
@@ -98,7 +100,9 @@ class CibAsWholeInvalid(TestCase, AssertInvalidCibMixin):
         #More fencing topology tests are provided by tests of
         #pcs.lib.commands.fencing_topology
         (self.config
-            .runner.cib.load(optional_in_conf=BAD_FENCING_TOPOLOGY)
+            .runner.cib.load(
+                optional_in_conf=BAD_FENCING_TOPOLOGY, with_status=True
+            )
             .runner.pcmk.load_state()
         )
         self.assert_raises_invalid_cib_content(
@@ -115,7 +119,7 @@ class CibIsMocked(TestCase, AssertInvalidCibMixin):
     def test_success_on_valid_cib(self):
         (self.config
             .runner.pcmk.verify(cib_tempfile=self.cib_tempfile)
-            .runner.cib.load()
+            .runner.cib.load(with_status=True)
             .runner.pcmk.load_state()
         )
         verify(self.env_assist.get_env())
@@ -126,7 +130,7 @@ class CibIsMocked(TestCase, AssertInvalidCibMixin):
                 stderr="".join(CRM_VERIFY_ERROR_REPORT_LINES),
                 cib_tempfile=self.cib_tempfile,
             )
-            .runner.cib.load()
+            .runner.cib.load(with_status=True)
             .runner.pcmk.load_state()
         )
         self.assert_raises_invalid_cib_content(CRM_VERIFY_ERROR_REPORT_LINES[0])
@@ -139,7 +143,7 @@ class VerboseMode(TestCase, AssertInvalidCibMixin):
     def test_success_on_valid_cib(self):
         (self.config
             .runner.pcmk.verify(verbose=True)
-            .runner.cib.load()
+            .runner.cib.load(with_status=True)
             .runner.pcmk.load_state()
         )
         verify(self.env_assist.get_env(), verbose=True)
@@ -150,7 +154,7 @@ class VerboseMode(TestCase, AssertInvalidCibMixin):
                 stderr=CRM_VERIFY_ERROR_REPORT_LINES[0],
                 verbose=True,
             )
-            .runner.cib.load()
+            .runner.cib.load(with_status=True)
             .runner.pcmk.load_state()
         )
         self.assert_raises_invalid_cib_content(
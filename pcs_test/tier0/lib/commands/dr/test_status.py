@@ -1,5 +1,6 @@
 import json
 import re
+from collections import deque
 from unittest import TestCase
 
 from pcs import settings
@@ -49,6 +50,40 @@ class CheckLive(TestCase):
             file_type_codes.COROSYNC_CONF,
         ])
 
+ERROR_REPORT_LIST = [
+    {
+        "severity": "ERROR",
+        "code": "CRM_MON_ERROR",
+        "info": {
+            "reason": REASON,
+        },
+        "forceable": None,
+        "report_text": "translated report",
+    }
+]
+
+def fixture_success(label, status):
+    return dict(
+        label=label,
+        output=json.dumps(dict(
+            status="success",
+            status_msg="",
+            data=status,
+            report_list=[],
+        )),
+    )
+
+def fixture_error(label):
+    return dict(
+        label=label,
+        output=json.dumps(dict(
+            status="error",
+            status_msg="",
+            data=None,
+            report_list=ERROR_REPORT_LIST,
+        )),
+    )
+
 class FixtureMixin():
     def _set_up(self, local_node_count=2):
         self.local_node_name_list = [
@@ -91,6 +126,61 @@ class FixtureMixin():
             .corosync_conf.load(node_name_list=self.local_node_name_list)
         )
 
+    def _fixture_status_calls(
+        self, local_communication_list, remote_communication_list,
+        local_target_list=None, remote_target_list=None, **kwargs
+    ):
+        # All sites are asked at once. The next node of a site is asked as
+        # well when the previous node is slow to respond (which never happens
+        # in tests, so the hedging request gets cancelled) or right away when
+        # the previous node fails.
+        def _hedge(target_list, index):
+            return [
+                dict(label=label, cancelled=True)
+                for label in target_list[index:index + 1]
+            ]
+
+        site_list = [
+            (
+                local_communication_list,
+                local_target_list if local_target_list is not None
+                else self.local_node_name_list
+            ),
+            (
+                remote_communication_list,
+                remote_target_list if remote_target_list is not None
+                else self.remote_node_name_list
+            ),
+        ]
+        first_requests = []
+        waiting_sites = deque()
+        for site_communication_list, target_list in site_list:
+            if site_communication_list:
+                first_requests.append(site_communication_list[0])
+                first_requests.extend(_hedge(target_list, 1))
+                waiting_sites.append((site_communication_list, target_list, 0))
+        communication_list = [first_requests]
+        while waiting_sites:
+            site_communication_list, target_list, index = (
+                waiting_sites.popleft()
+            )
+            index += 1
+            if index < len(site_communication_list):
+                communication_list.append(
+                    [site_communication_list[index]]
+                    +
+                    _hedge(target_list, index + 1)
+                )
+                waiting_sites.append(
+                    (site_communication_list, target_list, index)
+                )
+        self.config.http.status.get_full_cluster_status_plaintext(
+            communication_list=(
+                communication_list if first_requests else []
+            ),
+            **kwargs
+        )
+
     def _fixture_result(self, local_success=True, remote_success=True):
         return [
             {
@@ -116,21 +206,15 @@ class Success(FixtureMixin, TestCase):
 
     def _assert_success(self, hide_inactive_resources, verbose):
         self._fixture_load_configs()
-        (self.config
-            .http.status.get_full_cluster_status_plaintext(
-                name="http.status.get_full_cluster_status_plaintext.local",
-                node_labels=self.local_node_name_list[:1],
-                hide_inactive_resources=hide_inactive_resources,
-                verbose=verbose,
-                cluster_status_plaintext=self.local_status,
-            )
-            .http.status.get_full_cluster_status_plaintext(
-                name="http.status.get_full_cluster_status_plaintext.remote",
-                node_labels=self.remote_node_name_list[:1],
-                hide_inactive_resources=hide_inactive_resources,
-                verbose=verbose,
-                cluster_status_plaintext=self.remote_status,
-            )
+        self._fixture_status_calls(
+            [fixture_success(self.local_node_name_list[0], self.local_status)],
+            [
+                fixture_success(
+                    self.remote_node_name_list[0], self.remote_status
+                )
+            ],
+            hide_inactive_resources=hide_inactive_resources,
+            verbose=verbose,
         )
         result = dr.status_all_sites_plaintext(
             self.env_assist.get_env(),
@@ -153,40 +237,18 @@ class Success(FixtureMixin, TestCase):
 
     def test_local_not_running_first_node(self):
         self._fixture_load_configs()
-        (self.config
-            .http.status.get_full_cluster_status_plaintext(
-                name="http.status.get_full_cluster_status_plaintext.local",
-                cluster_status_plaintext=self.local_status,
-                communication_list=[
-                    [dict(
-                        label=self.local_node_name_list[0],
-                        output=json.dumps(dict(
-                            status="error",
-                            status_msg="",
-                            data=None,
-                            report_list=[
-                                {
-                                    "severity": "ERROR",
-                                    "code": "CRM_MON_ERROR",
-                                    "info": {
-                                        "reason": REASON,
-                                    },
-                                    "forceable": None,
-                                    "report_text": "translated report",
-                                }
-                            ]
-                        )),
-                    )],
-                    [dict(
-                        label=self.local_node_name_list[1],
-                    )],
-                ]
-            )
-            .http.status.get_full_cluster_status_plaintext(
-                name="http.status.get_full_cluster_status_plaintext.remote",
-                node_labels=self.remote_node_name_list[:1],
-                cluster_status_plaintext=self.remote_status,
-            )
+        self._fixture_status_calls(
+            [
+                fixture_error(self.local_node_name_list[0]),
+                fixture_success(
+                    self.local_node_name_list[1], self.local_status
+                ),
+            ],
+            [
+                fixture_success(
+                    self.remote_node_name_list[0], self.remote_status
+                )
+            ],
         )
         result = dr.status_all_sites_plaintext(self.env_assist.get_env())
         self.assertEqual(result, self._fixture_result())
@@ -201,37 +263,13 @@ class Success(FixtureMixin, TestCase):
 
     def test_local_not_running(self):
         self._fixture_load_configs()
-        (self.config
-            .http.status.get_full_cluster_status_plaintext(
-                name="http.status.get_full_cluster_status_plaintext.local",
-                cmd_status="error",
-                cmd_status_msg="",
-                cluster_status_plaintext="",
-                report_list=[
-                    {
-                        "severity": "ERROR",
-                        "code": "CRM_MON_ERROR",
-                        "info": {
-                            "reason": REASON,
-                        },
-                        "forceable": None,
-                        "report_text": "translated report",
-                    }
-                ],
-                communication_list=[
-                    [dict(
-                        label=self.local_node_name_list[0],
-                    )],
-                    [dict(
-                        label=self.local_node_name_list[1],
-                    )],
-                ]
-            )
-            .http.status.get_full_cluster_status_plaintext(
-                name="http.status.get_full_cluster_status_plaintext.remote",
-                node_labels=self.remote_node_name_list[:1],
-                cluster_status_plaintext=self.remote_status,
-            )
+        self._fixture_status_calls(
+            [fixture_error(node) for node in self.local_node_name_list],
+            [
+                fixture_success(
+                    self.remote_node_name_list[0], self.remote_status
+                )
+            ],
         )
         result = dr.status_all_sites_plaintext(self.env_assist.get_env())
         self.assertEqual(result, self._fixture_result(local_success=False))
@@ -249,30 +287,9 @@ class Success(FixtureMixin, TestCase):
 
     def test_remote_not_running(self):
         self._fixture_load_configs()
-        (self.config
-            .http.status.get_full_cluster_status_plaintext(
-                name="http.status.get_full_cluster_status_plaintext.local",
-                node_labels=self.local_node_name_list[:1],
-                cluster_status_plaintext=self.local_status,
-            )
-            .http.status.get_full_cluster_status_plaintext(
-                name="http.status.get_full_cluster_status_plaintext.remote",
-                node_labels=self.remote_node_name_list[:1],
-                cmd_status="error",
-                cmd_status_msg="",
-                cluster_status_plaintext="",
-                report_list=[
-                    {
-                        "severity": "ERROR",
-                        "code": "CRM_MON_ERROR",
-                        "info": {
-                            "reason": REASON,
-                        },
-                        "forceable": None,
-                        "report_text": "translated report",
-                    }
-                ],
-            )
+        self._fixture_status_calls(
+            [fixture_success(self.local_node_name_list[0], self.local_status)],
+            [fixture_error(node) for node in self.remote_node_name_list],
         )
         result = dr.status_all_sites_plaintext(self.env_assist.get_env())
         self.assertEqual(result, self._fixture_result(remote_success=False))
@@ -290,50 +307,9 @@ class Success(FixtureMixin, TestCase):
 
     def test_both_not_running(self):
         self._fixture_load_configs()
-        (self.config
-            .http.status.get_full_cluster_status_plaintext(
-                name="http.status.get_full_cluster_status_plaintext.local",
-                cmd_status="error",
-                cmd_status_msg="",
-                cluster_status_plaintext="",
-                report_list=[
-                    {
-                        "severity": "ERROR",
-                        "code": "CRM_MON_ERROR",
-                        "info": {
-                            "reason": REASON,
-                        },
-                        "forceable": None,
-                        "report_text": "translated report",
-                    }
-                ],
-                communication_list=[
-                    [dict(
-                        label=self.local_node_name_list[0],
-                    )],
-                    [dict(
-                        label=self.local_node_name_list[1],
-                    )],
-                ]
-            )
-            .http.status.get_full_cluster_status_plaintext(
-                name="http.status.get_full_cluster_status_plaintext.remote",
-                node_labels=self.remote_node_name_list[:1],
-                cmd_status="error",
-                cmd_status_msg="",
-                cluster_status_plaintext="",
-                report_list=[
-                    {
-                        "severity": "ERROR",
-                        "code": "CRM_MON_ERROR",
-                        "info": {
-                            "reason": REASON,
-                        },
-                        "forceable": None,
-                        "report_text": "translated report",
-                    }
-                ],
-            )
+        self._fixture_status_calls(
+            [fixture_error(node) for node in self.local_node_name_list],
+            [fixture_error(node) for node in self.remote_node_name_list],
         )
         result = dr.status_all_sites_plaintext(self.env_assist.get_env())
         self.assertEqual(result, self._fixture_result(
@@ -353,6 +329,21 @@ class Success(FixtureMixin, TestCase):
             ]
         )
 
+    def test_timeout(self):
+        self._fixture_load_configs()
+        self._fixture_status_calls(
+            [fixture_success(self.local_node_name_list[0], self.local_status)],
+            [
+                fixture_success(
+                    self.remote_node_name_list[0], self.remote_status
+                )
+            ],
+        )
+        result = dr.status_all_sites_plaintext(
+            self.env_assist.get_env(), timeout=30
+        )
+        self.assertEqual(result, self._fixture_result())
+
 
 class CommunicationIssue(FixtureMixin, TestCase):
     def setUp(self):
@@ -364,17 +355,14 @@ class CommunicationIssue(FixtureMixin, TestCase):
             self.local_node_name_list[1:] + self.remote_node_name_list
         )
         self._fixture_load_configs()
-        (self.config
-            .http.status.get_full_cluster_status_plaintext(
-                name="http.status.get_full_cluster_status_plaintext.local",
-                node_labels=self.local_node_name_list[1:],
-                cluster_status_plaintext=self.local_status,
-            )
-            .http.status.get_full_cluster_status_plaintext(
-                name="http.status.get_full_cluster_status_plaintext.remote",
-                node_labels=self.remote_node_name_list[:1],
-                cluster_status_plaintext=self.remote_status,
-            )
+        self._fixture_status_calls(
+            [fixture_success(self.local_node_name_list[1], self.local_status)],
+            [
+                fixture_success(
+                    self.remote_node_name_list[0], self.remote_status
+                )
+            ],
+            local_target_list=self.local_node_name_list[1:],
         )
         result = dr.status_all_sites_plaintext(self.env_assist.get_env())
         self.assertEqual(result, self._fixture_result())
@@ -406,16 +394,13 @@ class CommunicationIssue(FixtureMixin, TestCase):
     def test_missing_node_names(self):
         self._fixture_load_configs()
         coro_call = self.config.calls.get("corosync_conf.load")
-        (self.config
-            .http.status.get_full_cluster_status_plaintext(
-                name="http.status.get_full_cluster_status_plaintext.local",
-                node_labels=[],
-            )
-            .http.status.get_full_cluster_status_plaintext(
-                name="http.status.get_full_cluster_status_plaintext.remote",
-                node_labels=self.remote_node_name_list[:1],
-                cluster_status_plaintext=self.remote_status,
-            )
+        self._fixture_status_calls(
+            [],
+            [
+                fixture_success(
+                    self.remote_node_name_list[0], self.remote_status
+                )
+            ],
         )
         coro_call.content = re.sub(r"name: node\d", "", coro_call.content)
         result = dr.status_all_sites_plaintext(self.env_assist.get_env())
@@ -430,45 +415,41 @@ class CommunicationIssue(FixtureMixin, TestCase):
     def test_node_issues(self):
         self._set_up(local_node_count=7)
         self._fixture_load_configs()
-        (self.config
-            .http.status.get_full_cluster_status_plaintext(
-                name="http.status.get_full_cluster_status_plaintext.local",
-                cluster_status_plaintext=self.local_status,
-                communication_list=[
-                    [dict(
-                        label=self.local_node_name_list[0],
-                        was_connected=False,
-                    )],
-                    [dict(
-                        label=self.local_node_name_list[1],
-                        response_code=401,
-                    )],
-                    [dict(
-                        label=self.local_node_name_list[2],
-                        response_code=500,
-                    )],
-                    [dict(
-                        label=self.local_node_name_list[3],
-                        response_code=404,
-                    )],
-                    [dict(
-                        label=self.local_node_name_list[4],
-                        output="invalid data",
-                    )],
-                    [dict(
-                        label=self.local_node_name_list[5],
-                        output=json.dumps(dict(status="success"))
-                    )],
-                    [dict(
-                        label=self.local_node_name_list[6],
-                    )],
-                ]
-            )
-            .http.status.get_full_cluster_status_plaintext(
-                name="http.status.get_full_cluster_status_plaintext.remote",
-                node_labels=self.remote_node_name_list[:1],
-                cluster_status_plaintext=self.remote_status,
-            )
+        self._fixture_status_calls(
+            [
+                dict(
+                    label=self.local_node_name_list[0],
+                    was_connected=False,
+                ),
+                dict(
+                    label=self.local_node_name_list[1],
+                    response_code=401,
+                ),
+                dict(
+                    label=self.local_node_name_list[2],
+                    response_code=500,
+                ),
+                dict(
+                    label=self.local_node_name_list[3],
+                    response_code=404,
+                ),
+                dict(
+                    label=self.local_node_name_list[4],
+                    output="invalid data",
+                ),
+                dict(
+                    label=self.local_node_name_list[5],
+                    output=json.dumps(dict(status="success"))
+                ),
+                fixture_success(
+                    self.local_node_name_list[6], self.local_status
+                ),
+            ],
+            [
+                fixture_success(
+                    self.remote_node_name_list[0], self.remote_status
+                )
+            ],
         )
         result = dr.status_all_sites_plaintext(self.env_assist.get_env())
         self.assertEqual(result, self._fixture_result())
@@ -509,26 +490,16 @@ class CommunicationIssue(FixtureMixin, TestCase):
 
     def test_local_site_down(self):
         self._fixture_load_configs()
-        (self.config
-            .http.status.get_full_cluster_status_plaintext(
-                name="http.status.get_full_cluster_status_plaintext.local",
-                cluster_status_plaintext=self.local_status,
-                communication_list=[
-                    [dict(
-                        label=self.local_node_name_list[0],
-                        was_connected=False,
-                    )],
-                    [dict(
-                        label=self.local_node_name_list[1],
-                        was_connected=False,
-                    )],
-                ]
-            )
-            .http.status.get_full_cluster_status_plaintext(
-                name="http.status.get_full_cluster_status_plaintext.remote",
-                node_labels=self.remote_node_name_list[:1],
-                cluster_status_plaintext=self.remote_status,
-            )
+        self._fixture_status_calls(
+            [
+                dict(label=node, was_connected=False)
+                for node in self.local_node_name_list
+            ],
+            [
+                fixture_success(
+                    self.remote_node_name_list[0], self.remote_status
+                )
+            ],
         )
         result = dr.status_all_sites_plaintext(self.env_assist.get_env())
         self.assertEqual(result, self._fixture_result(local_success=False))
@@ -549,22 +520,12 @@ class CommunicationIssue(FixtureMixin, TestCase):
 
     def test_remote_site_down(self):
         self._fixture_load_configs()
-        (self.config
-            .http.status.get_full_cluster_status_plaintext(
-                name="http.status.get_full_cluster_status_plaintext.local",
-                node_labels=self.local_node_name_list[:1],
-                cluster_status_plaintext=self.local_status,
-            )
-            .http.status.get_full_cluster_status_plaintext(
-                name="http.status.get_full_cluster_status_plaintext.remote",
-                cluster_status_plaintext=self.remote_status,
-                communication_list=[
-                    [dict(
-                        label=self.remote_node_name_list[0],
-                        was_connected=False,
-                    )],
-                ]
-            )
+        self._fixture_status_calls(
+            [fixture_success(self.local_node_name_list[0], self.local_status)],
+            [
+                dict(label=node, was_connected=False)
+                for node in self.remote_node_name_list
+            ],
         )
         result = dr.status_all_sites_plaintext(self.env_assist.get_env())
         self.assertEqual(result, self._fixture_result(remote_success=False))
@@ -579,31 +540,15 @@ class CommunicationIssue(FixtureMixin, TestCase):
 
     def test_both_sites_down(self):
         self._fixture_load_configs()
-        (self.config
-            .http.status.get_full_cluster_status_plaintext(
-                name="http.status.get_full_cluster_status_plaintext.local",
-                cluster_status_plaintext=self.local_status,
-                communication_list=[
-                    [dict(
-                        label=self.local_node_name_list[0],
-                        was_connected=False,
-                    )],
-                    [dict(
-                        label=self.local_node_name_list[1],
-                        was_connected=False,
-                    )],
-                ]
-            )
-            .http.status.get_full_cluster_status_plaintext(
-                name="http.status.get_full_cluster_status_plaintext.remote",
-                cluster_status_plaintext=self.remote_status,
-                communication_list=[
-                    [dict(
-                        label=self.remote_node_name_list[0],
-                        was_connected=False,
-                    )],
-                ]
-            )
+        self._fixture_status_calls(
+            [
+                dict(label=node, was_connected=False)
+                for node in self.local_node_name_list
+            ],
+            [
+                dict(label=node, was_connected=False)
+                for node in self.remote_node_name_list
+            ],
         )
         result = dr.status_all_sites_plaintext(self.env_assist.get_env())
         self.assertEqual(
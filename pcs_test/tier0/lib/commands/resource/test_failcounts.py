@@ -100,7 +100,9 @@ class GetFailcounts(TestCase):
         )
 
     def test_get_all(self):
-        self.config.runner.cib.load_content(self.fixture_cib())
+        self.config.runner.cib.load_content(
+            self.fixture_cib(), with_status=True
+        )
         self.assertEqual(
             resource.get_failcounts(self.env_assist.get_env()),
             [
@@ -126,7 +128,9 @@ class GetFailcounts(TestCase):
         )
 
     def test_filter_node(self):
-        self.config.runner.cib.load_content(self.fixture_cib())
+        self.config.runner.cib.load_content(
+            self.fixture_cib(), with_status=True
+        )
         self.assertEqual(
             resource.get_failcounts(
                 self.env_assist.get_env(), node="node2"
@@ -145,7 +149,9 @@ class GetFailcounts(TestCase):
         )
 
     def test_filter_interval(self):
-        self.config.runner.cib.load_content(self.fixture_cib())
+        self.config.runner.cib.load_content(
+            self.fixture_cib(), with_status=True
+        )
         self.assertEqual(
             resource.get_failcounts(
                 self.env_assist.get_env(), operation="monitor", interval="5"
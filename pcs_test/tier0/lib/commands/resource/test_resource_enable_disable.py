@@ -1675,7 +1675,7 @@ class DisableSimulate(TestCase):
         mock_write_tmpfile.side_effect = [
             AssertionError("No other write_tmpfile call expected")
         ]
-        self.config.runner.cib.load()
+        self.config.runner.cib.load(with_status=True)
         self.env_assist.assert_raise_library_error(
             lambda: resource.disable_simulate(self.env_assist.get_env(), ["A"]),
             [
@@ -1690,7 +1690,9 @@ class DisableSimulate(TestCase):
             AssertionError("No other write_tmpfile call expected")
         ]
         (self.config
-            .runner.cib.load(resources=fixture_primitive_cib_enabled)
+            .runner.cib.load(
+                resources=fixture_primitive_cib_enabled, with_status=True
+            )
             .runner.pcmk.load_state(resources=fixture_primitive_status_managed)
             .runner.pcmk.simulate_cib(
                 self.tmpfile_new_cib.name,
@@ -1709,7 +1711,9 @@ class DisableSimulate(TestCase):
             AssertionError("No other write_tmpfile call expected")
         ]
         (self.config
-            .runner.cib.load(resources=fixture_primitive_cib_enabled)
+            .runner.cib.load(
+                resources=fixture_primitive_cib_enabled, with_status=True
+            )
             .runner.pcmk.load_state(resources=fixture_primitive_status_managed)
             .runner.pcmk.simulate_cib(
                 self.tmpfile_new_cib.name,
@@ -1899,7 +1903,9 @@ class DisableSafeMixin():
             AssertionError("No other write_tmpfile call expected")
         ]
         (self.config
-            .runner.cib.load(resources=fixture_two_primitives_cib_enabled)
+            .runner.cib.load(
+                resources=fixture_two_primitives_cib_enabled, with_status=True
+            )
             .runner.pcmk.load_state(
                 resources=fixture_two_primitives_status_managed
             )
@@ -1914,7 +1920,9 @@ class DisableSafeMixin():
             AssertionError("No other write_tmpfile call expected")
         ]
         (self.config
-            .runner.cib.load(resources=fixture_two_primitives_cib_enabled)
+            .runner.cib.load(
+                resources=fixture_two_primitives_cib_enabled, with_status=True
+            )
             .runner.pcmk.load_state(
                 resources=fixture_two_primitives_status_managed
             )
@@ -1945,7 +1953,7 @@ class DisableSafeMixin():
         mock_write_tmpfile.side_effect = [
             AssertionError("No other write_tmpfile call expected")
         ]
-        self.config.runner.cib.load()
+        self.config.runner.cib.load(with_status=True)
         self.env_assist.assert_raise_library_error(
             lambda: resource.disable_safe(
                 self.env_assist.get_env(),
@@ -2038,7 +2046,9 @@ class DisableSafeMixin():
             AssertionError("No other write_tmpfile call expected")
         ]
         (self.config
-            .runner.cib.load(resources=self.fixture_cib_with_master)
+            .runner.cib.load(
+                resources=self.fixture_cib_with_master, with_status=True
+            )
             .runner.pcmk.load_state(
                 resources=self.fixture_status_with_master_managed
             )
@@ -2244,7 +2254,7 @@ class DisableSafeMixin():
             AssertionError("No other write_tmpfile call expected")
         ]
         (self.config
-            .runner.cib.load(resources=cib_xml)
+            .runner.cib.load(resources=cib_xml, with_status=True)
             .runner.pcmk.load_state(resources=status_xml)
         )
         self.config.runner.pcmk.simulate_cib(
@@ -2363,7 +2373,9 @@ class DisableSafe(DisableSafeMixin, TestCase):
             AssertionError("No other write_tmpfile call expected")
         ]
         (self.config
-            .runner.cib.load(resources=self.fixture_cib_with_master)
+            .runner.cib.load(
+                resources=self.fixture_cib_with_master, with_status=True
+            )
             .runner.pcmk.load_state(
                 resources=self.fixture_status_with_master_managed
             )
@@ -2423,7 +2435,9 @@ class DisableSafeStrict(DisableSafeMixin, TestCase):
             AssertionError("No other write_tmpfile call expected")
         ]
         (self.config
-            .runner.cib.load(resources=self.fixture_cib_with_master)
+            .runner.cib.load(
+                resources=self.fixture_cib_with_master, with_status=True
+            )
             .runner.pcmk.load_state(
                 resources=self.fixture_status_with_master_managed
             )
@@ -333,7 +333,11 @@ class AddRecipientTest(TestCase):
         )
 
     def test_value_not_defined(self):
-        self.config.remove("runner.cib.load")
+        (self.config
+            .remove("runner.cib.load")
+            .remove("runner.cib.load.configuration")
+            .remove("runner.cib.load.header_check")
+        )
         self.env_assist.assert_raise_library_error(
             lambda: cmd_alert.add_recipient(
                 self.env_assist.get_env(), "unknown", "", {}, {}
@@ -498,7 +502,11 @@ class UpdateRecipientTest(TestCase):
         )
 
     def test_empty_value(self):
-        self.config.remove("runner.cib.load")
+        (self.config
+            .remove("runner.cib.load")
+            .remove("runner.cib.load.configuration")
+            .remove("runner.cib.load.header_check")
+        )
         self.env_assist.assert_raise_library_error(
             lambda: cmd_alert.update_recipient(
                 self.env_assist.get_env(),
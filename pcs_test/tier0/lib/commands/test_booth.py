@@ -1,4 +1,7 @@
 # pylint: disable=too-many-lines
+import base64
+import hashlib
+import json
 import os
 from textwrap import dedent
 from unittest import mock, TestCase
@@ -2350,11 +2353,29 @@ class ConfigSyncTest(TestCase, FixtureMixin):
         self.config.env.set_known_nodes(self.node_list)
         self.reason = "fail"
 
+    def fixture_get_digests(
+        self, instance_name="booth", authfile="booth.key", **kwargs
+    ):
+        if "communication_list" not in kwargs:
+            kwargs.setdefault("node_labels", self.node_list)
+        file_list = {
+            f"{instance_name}.conf": dict(
+                type="booth_config",
+                name=f"{instance_name}.conf",
+            ),
+        }
+        if authfile:
+            file_list[authfile] = dict(type="booth_authfile", name=authfile)
+        self.config.http.files.get_file_digests(file_list, **kwargs)
+
     def fixture_config_success(self, instance_name="booth"):
         config_content = self.fixture_cfg_content(
              self.fixture_key_path(instance_name)
         )
         self.fixture_config_read_success(instance_name=instance_name)
+        self.fixture_get_digests(
+            instance_name=instance_name, authfile=f"{instance_name}.key"
+        )
         (self.config
             .http.booth.send_config(
                 instance_name,
@@ -2433,6 +2454,98 @@ class ConfigSyncTest(TestCase, FixtureMixin):
             )
         )
 
+    def fixture_digests(self):
+        return {
+            "booth.conf": hashlib.sha256(
+                self.fixture_cfg_content(self.fixture_key_path())
+            ).hexdigest(),
+            "booth.key": hashlib.sha256(
+                base64.b64encode(RANDOM_KEY)
+            ).hexdigest(),
+        }
+
+    def test_same_content_on_all_nodes(self):
+        self.fixture_config_read_success()
+        self.fixture_get_digests(digests=self.fixture_digests())
+        commands.config_sync(self.env_assist.get_env())
+        self.env_assist.assert_reports([
+            fixture.info(
+                report_codes.FILES_DISTRIBUTION_SKIPPED_SAME_CONTENT,
+                node=node,
+                file_list=["booth.conf", "booth.key"],
+            ) for node in self.node_list
+        ])
+
+    def test_same_content_on_some_nodes(self):
+        digests = self.fixture_digests()
+        digests_other_key = dict(digests)
+        digests_other_key["booth.key"] = "other"
+        self.fixture_config_read_success()
+        self.fixture_get_digests(
+            communication_list=[
+                dict(
+                    label=self.node_list[0],
+                    output=json.dumps(dict(files={
+                        file_id: dict(digest=digest)
+                        for file_id, digest in digests.items()
+                    })),
+                ),
+                dict(
+                    label=self.node_list[1],
+                    output=json.dumps(dict(files={
+                        file_id: dict(digest=digest)
+                        for file_id, digest in digests_other_key.items()
+                    })),
+                ),
+            ]
+        )
+        self.config.http.booth.send_config(
+            "booth",
+            self.fixture_cfg_content().decode("utf-8"),
+            authfile=os.path.basename(self.fixture_key_path()),
+            authfile_data=RANDOM_KEY,
+            node_labels=self.node_list[1:],
+        )
+        commands.config_sync(self.env_assist.get_env())
+        self.env_assist.assert_reports([
+            fixture.info(
+                report_codes.FILES_DISTRIBUTION_SKIPPED_SAME_CONTENT,
+                node=self.node_list[0],
+                file_list=["booth.conf", "booth.key"],
+            ),
+            fixture.info(report_codes.BOOTH_CONFIG_DISTRIBUTION_STARTED),
+            fixture.info(
+                report_codes.BOOTH_CONFIG_ACCEPTED_BY_NODE,
+                node=self.node_list[1],
+                name_list=["booth"]
+            ),
+        ])
+
+    def test_digests_not_supported(self):
+        self.fixture_config_read_success()
+        self.fixture_get_digests(
+            communication_list=[
+                dict(
+                    label=self.node_list[0],
+                    response_code=404,
+                    output="Not found",
+                ),
+                dict(
+                    label=self.node_list[1],
+                    output="invalid data",
+                ),
+            ]
+        )
+        self.config.http.booth.send_config(
+            "booth",
+            self.fixture_cfg_content().decode("utf-8"),
+            authfile=os.path.basename(self.fixture_key_path()),
+            authfile_data=RANDOM_KEY,
+            node_labels=self.node_list,
+        )
+        commands.config_sync(self.env_assist.get_env())
+        self.env_assist.assert_reports(self.fixture_reports_success())
+
     def test_not_live_cib(self):
         self.config.env.set_cib_data("<cib/>")
         self.env_assist.assert_raise_library_error(
@@ -2459,8 +2572,11 @@ class ConfigSyncTest(TestCase, FixtureMixin):
             "key_data": key_data,
             "key_path": "some key path",
         })
+        self.config.corosync_conf.load(node_name_list=self.node_list)
+        self.fixture_get_digests(
+            instance_name=instance_name, authfile="some.key"
+        )
         (self.config
-            .corosync_conf.load(node_name_list=self.node_list)
             .http.booth.send_config(
                 instance_name,
                 config_data.decode("utf-8"),
@@ -2495,11 +2611,12 @@ class ConfigSyncTest(TestCase, FixtureMixin):
     def test_some_node_names_missing(self):
         nodes = ["rh7-2"]
         self.fixture_config_read_success()
+        self.config.corosync_conf.load(
+            filename="corosync-some-node-names.conf",
+            instead="corosync_conf.load",
+        )
+        self.fixture_get_digests(node_labels=nodes)
         (self.config
-            .corosync_conf.load(
-                filename="corosync-some-node-names.conf",
-                instead="corosync_conf.load",
-            )
             .http.booth.send_config(
                 "booth",
                 self.fixture_cfg_content().decode("utf-8"),
@@ -2552,6 +2669,7 @@ class ConfigSyncTest(TestCase, FixtureMixin):
 
     def test_node_failure(self):
         self.fixture_config_read_success()
+        self.fixture_get_digests()
         (self.config
             .http.booth.send_config(
                 "booth",
@@ -2594,6 +2712,7 @@ class ConfigSyncTest(TestCase, FixtureMixin):
 
     def test_node_failure_skip_offline(self):
         self.fixture_config_read_success()
+        self.fixture_get_digests()
         (self.config
             .http.booth.send_config(
                 "booth",
@@ -2633,6 +2752,19 @@ class ConfigSyncTest(TestCase, FixtureMixin):
 
     def test_node_offline(self):
         self.fixture_config_read_success()
+        self.fixture_get_digests(
+            communication_list=[
+                dict(
+                    label=self.node_list[0],
+                    errno=1,
+                    error_msg=self.reason,
+                    was_connected=False,
+                ),
+                dict(
+                    label=self.node_list[1],
+                ),
+            ]
+        )
         (self.config
             .http.booth.send_config(
                 "booth",
@@ -2676,6 +2808,19 @@ class ConfigSyncTest(TestCase, FixtureMixin):
 
     def test_node_offline_skip_offline(self):
         self.fixture_config_read_success()
+        self.fixture_get_digests(
+            communication_list=[
+                dict(
+                    label=self.node_list[0],
+                    errno=1,
+                    error_msg=self.reason,
+                    was_connected=False,
+                ),
+                dict(
+                    label=self.node_list[1],
+                ),
+            ]
+        )
         (self.config
             .http.booth.send_config(
                 "booth",
@@ -2857,6 +3002,9 @@ class ConfigSyncTest(TestCase, FixtureMixin):
                 self.fixture_cfg_path(),
                 content=bytes(),
             )
+        )
+        self.fixture_get_digests(authfile=None)
+        (self.config
             .http.booth.send_config(
                 "booth",
                 bytes().decode("utf-8"),
@@ -2885,6 +3033,9 @@ class ConfigSyncTest(TestCase, FixtureMixin):
                 self.fixture_cfg_path(),
                 content=config_content.encode("utf-8"),
             )
+        )
+        self.fixture_get_digests(authfile=None)
+        (self.config
             .http.booth.send_config(
                 "booth",
                 config_content,
@@ -6,7 +6,6 @@ from pcs_test.tools.command_env import get_env_tools
 
 from pcs.common import report_codes
 from pcs.lib.commands import stonith
-from pcs.lib.resource_agent import StonithAgent
 
 expected_cib_simple = """
     <primitive class="stonith" id="stonith-test" type="test_simple">
@@ -90,12 +89,6 @@ class CreateMixin():
         # pylint: disable=invalid-name
         self.env_assist, self.config = get_env_tools(test_case=self)
 
-    def tearDown(self):
-        # pylint does not know this method is defined in TestCase
-        # pylint: disable=invalid-name
-        # pylint: disable=no-self-use
-        StonithAgent.clear_fenced_metadata_cache()
-
     def test_minimal_success(self):
         agent_name = "test_simple"
 
@@ -36,11 +36,6 @@ class TestListAgents(TestCase):
         self.lib_env = LibraryEnvironment(self.mock_logger, self.mock_reporter)
 
 
-    def tearDown(self):
-        # pylint: disable=protected-access
-        lib_ra.StonithAgent._fenced_metadata = None
-
-
     def test_list_all(self):
         self.assertEqual(
             lib.list_agents(self.lib_env, False, None),
@@ -170,11 +165,6 @@ class TestDescribeAgent(TestCase):
         }
 
 
-    def tearDown(self):
-        # pylint: disable=protected-access
-        lib_ra.StonithAgent._fenced_metadata = None
-
-
     def test_success(self, mock_metadata):
         mock_metadata.return_value = self.metadata
 
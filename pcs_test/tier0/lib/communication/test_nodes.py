@@ -28,3 +28,16 @@ class RemoveNodesFromCib(TestCase):
             RemoveNodesSuccessMinimal
         }
     """
+
+class NodeActions(TestCase):
+    """
+    tested in:
+        pcs_test.tier0.lib.commands.cluster.test_setup.SetupNodeActions
+    """
+
+class GetFileDigests(TestCase):
+    """
+    tested in:
+        pcs_test.tier0.lib.commands.cluster.test_sync_corosync_conf
+        pcs_test.tier0.lib.commands.test_booth.ConfigSyncTest
+    """
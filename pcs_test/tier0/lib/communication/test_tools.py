@@ -0,0 +1,452 @@
+from unittest import mock, TestCase
+
+from pcs.common import report_codes
+from pcs.common.node_communicator import (
+    Request,
+    RequestData,
+    RequestTarget,
+)
+from pcs.lib import reports
+from pcs.lib.communication import tools
+from pcs.lib.errors import LibraryError
+
+from pcs_test.tools import fixture
+from pcs_test.tools.custom_mock import MockLibraryReportProcessor
+
+
+def fixture_request(label):
+    return Request(RequestTarget(label), RequestData("action"))
+
+
+class Response:
+    # pylint: disable=too-few-public-methods
+    def __init__(self, label, success=True):
+        # responses do not have to contain the requests which have been sent
+        self.request = fixture_request(label)
+        self.success = success
+
+
+class Communicator:
+    def __init__(self, response_label_list):
+        self.response_label_list = response_label_list
+        self.request_list = []
+
+    def add_requests(self, request_list):
+        self.request_list.extend(request_list)
+
+    def start_loop(self):
+        for label in self.response_label_list:
+            yield Response(label)
+
+
+class OneByOneCmd:
+    def __init__(self, label_list):
+        self.label_list = list(label_list)
+        self.responses = []
+        self.before_called = False
+
+    def before(self):
+        self.before_called = True
+
+    def get_initial_request_list(self):
+        return [fixture_request(self.label_list.pop(0))]
+
+    def on_response(self, response):
+        self.responses.append(response.request.target.label)
+        if self.label_list:
+            return [fixture_request(self.label_list.pop(0))]
+        return []
+
+    def get_cancelled_request_list(self):
+        # pylint: disable=no-self-use
+        return []
+
+    def on_complete(self):
+        return self.responses
+
+    @property
+    def has_errors(self):
+        return False
+
+
+class RunConcurrently(TestCase):
+    def test_responses_routed_to_commands(self):
+        communicator = Communicator(["a1", "b1", "a2", "b2"])
+        cmd_a = OneByOneCmd(["a1", "a2"])
+        cmd_b = OneByOneCmd(["b1", "b2"])
+        self.assertEqual(
+            [["a1", "a2"], ["b1", "b2"]],
+            tools.run_concurrently(communicator, [cmd_a, cmd_b])
+        )
+        self.assertTrue(cmd_a.before_called)
+        self.assertTrue(cmd_b.before_called)
+        self.assertEqual(
+            ["a1", "b1", "a2", "b2"],
+            [request.target.label for request in communicator.request_list]
+        )
+        self.assertEqual(
+            [None] * 4,
+            [request.timeout for request in communicator.request_list]
+        )
+
+    @mock.patch("pcs.lib.communication.tools.monotonic")
+    def test_timeout(self, mock_monotonic):
+        # created, a1 and b1 sent, a2 sent, b2 not sent, a2 received
+        mock_monotonic.side_effect = [100, 100, 100, 105, 111, 112]
+        communicator = Communicator(["a1", "b1", "a2"])
+        self.assertEqual(
+            [["a1", "a2"], ["b1"]],
+            tools.run_concurrently(
+                communicator,
+                [OneByOneCmd(["a1", "a2"]), OneByOneCmd(["b1", "b2"])],
+                timeout=10,
+            )
+        )
+        self.assertEqual(
+            [("a1", 10), ("b1", 10), ("a2", 5)],
+            [
+                (request.target.label, request.timeout)
+                for request in communicator.request_list
+            ]
+        )
+
+
+class Clock:
+    # pylint: disable=too-few-public-methods
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class HedgingCommunicator:
+    def __init__(self, clock, response_list):
+        """
+        Clock clock -- time to move forward when returning responses
+        list response_list -- (label, success, time of the response) tuples
+        """
+        self.clock = clock
+        self.response_list = response_list
+        self.call_list = []
+
+    def add_requests(self, request_list):
+        self.call_list.append((
+            "add",
+            [
+                (request.target.label, request.delay)
+                for request in request_list
+            ]
+        ))
+
+    def cancel_requests(self, request_list):
+        self.call_list.append(
+            ("cancel", [request.target.label for request in request_list])
+        )
+
+    def start_loop(self):
+        for label, success, response_time in self.response_list:
+            self.clock.now = response_time
+            yield Response(label, success)
+
+
+class HedgedCmd(
+    tools.AllSameDataMixin, tools.OneByOneStrategyMixin, tools.RunRemotelyBase
+):
+    _hedge_requests = True
+
+    def __init__(self, report_processor):
+        super().__init__(report_processor)
+        self.successful_node = None
+
+    def _get_request_data(self):
+        return RequestData("action")
+
+    def _process_response(self, response):
+        if not response.success:
+            return self._get_next_list()
+        self.successful_node = response.request.target.label
+        return []
+
+
+@mock.patch("pcs.settings.node_communication_hedge_delay", 2)
+class OneByOneHedging(TestCase):
+    # pylint: disable=protected-access
+    def setUp(self):
+        self.clock = Clock()
+        patcher = mock.patch(
+            "pcs.lib.communication.tools.monotonic", self.clock
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch(
+            "pcs.lib.communication.tools._latency_stats",
+            tools._LatencyStats(),
+        )
+        self.latency_stats = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.report_processor = MockLibraryReportProcessor()
+        self.cmd = HedgedCmd(self.report_processor)
+        self.cmd.set_targets(
+            [RequestTarget(label) for label in ["node1", "node2", "node3"]]
+        )
+
+    def run_cmd(self, response_list):
+        communicator = HedgingCommunicator(self.clock, response_list)
+        tools.run(communicator, self.cmd)
+        return communicator.call_list
+
+    def test_first_node_fast(self):
+        self.assertEqual(
+            [
+                ("add", [("node1", 0), ("node2", 2)]),
+                ("cancel", ["node2"]),
+            ],
+            self.run_cmd([("node1", True, 101)])
+        )
+        self.assertEqual("node1", self.cmd.successful_node)
+        self.report_processor.assert_reports([])
+
+    def test_first_node_fails(self):
+        self.assertEqual(
+            [
+                ("add", [("node1", 0), ("node2", 2)]),
+                # node2 is started right away instead of waiting
+                ("cancel", ["node2"]),
+                ("add", [("node2", 0), ("node3", 2)]),
+                ("cancel", ["node3"]),
+            ],
+            self.run_cmd([("node1", False, 100.5), ("node2", True, 101)])
+        )
+        self.assertEqual("node2", self.cmd.successful_node)
+        self.report_processor.assert_reports([])
+
+    def test_first_node_slow(self):
+        self.assertEqual(
+            [
+                ("add", [("node1", 0), ("node2", 2)]),
+                ("cancel", ["node1"]),
+            ],
+            self.run_cmd([("node2", True, 103)])
+        )
+        self.assertEqual("node2", self.cmd.successful_node)
+        self.report_processor.assert_reports([
+            fixture.debug(
+                report_codes.NODE_COMMUNICATION_REQUEST_HEDGED,
+                node="node2",
+                request="action",
+                delay=2,
+            ),
+        ])
+
+    def test_hedged_node_fails(self):
+        self.assertEqual(
+            [
+                ("add", [("node1", 0), ("node2", 2)]),
+                # node1 is still running, hedge it by node3
+                ("add", [("node3", 2)]),
+                ("cancel", ["node3"]),
+            ],
+            self.run_cmd([("node2", False, 103), ("node1", True, 104)])
+        )
+        self.assertEqual("node1", self.cmd.successful_node)
+
+    def test_all_nodes_fail(self):
+        self.assertEqual(
+            [
+                ("add", [("node1", 0), ("node2", 2)]),
+                ("cancel", ["node2"]),
+                ("add", [("node2", 0), ("node3", 2)]),
+                ("cancel", ["node3"]),
+                ("add", [("node3", 0)]),
+            ],
+            self.run_cmd([
+                ("node1", False, 100.5),
+                ("node2", False, 101),
+                ("node3", False, 101.5),
+            ])
+        )
+        self.assertIsNone(self.cmd.successful_node)
+
+    def test_learned_delay(self):
+        for duration in range(1, 21):
+            self.latency_stats.add("action", duration / 10)
+        self.assertEqual(
+            [
+                ("add", [("node1", 0), ("node2", 1.9)]),
+                ("cancel", ["node2"]),
+            ],
+            self.run_cmd([("node1", True, 101)])
+        )
+        self.assertEqual(21, len(self.latency_stats._durations["action"]))
+
+    def test_not_hedging(self):
+        self.cmd._hedge_requests = False
+        self.assertEqual(
+            [
+                ("add", [("node1", 0)]),
+                ("add", [("node2", 0)]),
+            ],
+            self.run_cmd([("node1", False, 103), ("node2", True, 104)])
+        )
+        self.assertEqual("node2", self.cmd.successful_node)
+
+
+class PipelineCommunicator:
+    def __init__(self, failing=()):
+        """
+        iterable failing -- (label, action) of requests which fail
+        """
+        self.failing = set(failing)
+        self.call_list = []
+        self._queue = []
+
+    def add_requests(self, request_list):
+        self.call_list.append([
+            (request.target.label, request.action) for request in request_list
+        ])
+        self._queue.extend(request_list)
+
+    def start_loop(self):
+        while self._queue:
+            request = self._queue.pop(0)
+            response = Response(request.target.label)
+            response.request = request
+            response.success = (
+                (request.target.label, request.action) not in self.failing
+            )
+            yield response
+
+
+class PipelineStepCmd(
+    tools.AllSameDataMixin, tools.AllAtOnceStrategyMixin,
+    tools.RunRemotelyBase
+):
+    def __init__(self, report_processor, action, result="done"):
+        super().__init__(report_processor)
+        self.action = action
+        self.result = result
+        self.before_called = False
+
+    def _get_request_data(self):
+        return RequestData(self.action)
+
+    def _process_response(self, response):
+        if not response.success:
+            self._report(fixture_report_error(response.request.target.label))
+
+    def before(self):
+        self.before_called = True
+
+    def on_complete(self):
+        return self.result
+
+
+def fixture_report_error(node):
+    return reports.invalid_response_format(node)
+
+
+@mock.patch("pcs.lib.communication.tools.monotonic", lambda: 10.0)
+class RunPipelined(TestCase):
+    def setUp(self):
+        self.report_processor = MockLibraryReportProcessor()
+
+    def fixture_cmd(self, action, target_list=("node1", "node2")):
+        cmd = PipelineStepCmd(self.report_processor, action, f"{action} done")
+        cmd.set_targets([RequestTarget(label) for label in target_list])
+        return cmd
+
+    def test_nodes_proceed_independently(self):
+        communicator = PipelineCommunicator()
+        cmd_list = [self.fixture_cmd("a"), self.fixture_cmd("b")]
+        self.assertEqual(
+            ["a done", "b done"],
+            tools.run_pipelined_and_raise(
+                communicator, self.report_processor, cmd_list
+            )
+        )
+        self.assertEqual(
+            [
+                [("node1", "a"), ("node2", "a")],
+                [("node1", "b")],
+                [("node2", "b")],
+            ],
+            communicator.call_list
+        )
+        self.report_processor.assert_reports([
+            fixture.debug(
+                report_codes.NODE_COMMUNICATION_PIPELINE_FINISHED,
+                node=node,
+                request_durations=[("a", 0.0), ("b", 0.0)],
+            )
+            for node in ["node1", "node2"]
+        ])
+
+    def test_node_not_targeted_skips_command(self):
+        communicator = PipelineCommunicator()
+        cmd_list = [
+            self.fixture_cmd("a"),
+            self.fixture_cmd("b", ["node2"]),
+            self.fixture_cmd("c"),
+        ]
+        tools.run_pipelined(communicator, self.report_processor, cmd_list)
+        self.assertEqual(
+            [
+                [("node1", "a"), ("node2", "a")],
+                [("node1", "c")],
+                [("node2", "b")],
+                [("node2", "c")],
+            ],
+            communicator.call_list
+        )
+
+    def test_failure_stops_all_nodes(self):
+        communicator = PipelineCommunicator(failing=[("node1", "a")])
+        cmd_list = [self.fixture_cmd("a"), self.fixture_cmd("b")]
+        self.assertEqual(
+            ["a done", None],
+            tools.run_pipelined(communicator, self.report_processor, cmd_list)
+        )
+        self.assertEqual(
+            [[("node1", "a"), ("node2", "a")]],
+            communicator.call_list
+        )
+        self.assertFalse(cmd_list[1].before_called)
+        self.assertRaises(
+            LibraryError,
+            lambda: tools.run_pipelined_and_raise(
+                PipelineCommunicator(failing=[("node1", "a")]),
+                self.report_processor,
+                [self.fixture_cmd("a"), self.fixture_cmd("b")],
+            )
+        )
+
+    def test_failure_stops_nodes_ahead(self):
+        communicator = PipelineCommunicator(failing=[("node2", "a")])
+        cmd_list = [
+            self.fixture_cmd("a"), self.fixture_cmd("b"), self.fixture_cmd("c")
+        ]
+        tools.run_pipelined(communicator, self.report_processor, cmd_list)
+        # node1 has started "b" before node2 failed, it does not continue
+        self.assertEqual(
+            [
+                [("node1", "a"), ("node2", "a")],
+                [("node1", "b")],
+            ],
+            communicator.call_list
+        )
+        self.assertEqual(
+            ["a done", "b done", None],
+            [
+                cmd.on_complete() if cmd.before_called else None
+                for cmd in cmd_list
+            ]
+        )
+
+    def test_no_commands(self):
+        communicator = PipelineCommunicator()
+        self.assertEqual(
+            [],
+            tools.run_pipelined(communicator, self.report_processor, [])
+        )
+        self.assertEqual([[]], communicator.call_list)
@@ -75,6 +75,39 @@ class GetQuorumStatusTextTest(TestCase):
         self.assertEqual(cm.exception.reason, "status error")
 
 
+class GetJoinedNodesNames(TestCase):
+    def setUp(self):
+        self.mock_runner = mock.MagicMock(spec_set=CommandRunner)
+
+    def test_success(self):
+        self.mock_runner.run.return_value = (
+            dedent("""\
+                nodelist.node.0.name (str) = node1
+                nodelist.node.0.nodeid (u32) = 1
+                nodelist.node.1.name (str) = node2
+                nodelist.node.1.nodeid (u32) = 2
+                nodelist.node.2.name (str) = node3
+                nodelist.node.2.nodeid (u32) = 3
+                runtime.members.1.status (str) = joined
+                runtime.members.2.status (str) = left
+                runtime.members.3.status (str) = joined
+            """),
+            "",
+            0
+        )
+        self.assertEqual(
+            ["node1", "node3"],
+            lib.get_joined_nodes_names(self.mock_runner)
+        )
+        self.mock_runner.run.assert_called_once_with(
+            ["/usr/sbin/corosync-cmapctl"]
+        )
+
+    def test_corosync_not_running(self):
+        self.mock_runner.run.return_value = ("", "error", 1)
+        self.assertEqual([], lib.get_joined_nodes_names(self.mock_runner))
+
+
 class SetExpectedVotesTest(TestCase):
     def setUp(self):
         self.mock_runner = mock.MagicMock(spec_set=CommandRunner)
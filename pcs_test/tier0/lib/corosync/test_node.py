@@ -1,8 +1,17 @@
-from unittest import TestCase
+import threading
+import time
+from unittest import mock, TestCase
+
+from pcs_test.tools.custom_mock import patch_getaddrinfo
 
 from pcs.lib.corosync.node import (
+    ADDR_FQDN,
+    ADDR_IPV4,
+    ADDR_IPV6,
+    ADDR_UNRESOLVABLE,
     CorosyncNode,
     CorosyncNodeAddress,
+    get_address_types,
 )
 
 
@@ -99,3 +108,107 @@ class AddrsPlain(TestCase):
             ["10.0.0.0", "10.0.0.1", "10.0.0.4", "10.0.0.3"],
             node.addrs_plain(except_link="2")
         )
+
+
+class GetAddressTypes(TestCase):
+    def setUp(self):
+        patch_getaddrinfo(self, ["node1"])
+        self.addr_list = ["10.0.0.1", "::1", "node1", "node2", "node1"]
+
+    def test_resolve(self):
+        self.assertEqual(
+            {
+                "10.0.0.1": ADDR_IPV4,
+                "::1": ADDR_IPV6,
+                "node1": ADDR_FQDN,
+                "node2": ADDR_UNRESOLVABLE,
+            },
+            get_address_types(self.addr_list, resolve=True)
+        )
+
+    def test_do_not_resolve(self):
+        self.assertEqual(
+            {
+                "10.0.0.1": ADDR_IPV4,
+                "::1": ADDR_IPV6,
+                "node1": ADDR_FQDN,
+                "node2": ADDR_FQDN,
+            },
+            get_address_types(self.addr_list)
+        )
+
+    @mock.patch("pcs.settings.corosync_address_resolve_timeout", 0.01)
+    def test_resolve_timeout(self):
+        resolver_released = threading.Event()
+        self.addCleanup(resolver_released.set)
+        def getaddrinfo(host, port):
+            # pylint: disable=unused-argument
+            if host == "slow-node":
+                resolver_released.wait()
+        with mock.patch("socket.getaddrinfo", getaddrinfo):
+            self.assertEqual(
+                {
+                    "node1": ADDR_FQDN,
+                    "slow-node": ADDR_UNRESOLVABLE,
+                },
+                get_address_types(["node1", "slow-node"], resolve=True)
+            )
+
+    @mock.patch("pcs.settings.corosync_address_resolve_parallelism", 1)
+    @mock.patch("pcs.settings.corosync_address_resolve_timeout", 0.01)
+    def test_resolve_timeout_waiting_lookups_run(self):
+        resolver_released = threading.Event()
+        self.addCleanup(resolver_released.set)
+        resolved = []
+        def getaddrinfo(host, port):
+            # pylint: disable=unused-argument
+            resolved.append(host)
+            if host == "slow-node":
+                resolver_released.wait()
+        with mock.patch("socket.getaddrinfo", getaddrinfo):
+            self.assertEqual(
+                {
+                    "slow-node": ADDR_UNRESOLVABLE,
+                    "node1": ADDR_FQDN,
+                },
+                get_address_types(["slow-node", "node1"], resolve=True)
+            )
+        self.assertEqual(["slow-node", "node1"], resolved)
+
+    @mock.patch("pcs.settings.corosync_address_resolve_parallelism", 2)
+    @mock.patch("pcs.settings.corosync_address_resolve_timeout", 0.2)
+    def test_resolve_timeout_per_lookup(self):
+        running = []
+        max_running = []
+        lock = threading.Lock()
+        def getaddrinfo(host, port):
+            # pylint: disable=unused-argument
+            with lock:
+                running.append(host)
+                max_running.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.remove(host)
+        node_list = [f"node{i}" for i in range(10)]
+        with mock.patch("socket.getaddrinfo", getaddrinfo):
+            self.assertEqual(
+                {node: ADDR_FQDN for node in node_list},
+                get_address_types(node_list, resolve=True)
+            )
+        self.assertEqual(2, max(max_running))
+
+    @mock.patch("pcs.settings.corosync_address_resolve_timeout", 0.01)
+    def test_lookup_in_daemon_thread(self):
+        resolver_released = threading.Event()
+        self.addCleanup(resolver_released.set)
+        thread_list = []
+        def getaddrinfo(host, port):
+            # pylint: disable=unused-argument
+            thread_list.append(threading.current_thread())
+            resolver_released.wait()
+        with mock.patch("socket.getaddrinfo", getaddrinfo):
+            self.assertEqual(
+                {"slow-node": ADDR_UNRESOLVABLE},
+                get_address_types(["slow-node"], resolve=True)
+            )
+        self.assertTrue(thread_list[0].daemon)
@@ -0,0 +1,376 @@
+from copy import deepcopy
+import os.path
+import subprocess
+import tempfile
+from unittest import skipUnless, TestCase
+
+from lxml import etree
+
+from pcs_test.tools.assertions import assert_xml_equal
+from pcs_test.tools.misc import get_test_resource as rc
+from pcs_test.tools.xml import etree_to_str
+
+from pcs import settings
+from pcs.lib.pacemaker.cib_diff import CibDiffUnsupported, diff_cibs
+
+CRM_DIFF = os.path.join(settings.pacemaker_binaries, "crm_diff")
+
+
+def apply_patchset(cib, patchset):
+    """
+    Apply a patchset the same way pacemaker does, good enough for testing
+    """
+    for change in patchset.iterfind("change"):
+        match_list = cib.getroottree().xpath(change.get("path"))
+        assert len(match_list) == 1, change.get("path")
+        match = match_list[0]
+        operation = change.get("operation")
+        if operation == "delete":
+            match.getparent().remove(match)
+        elif operation == "create":
+            match.insert(int(change.get("position")), deepcopy(change[0]))
+        elif operation == "modify":
+            for change_attr in change.find("change-list"):
+                if change_attr.get("operation") == "set":
+                    match.set(change_attr.get("name"), change_attr.get("value"))
+                else:
+                    del match.attrib[change_attr.get("name")]
+        else:
+            raise AssertionError(f"unexpected operation '{operation}'")
+    return cib
+
+
+class DiffCibs(TestCase):
+    cib = """
+        <cib epoch="1" num_updates="0" admin_epoch="0">
+            <configuration>
+                <crm_config/>
+                <nodes>
+                    <node id="1" uname="node1"/>
+                </nodes>
+                <resources>
+                    <primitive id="A" class="ocf" type="Dummy">
+                        <operations>
+                            <op id="A-monitor" name="monitor" interval="10s"/>
+                        </operations>
+                    </primitive>
+                    <primitive id="B" class="ocf" type="Dummy"/>
+                </resources>
+                <constraints/>
+            </configuration>
+            <status/>
+        </cib>
+    """
+
+    def setUp(self):
+        self.cib_old = etree.fromstring(self.cib)
+        self.cib_new = etree.fromstring(self.cib)
+
+    def assert_diff(self, expected_diff):
+        diff = diff_cibs(self.cib_old, self.cib_new)
+        assert_xml_equal(expected_diff, etree_to_str(diff))
+        assert_xml_equal(
+            etree_to_str(self.cib_new),
+            etree_to_str(apply_patchset(self.cib_old, diff))
+        )
+
+    def assert_unsupported(self):
+        with self.assertRaises(CibDiffUnsupported):
+            diff_cibs(self.cib_old, self.cib_new)
+
+    def test_no_change(self):
+        self.assertIsNone(diff_cibs(self.cib_old, self.cib_new))
+
+    def test_whitespace_change(self):
+        self.cib_new.find("configuration").text = "\n"
+        self.assertIsNone(diff_cibs(self.cib_old, self.cib_new))
+
+    def test_attributes(self):
+        primitive = self.cib_new.find(".//primitive[@id='A']")
+        primitive.set("type", "Stateful")
+        primitive.set("provider", "pacemaker")
+        del primitive.attrib["class"]
+        self.assert_diff("""
+            <diff format="2">
+                <change operation="modify"
+                    path="/cib/configuration/resources/primitive[@id='A']"
+                >
+                    <change-list>
+                        <change-attr name="type" operation="set"
+                            value="Stateful"
+                        />
+                        <change-attr name="provider" operation="set"
+                            value="pacemaker"
+                        />
+                        <change-attr name="class" operation="unset"/>
+                    </change-list>
+                    <change-result>
+                        <primitive id="A" type="Stateful"
+                            provider="pacemaker"
+                        />
+                    </change-result>
+                </change>
+            </diff>
+        """)
+
+    def test_create(self):
+        resources = self.cib_new.find(".//resources")
+        resources.insert(1, etree.Element("primitive", id="C"))
+        etree.SubElement(resources, "primitive", id="D")
+        etree.SubElement(
+            self.cib_new.find(".//constraints"), "rsc_order", id="O"
+        )
+        self.assert_diff("""
+            <diff format="2">
+                <change operation="create"
+                    path="/cib/configuration/resources" position="1"
+                >
+                    <primitive id="C"/>
+                </change>
+                <change operation="create"
+                    path="/cib/configuration/resources" position="3"
+                >
+                    <primitive id="D"/>
+                </change>
+                <change operation="create"
+                    path="/cib/configuration/constraints" position="0"
+                >
+                    <rsc_order id="O"/>
+                </change>
+            </diff>
+        """)
+
+    def test_delete(self):
+        resources = self.cib_new.find(".//resources")
+        resources.remove(resources.find("primitive[@id='A']"))
+        nodes = self.cib_new.find(".//nodes")
+        nodes.remove(nodes[0])
+        self.assert_diff("""
+            <diff format="2">
+                <change operation="delete"
+                    path="/cib/configuration/nodes/node[@id='1']"
+                />
+                <change operation="delete"
+                    path="/cib/configuration/resources/primitive[@id='A']"
+                />
+            </diff>
+        """)
+
+    def test_deletes_go_first(self):
+        self.cib_new.find("configuration").set("foo", "bar")
+        nodes = self.cib_new.find(".//nodes")
+        nodes.remove(nodes[0])
+        self.assert_diff("""
+            <diff format="2">
+                <change operation="delete"
+                    path="/cib/configuration/nodes/node[@id='1']"
+                />
+                <change operation="modify" path="/cib/configuration">
+                    <change-list>
+                        <change-attr name="foo" operation="set" value="bar"/>
+                    </change-list>
+                    <change-result>
+                        <configuration foo="bar"/>
+                    </change-result>
+                </change>
+            </diff>
+        """)
+
+    def test_replace_element(self):
+        resources = self.cib_new.find(".//resources")
+        resources.remove(resources.find("primitive[@id='B']"))
+        etree.SubElement(resources, "group", id="B")
+        self.assert_diff("""
+            <diff format="2">
+                <change operation="delete"
+                    path="/cib/configuration/resources/primitive[@id='B']"
+                />
+                <change operation="create"
+                    path="/cib/configuration/resources" position="1"
+                >
+                    <group id="B"/>
+                </change>
+            </diff>
+        """)
+
+    def test_move_unsupported(self):
+        resources = self.cib_new.find(".//resources")
+        resources.append(resources.find("primitive[@id='A']"))
+        self.assert_unsupported()
+
+    def test_text_change_unsupported(self):
+        self.cib_new.find(".//nodes").text = "text"
+        self.assert_unsupported()
+
+    def test_comment_change_unsupported(self):
+        self.cib_new.find(".//nodes").append(etree.Comment("comment"))
+        self.assert_unsupported()
+
+    def test_unchanged_comment(self):
+        self.cib_old.find(".//nodes").append(etree.Comment("comment"))
+        self.cib_new.find(".//nodes").append(etree.Comment("comment"))
+        self.cib_new.find(".//node").set("uname", "node2")
+        self.assert_diff("""
+            <diff format="2">
+                <change operation="modify"
+                    path="/cib/configuration/nodes/node[@id='1']"
+                >
+                    <change-list>
+                        <change-attr name="uname" operation="set"
+                            value="node2"
+                        />
+                    </change-list>
+                    <change-result>
+                        <node id="1" uname="node2"/>
+                    </change-result>
+                </change>
+            </diff>
+        """)
+
+    def test_ambiguous_path_unsupported(self):
+        for cib in (self.cib_old, self.cib_new):
+            etree.SubElement(cib.find(".//primitive[@id='B']"), "operations")
+            etree.SubElement(cib.find(".//primitive[@id='B']"), "operations")
+        self.cib_new.find(".//primitive[@id='B']/operations").set("a", "b")
+        self.assert_unsupported()
+
+    def test_ambiguous_unchanged_elements(self):
+        for cib in (self.cib_old, self.cib_new):
+            etree.SubElement(cib.find(".//primitive[@id='B']"), "operations")
+            etree.SubElement(cib.find(".//primitive[@id='B']"), "operations")
+        self.cib_new.find(".//primitive[@id='B']").set("a", "b")
+        self.assert_diff("""
+            <diff format="2">
+                <change operation="modify"
+                    path="/cib/configuration/resources/primitive[@id='B']"
+                >
+                    <change-list>
+                        <change-attr name="a" operation="set" value="b"/>
+                    </change-list>
+                    <change-result>
+                        <primitive id="B" class="ocf" type="Dummy" a="b"/>
+                    </change-result>
+                </change>
+            </diff>
+        """)
+
+    def test_ambiguous_siblings_changed_unsupported(self):
+        etree.SubElement(self.cib_old.find(".//nodes"), "node")
+        etree.SubElement(self.cib_old.find(".//nodes"), "node")
+        etree.SubElement(self.cib_new.find(".//nodes"), "node")
+        self.assert_unsupported()
+
+    def test_apostrophe_in_id_unsupported(self):
+        for cib in (self.cib_old, self.cib_new):
+            etree.SubElement(cib.find(".//resources"), "primitive", id="a'b")
+        self.cib_new.find(".//primitive[@id=\"a'b\"]").set("a", "b")
+        self.assert_unsupported()
+
+    def test_apostrophe_in_unchanged_id(self):
+        for cib in (self.cib_old, self.cib_new):
+            etree.SubElement(cib.find(".//resources"), "primitive", id="a'b")
+        self.cib_new.find(".//primitive[@id='A']").set("a", "b")
+        self.assertIsNotNone(diff_cibs(self.cib_old, self.cib_new))
+
+    def test_different_root_unsupported(self):
+        with self.assertRaises(CibDiffUnsupported):
+            diff_cibs(self.cib_old, etree.Element("configuration"))
+
+
+def _modify_add_resource(cib):
+    etree.SubElement(
+        cib.find("configuration/resources"),
+        "primitive",
+        {"id": "diff-test", "class": "ocf", "type": "Dummy"}
+    )
+
+def _modify_remove_elements(cib):
+    for xpath in ("configuration/resources/*", "configuration/nodes/node"):
+        element = cib.find(xpath)
+        if element is not None:
+            element.getparent().remove(element)
+
+def _modify_attributes(cib):
+    for nvpair in list(cib.iterfind(".//nvpair"))[:20]:
+        nvpair.set("value", "changed")
+    primitive = cib.find(".//primitive")
+    if primitive is not None:
+        primitive.set("description", "diff test")
+        primitive.attrib.pop("provider", None)
+    cib.set("epoch", "1000000")
+
+def _modify_all(cib):
+    _modify_remove_elements(cib)
+    _modify_attributes(cib)
+    _modify_add_resource(cib)
+
+
+class DiffCibsCorpus(TestCase):
+    fixture_list = [
+        "cib-empty-1.2.xml",
+        "cib-empty-2.0.xml",
+        "cib-empty-3.2.xml",
+        "cib-empty-withnodes.xml",
+        "cib-empty-with3nodes.xml",
+        "cib-large.xml",
+        "cib-largefile.xml",
+    ]
+    modifier_list = [
+        _modify_add_resource,
+        _modify_remove_elements,
+        _modify_attributes,
+        _modify_all,
+    ]
+
+    def iter_cases(self):
+        for fixture_name in self.fixture_list:
+            with open(rc(fixture_name)) as cib_file:
+                cib_xml = cib_file.read()
+            for modifier in self.modifier_list:
+                cib_new = etree.fromstring(cib_xml)
+                modifier(cib_new)
+                yield (
+                    dict(fixture=fixture_name, modifier=modifier.__name__),
+                    cib_xml,
+                    cib_new,
+                )
+
+    def test_patchset_applies(self):
+        for case, cib_xml, cib_new in self.iter_cases():
+            with self.subTest(**case):
+                cib_old = etree.fromstring(cib_xml)
+                diff = diff_cibs(cib_old, cib_new)
+                if diff is not None:
+                    apply_patchset(cib_old, diff)
+                # assert_xml_equal is too slow for large CIBs
+                self.assertEqual(
+                    etree.tostring(cib_new, method="c14n"),
+                    etree.tostring(cib_old, method="c14n"),
+                )
+
+    @skipUnless(os.path.exists(CRM_DIFF), "crm_diff is not available")
+    def test_same_as_crm_diff(self):
+        for case, cib_xml, cib_new in self.iter_cases():
+            with self.subTest(**case):
+                self.assert_same_as_crm_diff(cib_xml, cib_new)
+
+    @staticmethod
+    def assert_same_as_crm_diff(cib_xml, cib_new):
+        with tempfile.NamedTemporaryFile("w", suffix=".xml") as old_file, \
+            tempfile.NamedTemporaryFile("w", suffix=".xml") as new_file:
+            old_file.write(cib_xml)
+            old_file.flush()
+            new_file.write(etree_to_str(cib_new))
+            new_file.flush()
+            crm_diff = subprocess.run(
+                [
+                    CRM_DIFF, "--original", old_file.name,
+                    "--new", new_file.name, "--no-version",
+                ],
+                stdout=subprocess.PIPE,
+                check=False,
+            )
+        assert_xml_equal(
+            crm_diff.stdout.decode(),
+            etree_to_str(diff_cibs(etree.fromstring(cib_xml), cib_new))
+        )
@@ -214,6 +214,34 @@ class GetClusterStatusText(TestCase):
             ["msgA", "DEBUG: msgB", "msgC", "DEBUG: msgd"]
         )
 
+class GetCibHeaderXmlTest(LibraryPacemakerTest):
+    def test_success(self):
+        expected_stdout = '<cib epoch="1" num_updates="2" admin_epoch="0"/>'
+        mock_runner = get_runner(expected_stdout, "", 0)
+
+        real_xml = lib.get_cib_header_xml(mock_runner)
+
+        mock_runner.run.assert_called_once_with([
+            self.path("cibadmin"), "--local", "--query", "--xpath=/cib",
+            "--no-children",
+        ])
+        self.assertEqual(expected_stdout, real_xml)
+
+    def test_error(self):
+        mock_runner = get_runner("some info", "some error", 1)
+
+        assert_raise_library_error(
+            lambda: lib.get_cib_header_xml(mock_runner),
+            (
+                Severity.ERROR,
+                report_codes.CIB_LOAD_ERROR,
+                {
+                    "reason": "some error\nsome info",
+                }
+            )
+        )
+
+
 class GetCibXmlTest(LibraryPacemakerTest):
     def test_success(self):
         expected_stdout = "<xml />"
@@ -312,6 +340,110 @@ class GetCibXmlTest(LibraryPacemakerTest):
             ]
         )
 
+class GetCibWithoutStatusXmlTest(LibraryPacemakerTest):
+    def setUp(self):
+        self.mock_runner = mock.MagicMock(spec_set=CommandRunner)
+        self.header = '<cib epoch="1" validate-with="pacemaker-3.2"/>'
+
+    def call_header(self):
+        return mock.call([
+            self.path("cibadmin"), "--local", "--query", "--xpath=/cib",
+            "--no-children",
+        ])
+
+    def call_configuration(self):
+        return mock.call([
+            self.path("cibadmin"), "--local", "--query",
+            "--scope=configuration",
+        ])
+
+    def test_success(self):
+        self.mock_runner.run.side_effect = [
+            (self.header, "", 0),
+            ("<configuration><resources/></configuration>", "", 0),
+            (self.header.replace("/>", ' num_updates="5"/>'), "", 0),
+        ]
+        assert_xml_equal(
+            """
+                <cib epoch="1" validate-with="pacemaker-3.2">
+                    <configuration><resources/></configuration>
+                    <status/>
+                </cib>
+            """,
+            lib.get_cib_without_status_xml(self.mock_runner)
+        )
+        self.assertEqual(
+            [
+                self.call_header(),
+                self.call_configuration(),
+                self.call_header(),
+            ],
+            self.mock_runner.run.mock_calls
+        )
+
+    def test_changed_while_loading(self):
+        full_cib = """
+            <cib epoch="2" validate-with="pacemaker-3.2">
+                <configuration><resources><primitive id="R"/></resources>
+                </configuration>
+                <status><node_state id="1"/></status>
+            </cib>
+        """
+        self.mock_runner.run.side_effect = [
+            (self.header, "", 0),
+            ("<configuration><resources/></configuration>", "", 0),
+            (self.header.replace('epoch="1"', 'epoch="2"'), "", 0),
+            (full_cib, "", 0),
+        ]
+        self.assertEqual(
+            full_cib, lib.get_cib_without_status_xml(self.mock_runner)
+        )
+        self.assertEqual(
+            [
+                self.call_header(),
+                self.call_configuration(),
+                self.call_header(),
+                mock.call([self.path("cibadmin"), "--local", "--query"]),
+            ],
+            self.mock_runner.run.mock_calls
+        )
+
+    def test_configuration_error(self):
+        self.mock_runner.run.side_effect = [
+            (self.header, "", 0),
+            ("some info", "some error", 1),
+        ]
+        assert_raise_library_error(
+            lambda: lib.get_cib_without_status_xml(self.mock_runner),
+            (
+                Severity.ERROR,
+                report_codes.CIB_LOAD_ERROR,
+                {
+                    "reason": "some error\nsome info",
+                }
+            )
+        )
+        self.assertEqual(
+            [self.call_header(), self.call_configuration()],
+            self.mock_runner.run.mock_calls
+        )
+
+    def test_invalid_header(self):
+        self.mock_runner.run.side_effect = [
+            ("<cib", "", 0),
+            ("<configuration/>", "", 0),
+            ("<cib", "", 0),
+        ]
+        assert_raise_library_error(
+            lambda: lib.get_cib_without_status_xml(self.mock_runner),
+            (
+                Severity.ERROR,
+                report_codes.CIB_LOAD_ERROR_BAD_FORMAT,
+                {
+                }
+            )
+        )
+
 class GetCibTest(LibraryPacemakerTest):
     def test_success(self):
         xml = "<xml />"
@@ -605,6 +737,25 @@ class EnsureCibVersionTest(TestCase):
         mock_upgrade.assert_called_once_with(self.mock_runner)
         mock_get_cib.assert_called_once_with(self.mock_runner)
 
+    @mock.patch("pcs.lib.pacemaker.live.get_cib_without_status_xml")
+    def test_upgraded_without_status(
+        self, mock_get_cib_without_status, mock_upgrade, mock_get_cib
+    ):
+        upgraded_cib = '<cib validate-with="pacemaker-2.3.5"><status/></cib>'
+        mock_get_cib_without_status.return_value = upgraded_cib
+        assert_xml_equal(
+            upgraded_cib,
+            etree.tostring(
+                lib.ensure_cib_version(
+                    self.mock_runner, self.cib, Version(2, 3, 5),
+                    with_status=False,
+                )
+            ).decode()
+        )
+        mock_upgrade.assert_called_once_with(self.mock_runner)
+        mock_get_cib.assert_not_called()
+        mock_get_cib_without_status.assert_called_once_with(self.mock_runner)
+
     def test_upgraded_lower_version(self, mock_upgrade, mock_get_cib):
         mock_get_cib.return_value = etree.tostring(self.cib).decode()
         assert_raise_library_error(
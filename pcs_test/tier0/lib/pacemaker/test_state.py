@@ -1,3 +1,5 @@
+import os
+import tempfile
 from unittest import mock, TestCase
 
 from lxml import etree
@@ -9,6 +11,7 @@ from pcs_test.tools.assertions import (
 from pcs_test.tools.misc import get_test_resource as rc
 from pcs_test.tools.xml import get_xml_manipulation_creator_from_file
 
+from pcs import settings
 from pcs.common import report_codes
 from pcs.common.reports import ReportItemSeverity as severities
 from pcs.lib.pacemaker import state
@@ -94,6 +97,53 @@ class ClusterStatusTest(TestBase):
         )
 
 
+class CrmMonSchemaCache(TestCase):
+    schema = """
+        <grammar xmlns="http://relaxng.org/ns/structure/1.0">
+            <start><element name="{0}"><empty/></element></start>
+        </grammar>
+    """
+
+    def setUp(self):
+        schema_file = tempfile.NamedTemporaryFile(
+            "w", suffix=".rng", delete=False
+        )
+        schema_file.close()
+        self.schema_path = schema_file.name
+        self.addCleanup(os.unlink, self.schema_path)
+        self.write_schema("crm_mon", 1)
+        patcher = mock.patch.object(
+            settings, "crm_mon_schema", self.schema_path
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(state._crm_mon_schema_cache.clear)
+
+    def write_schema(self, root_name, mtime):
+        with open(self.schema_path, "w") as schema_file:
+            schema_file.write(self.schema.format(root_name))
+        os.utime(self.schema_path, (mtime, mtime))
+
+    @mock.patch("pcs.lib.pacemaker.state.etree.RelaxNG", wraps=etree.RelaxNG)
+    def test_compiled_once(self, mock_relaxng):
+        state.get_cluster_state_dom("<crm_mon/>")
+        state.get_cluster_state_dom("<crm_mon/>")
+        mock_relaxng.assert_called_once_with(file=self.schema_path)
+        assert_raise_library_error(
+            lambda: state.get_cluster_state_dom("<other/>"),
+            (severities.ERROR, report_codes.BAD_CLUSTER_STATE_FORMAT, {})
+        )
+
+    def test_recompiled_when_changed(self):
+        state.get_cluster_state_dom("<crm_mon/>")
+        self.write_schema("other", 2)
+        state.get_cluster_state_dom("<other/>")
+        assert_raise_library_error(
+            lambda: state.get_cluster_state_dom("<crm_mon/>"),
+            (severities.ERROR, report_codes.BAD_CLUSTER_STATE_FORMAT, {})
+        )
+
+
 class WorkWithClusterStatusNodesTest(TestBase):
     def fixture_node_string(self, **kwargs):
         attrs = dict(name='name', id='id', type='member')
@@ -488,6 +538,31 @@ class GetPrimitivesForStateCheck(TestCase):
         self.assert_primitives("B2-R2", ["B2-R2", "B2-R2"], False)
 
 
+class ResourceStateIndexCache(TestCase):
+    status = """
+        <crm_mon>
+            <resources>
+                <resource id="R1" managed="true" role="Stopped" />
+                <resource id="R2" managed="false" role="Stopped" />
+            </resources>
+        </crm_mon>
+    """
+
+    @mock.patch(
+        "pcs.lib.pacemaker.state._ResourceStateIndex",
+        wraps=state._ResourceStateIndex,
+    )
+    def test_index_built_once_for_a_state(self, mock_index):
+        status1 = etree.fromstring(self.status)
+        status2 = etree.fromstring(self.status)
+        self.assertTrue(state.is_resource_managed(status1, "R1"))
+        self.assertFalse(state.is_resource_managed(status1, "R2"))
+        self.assertEqual(1, mock_index.call_count)
+        self.assertFalse(state.is_resource_managed(status2, "R2"))
+        self.assertEqual({}, state.get_resource_state(status2, "R1"))
+        self.assertEqual(2, mock_index.call_count)
+
+
 class CommonResourceState(TestCase):
     resource_id = "R"
     def setUp(self):
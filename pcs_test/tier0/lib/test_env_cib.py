@@ -5,6 +5,7 @@ from lxml import etree
 from pcs_test.tools import fixture
 from pcs_test.tools.assertions import  assert_xml_equal
 from pcs_test.tools.command_env import get_env_tools
+from pcs_test.tools.command_env.config_runner_cib import get_loaded_cib
 from pcs_test.tools.misc import (
     get_test_resource as rc,
     create_setup_patch_mixin,
@@ -84,6 +85,23 @@ class UpgradeCib(TestCase):
         env = self.env_assist.get_env()
         env.get_cib(Version(2, 5, 0))
 
+    def test_get_cib_with_status_version_upgrade_needed(self):
+        (self.config
+            .runner.cib.load(
+                name="load_cib_old",
+                filename="cib-empty-2.6.xml",
+                with_status=True,
+            )
+            .runner.cib.upgrade()
+            .runner.cib.load(filename="cib-empty-2.8.xml", with_status=True)
+        )
+        env = self.env_assist.get_env()
+        env.get_cib(Version(2, 8, 0), with_status=True)
+
+        self.env_assist.assert_reports(
+            [fixture.info(report_codes.CIB_UPGRADE_SUCCESSFUL)]
+        )
+
 
 class GetCib(TestCase, ManageCibAssertionMixin):
     def setUp(self):
@@ -126,6 +144,40 @@ class GetCib(TestCase, ManageCibAssertionMixin):
         env = self.env_assist.get_env()
         self.assertEqual(env.get_cib(), env.cib)
 
+    @staticmethod
+    def fixture_add_node_state(cib):
+        etree.SubElement(cib.find("status"), "node_state", id="1")
+
+    def test_status_not_loaded_by_default(self):
+        self.config.runner.cib.load(modifiers=[self.fixture_add_node_state])
+        env = self.env_assist.get_env()
+        cib = env.get_cib()
+        self.assertEqual([], list(cib.find("status")))
+        self.assertEqual("557", cib.get("epoch"))
+        self.assertIsNotNone(cib.find("configuration/resources"))
+        env.logger.debug.assert_called_once_with(
+            "Loaded CIB %s the status section: %d bytes parsed in %.3f s",
+            "without",
+            len(get_loaded_cib(self.config.calls, "runner.cib.load")),
+            mock.ANY,
+        )
+
+    def test_status_loaded_on_request(self):
+        self.config.runner.cib.load(
+            modifiers=[self.fixture_add_node_state], with_status=True
+        )
+        env = self.env_assist.get_env()
+        cib = env.get_cib(with_status=True)
+        self.assertEqual(
+            ["1"], [el.get("id") for el in cib.findall("status/node_state")]
+        )
+        env.logger.debug.assert_called_once_with(
+            "Loaded CIB %s the status section: %d bytes parsed in %.3f s",
+            "with",
+            len(self.config.calls.get("runner.cib.load").stdout),
+            mock.ANY,
+        )
+
     def test_property_without_get(self):
         env = self.env_assist.get_env()
         # need to use lambda because env.cib is a property
@@ -141,6 +193,15 @@ class GetCib(TestCase, ManageCibAssertionMixin):
 class PushLoadedCib(TestCase, ManageCibAssertionMixin):
     # pylint: disable=too-many-public-methods
     wait_timeout = 10
+    cib_diff = """
+        <diff format="2">
+            <change operation="create" path="/cib/configuration/resources"
+                position="0"
+            >
+                <primitive id="R"/>
+            </change>
+        </diff>
+    """
     def setUp(self):
         tmpfile_patcher = mock.patch("pcs.lib.pacemaker.live.write_tmpfile")
         self.addCleanup(tmpfile_patcher.stop)
@@ -154,7 +215,25 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
         self.cib_cannot_diff = "cib-empty-1.2.xml"
         self.env_assist, self.config = get_env_tools(test_case=self)
 
+    @staticmethod
+    def modify_cib(cib):
+        etree.SubElement(
+            cib.find("configuration/resources"), "primitive", id="R"
+        )
+
+    @staticmethod
+    def modify_cib_unsupported(cib):
+        # moving elements is left to crm_diff
+        configuration = cib.find("configuration")
+        configuration.append(configuration.find("nodes"))
+
     def config_load_and_push_diff(self):
+        (self.config
+            .runner.cib.load(filename=self.cib_can_diff)
+            .runner.cib.push_diff(cib_diff=self.cib_diff)
+        )
+
+    def config_load_and_push_crm_diff(self):
         (self.config
             .runner.cib.load(filename=self.cib_can_diff)
             .runner.cib.diff(self.tmpfile_old.name, self.tmpfile_new.name)
@@ -167,20 +246,17 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
             .runner.cib.push()
         )
 
-    def push_reports(self, cib_old=None, cib_new=None):
-        # No test changes the CIB between load and push. The point is to test
-        # loading and pushing, not editing the CIB.
-        loaded_cib = self.config.calls.get("runner.cib.load").stdout
+    def push_reports(self, cib_new):
         return [
             fixture.debug(
                 report_codes.TMP_FILE_WRITE,
                 file_path=self.tmpfile_old.name,
-                content=(cib_old if cib_old is not None else loaded_cib)
+                content=get_loaded_cib(self.config.calls, "runner.cib.load"),
             ),
             fixture.debug(
                 report_codes.TMP_FILE_WRITE,
                 file_path=self.tmpfile_new.name,
-                content=(cib_new if cib_new is not None else loaded_cib).strip()
+                content=etree_to_str(cib_new),
             ),
         ]
 
@@ -198,9 +274,26 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
         self.config_load_and_push_diff()
         env = self.env_assist.get_env()
 
+        self.modify_cib(env.get_cib())
+        env.push_cib()
+        self.mock_write_tmpfile.assert_not_called()
+
+    def test_get_and_push_no_change(self):
+        self.config.runner.cib.load(filename=self.cib_can_diff)
+        env = self.env_assist.get_env()
+
         env.get_cib()
         env.push_cib()
-        self.env_assist.assert_reports(self.push_reports())
+        self.mock_write_tmpfile.assert_not_called()
+
+    def test_get_and_push_unsupported_change(self):
+        self.config_load_and_push_crm_diff()
+        env = self.env_assist.get_env()
+
+        cib = env.get_cib()
+        self.modify_cib_unsupported(cib)
+        env.push_cib()
+        self.env_assist.assert_reports(self.push_reports(cib))
 
     def test_get_and_push_cannot_diff(self):
         self.config_load_and_push()
@@ -213,22 +306,40 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
         )
 
     def test_modified_cib_features_do_not_matter(self):
-        self.config_load_and_push_diff()
+        (self.config
+            .runner.cib.load(filename=self.cib_can_diff)
+            .runner.cib.push_diff(cib_diff="""
+                <diff format="2">
+                    <change operation="modify" path="/cib">
+                        <change-list>
+                            <change-attr name="crm_feature_set"
+                                operation="set" value="3.0.8"
+                            />
+                        </change-list>
+                        <change-result>
+                            <cib epoch="557" num_updates="122"
+                                admin_epoch="0" validate-with="pacemaker-2.0"
+                                crm_feature_set="3.0.8" update-origin="rh7-3"
+                                update-client="crmd"
+                                cib-last-written="Thu Aug 23 16:49:17 2012"
+                                have-quorum="0" dc-uuid="2"
+                            />
+                        </change-result>
+                    </change>
+                </diff>
+            """)
+        )
         env = self.env_assist.get_env()
 
         cib = env.get_cib()
         cib.set("crm_feature_set", "3.0.8")
         env.push_cib()
-        self.env_assist.assert_reports(self.push_reports(
-            cib_new=self.config.calls.get("runner.cib.load").stdout.replace(
-                "3.0.9",
-                "3.0.8"
-            )
-        ))
 
     def test_push_no_features_goes_with_full(self):
         (self.config
-            .runner.cib.load_content("<cib />", name="runner.cib.load_content")
+            .runner.cib.load_content(
+                "<cib><configuration/></cib>", name="runner.cib.load_content"
+            )
             .runner.cib.push(load_key="runner.cib.load_content")
         )
         env = self.env_assist.get_env()
@@ -247,12 +358,11 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
         )
         env = self.env_assist.get_env()
 
-        env.get_cib()
+        self.modify_cib(env.get_cib())
         env.push_cib()
         # need to use lambda because env.cib is a property
         self.assert_raises_cib_not_loaded(lambda: env.cib)
         env.get_cib()
-        self.env_assist.assert_reports(self.push_reports())
 
     def test_can_get_after_push_cannot_diff(self):
         self.config_load_and_push()
@@ -280,7 +390,7 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
         self.mock_write_tmpfile.side_effect = EnvironmentError("test error")
         env = self.env_assist.get_env()
 
-        env.get_cib()
+        self.modify_cib_unsupported(env.get_cib())
         self.env_assist.assert_raise_library_error(
             env.push_cib,
             [
@@ -292,7 +402,7 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
             expected_in_processor=False
         )
 
-    def test_diff_is_empty(self):
+    def test_crm_diff_is_empty(self):
         (self.config
             .runner.cib.load(filename=self.cib_can_diff)
             .runner.cib.diff(
@@ -304,11 +414,12 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
             )
         )
         env = self.env_assist.get_env()
-        env.get_cib()
+        cib = env.get_cib()
+        self.modify_cib_unsupported(cib)
         env.push_cib()
-        self.env_assist.assert_reports(self.push_reports())
+        self.env_assist.assert_reports(self.push_reports(cib))
 
-    def test_diff_fails(self):
+    def test_crm_diff_fails(self):
         (self.config
             .runner.cib.load(filename=self.cib_can_diff)
             .runner.cib.diff(
@@ -319,7 +430,8 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
             )
         )
         env = self.env_assist.get_env()
-        env.get_cib()
+        cib = env.get_cib()
+        self.modify_cib_unsupported(cib)
         self.env_assist.assert_raise_library_error(
             env.push_cib,
             [
@@ -330,16 +442,17 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
             ],
             expected_in_processor=False
         )
-        self.env_assist.assert_reports(self.push_reports())
+        self.env_assist.assert_reports(self.push_reports(cib))
 
     def test_push_diff_fails(self):
         (self.config
             .runner.cib.load(filename=self.cib_can_diff)
-            .runner.cib.diff(self.tmpfile_old.name, self.tmpfile_new.name)
-            .runner.cib.push_diff(stderr="invalid cib", returncode=1)
+            .runner.cib.push_diff(
+                cib_diff=self.cib_diff, stderr="invalid cib", returncode=1
+            )
         )
         env = self.env_assist.get_env()
-        env.get_cib()
+        self.modify_cib(env.get_cib())
         self.env_assist.assert_raise_library_error(
             env.push_cib,
             [
@@ -350,7 +463,6 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
             ],
             expected_in_processor=False
         )
-        self.env_assist.assert_reports(self.push_reports())
 
     def test_push_fails(self):
         (self.config
@@ -377,15 +489,13 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
         (self.config
             .runner.cib.load(filename=self.cib_can_diff)
             .runner.pcmk.can_wait()
-            .runner.cib.diff(self.tmpfile_old.name, self.tmpfile_new.name)
-            .runner.cib.push_diff()
+            .runner.cib.push_diff(cib_diff=self.cib_diff)
             .runner.pcmk.wait(timeout=self.wait_timeout)
         )
         env = self.env_assist.get_env()
 
-        env.get_cib()
+        self.modify_cib(env.get_cib())
         env.push_cib(wait=self.wait_timeout)
-        self.env_assist.assert_reports(self.push_reports())
 
     def test_wait_cannot_diff(self):
         (self.config
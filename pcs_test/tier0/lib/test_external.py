@@ -110,6 +110,19 @@ class CommandRunnerTest(TestCase):
             ]
         )
 
+    def test_signals_restored_without_preexec_fn(self, mock_popen):
+        mock_process = mock.MagicMock(spec_set=["communicate", "returncode"])
+        mock_process.communicate.return_value = ("", "")
+        mock_process.returncode = 0
+        mock_popen.return_value = mock_process
+
+        runner = lib.CommandRunner(self.mock_logger, self.mock_reporter)
+        runner.run(["a_command"])
+
+        dummy_args, kwargs = mock_popen.call_args
+        self.assertTrue(kwargs["restore_signals"])
+        self.assertIsNone(kwargs.get("preexec_fn"))
+
     def test_env(self, mock_popen):
         expected_stdout = "expected output"
         expected_stderr = "expected stderr"
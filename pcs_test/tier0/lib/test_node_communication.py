@@ -659,3 +659,19 @@ class CommunicatorLoggerTest(TestCase):
             )
         )
         self.assertEqual([logger_call], self.logger.mock_calls)
+
+    def test_log_connections(self):
+        self.com_logger.log_connections(2, 3)
+        self.reporter.assert_reports([(
+            severity.DEBUG,
+            report_codes.NODE_COMMUNICATION_CONNECTIONS,
+            {
+                "created": 2,
+                "reused": 3,
+            },
+            None
+        )])
+        self.assertEqual(
+            [mock.call.debug("Connections to nodes: 2 opened, 3 reused")],
+            self.logger.mock_calls
+        )
@@ -34,6 +34,19 @@ class ServiceCommandFormat(TestCase):
             }
         )
 
+
+class FileDigest(TestCase):
+    def test_digest_of_transferred_data(self):
+        self.assertEqual(
+            node_communication_format.file_digest(
+                node_communication_format.booth_authfile_format(
+                    "booth.key", b"key"
+                )
+            ),
+            # sha256 of base64 encoded b"key"
+            "aedbcece349eeb048bcf19b4a6ac8e747cd2efa852bda2793aeec9c0357dbd94"
+        )
+
 def fixture_invalid_response_format(node_label):
     return (
         severity.ERROR,
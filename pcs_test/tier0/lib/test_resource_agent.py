@@ -19,6 +19,7 @@ from pcs.common.reports import ReportItemSeverity as severity
 from pcs.lib import resource_agent as lib_ra
 from pcs.lib.errors import LibraryError
 from pcs.lib.external import CommandRunner
+from pcs.lib.resource_agent_cache import AgentMetadataCache
 
 # pylint: disable=protected-access
 
@@ -583,15 +584,20 @@ class GuessResourceAgentFullNameTest(TestCase):
         )
 
     def test_two_agents_one_valid_list(self):
+        # metadata of the agents are loaded concurrently, so they must be
+        # matched to the agents by command, not by order
+        metadata = {
+            "ocf:heartbeat:Dummy": ("<resource-agent />", "", 0),
+            "ocf:pacemaker:Dummy": ("invalid metadata", "", 0),
+        }
+        side_effect = iter(self.mock_runner_side_effect)
+        def run(args, **kwargs):
+            # pylint: disable=unused-argument
+            if "--show-metadata" in args:
+                return metadata[args[-1]]
+            return next(side_effect)
         mock_runner = mock.MagicMock(spec_set=CommandRunner)
-        mock_runner.run.side_effect = (
-            self.mock_runner_side_effect
-            +
-            [
-                ("<resource-agent />", "", 0),
-                ("invalid metadata", "", 0),
-            ]
-        )
+        mock_runner.run.side_effect = run
 
         self.assertEqual(
             [
@@ -673,6 +679,75 @@ class GuessResourceAgentFullNameTest(TestCase):
         )
 
 
+class LoadAgentsMetadata(TestCase):
+    def setUp(self):
+        self.metadata = {
+            "ocf:heartbeat:Dummy": ("<resource-agent />", "", 0),
+            "ocf:pacemaker:Dummy": ("invalid metadata", "", 0),
+            "ocf:pacemaker:Stateful": ("", "some error", 1),
+            "ocf:pacemaker:Delay": (
+                "<resource-agent><shortdesc>Delay</shortdesc></resource-agent>",
+                "",
+                0,
+            ),
+        }
+        self.mock_runner = mock.MagicMock(spec_set=CommandRunner)
+        self.mock_runner.run.side_effect = (
+            lambda args, **kwargs: self.metadata[args[-1]]
+        )
+
+    def test_success(self):
+        agent_list = [
+            lib_ra.ResourceAgent(self.mock_runner, name)
+            for name in self.metadata
+        ]
+        error_list = lib_ra.load_agents_metadata(agent_list)
+
+        self.assertEqual(4, len(error_list))
+        self.assertIsNone(error_list[0])
+        self.assertIsInstance(error_list[1], lib_ra.UnableToGetAgentMetadata)
+        self.assertEqual("ocf:pacemaker:Dummy", error_list[1].agent)
+        self.assertIsInstance(error_list[2], lib_ra.UnableToGetAgentMetadata)
+        self.assertEqual(
+            ("ocf:pacemaker:Stateful", "some error"),
+            (error_list[2].agent, error_list[2].message)
+        )
+        self.assertIsNone(error_list[3])
+        self.assertEqual(4, self.mock_runner.run.call_count)
+
+        # loaded metadata are kept in the agents
+        self.assertEqual("Delay", agent_list[3].get_shortdesc())
+        self.assertEqual(4, self.mock_runner.run.call_count)
+
+    @patch_agent("settings.agent_metadata_load_parallelism", 1)
+    def test_sequential(self):
+        agent_list = [
+            lib_ra.ResourceAgent(self.mock_runner, name)
+            for name in ["ocf:heartbeat:Dummy", "ocf:pacemaker:Stateful"]
+        ]
+        error_list = lib_ra.load_agents_metadata(agent_list)
+
+        self.assertIsNone(error_list[0])
+        self.assertIsInstance(error_list[1], lib_ra.UnableToGetAgentMetadata)
+        self.assertEqual(
+            [
+                mock.call(
+                    [
+                        "/usr/sbin/crm_resource",
+                        "--show-metadata",
+                        name,
+                    ],
+                    env_extend={"PATH": "/usr/sbin/:/bin/:/usr/bin/"},
+                )
+                for name in ["ocf:heartbeat:Dummy", "ocf:pacemaker:Stateful"]
+            ],
+            self.mock_runner.run.mock_calls
+        )
+
+    def test_no_agents(self):
+        self.assertEqual([], lib_ra.load_agents_metadata([]))
+
+
 @patch_agent_object("_get_metadata")
 class AgentMetadataGetShortdescTest(TestCase):
     def setUp(self):
@@ -1883,6 +1958,112 @@ class CrmAgentMetadataIsValidAgentTest(TestCase):
         self.assertFalse(self.agent.is_valid_metadata())
 
 
+class AgentMetadataCacheTest(TestCase):
+    def setUp(self):
+        self.mock_runner = mock.MagicMock(spec_set=CommandRunner)
+        self.mock_cache = mock.MagicMock(spec_set=AgentMetadataCache)
+        lib_ra.Agent.set_metadata_cache(self.mock_cache)
+        self.metadata = (
+            "<resource-agent><shortdesc>desc</shortdesc></resource-agent>"
+        )
+
+    def tearDown(self):
+        lib_ra.Agent.set_metadata_cache(None)
+
+    def assert_loaded(self, agent, agent_file):
+        self.mock_cache.get.return_value = None
+        self.mock_runner.run.return_value = (self.metadata, "", 0)
+
+        self.assertEqual("desc", agent.get_shortdesc())
+
+        self.mock_cache.get.assert_called_once_with(
+            agent.get_name(), agent_file
+        )
+        self.mock_runner.run.assert_called_once()
+        self.mock_cache.put.assert_called_once_with(
+            agent.get_name(), agent_file, self.metadata
+        )
+
+    def assert_cached(self, agent, agent_file):
+        self.mock_cache.get.return_value = self.metadata
+
+        self.assertEqual("desc", agent.get_shortdesc())
+
+        self.mock_cache.get.assert_called_once_with(
+            agent.get_name(), agent_file
+        )
+        self.mock_runner.run.assert_not_called()
+        self.mock_cache.put.assert_not_called()
+
+    def assert_not_cached(self, agent):
+        self.mock_runner.run.return_value = (self.metadata, "", 0)
+
+        self.assertEqual("desc", agent.get_shortdesc())
+
+        self.mock_runner.run.assert_called_once()
+        self.mock_cache.get.assert_not_called()
+        self.mock_cache.put.assert_not_called()
+
+    def test_ocf_agent_loaded(self):
+        self.assert_loaded(
+            lib_ra.ResourceAgent(self.mock_runner, "ocf:pacemaker:Dummy"),
+            "/usr/lib/ocf/resource.d/pacemaker/Dummy"
+        )
+
+    def test_ocf_agent_cached(self):
+        self.assert_cached(
+            lib_ra.ResourceAgent(self.mock_runner, "ocf:pacemaker:Dummy"),
+            "/usr/lib/ocf/resource.d/pacemaker/Dummy"
+        )
+
+    def test_lsb_agent_cached(self):
+        self.assert_cached(
+            lib_ra.ResourceAgent(self.mock_runner, "lsb:network"),
+            "/etc/init.d/network"
+        )
+
+    def test_stonith_agent_cached(self):
+        self.assert_cached(
+            lib_ra.StonithAgent(self.mock_runner, "fence_xvm"),
+            "/usr/sbin/fence_xvm"
+        )
+
+    def test_fenced_metadata_loaded(self):
+        self.assert_loaded(
+            lib_ra.FencedMetadata(self.mock_runner),
+            "/usr/libexec/pacemaker/pacemaker-fenced"
+        )
+
+    def test_fenced_metadata_cached(self):
+        self.assert_cached(
+            lib_ra.FencedMetadata(self.mock_runner),
+            "/usr/libexec/pacemaker/pacemaker-fenced"
+        )
+
+    def test_systemd_agent_not_cached(self):
+        self.assert_not_cached(
+            lib_ra.ResourceAgent(self.mock_runner, "systemd:chronyd")
+        )
+
+    def test_absent_agent_not_cached(self):
+        agent = lib_ra.AbsentResourceAgent(
+            self.mock_runner, "ocf:pacemaker:Dummy"
+        )
+        self.assertEqual("", agent.get_shortdesc())
+        self.mock_cache.get.assert_not_called()
+        self.mock_cache.put.assert_not_called()
+
+    def test_no_cache(self):
+        lib_ra.Agent.set_metadata_cache(None)
+        self.assert_not_cached(
+            lib_ra.ResourceAgent(self.mock_runner, "ocf:pacemaker:Dummy")
+        )
+
+    def test_clear(self):
+        lib_ra.Agent.clear_metadata_cache()
+        self.mock_cache.clear.assert_called_once_with()
+
+
 class StonithAgentMetadataGetNameTest(TestCase, ExtendedAssertionsMixin):
     def test_success(self):
         mock_runner = mock.MagicMock(spec_set=CommandRunner)
@@ -1903,9 +2084,6 @@ class StonithAgentMetadataGetMetadataTest(TestCase, ExtendedAssertionsMixin):
             self.agent_name
         )
 
-    def tearDown(self):
-        lib_ra.StonithAgent._fenced_metadata = None
-
     def test_success(self):
         metadata = """
             <resource-agent>
@@ -1940,9 +2118,6 @@ class StonithAgentMetadataGetParametersTest(TestCase):
             self.agent_name
         )
 
-    def tearDown(self):
-        lib_ra.StonithAgent._fenced_metadata = None
-
     def test_success(self):
         metadata = """
             <resource-agent>
@@ -2092,9 +2267,6 @@ class StonithAgentMetadataGetProvidesUnfencingTest(TestCase):
             "fence_dummy"
         )
 
-    def tearDown(self):
-        lib_ra.StonithAgent._fenced_metadata = None
-
     def test_true(self, mock_metadata):
         xml = """
             <resource-agent>
@@ -0,0 +1,165 @@
+import os
+import os.path
+import tempfile
+from unittest import TestCase
+
+from pcs.lib.resource_agent_cache import (
+    AgentFileStamp,
+    AgentMetadataCache,
+    get_agent_file_stamp,
+)
+
+# pylint: disable=protected-access
+
+
+class CacheTestMixin():
+    # pylint: disable=invalid-name
+    def setUp(self):
+        # pylint: disable=consider-using-with
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp_dir.name, "cache")
+        self.agent_file = self.write_agent("agent", "#!/bin/sh\n")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_agent(self, name, content):
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, "w") as agent_file:
+            agent_file.write(content)
+        return path
+
+    def list_entries(self):
+        return sorted(os.listdir(self.cache_dir))
+
+
+class GetAgentFileStamp(CacheTestMixin, TestCase):
+    def test_existing_file(self):
+        stat = os.stat(self.agent_file)
+        self.assertEqual(
+            AgentFileStamp(self.agent_file, stat.st_mtime_ns, stat.st_size),
+            get_agent_file_stamp(self.agent_file)
+        )
+
+    def test_missing_file(self):
+        self.assertIsNone(
+            get_agent_file_stamp(os.path.join(self.tmp_dir.name, "missing"))
+        )
+
+    def test_no_file(self):
+        self.assertIsNone(get_agent_file_stamp(None))
+
+
+class AgentMetadataCacheTest(CacheTestMixin, TestCase):
+    def test_miss(self):
+        cache = AgentMetadataCache(self.cache_dir, 10)
+        self.assertIsNone(cache.get("ocf:pacemaker:Dummy", self.agent_file))
+
+    def test_hit(self):
+        cache = AgentMetadataCache(self.cache_dir, 10)
+        cache.put("ocf:pacemaker:Dummy", self.agent_file, "<resource-agent/>")
+        self.assertEqual(
+            "<resource-agent/>",
+            cache.get("ocf:pacemaker:Dummy", self.agent_file)
+        )
+        self.assertEqual(
+            "<resource-agent/>",
+            AgentMetadataCache(self.cache_dir, 10).get(
+                "ocf:pacemaker:Dummy", self.agent_file
+            )
+        )
+
+    def test_agents_do_not_mix(self):
+        cache = AgentMetadataCache(self.cache_dir, 10)
+        cache.put("ocf:pacemaker:Dummy", self.agent_file, "<resource-agent/>")
+        self.assertIsNone(cache.get("ocf:heartbeat:Dummy", self.agent_file))
+
+    def test_invalidated_by_agent_change(self):
+        cache = AgentMetadataCache(self.cache_dir, 10)
+        cache.put("ocf:pacemaker:Dummy", self.agent_file, "<resource-agent/>")
+        self.write_agent("agent", "#!/bin/sh\nexit 0\n")
+        self.assertIsNone(cache.get("ocf:pacemaker:Dummy", self.agent_file))
+
+    def test_invalidated_by_agent_mtime_change(self):
+        cache = AgentMetadataCache(self.cache_dir, 10)
+        cache.put("ocf:pacemaker:Dummy", self.agent_file, "<resource-agent/>")
+        stat = os.stat(self.agent_file)
+        os.utime(
+            self.agent_file,
+            ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000)
+        )
+        self.assertIsNone(cache.get("ocf:pacemaker:Dummy", self.agent_file))
+
+    def test_invalidated_by_agent_path_change(self):
+        cache = AgentMetadataCache(self.cache_dir, 10)
+        cache.put("ocf:pacemaker:Dummy", self.agent_file, "<resource-agent/>")
+        self.assertIsNone(
+            cache.get(
+                "ocf:pacemaker:Dummy",
+                self.write_agent("other_agent", "#!/bin/sh\n"),
+            )
+        )
+
+    def test_missing_agent_file(self):
+        cache = AgentMetadataCache(self.cache_dir, 10)
+        missing_file = os.path.join(self.tmp_dir.name, "missing")
+        cache.put("ocf:pacemaker:Dummy", missing_file, "<resource-agent/>")
+        self.assertFalse(os.path.exists(self.cache_dir))
+        self.assertIsNone(cache.get("ocf:pacemaker:Dummy", missing_file))
+
+    def test_refresh(self):
+        AgentMetadataCache(self.cache_dir, 10).put(
+            "ocf:pacemaker:Dummy", self.agent_file, "<resource-agent/>"
+        )
+        cache = AgentMetadataCache(self.cache_dir, 10, refresh=True)
+        self.assertIsNone(cache.get("ocf:pacemaker:Dummy", self.agent_file))
+        cache.put("ocf:pacemaker:Dummy", self.agent_file, "<new/>")
+        self.assertEqual(
+            "<new/>",
+            AgentMetadataCache(self.cache_dir, 10).get(
+                "ocf:pacemaker:Dummy", self.agent_file
+            )
+        )
+
+    def test_corrupted_entry(self):
+        cache = AgentMetadataCache(self.cache_dir, 10)
+        cache.put("ocf:pacemaker:Dummy", self.agent_file, "<resource-agent/>")
+        entry_name, = self.list_entries()
+        with open(os.path.join(self.cache_dir, entry_name), "w") as entry:
+            entry.write("{not json")
+        self.assertIsNone(cache.get("ocf:pacemaker:Dummy", self.agent_file))
+
+    def test_unusable_cache_dir(self):
+        blocker = self.write_agent("blocker", "")
+        cache = AgentMetadataCache(os.path.join(blocker, "cache"), 10)
+        cache.put("ocf:pacemaker:Dummy", self.agent_file, "<resource-agent/>")
+        self.assertIsNone(cache.get("ocf:pacemaker:Dummy", self.agent_file))
+
+    def test_lru_eviction(self):
+        cache = AgentMetadataCache(self.cache_dir, 2)
+        entry_path = {}
+        for i, name in enumerate(["a", "b"]):
+            cache.put(name, self.agent_file, name)
+            entry_path[name] = cache._get_entry_path(name)
+            # make the order of entries deterministic
+            os.utime(entry_path[name], ns=(i, i))
+        # "a" becomes the most recently used entry
+        self.assertEqual("a", cache.get("a", self.agent_file))
+        cache.put("c", self.agent_file, "c")
+
+        self.assertEqual(2, len(self.list_entries()))
+        self.assertFalse(os.path.exists(entry_path["b"]))
+        self.assertEqual("a", cache.get("a", self.agent_file))
+        self.assertIsNone(cache.get("b", self.agent_file))
+        self.assertEqual("c", cache.get("c", self.agent_file))
+
+    def test_clear(self):
+        cache = AgentMetadataCache(self.cache_dir, 10)
+        cache.put("a", self.agent_file, "a")
+        cache.put("b", self.agent_file, "b")
+        cache.clear()
+        self.assertEqual([], self.list_entries())
+        self.assertIsNone(cache.get("a", self.agent_file))
+
+    def test_clear_missing_cache_dir(self):
+        AgentMetadataCache(self.cache_dir, 10).clear()
@@ -0,0 +1,203 @@
+import os
+import tempfile
+from unittest import mock, TestCase
+
+from pcs.snmp import collector
+
+COROSYNC_CONF = """
+totem {
+    version: 2
+    cluster_name: cluster1
+    transport: knet
+}
+
+nodelist {
+    node {
+        ring0_addr: 10.0.0.1
+        name: node1
+        nodeid: 1
+    }
+    node {
+        ring0_addr: 10.0.0.2
+        name: node2
+        nodeid: 2
+    }
+    node {
+        ring0_addr: 10.0.0.3
+        name: node3
+        nodeid: 3
+    }
+}
+"""
+
+CRM_MON = """
+<crm_mon version="2.0.3">
+  <summary>
+    <current_dc present="true" name="node1" id="1" with_quorum="true"/>
+  </summary>
+  <nodes>
+    <node name="node1" id="1" online="true" standby="false"
+      maintenance="false" resources_running="3" type="member"/>
+    <node name="node2" id="2" online="true" standby="true"
+      maintenance="false" resources_running="1" type="member"/>
+    <node name="node3" id="3" online="false" standby="false"
+      maintenance="false" resources_running="0" type="member"/>
+    <node name="remote1" id="remote1" online="true" standby="false"
+      maintenance="false" resources_running="0" type="remote"/>
+  </nodes>
+  <resources>
+    <resource id="R1" active="true"/>
+    <group id="G" number_resources="2">
+      <resource id="R2" active="true"/>
+      <resource id="R3" active="false" failed="true"/>
+    </group>
+    <clone id="C-clone">
+      <resource id="C:0" active="true"/>
+      <resource id="C:1" active="false"/>
+    </clone>
+    <resource id="S" active="true"/>
+  </resources>
+</crm_mon>
+"""
+
+CIB = """
+<cib admin_epoch="0" epoch="5" num_updates="7">
+  <configuration>
+    <resources>
+      <primitive id="R1" class="ocf" provider="pacemaker" type="Dummy"/>
+      <group id="G">
+        <primitive id="R2" class="ocf" provider="pacemaker" type="Dummy"/>
+        <primitive id="R3" class="ocf" provider="pacemaker" type="Dummy"/>
+      </group>
+      <clone id="C-clone">
+        <primitive id="C" class="ocf" provider="pacemaker" type="Dummy"/>
+      </clone>
+      <clone id="D-clone">
+        <meta_attributes id="D-clone-meta">
+          <nvpair id="D-clone-role" name="target-role" value="Stopped"/>
+        </meta_attributes>
+        <primitive id="D" class="ocf" provider="pacemaker" type="Dummy"/>
+      </clone>
+      <primitive id="S" class="stonith" type="fence_xvm">
+        <meta_attributes id="S-meta">
+          <nvpair id="S-role" name="target-role" value="stopped"/>
+        </meta_attributes>
+      </primitive>
+      <bundle id="B">
+        <primitive id="B-R" class="ocf" provider="pacemaker" type="Dummy"/>
+      </bundle>
+    </resources>
+  </configuration>
+  <status/>
+</cib>
+"""
+
+CIB_HEADER = '<cib admin_epoch="0" epoch="5" num_updates="{0}"/>'
+
+CMAPCTL = """
+nodelist.node.0.name (str) = node1
+nodelist.node.0.nodeid (u32) = 1
+nodelist.node.1.name (str) = node2
+nodelist.node.1.nodeid (u32) = 2
+nodelist.node.2.name (str) = node3
+nodelist.node.2.nodeid (u32) = 3
+runtime.members.1.status (str) = joined
+runtime.members.2.status (str) = joined
+"""
+
+
+class Runner:
+    def __init__(self):
+        self.num_updates = 7
+        self.commands = []
+
+    def run(self, args):
+        command = os.path.basename(args[0])
+        self.commands.append(command)
+        if command == "crm_mon":
+            return CRM_MON, "", 0
+        if command == "corosync-cmapctl":
+            return CMAPCTL, "", 0
+        if "--no-children" in args:
+            return CIB_HEADER.format(self.num_updates), "", 0
+        return CIB, "", 0
+
+
+@mock.patch("pcs.settings.crm_mon_schema", "/nonexistent")
+@mock.patch(
+    "pcs.snmp.collector.get_local_corosync_conf", lambda: COROSYNC_CONF
+)
+class CollectClusterData(TestCase):
+    def test_success(self):
+        self.assertEqual(
+            collector.ClusterData(
+                cluster_name="cluster1",
+                quorate=True,
+                nodes=["node1", "node2", "node3"],
+                corosync_nodes_online=["node1", "node2"],
+                corosync_nodes_offline=["node3"],
+                pcmk_nodes_online=["node1"],
+                pcmk_nodes_standby=["node2"],
+                pcmk_nodes_offline=["node3"],
+                resources=["R1", "R2", "R3", "C", "D", "S"],
+                resources_running=["R1", "R2", "C", "S"],
+                resources_stopped=["D"],
+                resources_failed=["R3"],
+            ),
+            collector.collect_cluster_data(Runner())
+        )
+
+
+@mock.patch("pcs.settings.crm_mon_schema", "/nonexistent")
+@mock.patch(
+    "pcs.snmp.collector.get_local_corosync_conf", lambda: COROSYNC_CONF
+)
+class Collector(TestCase):
+    def setUp(self):
+        # pylint: disable=consider-using-with
+        corosync_conf = tempfile.NamedTemporaryFile("w", delete=False)
+        corosync_conf.write(COROSYNC_CONF)
+        corosync_conf.close()
+        self.addCleanup(os.unlink, corosync_conf.name)
+        patcher = mock.patch(
+            "pcs.settings.corosync_conf_file", corosync_conf.name
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.runner = Runner()
+
+    def collect(self, ttl=300):
+        data_collector = collector.Collector(self.runner, 1, ttl)
+        data_collector.refresh()
+        return data_collector
+
+    def test_cached_data_reused(self):
+        data_collector = self.collect()
+        data = data_collector.get_data()
+        data_collector.refresh()
+        self.assertIs(data, data_collector.get_data())
+        self.assertEqual(
+            [
+                "cibadmin", "corosync-cmapctl", "crm_mon", "cibadmin",
+                "cibadmin",
+            ],
+            self.runner.commands
+        )
+
+    def test_collected_when_cib_changed(self):
+        data_collector = self.collect()
+        self.runner.num_updates = 8
+        data_collector.refresh()
+        self.assertEqual(2, self.runner.commands.count("crm_mon"))
+
+    def test_collected_when_cache_expired(self):
+        data_collector = self.collect(ttl=0)
+        data_collector.refresh()
+        self.assertEqual(2, self.runner.commands.count("crm_mon"))
+
+    @mock.patch("pcs.snmp.collector.logger")
+    def test_failure(self, mock_logger):
+        self.runner.run = lambda args: ("", "error", 1)
+        data_collector = self.collect()
+        self.assertIsNone(data_collector.get_data(timeout=0))
+        mock_logger.error.assert_called_once()
@@ -0,0 +1,75 @@
+import os.path
+import re
+import subprocess
+import sys
+from unittest import TestCase
+
+# Commands are run hundreds of times per hour by monitoring tools, the time it
+# takes to start pcs matters. The budget is generous so that the test does not
+# fail on slow machines. Importing unneeded modules is checked precisely.
+IMPORT_TIME_BUDGET = 1 # in seconds
+
+PACKAGE_DIR = os.path.realpath(
+    os.path.join(os.path.dirname(__file__), "..", "..")
+)
+# Run pcs main and list all imported modules once it exits. Modules imported
+# by importlib are not reported by '-X importtime', so the list is taken from
+# sys.modules.
+RUN_PCS = """
+import atexit, sys
+atexit.register(lambda: sys.stderr.write(
+    "".join(f"imported module: {name}\\n" for name in sys.modules)
+))
+from pcs import app
+app.main(sys.argv[1:])
+"""
+
+
+def run_pcs(argv):
+    pcs_process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", RUN_PCS] + argv,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=PACKAGE_DIR,
+        check=False,
+    )
+    stderr = pcs_process.stderr.decode()
+    module_list = re.findall(r"^imported module: (\S+)$", stderr, re.M)
+    # "import time: self [us] | cumulative | imported package"
+    import_time = re.search(
+        r"^import time:\s*\d+ \|\s*(\d+) \| pcs\.app$", stderr, re.M
+    )
+    return module_list, int(import_time.group(1)) / 1000000
+
+
+class ImportTime(TestCase):
+    def assert_import_time(self, argv):
+        # the best of several runs to filter out noise from other processes
+        import_time = min(run_pcs(argv)[1] for dummy_i in range(3))
+        self.assertLess(import_time, IMPORT_TIME_BUDGET)
+
+    def assert_no_modules_imported(self, module_list, prefix, allowed=()):
+        self.assertEqual(
+            [],
+            [
+                name for name in module_list
+                if name.startswith(prefix) and name not in allowed
+            ]
+        )
+
+    def test_version(self):
+        module_list, dummy_time = run_pcs(["--version"])
+        self.assertIn("pcs.app", module_list)
+        self.assert_no_modules_imported(module_list, "pcs.cli.routing.")
+        self.assert_no_modules_imported(module_list, "pcs.lib.commands.")
+        self.assert_import_time(["--version"])
+
+    def test_status(self):
+        module_list, dummy_time = run_pcs(["status", "help"])
+        self.assert_no_modules_imported(
+            module_list, "pcs.cli.routing.", ["pcs.cli.routing.status"]
+        )
+        self.assert_no_modules_imported(
+            module_list, "pcs.lib.commands.", ["pcs.lib.commands.resource"]
+        )
+        self.assert_import_time(["status", "help"])
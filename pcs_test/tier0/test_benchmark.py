@@ -0,0 +1,49 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from pcs_test.benchmark import __main__ as benchmark
+from pcs_test.benchmark.scenarios import SCENARIO_NAMES
+from pcs_test.benchmark.synthetic import ClusterSpec
+
+
+class ClusterSpecFromResourceCount(TestCase):
+    def test_resource_count_kept(self):
+        spec = ClusterSpec.from_resource_count(1000, nodes=3)
+        self.assertEqual(
+            ClusterSpec(
+                nodes=3,
+                primitives=450,
+                groups=100,
+                group_size=4,
+                clones=100,
+                bundles=50,
+                constraints=1000,
+            ),
+            spec
+        )
+        self.assertEqual(1000, spec.resources)
+        self.assertEqual(1000, len(spec.primitive_ids))
+        self.assertEqual(700, len(spec.top_level_ids))
+
+
+class Benchmark(TestCase):
+    def test_all_scenarios_run(self):
+        # pylint: disable=consider-using-with
+        output = tempfile.NamedTemporaryFile("r", delete=False)
+        output.close()
+        self.addCleanup(os.unlink, output.name)
+        benchmark.main([
+            "--resources", "40", "--nodes", "3", "--repeat", "1",
+            "--output", output.name,
+        ])
+        with open(output.name) as output_file:
+            result = json.load(output_file)
+        self.assertEqual(40, result["cluster"]["constraints"])
+        self.assertEqual(SCENARIO_NAMES, list(result["scenarios"]))
+        for name, scenario in result["scenarios"].items():
+            self.assertGreater(
+                scenario["external_calls"].get("cibadmin", 0), 0, name
+            )
+            self.assertGreater(scenario["peak_memory_bytes"], 0, name)
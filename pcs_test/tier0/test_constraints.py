@@ -4,6 +4,8 @@ import datetime
 import shutil
 import unittest
 from collections import namedtuple
+from unittest import mock
+import xml.dom.minidom
 from lxml import etree
 
 from pcs_test.tools.assertions import (
@@ -28,9 +30,20 @@ from pcs_test.tools.misc import (
 )
 from pcs_test.tools.pcs_runner import pcs, PcsRunner
 
+from pcs import (
+    rule as rule_utils,
+    settings,
+)
 from pcs.constraint import (
     LOCATION_NODE_VALIDATION_SKIP_MSG,
     CRM_RULE_MISSING_MSG,
+    RULE_EXPIRED,
+    RULE_NOT_IN_EFFECT,
+    RULE_UNKNOWN_STATUS,
+    ConstraintsIndex,
+    _get_rule_status,
+    find_constraints_containing,
+    remove_constraints_containing,
 )
 
 # pylint: disable=line-too-long
@@ -4239,3 +4252,146 @@ class ExpiredConstraints(ConstraintBaseTest):
                 """
             )
         )
+
+
+class GetRuleStatus(unittest.TestCase):
+    def setUp(self):
+        self.checker = rule_utils.DateRuleChecker()
+        patcher = mock.patch("pcs.constraint.utils.cmd_runner")
+        self.addCleanup(patcher.stop)
+        self.runner = patcher.start().return_value
+
+    @staticmethod
+    def fixture_rule(expression_xml):
+        return xml.dom.minidom.parseString(
+            f'<rule id="test-rule" score="INFINITY">{expression_xml}</rule>'
+        ).documentElement
+
+    def test_checked_by_pcs(self):
+        self.assertEqual(
+            RULE_EXPIRED,
+            _get_rule_status(
+                self.fixture_rule(
+                    '<date_expression id="e" operation="lt" end="2019-01-01"/>'
+                ),
+                "cib",
+                self.checker,
+            )
+        )
+        self.runner.run.assert_not_called()
+
+    def test_checked_by_crm_rule(self):
+        self.runner.run.return_value = ("", "", 111)
+        self.assertEqual(
+            RULE_NOT_IN_EFFECT,
+            _get_rule_status(
+                self.fixture_rule(
+                    '<date_expression id="e" operation="gt" start="2119-W01"/>'
+                ),
+                "cib",
+                self.checker,
+            )
+        )
+        self.runner.run.assert_called_once_with(
+            [
+                settings.crm_rule,
+                "--check",
+                "--rule=test-rule",
+                "-X-",
+            ],
+            "cib"
+        )
+
+    def test_not_checked_by_crm_rule(self):
+        self.assertEqual(
+            RULE_UNKNOWN_STATUS,
+            _get_rule_status(
+                self.fixture_rule(
+                    '<expression id="e" attribute="pingd" '
+                    'operation="defined"/>'
+                ),
+                "cib",
+                self.checker,
+            )
+        )
+        self.runner.run.assert_not_called()
+
+
+class ConstraintsContaining(unittest.TestCase):
+    def setUp(self):
+        self.dom = xml.dom.minidom.parseString("""
+            <cib><configuration>
+                <resources>
+                    <primitive id="A"/>
+                    <clone id="B-clone"><primitive id="B"/></clone>
+                </resources>
+                <constraints>
+                    <rsc_order id="order-A-B" first="A" then="B-clone"/>
+                    <rsc_location id="location-A" rsc="A" node="n"/>
+                    <rsc_colocation id="colocation-A-A" rsc="A" with-rsc="A"/>
+                    <rsc_location id="location-B" rsc="B" node="n"/>
+                    <rsc_ticket id="ticket-set">
+                        <resource_set id="set1">
+                            <resource_ref id="A"/>
+                            <resource_ref id="B"/>
+                        </resource_set>
+                        <resource_set id="set2">
+                            <resource_ref id="A"/>
+                        </resource_set>
+                    </rsc_ticket>
+                </constraints>
+            </configuration></cib>
+        """)
+
+    def test_find(self):
+        self.assertEqual(
+            (
+                ["colocation-A-A", "location-A", "order-A-B"],
+                ["ticket-set"],
+            ),
+            find_constraints_containing("A", self.dom)
+        )
+
+    def test_find_clone_constraints(self):
+        self.assertEqual(
+            (["order-A-B", "location-B"], ["ticket-set"]),
+            find_constraints_containing("B", self.dom)
+        )
+
+    def test_find_none(self):
+        self.assertEqual(([], []), find_constraints_containing("C", self.dom))
+
+    @mock.patch("pcs.constraint.print", create=True)
+    def test_remove(self, mock_print):
+        remove_constraints_containing("A", passed_dom=self.dom)
+        self.assertEqual(
+            (["location-B"], ["ticket-set"]),
+            find_constraints_containing("B", self.dom)
+        )
+        self.assertEqual(
+            ["set1"],
+            [
+                set_el.getAttribute("id")
+                for set_el in self.dom.getElementsByTagName("resource_set")
+            ]
+        )
+        mock_print.assert_called_once_with("Removing set set2")
+
+    @mock.patch("pcs.constraint.print", create=True)
+    def test_remove_more_with_one_index(self, mock_print):
+        constraints_index = ConstraintsIndex(self.dom)
+        with mock.patch("pcs.constraint.ConstraintsIndex") as mock_index:
+            for resource_id in ("A", "B"):
+                remove_constraints_containing(
+                    resource_id,
+                    passed_dom=self.dom,
+                    constraints_index=constraints_index,
+                )
+        mock_index.assert_not_called()
+        constraints_el = self.dom.getElementsByTagName("constraints")[0]
+        self.assertEqual([], constraints_el.getElementsByTagName("*"))
+        mock_print.assert_has_calls([
+            mock.call("Removing set set2"),
+            mock.call("Removing set set1"),
+            mock.call("Removing constraint ticket-set"),
+        ])
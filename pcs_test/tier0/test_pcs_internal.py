@@ -0,0 +1,173 @@
+import json
+import os.path
+import shutil
+import subprocess
+import sys
+import tempfile
+from unittest import mock, TestCase
+
+from pcs import (
+    pcs_internal,
+    settings,
+    utils,
+)
+from pcs.common.reports import ReportItem
+
+PACKAGE_DIR = os.path.realpath(
+    os.path.join(os.path.dirname(__file__), "..", "..")
+)
+RUN_WORKER = "from pcs.pcs_internal import main; main()"
+
+
+def request_stream(*request_list):
+    stream = b""
+    for request in request_list:
+        data = request.encode()
+        stream += str(len(data)).encode() + b"\n" + data
+    return stream
+
+
+def parse_response_stream(stream):
+    response_list = []
+    while stream:
+        header, stream = stream.split(b"\n", 1)
+        response_list.append(json.loads(stream[:int(header)]))
+        stream = stream[int(header):]
+    return response_list
+
+
+class GetCliEnv(TestCase):
+    def test_report_processors_are_not_shared(self):
+        env1 = pcs_internal.get_cli_env({})
+        env2 = pcs_internal.get_cli_env({})
+        env1.report_processor.report(ReportItem.info("CODE"))
+        self.assertEqual(1, len(env1.report_processor.processed_items))
+        self.assertEqual([], env2.report_processor.processed_items)
+
+    @mock.patch("pcs.pcs_internal.os.geteuid", lambda: 0)
+    def test_user_from_request(self):
+        env = pcs_internal.get_cli_env(
+            {}, {"username": "user", "groups": ["group1", "group2"]}
+        )
+        self.assertEqual("user", env.user)
+        self.assertEqual(["group1", "group2"], env.groups)
+
+    @mock.patch("pcs.pcs_internal.os.geteuid", lambda: 1000)
+    def test_user_from_request_not_root(self):
+        env = pcs_internal.get_cli_env(
+            {}, {"username": "user", "groups": ["group1", "group2"]}
+        )
+        self.assertIsNone(env.user)
+        self.assertIsNone(env.groups)
+
+
+class ProcessRequest(TestCase):
+    def test_unknown_cmd(self):
+        self.assertEqual(
+            {
+                "status": "unknown_cmd",
+                "status_msg": "Unknown command 'cluster.destroy'",
+                "report_list": [],
+                "data": None,
+            },
+            pcs_internal.process_request(
+                {"cmd": "cluster.destroy", "cmd_data": {}}
+            )
+        )
+
+    def test_missing_key(self):
+        self.assertEqual(
+            "input_error",
+            pcs_internal.process_request({"cmd_data": {}})["status"]
+        )
+
+
+class FakeLibrary:
+    """
+    Library whose commands return names of hosts known to the environment
+    """
+    def __init__(self, cli_env, middleware_factory):
+        # pylint: disable=unused-argument
+        self.cli_env = cli_env
+
+    def __getattr__(self, name):
+        return self
+
+    def __call__(self, **kwargs):
+        return sorted(self.cli_env.known_hosts_getter())
+
+
+@mock.patch("pcs.pcs_internal.Library", FakeLibrary)
+@mock.patch("pcs.utils.os.getuid", lambda: 0)
+class ProcessRequestCachedState(TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        self.known_hosts_path = os.path.join(tmp_dir, "known-hosts")
+        patcher = mock.patch.object(
+            settings, "pcsd_known_hosts_location", self.known_hosts_path
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(utils.read_known_hosts_file.cache_clear)
+
+    def write_known_hosts(self, host_list):
+        with open(self.known_hosts_path, "w") as known_hosts_file:
+            json.dump(
+                dict(
+                    format_version=1,
+                    data_version=1,
+                    known_hosts={
+                        host: dict(
+                            token="token",
+                            dest_list=[dict(addr=host, port=2224)],
+                        )
+                        for host in host_list
+                    },
+                ),
+                known_hosts_file
+            )
+
+    def test_known_hosts_read_again_for_each_request(self):
+        request = {"cmd": "cluster.setup", "cmd_data": {}}
+        self.write_known_hosts(["node1"])
+        self.assertEqual(
+            ["node1"], pcs_internal.process_request(request)["data"]
+        )
+        self.write_known_hosts(["node1", "node2"])
+        self.assertEqual(
+            ["node1", "node2"], pcs_internal.process_request(request)["data"]
+        )
+
+    def test_cli_state_reset(self):
+        self.write_known_hosts([])
+        utils.pcs_options = {"-f": "cib.xml"}
+        utils.usefile = True
+        utils.filename = "cib.xml"
+        pcs_internal.process_request({"cmd": "cluster.setup", "cmd_data": {}})
+        self.assertEqual({}, utils.pcs_options)
+        self.assertFalse(utils.usefile)
+        self.assertEqual("", utils.filename)
+
+
+class Worker(TestCase):
+    def test_requests_processed_one_by_one(self):
+        worker = subprocess.run(
+            [sys.executable, "-c", RUN_WORKER, "--worker"],
+            input=request_stream(
+                json.dumps({"cmd": "cluster.destroy", "cmd_data": {}}),
+                "not json",
+                json.dumps({"cmd_data": {}}),
+            ),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=PACKAGE_DIR,
+            check=True,
+        )
+        self.assertEqual(
+            ["unknown_cmd", "input_error", "input_error"],
+            [
+                response["status"]
+                for response in parse_response_stream(worker.stdout)
+            ]
+        )
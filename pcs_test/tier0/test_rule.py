@@ -1,4 +1,5 @@
 # pylint: disable=too-many-lines
+import datetime
 import shutil
 from unittest import TestCase
 import xml.dom.minidom
@@ -1657,6 +1658,273 @@ class ExportAsExpressionTest(TestCase):
         )
 
 
+class DateRuleCheckerTest(TestCase):
+    # 2020-06-15 is Monday
+    now = datetime.datetime(
+        2020, 6, 15, 12, 30, 0, 700,
+        tzinfo=datetime.timezone(datetime.timedelta(hours=2))
+    )
+
+    def assert_check(self, expected, rule_xml, now=None):
+        self.assertEqual(
+            expected,
+            rule.DateRuleChecker(now or self.now).check(
+                xml.dom.minidom.parseString(rule_xml).documentElement
+            )
+        )
+
+    def test_gt(self):
+        rule_xml = """
+            <rule id="r" score="INFINITY">
+                <date_expression id="r-expr" operation="gt" start="{0}"/>
+            </rule>
+        """
+        self.assert_check(
+            rule.CrmRuleReturnCode.IN_EFFECT,
+            rule_xml.format("2020-06-15 12:29:59")
+        )
+        # times are compared in seconds
+        self.assert_check(
+            rule.CrmRuleReturnCode.TO_BE_IN_EFFECT,
+            rule_xml.format("2020-06-15 12:30")
+        )
+        self.assert_check(
+            rule.CrmRuleReturnCode.TO_BE_IN_EFFECT,
+            rule_xml.format("2020-06-15T10:30:01Z")
+        )
+
+    def test_lt(self):
+        rule_xml = """
+            <rule id="r" score="INFINITY">
+                <date_expression id="r-expr" operation="lt" end="{0}"/>
+            </rule>
+        """
+        self.assert_check(
+            rule.CrmRuleReturnCode.IN_EFFECT,
+            rule_xml.format("2020-06-15T10:30:01Z")
+        )
+        self.assert_check(
+            rule.CrmRuleReturnCode.EXPIRED,
+            rule_xml.format("2020-06-15 12:30:00")
+        )
+        self.assert_check(
+            rule.CrmRuleReturnCode.EXPIRED, rule_xml.format("2019-01-01")
+        )
+
+    def test_in_range(self):
+        rule_xml = """
+            <rule id="r" score="INFINITY">
+                <date_expression id="r-expr" operation="in_range" {0}/>
+            </rule>
+        """
+        self.assert_check(
+            rule.CrmRuleReturnCode.IN_EFFECT,
+            rule_xml.format('start="2020-01-01" end="2021-01-01"')
+        )
+        self.assert_check(
+            rule.CrmRuleReturnCode.IN_EFFECT,
+            rule_xml.format('end="2021-01-01"')
+        )
+        self.assert_check(
+            rule.CrmRuleReturnCode.TO_BE_IN_EFFECT,
+            rule_xml.format('start="2021-01-01"')
+        )
+        self.assert_check(
+            rule.CrmRuleReturnCode.EXPIRED,
+            rule_xml.format('start="2019-01-01" end="2020-01-01"')
+        )
+        self.assert_check(None, rule_xml.format(""))
+
+    def test_in_range_duration(self):
+        rule_xml = """
+            <rule id="r" score="INFINITY">
+                <date_expression id="r-expr" operation="in_range"
+                    start="{0}"
+                >
+                    <duration id="r-expr-duration" {1}/>
+                </date_expression>
+            </rule>
+        """
+        self.assert_check(
+            rule.CrmRuleReturnCode.IN_EFFECT,
+            rule_xml.format("2020-06-01 12:00", 'weeks="2" minutes="30"')
+        )
+        self.assert_check(
+            rule.CrmRuleReturnCode.EXPIRED,
+            rule_xml.format("2020-06-01 12:00", 'weeks="2" minutes="29"')
+        )
+        # the day of the month is kept if possible
+        self.assert_check(
+            rule.CrmRuleReturnCode.IN_EFFECT,
+            rule_xml.format("2020-01-31 12:00", 'months="4" days="16"')
+        )
+        self.assert_check(
+            rule.CrmRuleReturnCode.IN_EFFECT,
+            rule_xml.format("2019-02-28 12:00", 'years="1" months="4"')
+        )
+        self.assert_check(
+            rule.CrmRuleReturnCode.EXPIRED,
+            rule_xml.format("2018-03-15 12:00", 'years="1"')
+        )
+        # the day of the month and the day of the year differ in leap years
+        self.assert_check(None, rule_xml.format("2019-03-15", 'years="1"'))
+        self.assert_check(None, rule_xml.format("2020-03-15", 'years="1"'))
+        self.assert_check(None, rule_xml.format("2020-03-15", 'moon="1"'))
+
+    def test_date_spec(self):
+        rule_xml = """
+            <rule id="r" score="INFINITY">
+                <date_expression id="r-expr" operation="date_spec">
+                    <date_spec id="r-expr-datespec" {0}/>
+                </date_expression>
+            </rule>
+        """
+        self.assert_check(
+            rule.CrmRuleReturnCode.IN_EFFECT,
+            rule_xml.format('years="2020" weekdays="1-5" hours="9-16"')
+        )
+        self.assert_check(
+            rule.CrmRuleReturnCode.EXPIRED, rule_xml.format('years="2019"')
+        )
+        self.assert_check(
+            rule.CrmRuleReturnCode.TO_BE_IN_EFFECT,
+            rule_xml.format('years="2020-2022" months="7-8"')
+        )
+        self.assert_check(
+            rule.CrmRuleReturnCode.EXPIRED,
+            rule_xml.format('years="2020" weekdays="6-7" months="1-5"')
+        )
+        # crm_rule does not check these
+        self.assert_check(None, rule_xml.format('weekdays="1-5"'))
+        self.assert_check(None, rule_xml.format('years="2020" moon="1"'))
+
+    def test_date_without_time(self):
+        rule_xml = """
+            <rule id="r" score="INFINITY">
+                <date_expression id="r-expr" operation="gt"
+                    start="2020-06-15"
+                />
+            </rule>
+        """
+        self.assert_check(rule.CrmRuleReturnCode.IN_EFFECT, rule_xml)
+        # the result depends on the time zone of the date
+        self.assert_check(
+            None,
+            rule_xml,
+            datetime.datetime(
+                2020, 6, 15, 1, 0, 0,
+                tzinfo=datetime.timezone(datetime.timedelta(hours=2))
+            )
+        )
+
+    def test_no_date_expression(self):
+        self.assert_check(
+            rule.CrmRuleReturnCode.UNSUPPORTED,
+            """
+            <rule id="r" score="INFINITY">
+                <expression id="r-expr" attribute="#uname" operation="eq"
+                    value="node1"
+                />
+            </rule>
+            """
+        )
+        self.assert_check(
+            rule.CrmRuleReturnCode.UNSUPPORTED,
+            """
+            <rule id="r" score="-INFINITY" boolean-op="or">
+                <expression id="r-expr" attribute="pingd"
+                    operation="not_defined"
+                />
+                <expression id="r-expr-1" attribute="pingd" operation="lte"
+                    value="0"
+                />
+            </rule>
+            """
+        )
+
+    def test_more_date_expressions(self):
+        self.assert_check(
+            rule.CrmRuleReturnCode.UNSUPPORTED,
+            """
+            <rule id="r" score="INFINITY" boolean-op="and">
+                <date_expression id="r-expr" operation="gt"
+                    start="2020-01-01"
+                />
+                <date_expression id="r-expr-1" operation="lt"
+                    end="2021-01-01"
+                />
+            </rule>
+            """
+        )
+
+    def test_unsupported(self):
+        self.assert_check(
+            None,
+            """
+            <rule id="r" score="INFINITY">
+                <date_expression id="r-expr" operation="gt"
+                    start="2020-W01-1"
+                />
+            </rule>
+            """
+        )
+        self.assert_check(
+            None,
+            """
+            <rule id="r" score="INFINITY">
+                <date_expression id="r-expr" start="2020-01-01"/>
+            </rule>
+            """
+        )
+
+    def test_only_date_expression_is_checked(self):
+        self.assert_check(
+            rule.CrmRuleReturnCode.EXPIRED,
+            """
+            <rule id="r" score="INFINITY" boolean-op="or">
+                <expression id="r-expr" attribute="#uname" operation="eq"
+                    value="node1"
+                />
+                <date_expression id="r-expr-1" operation="lt"
+                    end="2020-01-01"
+                />
+            </rule>
+            """
+        )
+
+    def test_nested_rules(self):
+        self.assert_check(
+            None,
+            """
+            <rule id="r" score="INFINITY" boolean-op="or">
+                <expression id="r-expr" attribute="#uname" operation="eq"
+                    value="node1"
+                />
+                <rule id="r-rule" score="0">
+                    <date_expression id="r-rule-expr" operation="lt"
+                        end="2020-01-01"
+                    />
+                </rule>
+            </rule>
+            """
+        )
+        self.assert_check(
+            None,
+            """
+            <rule id="r" score="INFINITY" boolean-op="and">
+                <date_expression id="r-expr" operation="lt"
+                    end="2020-01-01"
+                />
+                <rule id="r-rule" score="0">
+                    <date_expression id="r-rule-expr" operation="gt"
+                        start="2019-01-01"
+                    />
+                </rule>
+            </rule>
+            """
+        )
+
+
 class DomRuleAddTest(TestCase):
 
     def setUp(self):
@@ -1890,3 +1890,203 @@ class TouchCibFile(TestCase):
         err.assert_called_once_with(
             "Unable to write to file: '/fake/filename': 'some message'"
         )
+
+
+class CibSnapshot(TestCase):
+    cib = (
+        "<cib><configuration><resources>"
+        '<group id="G1"><primitive id="R1"/></group>'
+        '<group id="G2"><primitive id="R2"/></group>'
+        "</resources><constraints/></configuration><status/></cib>"
+    )
+
+    def setUp(self):
+        utils.drop_cib_snapshot()
+        self.addCleanup(utils.drop_cib_snapshot)
+        patcher = mock.patch("pcs.utils.subprocess.Popen")
+        self.popen = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.popen.side_effect = self.fixture_popen
+
+    def fixture_popen(self, args, **kwargs):
+        del kwargs
+        process = mock.Mock(returncode=0)
+        process.communicate.return_value = (
+            (self.cib, None) if args[-1] == "-Q" else ("", None)
+        )
+        return process
+
+    def assert_commands(self, command_list):
+        self.assertEqual(
+            command_list,
+            [
+                call_args[0][0][1:]
+                for call_args in self.popen.call_args_list
+            ]
+        )
+
+    def test_queries_served_from_snapshot(self):
+        self.assertEqual(self.cib, utils.get_cib())
+        self.assertTrue(utils.does_exist('//group[@id="G1"]'))
+        self.assertFalse(utils.does_exist('//group[@id="G3"]'))
+        self.assertEqual(
+            '<group id="G1"><primitive id="R1"/></group>\n',
+            utils.get_cib_xpath('//group/primitive[@id="R1"]/..')
+        )
+        self.assertEqual("", utils.get_cib_xpath('//group[@id="G3"]'))
+        self.assertEqual(
+            "<constraints/>\n", utils.get_cib(scope="constraints")
+        )
+        self.assertEqual(
+            "G1", utils.get_cib_dom().getElementsByTagName("group")[0]
+                .getAttribute("id")
+        )
+        self.assert_commands([["-l", "-Q"]])
+
+    def test_multiple_matches_are_wrapped(self):
+        utils.get_cib()
+        group_list = xml.dom.minidom.parseString(
+            utils.get_cib_xpath("//group")
+        ).documentElement
+        self.assertEqual("xpath-query", group_list.tagName)
+        self.assertEqual(
+            ["G1", "G2"],
+            [
+                group.getAttribute("id")
+                for group in group_list.getElementsByTagName("group")
+            ]
+        )
+
+    def test_no_snapshot_runs_cibadmin(self):
+        utils.does_exist('//group[@id="G1"]')
+        utils.get_cib_xpath('//group[@id="G1"]')
+        self.assert_commands([
+            ["-Q", "--xpath", '//group[@id="G1"]'],
+            ["-Q", "--xpath", '//group[@id="G1"]'],
+        ])
+
+    @mock.patch("pcs.utils.err")
+    def test_missing_scope(self, mock_err):
+        self.cib = "<cib><configuration/></cib>"
+        utils.get_cib()
+        utils.get_cib(scope="resources")
+        mock_err.assert_called_once_with(
+            "unable to get cib, scope 'resources' not present in cib"
+        )
+
+    def test_dropped_by_replace(self):
+        utils.get_cib()
+        utils.replace_cib_configuration("<configuration/>")
+        utils.does_exist('//group[@id="G1"]')
+        self.assert_commands([
+            ["-l", "-Q"],
+            ["--replace", "-V", "--xml-pipe", "-o", "configuration"],
+            ["-Q", "--xpath", '//group[@id="G1"]'],
+        ])
+
+    def test_dropped_by_cib_change(self):
+        utils.get_cib()
+        utils.run(["cibadmin", "-o", "resources", "-D", "--xpath", "//group"])
+        utils.get_cib()
+        self.assert_commands([
+            ["-l", "-Q"],
+            ["-o", "resources", "-D", "--xpath", "//group"],
+            ["-l", "-Q"],
+        ])
+
+    def test_kept_by_read_only_command(self):
+        utils.get_cib()
+        utils.run(["crm_mon", "--one-shot", "--as-xml"])
+        utils.get_cib()
+        self.assert_commands([["-l", "-Q"], ["--one-shot", "--as-xml"]])
+
+    def test_dropped_by_library_command(self):
+        utils.get_cib()
+        utils.get_middleware_factory().cib(lambda env: None, mock.Mock())
+        utils.get_cib()
+        self.assert_commands([["-l", "-Q"], ["-l", "-Q"]])
+
+    @mock.patch("pcs.utils.pcs_options", {"--debug": True})
+    def test_debug_report(self):
+        with mock.patch("sys.stdout", new_callable=StringIO) as stdout:
+            utils.get_cib()
+            utils.does_exist("//group")
+        self.assertIn(
+            "Served from CIB snapshot: cibadmin -Q --xpath //group\n",
+            stdout.getvalue()
+        )
+
+
+class FindUniqueId(TestCase):
+    dom = xml.dom.minidom.parseString("""
+        <cib>
+            <configuration>
+                <resources>
+                    <primitive id="R"/>
+                    <primitive id="R-1"/>
+                    <primitive id="R-3"/>
+                </resources>
+            </configuration>
+            <status>
+                <node_state id="S"/>
+            </status>
+        </cib>
+    """)
+
+    def test_unique(self):
+        self.assertEqual("A", utils.find_unique_id(self.dom, "A"))
+
+    def test_first_free_suffix(self):
+        self.assertEqual("R-2", utils.find_unique_id(self.dom, "R"))
+
+    def test_status_ignored(self):
+        self.assertEqual("S", utils.find_unique_id(self.dom, "S"))
+
+
+class DoesIdExistIndex(TestCase):
+    def setUp(self):
+        self.dom = xml.dom.minidom.parseString("""
+            <cib>
+                <configuration>
+                    <resources>
+                        <primitive id="R"/>
+                    </resources>
+                </configuration>
+                <status/>
+            </cib>
+        """)
+        self.resources = self.dom.getElementsByTagName("resources")[0]
+
+    def add_primitive(self, primitive_id):
+        primitive = self.dom.createElement("primitive")
+        primitive.setAttribute("id", primitive_id)
+        self.resources.appendChild(primitive)
+        return primitive
+
+    def test_removed_element(self):
+        primitive = self.dom.getElementsByTagName("primitive")[0]
+        self.assertTrue(utils.does_id_exist(self.dom, "R"))
+        self.resources.removeChild(primitive)
+        self.assertFalse(utils.does_id_exist(self.dom, "R"))
+        self.add_primitive("R")
+        self.assertTrue(utils.does_id_exist(self.dom, "R"))
+
+    def test_moved_to_status(self):
+        primitive = self.dom.getElementsByTagName("primitive")[0]
+        self.assertTrue(utils.does_id_exist(self.dom, "R"))
+        self.dom.getElementsByTagName("status")[0].appendChild(primitive)
+        self.assertFalse(utils.does_id_exist(self.dom, "R"))
+
+    def test_added_elements_looked_up_once(self):
+        with mock.patch(
+            "pcs.utils._dom_get_id_scope_elements",
+            # pylint: disable=protected-access
+            side_effect=utils._dom_get_id_scope_elements,
+        ) as mock_scope:
+            for _ in range(10):
+                self.add_primitive(utils.find_unique_id(self.dom, "A"))
+            self.assertTrue(utils.does_id_exist(self.resources, "A-5"))
+            self.assertEqual("A-10", utils.find_unique_id(self.dom, "A"))
+            # one build of the index and one lookup for each id put to the
+            # document after it has been reported as free
+            self.assertEqual(11, mock_scope.call_count)
@@ -10,6 +10,8 @@ from pcs_test.tools.command_env.config_http_sbd import SbdShortcuts
 from pcs_test.tools.command_env.config_http_status import StatusShortcuts
 from pcs_test.tools.command_env.mock_node_communicator import(
     place_communication,
+    place_node_actions_communication,
+    place_pipelined_communication,
     place_requests,
     place_responses,
 )
@@ -58,6 +60,25 @@ class HttpConfig:
         """
         place_communication(self.__calls, name, communication_list, **kwargs)
 
+    def pipeline(self, step_name_list, name="http.pipeline"):
+        """
+        Merge communications into a pipelined run of their commands
+        string name -- key of the merged calls
+        list step_name_list -- keys of the communications, one for each step
+            in the order of the pipeline
+        """
+        place_pipelined_communication(self.__calls, name, step_name_list)
+
+    def node_actions(self, step_name_list, name="http.node_actions"):
+        """
+        Merge communications of file and service commands into one request per
+        node running all their actions
+        string name -- key of the merged calls
+        list step_name_list -- keys of the communications in the order of the
+            actions
+        """
+        place_node_actions_communication(self.__calls, name, step_name_list)
+
     def add_requests(self, request_list, name):
         place_requests(self.__calls, name, request_list)
 
@@ -133,3 +133,32 @@ class FilesShortcuts:
             param_list=[("data_json", json.dumps(input_data))],
             output=json.dumps(dict(files=output_data))
         )
+
+    def get_file_digests(
+        self, file_list, digests=None, node_labels=None,
+        communication_list=None, name="http.files.get_file_digests",
+    ):
+        """
+        Create a call for getting digests of files on the nodes.
+
+        dict file_list -- requested files, key is a file id, value is a dict
+            with the file type and optionally its name
+        dict digests -- digests of the files returned by the nodes, key is
+            a file id, files not present are reported as missing on the nodes
+        node_labels list -- create success responses from these nodes
+        communication_list list -- create custom responses
+        name string -- the key of this call
+        """
+        digests = digests or {}
+        place_multinode_call(
+            self.__calls,
+            name,
+            node_labels,
+            communication_list,
+            action="remote/get_file_digests",
+            param_list=[("data_json", json.dumps(file_list))],
+            output=json.dumps(dict(files={
+                file_id: dict(digest=digests.get(file_id))
+                for file_id in file_list
+            })),
+        )
@@ -1,12 +1,43 @@
+from lxml import etree
+
 from pcs_test.tools.command_env.mock_runner import(
     Call as RunnerCall,
     CheckStdinEqualXml,
 )
 from pcs_test.tools.fixture_cib import modify_cib
 from pcs_test.tools.misc import get_test_resource as rc
+from pcs_test.tools.xml import etree_to_str
 
 
 CIB_FILENAME = "cib-empty.xml"
+COMMAND_LOAD = "cibadmin --local --query"
+COMMAND_LOAD_CONFIGURATION = "cibadmin --local --query --scope=configuration"
+COMMAND_LOAD_HEADER = "cibadmin --local --query --xpath=/cib --no-children"
+
+
+def _configuration_name(load_name):
+    return f"{load_name}.configuration"
+
+
+def _header_check_name(load_name):
+    return f"{load_name}.header_check"
+
+
+def get_loaded_cib(calls, load_key):
+    """
+    Return the CIB a library environment holds after loading it
+
+    CallListBuilder calls -- configured calls
+    string load_key -- key of a call loading the CIB
+    """
+    if _configuration_name(load_key) not in calls.names:
+        return calls.get(load_key).stdout
+    cib = etree.fromstring(calls.get(load_key).stdout)
+    cib.append(
+        etree.fromstring(calls.get(_configuration_name(load_key)).stdout)
+    )
+    etree.SubElement(cib, "status")
+    return etree_to_str(cib)
 
 
 class CibShortcuts:
@@ -26,11 +57,16 @@ class CibShortcuts:
         returncode=0,
         stderr=None,
         instead=None,
+        with_status=False,
         **modifier_shortcuts
     ):
         """
         Create call for loading cib.
 
+        Unless with_status is set, the cib element is loaded before and after
+        the configuration section. The first call has the key name, the
+        following ones name + ".configuration" and name + ".header_check".
+
         string name -- key of the call
         list of callable modifiers -- every callable takes etree.Element and
             returns new etree.Element with desired modification.
@@ -40,6 +76,7 @@ class CibShortcuts:
         string stderr
         string instead -- key of call instead of which this new call is to be
             placed
+        bool with_status -- load the whole cib including its status section
         dict modifier_shortcuts -- a new modifier is generated from each
             modifier shortcut.
             As key there can be keys of MODIFIER_GENERATORS.
@@ -60,10 +97,8 @@ class CibShortcuts:
                 " parameters 'modifiers', 'filename' and 'modifier_shortcuts'"
             )
 
-        command = "cibadmin --local --query"
-        if returncode != 0:
-            call = RunnerCall(command, stderr=stderr, returncode=returncode)
-        else:
+        cib = None
+        if returncode == 0:
             with open(
                 rc(filename if filename else self.cib_filename)
             ) as cib_file:
@@ -72,9 +107,9 @@ class CibShortcuts:
                     modifiers,
                     **modifier_shortcuts
                 )
-                call = RunnerCall(command, stdout=cib)
-
-        self.__calls.place(name, call, before=before, instead=instead)
+        self.__place_load(
+            name, cib, stderr, returncode, with_status, before, instead
+        )
 
     def load_content(
         self,
@@ -84,10 +119,15 @@ class CibShortcuts:
         name="runner.cib.load_content",
         instead=None,
         before=None,
+        with_status=False,
     ):
         """
         Create call for loading CIB specified by its full content
 
+        Unless with_status is set, the cib element is loaded before and after
+        the configuration section. The first call has the key name, the
+        following ones name + ".configuration" and name + ".header_check".
+
         string cib -- CIB data (stdout of the loading process)
         string stderr -- error returned from the loading process
         int returncode -- exit code of the loading process
@@ -95,13 +135,65 @@ class CibShortcuts:
         string instead -- key of call instead of which this new call is to be
             placed
         string before -- key of call before which this new call is to be placed
+        bool with_status -- load the whole cib including its status section
         """
-        command = "cibadmin --local --query"
-        if returncode != 0:
-            call = RunnerCall(command, stderr=stderr, returncode=returncode)
-        else:
-            call = RunnerCall(command, stdout=cib)
-        self.__calls.place(name, call, before=before, instead=instead)
+        self.__place_load(
+            name,
+            cib if returncode == 0 else None,
+            stderr,
+            returncode,
+            with_status,
+            before,
+            instead,
+        )
+
+    def __place_load(
+        self, name, cib, stderr, returncode, with_status, before, instead
+    ):
+        # pylint: disable=too-many-arguments
+        if instead:
+            for following_name in (
+                _configuration_name(instead), _header_check_name(instead)
+            ):
+                if following_name in self.__calls.names:
+                    self.__calls.remove(following_name)
+        if with_status or cib is None:
+            # loading without the status section fails on its first command
+            command = COMMAND_LOAD if with_status else COMMAND_LOAD_HEADER
+            if cib is None:
+                call = RunnerCall(command, stderr=stderr, returncode=returncode)
+            else:
+                call = RunnerCall(command, stdout=cib)
+            self.__calls.place(name, call, before=before, instead=instead)
+            return
+        cib_tree = etree.fromstring(cib)
+        configuration = cib_tree.find("configuration")
+        configuration.tail = None
+        for child in list(cib_tree):
+            cib_tree.remove(child)
+        cib_tree.text = None
+        header = etree_to_str(cib_tree)
+        # calls are placed from the last one to keep them in the place
+        # specified by before or instead
+        self.__calls.place(
+            _header_check_name(name),
+            RunnerCall(COMMAND_LOAD_HEADER, stdout=header),
+            before=before,
+            instead=instead,
+        )
+        self.__calls.place(
+            _configuration_name(name),
+            RunnerCall(
+                COMMAND_LOAD_CONFIGURATION,
+                stdout=etree_to_str(configuration),
+            ),
+            before=_header_check_name(name),
+        )
+        self.__calls.place(
+            name,
+            RunnerCall(COMMAND_LOAD_HEADER, stdout=header),
+            before=_configuration_name(name),
+        )
 
     def push(
         self,
@@ -132,7 +224,7 @@ class CibShortcuts:
             here)
         """
         cib = modify_cib(
-            self.__calls.get(load_key).stdout,
+            get_loaded_cib(self.__calls, load_key),
             modifiers,
             **modifier_shortcuts
         )
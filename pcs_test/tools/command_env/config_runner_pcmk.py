@@ -2,6 +2,7 @@ import os
 
 from lxml import etree
 
+from pcs_test.tools.command_env.config_runner_cib import get_loaded_cib
 from pcs_test.tools.command_env.mock_runner import (
     Call as RunnerCall,
     CheckStdinEqualXml,
@@ -760,7 +761,7 @@ class PcmkShortcuts():
             here)
         """
         cib_xml = modify_cib(
-            self.__calls.get(cib_load_name).stdout,
+            get_loaded_cib(self.__calls, cib_load_name),
             cib_modifiers,
             **modifier_shortcuts
         )
@@ -156,6 +156,8 @@ def create_communication(
             bool was_connected -- see Response
             int errno -- see Response
             string error_msg -- see Response
+            bool cancelled -- the request is cancelled before it finishes, no
+                response is returned for it
         if some key is not present, it is put here from common values - rest
         args of this fuction(except name, communication_list,
         error_msg_template)
@@ -180,6 +182,7 @@ def create_communication(
         error_msg=error_msg,
     )
 
+    request_list = []
     response_list = []
     for communication in communication_list:
         if "dest_list" not in communication:
@@ -188,9 +191,12 @@ def create_communication(
             ]
         full = common.copy()
         full.update(communication)
-        response_list.append(_communication_to_response(**full))
+        cancelled = full.pop("cancelled", False)
+        response = _communication_to_response(**full)
+        request_list.append(response.request)
+        if not cancelled:
+            response_list.append(response)
 
-    request_list = [response.request for response in response_list]
     return request_list, response_list
 
 def place_multinode_call(
@@ -259,6 +265,164 @@ def place_communication(calls, name, communication_list, before=None, **kwargs):
         place_requests(calls, f"{name}_requests_{i}", req_list, before=before)
 
 
+def place_pipelined_communication(calls, name, step_name_list):
+    """
+    Merge communications placed one after another into a pipelined run of
+    their commands, see pcs.lib.communication.tools.run_pipelined
+
+    Nodes respond step by step in the order of the steps. A node is sent
+    a request of its next step once it has responded in the previous one. The
+    merged calls are placed instead of the calls of the last step.
+
+    CallListBuilder calls -- list of expected calls
+    string name -- the key of the merged calls
+    list step_name_list -- keys of the communications, one for each step
+    """
+    step_list = [
+        (
+            calls.get(f"{step_name}_requests").request_list,
+            calls.get(f"{step_name}_responses").response_list,
+        )
+        for step_name in step_name_list
+    ]
+    for step_name in step_name_list[:-1]:
+        calls.remove(f"{step_name}_requests")
+        calls.remove(f"{step_name}_responses")
+
+    response_list = []
+    next_request_list = []
+    for index, (dummy_request_list, step_response_list) in enumerate(
+        step_list
+    ):
+        for response in step_response_list:
+            response_list.append(response)
+            label = response.request.target.label
+            for later_request_list, dummy_response_list in step_list[index+1:]:
+                node_request_list = [
+                    request for request in later_request_list
+                    if request.target.label == label
+                ]
+                if node_request_list:
+                    next_request_list.append(node_request_list)
+                    break
+
+    last_name = step_name_list[-1]
+    name_list = calls.names
+    following_index = name_list.index(f"{last_name}_responses") + 1
+    following_name = (
+        name_list[following_index] if following_index < len(name_list)
+        else None
+    )
+    calls.place(
+        f"{name}_requests",
+        AddRequestCall(step_list[0][0]),
+        instead=f"{last_name}_requests",
+    )
+    calls.place(
+        f"{name}_responses",
+        StartLoopCall(response_list),
+        instead=f"{last_name}_responses",
+    )
+    for i, request_list in enumerate(next_request_list, start=1):
+        calls.place(
+            f"{name}_requests_{i}",
+            AddRequestCall(request_list),
+            before=following_name,
+        )
+
+
+def place_node_actions_communication(calls, name, step_name_list):
+    """
+    Merge communications of file and service commands into a node_actions
+    communication running all their actions in one request per node, see
+    pcs.lib.communication.nodes.NodeActions
+
+    A node responds with the results of all the communications. If a node
+    does not respond successfully in the first communication, that response is
+    used as it is. The merged calls are placed instead of the calls of the
+    first communication.
+
+    CallListBuilder calls -- list of expected calls
+    string name -- the key of the merged calls
+    list step_name_list -- keys of the communications in the order of the
+        actions
+    """
+    step_list = [
+        (
+            calls.get(f"{step_name}_requests").request_list,
+            calls.get(f"{step_name}_responses").response_list,
+        )
+        for step_name in step_name_list
+    ]
+    for step_name in step_name_list[1:]:
+        calls.remove(f"{step_name}_requests")
+        calls.remove(f"{step_name}_responses")
+
+    def _data_json(request):
+        return json.loads(request._data.structured_data[0][1])
+
+    def _node_request(request_list, label):
+        return next(
+            request for request in request_list if request.target.label == label
+        )
+
+    def _node_response(response_list, label):
+        return next(
+            response for response in response_list
+            if response.request.target.label == label
+        )
+
+    action_list = []
+    communication_list = []
+    for request in step_list[0][0]:
+        label = request.target.label
+        action_list.append([
+            dict(
+                type=step_request_list[0].action.split("/", 1)[1],
+                data=_data_json(_node_request(step_request_list, label)),
+            )
+            for step_request_list, dummy_response_list in step_list
+        ])
+        first_response = _node_response(step_list[0][1], label)
+        communication = dict(
+            label=label,
+            dest_list=request.target.dest_list,
+            param_list=[
+                ("data_json", json.dumps(dict(actions=action_list[-1])))
+            ],
+            was_connected=first_response.was_connected,
+            errno=first_response.errno,
+            error_msg=first_response.error_msg,
+            response_code=first_response.response_code,
+            output=first_response.data,
+        )
+        if (
+            first_response.was_connected
+            and
+            first_response.response_code == 200
+        ):
+            communication["output"] = json.dumps(dict(results=[
+                json.loads(_node_response(step_response_list, label).data)
+                for dummy_request_list, step_response_list in step_list
+            ]))
+        communication_list.append(communication)
+
+    request_list, response_list = create_communication(
+        communication_list, action="remote/node_actions"
+    )
+    first_name = step_name_list[0]
+    calls.place(
+        f"{name}_requests",
+        AddRequestCall(request_list),
+        instead=f"{first_name}_requests",
+    )
+    calls.place(
+        f"{name}_responses",
+        StartLoopCall(response_list),
+        instead=f"{first_name}_responses",
+    )
+
+
 class AddRequestCall:
     type = CALL_TYPE_HTTP_ADD_REQUESTS
 
@@ -377,6 +541,12 @@ class NodeCommunicator:
             )
 
 
+    def cancel_requests(self, request_list):
+        # pylint: disable=no-self-use, unused-argument
+        # Cancelled requests are specified in the expected calls by not having
+        # responses, there is nothing to check here.
+        pass
+
     def start_loop(self):
         _, call = self.__call_queue.take(CALL_TYPE_HTTP_START_LOOP)
         return call.response_list
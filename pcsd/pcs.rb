@@ -6,6 +6,7 @@ require 'shellwords'
 require 'cgi'
 require 'net/http'
 require 'net/https'
+require 'socket'
 require 'uri'
 require 'json'
 require 'fileutils'
@@ -1953,6 +1954,34 @@ def pcs_internal_proxy(auth_user, data, cmd)
   end
 end
 
+# Send a request to long-running pcs_internal workers of pcsd. Returns nil if
+# the request has not been processed, it is up to the caller to run
+# pcs_internal then.
+def run_pcs_internal_server(auth_user, input_data)
+  socket_path = ENV['PCSD_PCS_INTERNAL_SOCKET']
+  return nil if not socket_path or socket_path.empty?
+  request = input_data.merge({
+    :user => {
+      :username => auth_user[:username],
+      :groups => auth_user[:usergroups] || [],
+    },
+  })
+  $logger.info("Running: pcs_internal #{input_data[:cmd]} by pcsd workers")
+  start = Time.now
+  begin
+    output = UNIXSocket.open(socket_path) { |socket|
+      request_json = JSON.generate(request)
+      socket.write("#{request_json.bytesize}\n#{request_json}")
+      socket.read()
+    }
+  rescue SystemCallError, IOError => e
+    $logger.info("pcs_internal workers are not available: #{e}")
+    return nil
+  end
+  $logger.debug("Duration: " + (Time.now - start).to_s + "s")
+  return (output.nil? or output.empty?) ? nil : output
+end
+
 def run_pcs_internal(auth_user, cmd, data, request_timeout=nil)
   input_data = {
     :cmd => cmd,
@@ -1961,18 +1990,22 @@ def run_pcs_internal(auth_user, cmd, data, request_timeout=nil)
       :request_timeout => request_timeout,
     },
   }
-  stdout, stderr, return_val = run_cmd_options(
-    auth_user,
-    {'stdin' => JSON.generate(input_data)},
-    PCS_INTERNAL
-  )
-  if return_val != 0
-    return get_pcs_internal_output_format(
-      'exception', "Command failed: #{stderr.join("\n")}"
+  output = run_pcs_internal_server(auth_user, input_data)
+  if output.nil?
+    stdout, stderr, return_val = run_cmd_options(
+      auth_user,
+      {'stdin' => JSON.generate(input_data)},
+      PCS_INTERNAL
     )
+    if return_val != 0
+      return get_pcs_internal_output_format(
+        'exception', "Command failed: #{stderr.join("\n")}"
+      )
+    end
+    output = stdout.join("\n")
   end
   begin
-    parsed_output = JSON.parse(stdout.join("\n"))
+    parsed_output = JSON.parse(output)
     if (
       parsed_output.include?('report_list') \
       and \
@@ -1,4 +1,5 @@
 require 'base64'
+require 'digest'
 require 'pcs.rb' #write_file_lock, read_file_lock
 require 'settings.rb'
 require 'pcsd_exchange_format.rb'
@@ -14,6 +15,10 @@ module PcsdFile
 
     def validate()
       PcsdFile::validate_file_key_with_string(@id, @file, :data)
+      self.validate_location()
+    end
+
+    def validate_location()
     end
 
     def rewrite_existing()
@@ -47,6 +52,19 @@ module PcsdFile
       return self.read() == @file[:data]
     end
 
+    # Digest of the file content in the form it is transferred in, so it can
+    # be compared to a digest of the data to be put without sending them.
+    def digest()
+      self.validate_location()
+      unless self.exists?
+        return nil
+      end
+      content = self.read()
+      return Digest::SHA256.hexdigest(
+        self.binary? ? Base64.strict_encode64(content) : content
+      )
+    end
+
     def write()
       write_file_lock(
         self.full_file_name,
@@ -99,8 +117,7 @@ module PcsdFile
   end
 
   class PutFileBooth < PutFile
-    def validate()
-      super
+    def validate_location()
       PcsdFile::validate_file_key_with_string(@id, @file, :name)
       if @file[:name].empty?
         raise PcsdExchangeFormat::Error.for_item('file', @id, "'name' is empty")
@@ -223,6 +240,32 @@ module PcsdFile
   }
 end
 
+def PcsdFile.digest(id, file_hash)
+  unless file_hash.has_key?(:type)
+    raise PcsdExchangeFormat::Error.for_item('file', id, "'type' is missing")
+  end
+
+  unless PcsdFile::TYPES.key?(file_hash[:type])
+    raise PcsdExchangeFormat::Error.for_item(
+      'file',
+      id,
+      "unsupported 'type' ('#{file_hash[:type]}')"+
+      " supported are #{PcsdFile::TYPES.keys}"
+    )
+  end
+
+  file = PcsdFile::TYPES[file_hash[:type]].new(id, file_hash)
+  begin
+    return file.digest()
+  rescue PcsdExchangeFormat::Error
+    raise
+  rescue => e
+    # an unreadable file is reported as a missing one, so it gets rewritten
+    $logger.warn("Unable to get digest of '#{file.full_file_name}': #{e}")
+    return nil
+  end
+end
+
 def PcsdFile.validate_file_key_with_string(id, file_hash, key_name)
   unless file_hash.has_key?(key_name)
     raise PcsdExchangeFormat::Error.for_item(
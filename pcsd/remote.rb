@@ -83,8 +83,10 @@ def remote(params, request, auth_user)
       :booth_save_files => method(:booth_save_files),
       :booth_get_config => method(:booth_get_config),
       :put_file => method(:put_file),
+      :get_file_digests => method(:get_file_digests),
       :remove_file => method(:remove_file),
       :manage_services => method(:manage_services),
+      :node_actions => method(:node_actions),
       :check_host => method(:check_host),
       :reload_corosync_conf => method(:reload_corosync_conf),
       :remove_nodes_from_cib => method(:remove_nodes_from_cib),
@@ -2689,6 +2691,26 @@ def put_file(params, request, auth_user)
   end
 end
 
+def get_file_digests(params, request, auth_user)
+  begin
+    check_permissions(auth_user, Permissions::READ)
+
+    files = check_request_data_for_json(params, auth_user)
+    PcsdExchangeFormat::validate_item_map_is_Hash('files', files)
+
+    return pcsd_success(
+      JSON.generate({"files" => Hash[files.map{|id, file_data|
+        PcsdExchangeFormat::validate_item_is_Hash('file', id, file_data)
+        [id, {:digest => PcsdFile::digest(id, file_data)}]
+      }]})
+    )
+  rescue PcsdRequestException => e
+    return e.code, e.message
+  rescue PcsdExchangeFormat::Error => e
+    return 400, "Invalid input data format: #{e.message}"
+  end
+end
+
 def remove_file(params, request, auth_user)
   begin
     check_permissions(auth_user, Permissions::WRITE)
@@ -2734,6 +2756,108 @@ def manage_services(params, request, auth_user)
   end
 end
 
+# Actions which can be run by node_actions. Each of them corresponds to a remote
+# call of the same name and returns the same results.
+NODE_ACTION_TYPES = {
+  'put_file' => {
+    :item_types => PcsdFile::TYPES,
+    :item_name => 'file',
+    :results_key => 'files',
+    :success_codes => ['written', 'rewritten', 'same_content'],
+  },
+  'remove_file' => {
+    :item_types => PcsdRemoveFile::TYPES,
+    :item_name => 'file',
+    :results_key => 'files',
+    :success_codes => ['deleted', 'not_found'],
+  },
+  'manage_services' => {
+    :item_types => PcsdActionCommand::TYPES,
+    :item_name => 'action',
+    :results_key => 'actions',
+    :success_codes => ['success'],
+  },
+}
+
+# Run put_file, remove_file and manage_services actions in one request. The
+# actions are run in the specified order. The whole input is validated before
+# any action is run and once an action fails, the remaining actions are not
+# run. Results are returned in the order of the actions.
+def node_actions(params, request, auth_user)
+  begin
+    check_permissions(auth_user, Permissions::WRITE)
+
+    data = check_request_data_for_json(params, auth_user)
+    PcsdExchangeFormat::validate_item_map_is_Hash('data', data)
+    action_list = data[:actions]
+    unless action_list.is_a? Array
+      raise PcsdExchangeFormat::Error.new(
+        "actions should be 'Array'. But it is '#{action_list.class}'"
+      )
+    end
+
+    # Items are created and validated up front so that no action is run if
+    # any of them is invalid.
+    prepared_action_list = action_list.each_with_index.map { |action, index|
+      PcsdExchangeFormat::validate_item_is_Hash('action', index, action)
+      unless NODE_ACTION_TYPES.key?(action[:type])
+        raise PcsdExchangeFormat::Error.for_item(
+          'action',
+          index,
+          "unsupported 'type' ('#{action[:type]}')"+
+          " supported are #{NODE_ACTION_TYPES.keys}"
+        )
+      end
+      action_type = NODE_ACTION_TYPES[action[:type]]
+      PcsdExchangeFormat::validate_item_map_is_Hash(
+        action_type[:results_key], action[:data]
+      )
+      item_list = action[:data].map { |id, item_data|
+        PcsdExchangeFormat::validate_item_is_Hash(
+          action_type[:item_name], id, item_data
+        )
+        unless action_type[:item_types].key?(item_data[:type])
+          raise PcsdExchangeFormat::Error.for_item(
+            action_type[:item_name],
+            id,
+            "unsupported 'type' ('#{item_data[:type]}')"+
+            " supported are #{action_type[:item_types].keys}"
+          )
+        end
+        item = action_type[:item_types][item_data[:type]].new(id, item_data)
+        item.validate()
+        [id, item]
+      }
+      [action_type, item_list]
+    }
+
+    # put_file requires full permissions, see put_file
+    if action_list.any? { |action| action[:type] == 'put_file' }
+      check_permissions(auth_user, Permissions::FULL)
+    end
+
+    failed = false
+    results = prepared_action_list.map { |action_type, item_list|
+      {action_type[:results_key] => Hash[item_list.map { |id, item|
+        if failed
+          result = PcsdExchangeFormat::result(
+            :not_run, 'Not run because a previous action failed'
+          )
+        else
+          result = item.process()
+          failed = !action_type[:success_codes].include?(result[:code].to_s)
+        end
+        [id, result]
+      }]}
+    }
+    return pcsd_success(JSON.generate({'results' => results}))
+  rescue PcsdRequestException => e
+    return e.code, e.message
+  rescue PcsdExchangeFormat::Error => e
+    return 400, "Invalid input data format: #{e.message}"
+  end
+end
+
 def _hash_to_argument_list(hash)
   result = []
   if hash.kind_of?(Hash)
@@ -2926,7 +3050,8 @@ def check_host(params, request, auth_user)
     :services => {},
     :cluster_configuration_exists => (
       File.exist?(Cfgsync::CorosyncConf.file_path) or File.exist?(CIB_PATH)
-    )
+    ),
+    :pcsd_capabilities => CAPABILITIES_PCSD,
   }
 
   service_checker = get_service_installed_checker
@@ -2,62 +2,106 @@ require "base64"
 require "date"
 require "json"
 
-request_json = ARGF.read()
+# Started with --worker, the script loads pcsd once and then processes requests
+# one by one until its stdin is closed. Each request and each response is
+# a JSON document preceded by a line containing its length in bytes.
+# Otherwise, the script processes one request read from its stdin.
+worker_mode = ARGV.delete("--worker")
 
-begin
-  request = JSON.parse(request_json)
-rescue => e
-  puts e
-  exit
-end
+def process_request(request)
+  $tornado_logs = []
+  $tornado_username = nil
+  $tornado_groups = nil
+  $tornado_is_authenticated = nil
 
-if !request.include?("type")
-  result = {:error => "Type not specified"}
-  print result.to_json
-  exit
-end
+  if ["sinatra_gui", "sinatra_remote"].include?(request["type"])
+    if request["type"] == "sinatra_gui"
+      $tornado_username = request["session"]["username"]
+      $tornado_groups = request["session"]["groups"]
+      $tornado_is_authenticated = request["session"]["is_authenticated"]
+    end
 
-$tornado_logs = []
+    app = [Sinatra::Application][0]
 
-require 'pcsd'
+    env = request["env"]
+    env["rack.input"] = StringIO.new(env["rack.input"])
+    env["rack.errors"] = StringIO.new()
 
-if ["sinatra_gui", "sinatra_remote"].include?(request["type"])
-  if request["type"] == "sinatra_gui"
-    $tornado_username = request["session"]["username"]
-    $tornado_groups = request["session"]["groups"]
-    $tornado_is_authenticated = request["session"]["is_authenticated"]
+    status, headers, body = app.call(env)
+    rack_errors = env['rack.errors'].string()
+    if not rack_errors.empty?()
+      $logger.error(rack_errors)
+    end
+
+    result = {
+      :status => status,
+      :headers => headers,
+      :body => Base64.encode64(body.join("")),
+    }
+
+  elsif request["type"] == "sync_configs"
+    result = {
+      :next => Time.now.to_i + run_cfgsync()
+    }
+  else
+    result = {:error => "Unknown type: '#{request["type"]}'"}
   end
 
+  result[:logs] = $tornado_logs
+  return result
+end
+
+def load_pcsd()
+  $tornado_logs = []
+  require 'pcsd'
   set :logging, true
   set :run, false
   # Do not turn exceptions into fancy 100kB HTML pages and print them on stdout.
   # Instead, rack.errors is logged and therefore returned in result[:log].
   set :show_exceptions, false
-  app = [Sinatra::Application][0]
+end
 
-  env = request["env"]
-  env["rack.input"] = StringIO.new(env["rack.input"])
-  env["rack.errors"] = StringIO.new()
+if worker_mode
+  # Keep the protocol streams private. Anything pcsd or its child processes
+  # print goes to stderr and they cannot consume requests from stdin.
+  protocol_in = STDIN.dup
+  protocol_out = STDOUT.dup
+  STDIN.reopen(File::NULL)
+  STDOUT.reopen(STDERR)
+  protocol_in.binmode
+  protocol_out.binmode
+  protocol_out.sync = true
 
-  status, headers, body = app.call(env)
-  rack_errors = env['rack.errors'].string()
-  if not rack_errors.empty?()
-    $logger.error(rack_errors)
+  load_pcsd()
+  while (header = protocol_in.gets)
+    request_json = protocol_in.read(header.to_i)
+    break if request_json.nil?
+    begin
+      request = JSON.parse(request_json)
+    rescue => e
+      request = {"type" => nil}
+      $stderr.puts e
+    end
+    response_json = process_request(request).to_json
+    protocol_out.write("#{response_json.bytesize}\n#{response_json}")
   end
+  exit
+end
+
+request_json = ARGF.read()
+
+begin
+  request = JSON.parse(request_json)
+rescue => e
+  puts e
+  exit
+end
 
-  result = {
-    :status => status,
-    :headers => headers,
-    :body => Base64.encode64(body.join("")),
-  }
-
-elsif request["type"] == "sync_configs"
-  result = {
-    :next => Time.now.to_i + run_cfgsync()
-  }
-else
-  result = {:error => "Unknown type: '#{request["type"]}'"}
+if !request.include?("type")
+  result = {:error => "Type not specified"}
+  print result.to_json
+  exit
 end
 
-result[:logs] = $tornado_logs
-print result.to_json
+load_pcsd()
+print process_request(request).to_json